@@ -0,0 +1,239 @@
+"""Process-wide element index for actor Pages.
+
+Page objects are cheap and get recreated for every browser.get_current_page() call, so lookups
+are cached per target in a PageElementIndex shared by every Page of that target:
+
+- CSS selector queries reuse the document root node and already-described node ids, and
+  describe new nodes concurrently instead of one round trip at a time.
+- Prompt lookups keep the last serialized DOM and skip rebuilding it while a cheap in-page
+  fingerprint is unchanged, and memoize prompt -> backend node id keyed by
+  (url, hash of the serialized DOM, prompt), so a repeated prompt on unchanged content skips the LLM.
+
+Navigation (DOM.documentUpdated, main frame Page.frameNavigated) drops everything tied to the old
+document; DOM mutation events and a changed fingerprint mark the serialized DOM stale. The
+SessionManager forgets detached sessions and closed targets (see forget_element_index).
+"""
+
+import asyncio
+import hashlib
+import logging
+import weakref
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+	from cdp_use import CDPClient
+
+	from browser_use.browser.session import BrowserSession
+
+logger = logging.getLogger(__name__)
+
+# One round trip that changes whenever the URL, element count or text size of the page changes
+_FINGERPRINT_JS = """(() => {
+	const root = document.documentElement;
+	return [location.href, document.getElementsByTagName('*').length, root ? root.textContent.length : 0].join('|');
+})()"""
+
+_DOM_MUTATION_EVENTS = (
+	'childNodeInserted',
+	'childNodeRemoved',
+	'childNodeCountUpdated',
+	'attributeModified',
+	'attributeRemoved',
+	'characterDataModified',
+)
+
+
+@dataclass
+class DomSnapshot:
+	"""Serialized DOM of a page as shown to the LLM."""
+
+	url: str
+	content_hash: str
+	llm_representation: str
+	backend_node_ids: dict[int, int]  # highlight index -> backend node id
+	fingerprint: str
+	dom_version: int
+
+
+@dataclass
+class ElementIndexStats:
+	prompt_hits: int = 0
+	prompt_misses: int = 0
+	snapshot_builds: int = 0
+	snapshot_reuses: int = 0
+	nodes_described: int = 0
+
+
+class PageElementIndex:
+	"""Cached element lookups of one target."""
+
+	def __init__(self, target_id: str, max_prompts: int = 256):
+		self.target_id = target_id
+		self.max_prompts = max_prompts
+		self.dom_version = 0
+		self.stats = ElementIndexStats()
+		self._snapshot: DomSnapshot | None = None
+		self._snapshot_lock = asyncio.Lock()
+		self._prompts: OrderedDict[tuple[str, str, str], int] = OrderedDict()
+		self._roots: dict[str, int] = {}  # session id -> document node id
+		self._backend_ids: dict[str, dict[int, int]] = {}  # session id -> node id -> backend node id
+
+	# Invalidation
+
+	def document_updated(self) -> None:
+		"""The document was replaced: node ids and the serialized DOM are gone, memoized prompts stay."""
+		self.dom_version += 1
+		self._snapshot = None
+		self._roots.clear()
+		self._backend_ids.clear()
+
+	def dom_mutated(self) -> None:
+		self.dom_version += 1
+
+	# CSS selectors
+
+	async def query_selectors(self, client: 'CDPClient', session_id: str, selectors: list[str]) -> list[list[int]]:
+		"""Backend node ids matching each selector, querying all selectors concurrently."""
+		for attempt in range(2):
+			root = self._roots.get(session_id)
+			if root is None:
+				document = await client.send.DOM.getDocument(session_id=session_id)
+				root = self._roots[session_id] = document['root']['nodeId']
+			try:
+				results = await asyncio.gather(
+					*(
+						client.send.DOM.querySelectorAll({'nodeId': root, 'selector': selector}, session_id=session_id)
+						for selector in selectors
+					)
+				)
+				break
+			except Exception:
+				if attempt:
+					raise
+				# The cached root may belong to a document we missed the update for, retry with a fresh one
+				self._roots.pop(session_id, None)
+				self._backend_ids.pop(session_id, None)
+
+		known = self._backend_ids.setdefault(session_id, {})
+		missing = list(dict.fromkeys(node_id for result in results for node_id in result['nodeIds'] if node_id not in known))
+		if missing:
+			described = await asyncio.gather(
+				*(client.send.DOM.describeNode({'nodeId': node_id}, session_id=session_id) for node_id in missing)
+			)
+			for node_id, node in zip(missing, described):
+				known[node_id] = node['node']['backendNodeId']
+			self.stats.nodes_described += len(missing)
+		return [[known[node_id] for node_id in result['nodeIds']] for result in results]
+
+	# Prompts
+
+	async def snapshot(
+		self,
+		client: 'CDPClient',
+		session_id: str,
+		build: Callable[[], Awaitable[tuple[str, dict[int, int]]]],
+	) -> DomSnapshot:
+		"""The serialized DOM, rebuilt with build() only when the page changed since the last one."""
+		async with self._snapshot_lock:
+			result = await client.send.Runtime.evaluate(
+				{'expression': _FINGERPRINT_JS, 'returnByValue': True}, session_id=session_id
+			)
+			fingerprint = str(result.get('result', {}).get('value', ''))
+			snapshot = self._snapshot
+			if snapshot and snapshot.fingerprint == fingerprint and snapshot.dom_version == self.dom_version:
+				self.stats.snapshot_reuses += 1
+				return snapshot
+
+			# Mutations arriving while building must leave the new snapshot stale
+			dom_version = self.dom_version
+			llm_representation, backend_node_ids = await build()
+			self.stats.snapshot_builds += 1
+			self._snapshot = DomSnapshot(
+				url=fingerprint.rsplit('|', 2)[0],
+				content_hash=hashlib.sha256(llm_representation.encode()).hexdigest(),
+				llm_representation=llm_representation,
+				backend_node_ids=backend_node_ids,
+				fingerprint=fingerprint,
+				dom_version=dom_version,
+			)
+			return self._snapshot
+
+	def lookup_prompt(self, snapshot: DomSnapshot, prompt: str) -> int | None:
+		"""Backend node id an earlier identical prompt resolved to on the same content."""
+		key = (snapshot.url, snapshot.content_hash, prompt)
+		backend_node_id = self._prompts.get(key)
+		if backend_node_id is None:
+			self.stats.prompt_misses += 1
+			return None
+		self._prompts.move_to_end(key)
+		self.stats.prompt_hits += 1
+		return backend_node_id
+
+	def remember_prompt(self, snapshot: DomSnapshot, prompt: str, backend_node_id: int) -> None:
+		self._prompts[(snapshot.url, snapshot.content_hash, prompt)] = backend_node_id
+		self._prompts.move_to_end((snapshot.url, snapshot.content_hash, prompt))
+		while len(self._prompts) > self.max_prompts:
+			self._prompts.popitem(last=False)
+
+
+class _ClientIndexes:
+	"""Indexes of every target reached through one CDP client, fed by its DOM and Page events.
+
+	The client keeps one handler per event, so events are registered once here and dispatched
+	to the index of the session they arrived on.
+	"""
+
+	def __init__(self, client: 'CDPClient'):
+		self.by_target: dict[str, PageElementIndex] = {}
+		self.by_session: dict[str, PageElementIndex] = {}
+		client.register.DOM.documentUpdated(self._on_document_updated)
+		client.register.Page.frameNavigated(self._on_frame_navigated)
+		for event in _DOM_MUTATION_EVENTS:
+			getattr(client.register.DOM, event)(self._on_dom_mutated)
+
+	def forget(self, session_id: str, target_id: str | None = None) -> None:
+		self.by_session.pop(session_id, None)
+		if target_id is not None and (index := self.by_target.pop(target_id, None)) is not None:
+			for other_session_id in [key for key, value in self.by_session.items() if value is index]:
+				del self.by_session[other_session_id]
+
+	def _on_document_updated(self, event: Any, session_id: str | None = None) -> None:
+		if index := self.by_session.get(session_id or ''):
+			index.document_updated()
+
+	def _on_frame_navigated(self, event: Any, session_id: str | None = None) -> None:
+		if index := self.by_session.get(session_id or ''):
+			if event.get('frame', {}).get('parentId'):
+				index.dom_mutated()  # an iframe navigated, the main document is still there
+			else:
+				index.document_updated()
+
+	def _on_dom_mutated(self, event: Any, session_id: str | None = None) -> None:
+		if index := self.by_session.get(session_id or ''):
+			index.dom_mutated()
+
+
+_client_indexes: 'weakref.WeakKeyDictionary[CDPClient, _ClientIndexes]' = weakref.WeakKeyDictionary()
+
+
+def get_element_index(browser_session: 'BrowserSession', target_id: str, session_id: str | None = None) -> PageElementIndex:
+	"""The element index of a target, routing events of session_id to it when given."""
+	client = browser_session.cdp_client
+	indexes = _client_indexes.get(client)
+	if indexes is None:
+		indexes = _client_indexes[client] = _ClientIndexes(client)
+	index = indexes.by_target.get(target_id)
+	if index is None:
+		index = indexes.by_target[target_id] = PageElementIndex(target_id)
+	if session_id is not None:
+		indexes.by_session[session_id] = index
+	return index
+
+
+def forget_element_index(client: 'CDPClient', session_id: str, target_id: str | None = None) -> None:
+	"""Stop routing events of a detached session, and drop the index of target_id when the target is gone."""
+	if indexes := _client_indexes.get(client):
+		indexes.forget(session_id, target_id)
@@ -5,6 +5,7 @@ from typing import TYPE_CHECKING, TypeVar
 from pydantic import BaseModel
 
 from browser_use import logger
+from browser_use.actor.element_index import get_element_index
 from browser_use.actor.utils import get_key_info
 from browser_use.dom.serializer.serializer import DOMTreeSerializer
 from browser_use.dom.service import DomService
@@ -13,10 +14,6 @@ from browser_use.llm.messages import SystemMessage, UserMessage
 T = TypeVar('T', bound=BaseModel)
 
 if TYPE_CHECKING:
-	from cdp_use.cdp.dom.commands import (
-		DescribeNodeParameters,
-		QuerySelectorAllParameters,
-	)
 	from cdp_use.cdp.emulation.commands import SetDeviceMetricsOverrideParameters
 	from cdp_use.cdp.input.commands import (
 		DispatchKeyEventParameters,
@@ -366,28 +363,19 @@ class Page:
 	# Element finding methods (these would need to be implemented based on DOM queries)
 	async def get_elements_by_css_selector(self, selector: str) -> list['Element']:
 		"""Get elements by CSS selector."""
-		session_id = await self._ensure_session()
-
-		# Get document first
-		doc_result = await self._client.send.DOM.getDocument(session_id=session_id)
-		document_node_id = doc_result['root']['nodeId']
+		return (await self.get_elements_by_css_selectors([selector]))[0]
 
-		# Query selector all
-		query_params: 'QuerySelectorAllParameters' = {'nodeId': document_node_id, 'selector': selector}
-		result = await self._client.send.DOM.querySelectorAll(query_params, session_id=session_id)
+	async def get_elements_by_css_selectors(self, selectors: list[str]) -> list[list['Element']]:
+		"""Get the elements matching each of several CSS selectors in one batch."""
+		session_id = await self._ensure_session()
+		index = get_element_index(self._browser_session, self._target_id, session_id)
+		results = await index.query_selectors(self._client, session_id, selectors)
 
-		elements = []
 		from .element import Element as Element_
 
-		# Convert node IDs to backend node IDs
-		for node_id in result['nodeIds']:
-			# Get backend node ID
-			describe_params: 'DescribeNodeParameters' = {'nodeId': node_id}
-			node_result = await self._client.send.DOM.describeNode(describe_params, session_id=session_id)
-			backend_node_id = node_result['node']['backendNodeId']
-			elements.append(Element_(self._browser_session, backend_node_id, session_id))
-
-		return elements
+		return [
+			[Element_(self._browser_session, backend_node_id, session_id) for backend_node_id in result] for result in results
+		]
 
 	# AI METHODS
 
@@ -397,24 +385,25 @@ class Page:
 		return DomService(self._browser_session)
 
 	async def get_element_by_prompt(self, prompt: str, llm: 'BaseChatModel | None' = None) -> 'Element | None':
-		"""Get an element by a prompt."""
-		await self._ensure_session()
+		"""Get an element by a prompt.
+
+		Repeating a prompt on unchanged page content reuses the earlier answer without calling the LLM.
+		"""
+		session_id = await self._ensure_session()
 		llm = llm or self._llm
 
 		if not llm:
 			raise ValueError('LLM not provided')
 
-		dom_service = self.dom_service
-
-		# Lazy fetch all_frames inside get_dom_tree if needed (for cross-origin iframes)
-		enhanced_dom_tree, _ = await dom_service.get_dom_tree(target_id=self._target_id, all_frames=None)
+		from .element import Element as Element_
 
-		session_id = self._browser_session.id
-		serialized_dom_state, _ = DOMTreeSerializer(
-			enhanced_dom_tree, None, paint_order_filtering=True, session_id=session_id
-		).serialize_accessible_elements()
+		index = get_element_index(self._browser_session, self._target_id, session_id)
+		snapshot = await index.snapshot(self._client, session_id, self._serialize_dom)
+		backend_node_id = index.lookup_prompt(snapshot, prompt)
+		if backend_node_id is not None:
+			return Element_(self._browser_session, backend_node_id, session_id)
 
-		llm_representation = serialized_dom_state.llm_representation()
+		llm_representation = snapshot.llm_representation
 
 		system_message = SystemMessage(
 			content="""You are an AI created to find an element on a page by a prompt.
@@ -468,14 +457,26 @@ Before you return the element index, reason about the state and elements for a s
 
 		element_highlight_index = llm_response.completion.element_highlight_index
 
-		if element_highlight_index is None or element_highlight_index not in serialized_dom_state.selector_map:
+		if element_highlight_index is None or element_highlight_index not in snapshot.backend_node_ids:
 			return None
 
-		element = serialized_dom_state.selector_map[element_highlight_index]
+		backend_node_id = snapshot.backend_node_ids[element_highlight_index]
+		index.remember_prompt(snapshot, prompt, backend_node_id)
+		return Element_(self._browser_session, backend_node_id, session_id)
 
-		from .element import Element as Element_
+	async def _serialize_dom(self) -> tuple[str, dict[int, int]]:
+		"""Serialize the page for the LLM, returning its representation and highlight index -> backend node id."""
+		# Lazy fetch all_frames inside get_dom_tree if needed (for cross-origin iframes)
+		enhanced_dom_tree, _ = await self.dom_service.get_dom_tree(target_id=self._target_id, all_frames=None)
 
-		return Element_(self._browser_session, element.backend_node_id, self._session_id)
+		serialized_dom_state, _ = DOMTreeSerializer(
+			enhanced_dom_tree, None, paint_order_filtering=True, session_id=self._browser_session.id
+		).serialize_accessible_elements()
+
+		backend_node_ids = {
+			highlight_index: node.backend_node_id for highlight_index, node in serialized_dom_state.selector_map.items()
+		}
+		return serialized_dom_state.llm_representation(), backend_node_ids
 
 	async def must_get_element_by_prompt(self, prompt: str, llm: 'BaseChatModel | None' = None) -> 'Element':
 		"""Get an element by a prompt.
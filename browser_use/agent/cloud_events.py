@@ -5,7 +5,7 @@ from pathlib import Path
 
 import anyio
 from bubus import BaseEvent
-from pydantic import Field, field_validator
+from pydantic import ConfigDict, Field, field_validator
 from uuid_extensions import uuid7str
 
 MAX_STRING_LENGTH = 100000  # 100K chars ~ 25k tokens should be enough
@@ -14,8 +14,13 @@ MAX_TASK_LENGTH = 100000
 MAX_COMMENT_LENGTH = 2000
 MAX_FILE_CONTENT_SIZE = 50 * 1024 * 1024  # 50MB
 
+# These events are only used with cloud sync, so each one sets defer_build and builds its
+# pydantic schema on first use instead of at import
+
 
 class UpdateAgentTaskEvent(BaseEvent):
+	model_config = ConfigDict(defer_build=True)
+
 	# Required fields for identification
 	id: str  # The task ID to update
 	user_id: str = Field(max_length=255)  # For authorization
@@ -58,6 +63,8 @@ class UpdateAgentTaskEvent(BaseEvent):
 
 
 class CreateAgentOutputFileEvent(BaseEvent):
+	model_config = ConfigDict(defer_build=True)
+
 	# Model fields
 	id: str = Field(default_factory=uuid7str)
 	user_id: str = Field(max_length=255)
@@ -113,6 +120,8 @@ class CreateAgentOutputFileEvent(BaseEvent):
 
 
 class CreateAgentStepEvent(BaseEvent):
+	model_config = ConfigDict(defer_build=True)
+
 	# Model fields
 	id: str = Field(default_factory=uuid7str)
 	user_id: str = Field(max_length=255)  # Added for authorization checks
@@ -183,6 +192,8 @@ class CreateAgentStepEvent(BaseEvent):
 
 
 class CreateAgentTaskEvent(BaseEvent):
+	model_config = ConfigDict(defer_build=True)
+
 	# Model fields
 	id: str = Field(default_factory=uuid7str)
 	user_id: str = Field(max_length=255)  # Added for authorization checks
@@ -226,6 +237,8 @@ class CreateAgentTaskEvent(BaseEvent):
 
 
 class CreateAgentSessionEvent(BaseEvent):
+	model_config = ConfigDict(defer_build=True)
+
 	# Model fields
 	id: str = Field(default_factory=uuid7str)
 	user_id: str = Field(max_length=255)
@@ -273,6 +286,8 @@ class CreateAgentSessionEvent(BaseEvent):
 class UpdateAgentSessionEvent(BaseEvent):
 	"""Event to update an existing agent session"""
 
+	model_config = ConfigDict(defer_build=True)
+
 	# Model fields
 	id: str  # Session ID to update
 	user_id: str = Field(max_length=255)
@@ -13,6 +13,7 @@ from browser_use.agent.views import (
 	AgentStepInfo,
 	MessageManagerState,
 )
+from browser_use.browser.domain_patterns import compile_domain_patterns
 from browser_use.browser.views import BrowserStateSummary
 from browser_use.filesystem.file_system import FileSystem
 from browser_use.llm.messages import (
@@ -22,7 +23,7 @@ from browser_use.llm.messages import (
 	SystemMessage,
 )
 from browser_use.observability import observe_debug
-from browser_use.utils import match_url_with_domain_pattern, time_execution_sync
+from browser_use.utils import time_execution_sync
 
 logger = logging.getLogger(__name__)
 
@@ -268,11 +269,15 @@ class MessageManager:
 
 		# Collect placeholders for sensitive data
 		placeholders: set[str] = set()
+		matching_domains: set[str] = set()
+		if current_page_url:
+			domain_patterns = tuple(key for key, value in sensitive_data.items() if isinstance(value, dict))
+			matching_domains = set(compile_domain_patterns(domain_patterns, log_warnings=True).matching(current_page_url))
 
 		for key, value in sensitive_data.items():
 			if isinstance(value, dict):
 				# New format: {domain: {key: value}}
-				if current_page_url and match_url_with_domain_pattern(current_page_url, key, True):
+				if key in matching_domains:
 					placeholders.update(value.keys())
 			else:
 				# Old format: {key: value}
@@ -6,7 +6,7 @@ import logging
 import re
 import tempfile
 import time
-from collections.abc import Awaitable, Callable
+from collections.abc import Awaitable, Callable, Collection
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Generic, Literal, TypeVar, cast
 from urllib.parse import urlparse
@@ -45,6 +45,7 @@ from browser_use.agent.message_manager.service import (
 )
 from browser_use.agent.prompts import SystemPrompt
 from browser_use.agent.views import (
+	ActionProfile,
 	ActionResult,
 	AgentError,
 	AgentHistory,
@@ -58,6 +59,7 @@ from browser_use.agent.views import (
 	DetectedVariable,
 	JudgementResult,
 	StepMetadata,
+	StepProfile,
 )
 from browser_use.browser.session import DEFAULT_BROWSER_PROFILE
 from browser_use.browser.views import BrowserStateSummary
@@ -65,6 +67,7 @@ from browser_use.config import CONFIG
 from browser_use.dom.views import DOMInteractedElement, MatchLevel
 from browser_use.filesystem.file_system import FileSystem
 from browser_use.observability import observe, observe_debug
+from browser_use.profiler import SamplingProfiler
 from browser_use.telemetry.service import ProductTelemetry
 from browser_use.telemetry.views import AgentTelemetryEvent
 from browser_use.tools.registry.views import ActionModel
@@ -181,6 +184,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		injected_agent_state: AgentState | None = None,
 		source: str | None = None,
 		file_system_path: str | None = None,
+		file_system_append_flush_interval: float | None = None,
 		task_id: str | None = None,
 		calculate_cost: bool = False,
 		display_files_in_done_text: bool = True,
@@ -350,6 +354,8 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		self._fallback_llm: BaseChatModel | None = fallback_llm
 		self._using_fallback_llm: bool = False
 		self._original_llm: BaseChatModel = llm  # Store original for reference
+		self._step_profile: StepProfile | None = None  # Profile of the step in progress
+		self.profiler: SamplingProfiler | None = None  # Set by run(profile=...)
 		self.directly_open_url = directly_open_url
 		self.include_recent_events = include_recent_events
 		self._url_shortening_limit = _url_shortening_limit
@@ -402,7 +408,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		self.agent_directory = base_tmp / f'browser_use_agent_{self.id}_{timestamp}'
 
 		# Initialize file system and screenshot service
-		self._set_file_system(file_system_path)
+		self._set_file_system(file_system_path, append_flush_interval=file_system_append_flush_interval)
 		self._set_screenshot_service()
 
 		# Action setup
@@ -642,7 +648,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		else:
 			self.logger.debug(f'📁 No new downloads detected (tracking {len(current_files)} files)')
 
-	def _set_file_system(self, file_system_path: str | None = None) -> None:
+	def _set_file_system(self, file_system_path: str | None = None, append_flush_interval: float | None = None) -> None:
 		# Check for conflicting parameters
 		if self.state.file_system_state and file_system_path:
 			raise ValueError(
@@ -655,6 +661,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			try:
 				# Restore file system from state at the exact same location
 				self.file_system = FileSystem.from_state(self.state.file_system_state)
+				self.file_system.append_flush_interval = append_flush_interval
 				# The parent directory of base_dir is the original file_system_path
 				self.file_system_path = str(self.file_system.base_dir)
 				self.logger.debug(f'💾 File system restored from state to: {self.file_system_path}')
@@ -666,11 +673,11 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		# Initialize new file system
 		try:
 			if file_system_path:
-				self.file_system = FileSystem(file_system_path)
+				self.file_system = FileSystem(file_system_path, append_flush_interval=append_flush_interval)
 				self.file_system_path = file_system_path
 			else:
 				# Use the agent directory for file system
-				self.file_system = FileSystem(self.agent_directory)
+				self.file_system = FileSystem(self.agent_directory, append_flush_interval=append_flush_interval)
 				self.file_system_path = str(self.agent_directory)
 		except Exception as e:
 			self.logger.error(f'💾 Failed to initialize file system: {e}.')
@@ -983,19 +990,24 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		# Initialize timing first, before any exceptions can occur
 
 		self.step_start_time = time.time()
+		profile = self._step_profile = StepProfile()
 
 		browser_state_summary = None
 
 		try:
 			# Phase 1: Prepare context and timing
+			phase_start = time.perf_counter()
 			browser_state_summary = await self._prepare_context(step_info)
+			profile.context_ms = (time.perf_counter() - phase_start) * 1000 - profile.state_capture_ms
 
 			# Phase 2: Get model output and execute actions
 			await self._get_next_action(browser_state_summary)
 			await self._execute_actions()
 
 			# Phase 3: Post-processing
+			phase_start = time.perf_counter()
 			await self._post_process()
+			profile.post_process_ms = (time.perf_counter() - phase_start) * 1000
 
 		except Exception as e:
 			# Handle ALL exceptions in one place
@@ -1013,10 +1025,14 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		self.logger.debug(f'🌐 Step {self.state.n_steps}: Getting browser state...')
 		# Always take screenshots for all steps
 		self.logger.debug('📸 Requesting browser state with include_screenshot=True')
+		capture_start = time.perf_counter()
 		browser_state_summary = await self.browser_session.get_browser_state_summary(
 			include_screenshot=True,  # always capture even if use_vision=False so that cloud sync is useful (it's fast now anyway)
 			include_recent_events=self.include_recent_events,
 		)
+		if self._step_profile is not None:
+			self._step_profile.state_capture_ms = (time.perf_counter() - capture_start) * 1000
+			self._step_profile.state_capture = dict(browser_state_summary.timing)
 		if browser_state_summary.screenshot:
 			self.logger.debug(f'📸 Got browser state WITH screenshot, length: {len(browser_state_summary.screenshot)}')
 		else:
@@ -1067,6 +1083,7 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			f'🤖 Step {self.state.n_steps}: Calling LLM with {len(input_messages)} messages (model: {self.llm.model})...'
 		)
 
+		llm_start = time.perf_counter()
 		try:
 			model_output = await asyncio.wait_for(
 				self._get_model_output_with_retry(input_messages), timeout=self.settings.llm_timeout
@@ -1083,6 +1100,9 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			raise TimeoutError(
 				f'LLM call timed out after {self.settings.llm_timeout} seconds. Keep your thinking and output short.'
 			)
+		finally:
+			if self._step_profile is not None:
+				self._step_profile.llm.total_ms = (time.perf_counter() - llm_start) * 1000
 
 		self.state.last_model_output = model_output
 
@@ -1090,7 +1110,10 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		await self._check_stop_or_pause()
 
 		# Handle callbacks and conversation saving
+		callbacks_start = time.perf_counter()
 		await self._handle_post_llm_processing(browser_state_summary, input_messages)
+		if self._step_profile is not None:
+			self._step_profile.llm_callbacks_ms = (time.perf_counter() - callbacks_start) * 1000
 
 		# check again if Ctrl+C was pressed before we commit the output to history
 		await self._check_stop_or_pause()
@@ -1169,6 +1192,8 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 	async def _finalize(self, browser_state_summary: BrowserStateSummary | None) -> None:
 		"""Finalize the step with history, logging, and events"""
 		step_end_time = time.time()
+		# The step is over: actions run outside step() (initial actions, rerun) must not land in its saved profile
+		profile, self._step_profile = self._step_profile, None
 		if not self.state.last_result:
 			return
 
@@ -1181,11 +1206,14 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 					previous_end_time = last_history_item.metadata.step_end_time
 					previous_start_time = last_history_item.metadata.step_start_time
 					step_interval = max(0, previous_end_time - previous_start_time)
+			if profile is not None:
+				profile.total_ms = (step_end_time - self.step_start_time) * 1000
 			metadata = StepMetadata(
 				step_number=self.state.n_steps,
 				step_start_time=self.step_start_time,
 				step_end_time=step_end_time,
 				step_interval=step_interval,
+				profile=profile,
 			)
 
 			# Use _make_history_item like main branch
@@ -1605,7 +1633,16 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		kwargs: dict = {'output_format': self.AgentOutput, 'session_id': self.session_id}
 
 		try:
+			request_start = time.perf_counter()
 			response = await self.llm.ainvoke(input_messages, **kwargs)
+			if self._step_profile is not None:
+				llm_profile = self._step_profile.llm
+				llm_profile.calls += 1
+				llm_profile.request_ms += (time.perf_counter() - request_start) * 1000
+				if response.usage:
+					llm_profile.prompt_tokens += response.usage.prompt_tokens
+					llm_profile.prompt_cached_tokens += response.usage.prompt_cached_tokens or 0
+					llm_profile.completion_tokens += response.usage.completion_tokens
 			parsed: AgentOutput = response.completion  # type: ignore[assignment]
 
 			# Replace any shortened URLs in the LLM response back to original URLs
@@ -2150,8 +2187,16 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		max_steps: int = 100,
 		on_step_start: AgentHookFunc | None = None,
 		on_step_end: AgentHookFunc | None = None,
+		profile: bool | str | Path = False,
+		profile_steps: Collection[int] | None = None,
 	) -> AgentHistoryList[AgentStructuredOutput]:
-		"""Execute the task with maximum number of steps"""
+		"""Execute the task with maximum number of steps
+
+		profile=True samples the run with a SamplingProfiler and writes profile.speedscope.json and
+		profile.collapsed.txt to the agent directory, a path is used as the file prefix instead.
+		profile_steps limits sampling to those step numbers. save_history() also writes the profile
+		next to the history file.
+		"""
 
 		loop = asyncio.get_event_loop()
 		agent_run_error: str | None = None  # Initialize error tracking variable
@@ -2178,6 +2223,10 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		)
 		signal_handler.register()
 
+		if profile:
+			self.profiler = SamplingProfiler(step=lambda: self.state.n_steps, steps=profile_steps)
+			self.profiler.start()
+
 		try:
 			await self._log_agent_run()
 
@@ -2304,6 +2353,15 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			raise e
 
 		finally:
+			if profile and self.profiler is not None:
+				self.profiler.stop()
+				path_prefix = self.agent_directory / 'profile' if profile is True else Path(profile)
+				try:
+					speedscope_path, _ = self.profiler.save(path_prefix)
+					self.logger.info(f'🔥 Saved run profile to {_log_pretty_path(speedscope_path)}')
+				except OSError as e:
+					self.logger.warning(f'Failed to save run profile to {path_prefix}: {e}')
+
 			if should_delay_close and self._demo_mode_enabled and agent_run_error is None:
 				await asyncio.sleep(30)
 			if agent_run_error:
@@ -2414,6 +2472,10 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 
 				time_end = time.time()
 				time_elapsed = time_end - time_start
+				if self._step_profile is not None:
+					self._step_profile.actions.append(
+						ActionProfile(name=action_name, duration_ms=time_elapsed * 1000, error=result.error is not None)
+					)
 
 				if result.error:
 					await self._demo_mode_log(
@@ -3353,6 +3415,8 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		if not file_path:
 			file_path = 'AgentHistory.json'
 		self.history.save_to_file(file_path, sensitive_data=self.sensitive_data)
+		if self.profiler is not None:
+			self.profiler.save(Path(file_path).with_suffix(''))
 
 	def pause(self) -> None:
 		"""Pause the agent before the next step"""
@@ -3429,6 +3493,10 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			if self.skill_service is not None:
 				await self.skill_service.close()
 
+			# Write appends still batched in memory (file_system_append_flush_interval) to disk
+			if self.file_system is not None:
+				await self.file_system.close()
+
 			# Force garbage collection
 			gc.collect()
 
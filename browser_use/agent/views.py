@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import json
 import logging
+import math
 import traceback
 from dataclasses import dataclass
 from pathlib import Path
@@ -162,6 +163,85 @@ class RerunSummaryAction(BaseModel):
 	)
 
 
+class ActionProfile(BaseModel):
+	"""Timing of a single executed action"""
+
+	name: str
+	duration_ms: float
+	error: bool = False
+
+
+class LLMCallProfile(BaseModel):
+	"""Timing and token usage of the LLM calls made during a step"""
+
+	calls: int = 0  # includes empty-action retries and fallback LLM calls
+	request_ms: float = 0.0  # time spent waiting on the provider, summed over calls
+	total_ms: float = 0.0  # request_ms plus message preparation and response parsing
+	prompt_tokens: int = 0
+	prompt_cached_tokens: int = 0
+	completion_tokens: int = 0
+
+
+class StepProfile(BaseModel):
+	"""Where the time of a single step went, all durations in milliseconds"""
+
+	state_capture_ms: float = 0.0
+	# Breakdown reported by the DOM watchdog: cdp_ms, tree_build_ms, serialization_ms, screenshot_ms, ...
+	state_capture: dict[str, float] = Field(default_factory=dict)
+	context_ms: float = 0.0  # download checks, page action models and state messages
+	llm: LLMCallProfile = Field(default_factory=LLMCallProfile)
+	llm_callbacks_ms: float = 0.0
+	actions: list[ActionProfile] = Field(default_factory=list)
+	post_process_ms: float = 0.0
+	total_ms: float = 0.0
+
+	@property
+	def actions_ms(self) -> float:
+		return sum(action.duration_ms for action in self.actions)
+
+
+class TimingStats(BaseModel):
+	"""Distribution of one profiled duration across steps"""
+
+	count: int
+	total_ms: float
+	mean_ms: float
+	p50_ms: float
+	p95_ms: float
+	max_ms: float
+
+	@classmethod
+	def from_samples(cls, samples: list[float]) -> TimingStats:
+		ordered = sorted(samples)
+
+		def percentile(p: float) -> float:
+			# Nearest-rank percentile
+			return ordered[max(0, math.ceil(p * len(ordered)) - 1)]
+
+		total = sum(ordered)
+		return cls(
+			count=len(ordered),
+			total_ms=total,
+			mean_ms=total / len(ordered),
+			p50_ms=percentile(0.5),
+			p95_ms=percentile(0.95),
+			max_ms=ordered[-1],
+		)
+
+
+class PerformanceSummary(BaseModel):
+	"""Step profiles of a run aggregated per phase, state capture stage and action"""
+
+	steps: int = 0
+	phases: dict[str, TimingStats] = Field(default_factory=dict)
+	state_capture: dict[str, TimingStats] = Field(default_factory=dict)
+	actions: dict[str, TimingStats] = Field(default_factory=dict)
+	llm_calls: int = 0
+	prompt_tokens: int = 0
+	prompt_cached_tokens: int = 0
+	completion_tokens: int = 0
+
+
 class StepMetadata(BaseModel):
 	"""Metadata for a single step including timing and token information"""
 
@@ -169,6 +249,7 @@ class StepMetadata(BaseModel):
 	step_end_time: float
 	step_number: int
 	step_interval: float | None = None
+	profile: StepProfile | None = None
 
 	@property
 	def duration_seconds(self) -> float:
@@ -414,6 +495,41 @@ class AgentHistoryList(BaseModel, Generic[AgentStructuredOutput]):
 				total += h.metadata.duration_seconds
 		return total
 
+	def step_profiles(self) -> list[StepProfile]:
+		"""Get the performance profiles of all profiled steps"""
+		return [h.metadata.profile for h in self.history if h.metadata and h.metadata.profile]
+
+	def performance_summary(self) -> PerformanceSummary:
+		"""Aggregate the step profiles into per phase, state capture stage and action timing stats"""
+		profiles = self.step_profiles()
+		phases: dict[str, list[float]] = {}
+		state_capture: dict[str, list[float]] = {}
+		actions: dict[str, list[float]] = {}
+		summary = PerformanceSummary(steps=len(profiles))
+		for profile in profiles:
+			for phase, duration_ms in (
+				('state_capture', profile.state_capture_ms),
+				('context', profile.context_ms),
+				('llm', profile.llm.total_ms),
+				('llm_callbacks', profile.llm_callbacks_ms),
+				('actions', profile.actions_ms),
+				('post_process', profile.post_process_ms),
+				('total', profile.total_ms),
+			):
+				phases.setdefault(phase, []).append(duration_ms)
+			for stage, duration_ms in profile.state_capture.items():
+				state_capture.setdefault(stage, []).append(duration_ms)
+			for action in profile.actions:
+				actions.setdefault(action.name, []).append(action.duration_ms)
+			summary.llm_calls += profile.llm.calls
+			summary.prompt_tokens += profile.llm.prompt_tokens
+			summary.prompt_cached_tokens += profile.llm.prompt_cached_tokens
+			summary.completion_tokens += profile.llm.completion_tokens
+		summary.phases = {name: TimingStats.from_samples(samples) for name, samples in phases.items()}
+		summary.state_capture = {name: TimingStats.from_samples(samples) for name, samples in state_capture.items()}
+		summary.actions = {name: TimingStats.from_samples(samples) for name, samples in actions.items()}
+		return summary
+
 	def __len__(self) -> int:
 		"""Return the number of history items"""
 		return len(self.history)
@@ -0,0 +1,154 @@
+"""CDP round-trip accounting and pipelining helpers for action handlers.
+
+Every awaited CDP command costs a full network round-trip. On a local browser that is
+sub-millisecond, but over a remote CDP connection (cloud or Docker browsers) each one
+costs 20-80ms, so handlers that await long chains of commands one after another get slow.
+
+cdp-use multiplexes commands over a single websocket and matches responses by message id,
+so independent commands can be in flight at the same time. This module provides:
+- `pipeline()`: issue independent commands concurrently and pay for one round-trip
+- `track_cdp_round_trips()`: count commands and effective round-trips issued by an action
+- `CDPRoundTripStats`: per-action aggregates so improvements can be tracked over time
+"""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import wraps
+from typing import Any, ParamSpec, TypeVar
+
+from cdp_use import CDPClient
+
+logger = logging.getLogger(__name__)
+
+P = ParamSpec('P')
+R = TypeVar('R')
+
+_active_counter: ContextVar['CDPRoundTripCounter | None'] = ContextVar('cdp_round_trip_counter', default=None)
+
+
+@dataclass
+class CDPRoundTripCounter:
+	"""Counts CDP commands issued while tracking is active.
+
+	`commands` is the raw number of CDP messages sent. `round_trips` only counts commands
+	that were sent while no other tracked command was in flight, i.e. the number of times
+	the caller actually had to wait a full network round-trip. Commands pipelined with
+	`pipeline()` / `asyncio.gather()` therefore count as a single round-trip.
+	"""
+
+	action: str
+	commands: int = 0
+	round_trips: int = 0
+	methods: list[str] = field(default_factory=list)
+	_in_flight: int = 0
+
+	def command_started(self, method: str) -> None:
+		if self._in_flight == 0:
+			self.round_trips += 1
+		self._in_flight += 1
+		self.commands += 1
+		self.methods.append(method)
+
+	def command_finished(self) -> None:
+		self._in_flight = max(0, self._in_flight - 1)
+
+
+@dataclass
+class CDPRoundTripStats:
+	"""Running per-action aggregates of CDP round-trips."""
+
+	calls: dict[str, int] = field(default_factory=dict)
+	commands: dict[str, int] = field(default_factory=dict)
+	round_trips: dict[str, int] = field(default_factory=dict)
+
+	def record(self, counter: CDPRoundTripCounter) -> None:
+		action = counter.action
+		self.calls[action] = self.calls.get(action, 0) + 1
+		self.commands[action] = self.commands.get(action, 0) + counter.commands
+		self.round_trips[action] = self.round_trips.get(action, 0) + counter.round_trips
+
+	def summary(self) -> dict[str, dict[str, float]]:
+		"""Return {action: {calls, commands, round_trips, avg_round_trips}}."""
+		return {
+			action: {
+				'calls': calls,
+				'commands': self.commands[action],
+				'round_trips': self.round_trips[action],
+				'avg_round_trips': round(self.round_trips[action] / calls, 2),
+			}
+			for action, calls in self.calls.items()
+		}
+
+
+def install_round_trip_counter(cdp_client: CDPClient) -> None:
+	"""Wrap cdp_client.send_raw so commands issued inside track_cdp_round_trips() are counted.
+
+	The wrapper is a no-op (one ContextVar lookup) when no tracking is active, and is only
+	installed once per client.
+	"""
+	if getattr(cdp_client, '_round_trip_counter_installed', False):
+		return
+
+	original_send_raw = cdp_client.send_raw
+
+	async def counted_send_raw(method: str, params: Any | None = None, session_id: str | None = None) -> dict[str, Any]:
+		counter = _active_counter.get()
+		if counter is None:
+			return await original_send_raw(method, params, session_id)
+		counter.command_started(method)
+		try:
+			return await original_send_raw(method, params, session_id)
+		finally:
+			counter.command_finished()
+
+	cdp_client.send_raw = counted_send_raw  # type: ignore[method-assign]
+	cdp_client._round_trip_counter_installed = True  # type: ignore[attr-defined]
+
+
+@contextmanager
+def track_cdp_round_trips(action: str, stats: CDPRoundTripStats | None = None) -> Iterator[CDPRoundTripCounter]:
+	"""Count the CDP commands and round-trips issued by the current task (and tasks it spawns).
+
+	Nested tracking is supported: the innermost tracker gets the counts.
+	"""
+	counter = CDPRoundTripCounter(action=action)
+	token = _active_counter.set(counter)
+	try:
+		yield counter
+	finally:
+		_active_counter.reset(token)
+		if stats is not None:
+			stats.record(counter)
+		logger.debug(f'📡 {action}: {counter.commands} CDP commands in {counter.round_trips} round-trips')
+
+
+async def pipeline(*commands: Awaitable[Any]) -> list[Any]:
+	"""Send independent CDP commands concurrently and wait for all of them.
+
+	Only pass commands that do not depend on each other's results or side effects.
+	Exceptions are returned in place of results instead of being raised, so callers can
+	decide per-command whether a failure is fatal.
+	"""
+	return list(await asyncio.gather(*commands, return_exceptions=True))
+
+
+def tracks_cdp_round_trips(action: str) -> Callable[[Callable[P, Awaitable[R]]], Callable[P, Awaitable[R]]]:
+	"""Decorator for async handler methods: count their CDP round-trips under `action`.
+
+	Counts are aggregated into `self.cdp_round_trip_stats` when the instance provides it.
+	"""
+
+	def decorator(func: Callable[P, Awaitable[R]]) -> Callable[P, Awaitable[R]]:
+		@wraps(func)
+		async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+			stats = getattr(args[0], 'cdp_round_trip_stats', None) if args else None
+			with track_cdp_round_trips(action, stats):
+				return await func(*args, **kwargs)
+
+		return wrapper
+
+	return decorator
@@ -0,0 +1,248 @@
+"""Compiled domain pattern lists. SECURITY CRITICAL.
+
+Matching a URL against a pattern list used to loop over every pattern, re-parsing the URL and
+re-running fnmatch each time. The matchers here sort the patterns once into buckets:
+
+- exact hostnames in a dict,
+- `*.domain` suffix patterns in a trie keyed by reversed hostname labels,
+- per-scheme buckets, with scheme globs like `http*` checked once per scheme,
+- URL prefixes in sets by prefix length,
+- anything else (rare glob shapes) in a small fallback list evaluated with the original rules.
+
+Decisions are kept in a per-URL LRU cache. Both matchers must give exactly the same answers
+as the per-pattern functions they replace:
+
+- DomainPatternMatcher: `match_url_with_domain_pattern` (sensitive data, action domains)
+- DomainPolicy: `SecurityWatchdog._is_url_match` (allowed_domains / prohibited_domains)
+"""
+
+import logging
+import os
+import re
+from collections.abc import Iterable, Iterator
+from fnmatch import fnmatch, translate
+from functools import lru_cache
+from urllib.parse import urlparse
+
+from browser_use.utils import is_new_tab_page
+
+logger = logging.getLogger(__name__)
+
+_GLOB_CHARS = frozenset('*?[')
+
+
+class _LabelTrie:
+	"""Domain suffixes keyed by reversed labels: com -> example -> www."""
+
+	__slots__ = ('children', 'values')
+
+	def __init__(self):
+		self.children: dict[str, _LabelTrie] = {}
+		self.values: list[int] = []
+
+	def add(self, domain: str, value: int) -> None:
+		node = self
+		for label in reversed(domain.split('.')):
+			node = node.children.setdefault(label, _LabelTrie())
+		node.values.append(value)
+
+	def find(self, host: str) -> Iterator[int]:
+		"""Values of every added domain that equals host or is a parent domain of it."""
+		node = self
+		for label in reversed(host.split('.')):
+			child = node.children.get(label)
+			if child is None:
+				return
+			node = child
+			yield from node.values
+
+
+def _glob_match(host: str, pattern_domain: str) -> bool:
+	"""The glob branch of match_url_with_domain_pattern for an already validated pattern."""
+	if pattern_domain.startswith('*.'):
+		parent_domain = pattern_domain[2:]
+		if host == parent_domain or fnmatch(host, parent_domain):
+			return True
+	return fnmatch(host, pattern_domain)
+
+
+def _split_domain_pattern(domain_pattern: str, log_warnings: bool) -> tuple[str, str] | None:
+	"""Normalize a pattern into (scheme pattern, domain pattern), or None if it can never match."""
+	domain_pattern = domain_pattern.lower()
+	if '://' in domain_pattern:
+		pattern_scheme, pattern_domain = domain_pattern.split('://', 1)
+	else:
+		pattern_scheme = 'https'  # Default to matching only https for security
+		pattern_domain = domain_pattern
+
+	if ':' in pattern_domain and not pattern_domain.startswith(':'):
+		pattern_domain = pattern_domain.split(':', 1)[0]
+
+	if pattern_domain != '*' and '*' in pattern_domain:
+		if pattern_domain.count('*.') > 1 or pattern_domain.count('.*') > 1:
+			reason = 'Multiple wildcards in pattern=[{}] are not supported'
+		elif pattern_domain.endswith('.*'):
+			reason = 'Wildcard TLDs like in pattern=[{}] are not supported for security'
+		elif '*' in pattern_domain.replace('*.', ''):
+			reason = 'Only *.domain style patterns are supported, ignoring pattern=[{}]'
+		else:
+			reason = None
+		if reason:
+			if log_warnings:
+				logger.error('⛔️ ' + reason.format(domain_pattern))
+			return None
+	return pattern_scheme, pattern_domain
+
+
+class _HostIndex:
+	"""Domain patterns sharing one scheme pattern."""
+
+	def __init__(self):
+		self.any: list[int] = []
+		self.exact: dict[str, list[int]] = {}
+		self.suffixes = _LabelTrie()
+		self.globs: list[tuple[int, str]] = []
+
+	def add(self, pattern_domain: str, value: int) -> None:
+		if pattern_domain == '*':
+			self.any.append(value)
+		elif '*' not in pattern_domain:
+			self.exact.setdefault(pattern_domain, []).append(value)
+		elif pattern_domain.startswith('*.') and not _GLOB_CHARS.intersection(pattern_domain[2:]):
+			# *.example.com matches example.com and any subdomain of it
+			self.suffixes.add(pattern_domain[2:], value)
+		else:
+			self.globs.append((value, pattern_domain))
+
+	def collect(self, host: str, into: set[int]) -> None:
+		into.update(self.any)
+		into.update(self.exact.get(host, ()))
+		into.update(self.suffixes.find(host))
+		into.update(value for value, pattern_domain in self.globs if host == pattern_domain or _glob_match(host, pattern_domain))
+
+
+class DomainPatternMatcher:
+	"""A compiled list of match_url_with_domain_pattern patterns."""
+
+	def __init__(self, patterns: Iterable[str], log_warnings: bool = False, cache_size: int = 1024):
+		self.patterns = tuple(patterns)
+		self._schemes: dict[str, _HostIndex] = {}
+		self._scheme_globs: dict[str, _HostIndex] = {}
+		for value, pattern in enumerate(self.patterns):
+			split = _split_domain_pattern(pattern, log_warnings)
+			if split is None:
+				continue
+			pattern_scheme, pattern_domain = split
+			buckets = self._scheme_globs if _GLOB_CHARS.intersection(pattern_scheme) else self._schemes
+			buckets.setdefault(pattern_scheme, _HostIndex()).add(pattern_domain, value)
+		self._match_url = lru_cache(maxsize=cache_size)(self._compute)
+
+	def matches(self, url: str) -> bool:
+		"""Whether url matches any of the patterns."""
+		return bool(self._match_url(url))
+
+	def matching(self, url: str) -> list[str]:
+		"""The patterns url matches, in their original order."""
+		return [self.patterns[value] for value in self._match_url(url)]
+
+	def _compute(self, url: str) -> tuple[int, ...]:
+		# Note: new tab pages should be handled at the callsite, not here
+		if is_new_tab_page(url):
+			return ()
+		try:
+			parsed_url = urlparse(url)
+			scheme = parsed_url.scheme.lower() if parsed_url.scheme else ''
+			host = parsed_url.hostname.lower() if parsed_url.hostname else ''
+		except Exception as e:
+			logger.error(f'⛔️ Error matching URL {url} with domain patterns: {type(e).__name__}: {e}')
+			return ()
+		if not scheme or not host:
+			return ()
+
+		values: set[int] = set()
+		if index := self._schemes.get(scheme):
+			index.collect(host, values)
+		for pattern_scheme, index in self._scheme_globs.items():
+			if fnmatch(scheme, pattern_scheme):
+				index.collect(host, values)
+		return tuple(sorted(values))
+
+
+def _compile_globs(patterns: list[str]) -> re.Pattern[str] | None:
+	if not patterns:
+		return None
+	return re.compile('|'.join(translate(os.path.normcase(pattern)) for pattern in patterns))
+
+
+class DomainPolicy:
+	"""A compiled allowed_domains / prohibited_domains list, matched with SecurityWatchdog's rules."""
+
+	def __init__(self, patterns: Iterable[str], cache_size: int = 1024):
+		self.patterns = tuple(patterns)
+		self.has_globs = any('*' in pattern for pattern in self.patterns)
+		self._hosts: set[str] = set()
+		self._web_suffixes = _LabelTrie()
+		self._url_prefixes: dict[int, set[str]] = {}  # prefix length -> prefixes
+		self._origin_schemes: dict[str, list[str]] = {}  # host -> scheme globs, for scheme*://host patterns
+		url_globs: list[str] = []
+		origin_globs: list[str] = []
+		host_globs: list[str] = []
+
+		for pattern in self.patterns:
+			if '*' in pattern:
+				if pattern.startswith('*.'):
+					# *.example.com matches example.com and its subdomains, over http(s) only
+					self._web_suffixes.add(pattern[2:], 0)
+				elif pattern.endswith('/*'):
+					url_globs.append(pattern)
+				elif '://' in pattern:
+					pattern_scheme, pattern_host = pattern.split('://', 1)
+					if _GLOB_CHARS.intersection(pattern_host) or ':' in pattern_scheme or '/' in pattern_scheme:
+						origin_globs.append(pattern)
+					else:
+						self._origin_schemes.setdefault(os.path.normcase(pattern_host), []).append(pattern_scheme)
+				else:
+					host_globs.append(pattern)
+			elif '://' in pattern:
+				self._url_prefixes.setdefault(len(pattern), set()).add(pattern)
+			else:
+				self._hosts.add(pattern.lower())
+				# Root domains (domain.tld) also allow their www subdomain
+				if pattern.count('.') == 1:
+					self._hosts.add(f'www.{pattern.lower()}')
+
+		self._url_globs = _compile_globs(url_globs)
+		self._origin_globs = _compile_globs(origin_globs)
+		self._host_globs = _compile_globs(host_globs)
+		self._matches = lru_cache(maxsize=cache_size)(self._compute)
+
+	def matches(self, url: str, host: str, scheme: str) -> bool:
+		"""Whether the URL (with its already parsed host and scheme) matches any pattern."""
+		return self._matches(url, host, scheme)
+
+	def _compute(self, url: str, host: str, scheme: str) -> bool:
+		if any(url[:length] in prefixes for length, prefixes in self._url_prefixes.items()):
+			return True
+		if self._url_globs and self._url_globs.match(os.path.normcase(url)):
+			return True
+		if host.lower() in self._hosts:
+			return True
+		if scheme in ('http', 'https') and next(self._web_suffixes.find(host), None) is not None:
+			return True
+		if any(fnmatch(scheme, pattern_scheme) for pattern_scheme in self._origin_schemes.get(os.path.normcase(host), ())):
+			return True
+		if self._origin_globs and self._origin_globs.match(os.path.normcase(f'{scheme}://{host}')):
+			return True
+		return bool(self._host_globs and self._host_globs.match(os.path.normcase(host)))
+
+
+@lru_cache(maxsize=64)
+def compile_domain_patterns(patterns: tuple[str, ...], log_warnings: bool = False) -> DomainPatternMatcher:
+	"""Shared DomainPatternMatcher for a pattern list, compiled on first use."""
+	return DomainPatternMatcher(patterns, log_warnings=log_warnings)
+
+
+@lru_cache(maxsize=64)
+def compile_domain_policy(patterns: tuple[str, ...]) -> DomainPolicy:
+	"""Shared DomainPolicy for an allowed_domains / prohibited_domains list, compiled on first use."""
+	return DomainPolicy(patterns)
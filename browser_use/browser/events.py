@@ -7,11 +7,14 @@ from typing import Any, Literal
 from bubus import BaseEvent
 from bubus.models import T_EventResultType
 from cdp_use.cdp.target import TargetID
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 from browser_use.browser.views import BrowserStateSummary
 from browser_use.dom.views import EnhancedDOMTreeNode
 
+# Building pydantic schemas for the ~40 events below took most of this module's import time,
+# so every event sets defer_build and builds its schema on first instantiation instead.
+
 
 def _get_timeout(env_var: str, default: float) -> float | None:
 	"""
@@ -51,6 +54,8 @@ def _get_timeout(env_var: str, default: float) -> float | None:
 class ElementSelectedEvent(BaseEvent[T_EventResultType]):
 	"""An element was selected."""
 
+	model_config = ConfigDict(defer_build=True)
+
 	node: EnhancedDOMTreeNode
 
 	@field_validator('node', mode='before')
@@ -110,6 +115,8 @@ class ElementSelectedEvent(BaseEvent[T_EventResultType]):
 class NavigateToUrlEvent(BaseEvent[None]):
 	"""Navigate to a specific URL."""
 
+	model_config = ConfigDict(defer_build=True)
+
 	url: str
 	wait_until: Literal['load', 'domcontentloaded', 'networkidle', 'commit'] = 'load'
 	timeout_ms: int | None = None
@@ -136,6 +143,8 @@ class ClickElementEvent(ElementSelectedEvent[dict[str, Any] | None]):
 class ClickCoordinateEvent(BaseEvent[dict]):
 	"""Click at specific coordinates."""
 
+	model_config = ConfigDict(defer_build=True)
+
 	coordinate_x: int
 	coordinate_y: int
 	button: Literal['left', 'right', 'middle'] = 'left'
@@ -169,6 +178,8 @@ class ScrollEvent(ElementSelectedEvent[None]):
 class SwitchTabEvent(BaseEvent[TargetID]):
 	"""Switch to a different tab."""
 
+	model_config = ConfigDict(defer_build=True)
+
 	target_id: TargetID | None = Field(default=None, description='None means switch to the most recently opened tab')
 
 	event_timeout: float | None = Field(default_factory=lambda: _get_timeout('TIMEOUT_SwitchTabEvent', 10.0))  # seconds
@@ -177,6 +188,8 @@ class SwitchTabEvent(BaseEvent[TargetID]):
 class CloseTabEvent(BaseEvent[None]):
 	"""Close a tab."""
 
+	model_config = ConfigDict(defer_build=True)
+
 	target_id: TargetID
 
 	event_timeout: float | None = Field(default_factory=lambda: _get_timeout('TIMEOUT_CloseTabEvent', 10.0))  # seconds
@@ -185,6 +198,8 @@ class CloseTabEvent(BaseEvent[None]):
 class ScreenshotEvent(BaseEvent[str]):
 	"""Request to take a screenshot."""
 
+	model_config = ConfigDict(defer_build=True)
+
 	full_page: bool = False
 	clip: dict[str, float] | None = None  # {x, y, width, height}
 
@@ -194,6 +209,8 @@ class ScreenshotEvent(BaseEvent[str]):
 class BrowserStateRequestEvent(BaseEvent[BrowserStateSummary]):
 	"""Request current browser state."""
 
+	model_config = ConfigDict(defer_build=True)
+
 	include_dom: bool = True
 	include_screenshot: bool = True
 	include_recent_events: bool = False
@@ -213,24 +230,32 @@ class BrowserStateRequestEvent(BaseEvent[BrowserStateSummary]):
 class GoBackEvent(BaseEvent[None]):
 	"""Navigate back in browser history."""
 
+	model_config = ConfigDict(defer_build=True)
+
 	event_timeout: float | None = Field(default_factory=lambda: _get_timeout('TIMEOUT_GoBackEvent', 15.0))  # seconds
 
 
 class GoForwardEvent(BaseEvent[None]):
 	"""Navigate forward in browser history."""
 
+	model_config = ConfigDict(defer_build=True)
+
 	event_timeout: float | None = Field(default_factory=lambda: _get_timeout('TIMEOUT_GoForwardEvent', 15.0))  # seconds
 
 
 class RefreshEvent(BaseEvent[None]):
 	"""Refresh/reload the current page."""
 
+	model_config = ConfigDict(defer_build=True)
+
 	event_timeout: float | None = Field(default_factory=lambda: _get_timeout('TIMEOUT_RefreshEvent', 15.0))  # seconds
 
 
 class WaitEvent(BaseEvent[None]):
 	"""Wait for a specified number of seconds."""
 
+	model_config = ConfigDict(defer_build=True)
+
 	seconds: float = 3.0
 	max_seconds: float = 10.0  # Safety cap
 
@@ -240,6 +265,8 @@ class WaitEvent(BaseEvent[None]):
 class SendKeysEvent(BaseEvent[None]):
 	"""Send keyboard keys/shortcuts."""
 
+	model_config = ConfigDict(defer_build=True)
+
 	keys: str  # e.g., "ctrl+a", "cmd+c", "Enter"
 
 	event_timeout: float | None = Field(default_factory=lambda: _get_timeout('TIMEOUT_SendKeysEvent', 60.0))  # seconds
@@ -280,6 +307,8 @@ class SelectDropdownOptionEvent(ElementSelectedEvent[dict[str, str]]):
 class ScrollToTextEvent(BaseEvent[None]):
 	"""Scroll to specific text on the page. Raises exception if text not found."""
 
+	model_config = ConfigDict(defer_build=True)
+
 	text: str
 	direction: Literal['up', 'down'] = 'down'
 
@@ -292,6 +321,8 @@ class ScrollToTextEvent(BaseEvent[None]):
 class BrowserStartEvent(BaseEvent):
 	"""Start/connect to browser."""
 
+	model_config = ConfigDict(defer_build=True)
+
 	cdp_url: str | None = None
 	launch_options: dict[str, Any] = Field(default_factory=dict)
 
@@ -301,6 +332,8 @@ class BrowserStartEvent(BaseEvent):
 class BrowserStopEvent(BaseEvent):
 	"""Stop/disconnect from browser."""
 
+	model_config = ConfigDict(defer_build=True)
+
 	force: bool = False
 
 	event_timeout: float | None = Field(default_factory=lambda: _get_timeout('TIMEOUT_BrowserStopEvent', 45.0))  # seconds
@@ -316,6 +349,8 @@ class BrowserLaunchResult(BaseModel):
 class BrowserLaunchEvent(BaseEvent[BrowserLaunchResult]):
 	"""Launch a local browser process."""
 
+	model_config = ConfigDict(defer_build=True)
+
 	# TODO: add executable_path, proxy settings, preferences, extra launch args, etc.
 
 	event_timeout: float | None = Field(default_factory=lambda: _get_timeout('TIMEOUT_BrowserLaunchEvent', 30.0))  # seconds
@@ -324,6 +359,8 @@ class BrowserLaunchEvent(BaseEvent[BrowserLaunchResult]):
 class BrowserKillEvent(BaseEvent):
 	"""Kill local browser subprocess."""
 
+	model_config = ConfigDict(defer_build=True)
+
 	event_timeout: float | None = Field(default_factory=lambda: _get_timeout('TIMEOUT_BrowserKillEvent', 30.0))  # seconds
 
 
@@ -375,6 +412,8 @@ class BrowserKillEvent(BaseEvent):
 class BrowserConnectedEvent(BaseEvent):
 	"""Browser has started/connected."""
 
+	model_config = ConfigDict(defer_build=True)
+
 	cdp_url: str
 
 	event_timeout: float | None = Field(default_factory=lambda: _get_timeout('TIMEOUT_BrowserConnectedEvent', 30.0))  # seconds
@@ -383,6 +422,8 @@ class BrowserConnectedEvent(BaseEvent):
 class BrowserStoppedEvent(BaseEvent):
 	"""Browser has stopped/disconnected."""
 
+	model_config = ConfigDict(defer_build=True)
+
 	reason: str | None = None
 
 	event_timeout: float | None = Field(default_factory=lambda: _get_timeout('TIMEOUT_BrowserStoppedEvent', 30.0))  # seconds
@@ -391,6 +432,8 @@ class BrowserStoppedEvent(BaseEvent):
 class TabCreatedEvent(BaseEvent):
 	"""A new tab was created."""
 
+	model_config = ConfigDict(defer_build=True)
+
 	target_id: TargetID
 	url: str
 
@@ -400,6 +443,8 @@ class TabCreatedEvent(BaseEvent):
 class TabClosedEvent(BaseEvent):
 	"""A tab was closed."""
 
+	model_config = ConfigDict(defer_build=True)
+
 	target_id: TargetID
 
 	# TODO:
@@ -420,6 +465,8 @@ class TabClosedEvent(BaseEvent):
 class AgentFocusChangedEvent(BaseEvent):
 	"""Agent focus changed to a different tab."""
 
+	model_config = ConfigDict(defer_build=True)
+
 	target_id: TargetID
 	url: str
 
@@ -429,6 +476,8 @@ class AgentFocusChangedEvent(BaseEvent):
 class TargetCrashedEvent(BaseEvent):
 	"""A target has crashed."""
 
+	model_config = ConfigDict(defer_build=True)
+
 	target_id: TargetID
 	error: str
 
@@ -438,6 +487,8 @@ class TargetCrashedEvent(BaseEvent):
 class NavigationStartedEvent(BaseEvent):
 	"""Navigation started."""
 
+	model_config = ConfigDict(defer_build=True)
+
 	target_id: TargetID
 	url: str
 
@@ -447,6 +498,8 @@ class NavigationStartedEvent(BaseEvent):
 class NavigationCompleteEvent(BaseEvent):
 	"""Navigation completed."""
 
+	model_config = ConfigDict(defer_build=True)
+
 	target_id: TargetID
 	url: str
 	status: int | None = None
@@ -464,6 +517,8 @@ class NavigationCompleteEvent(BaseEvent):
 class BrowserErrorEvent(BaseEvent):
 	"""An error occurred in the browser layer."""
 
+	model_config = ConfigDict(defer_build=True)
+
 	error_type: str
 	message: str
 	details: dict[str, Any] = Field(default_factory=dict)
@@ -479,6 +534,8 @@ class BrowserErrorEvent(BaseEvent):
 class SaveStorageStateEvent(BaseEvent):
 	"""Request to save browser storage state."""
 
+	model_config = ConfigDict(defer_build=True)
+
 	path: str | None = None  # Optional path, uses profile default if not provided
 
 	event_timeout: float | None = Field(default_factory=lambda: _get_timeout('TIMEOUT_SaveStorageStateEvent', 45.0))  # seconds
@@ -487,6 +544,8 @@ class SaveStorageStateEvent(BaseEvent):
 class StorageStateSavedEvent(BaseEvent):
 	"""Notification that storage state was saved."""
 
+	model_config = ConfigDict(defer_build=True)
+
 	path: str
 	cookies_count: int
 	origins_count: int
@@ -497,6 +556,8 @@ class StorageStateSavedEvent(BaseEvent):
 class LoadStorageStateEvent(BaseEvent):
 	"""Request to load browser storage state."""
 
+	model_config = ConfigDict(defer_build=True)
+
 	path: str | None = None  # Optional path, uses profile default if not provided
 
 	event_timeout: float | None = Field(default_factory=lambda: _get_timeout('TIMEOUT_LoadStorageStateEvent', 45.0))  # seconds
@@ -509,6 +570,8 @@ class LoadStorageStateEvent(BaseEvent):
 class StorageStateLoadedEvent(BaseEvent):
 	"""Notification that storage state was loaded."""
 
+	model_config = ConfigDict(defer_build=True)
+
 	path: str
 	cookies_count: int
 	origins_count: int
@@ -524,6 +587,8 @@ class StorageStateLoadedEvent(BaseEvent):
 class FileDownloadedEvent(BaseEvent):
 	"""A file has been downloaded."""
 
+	model_config = ConfigDict(defer_build=True)
+
 	url: str
 	path: str
 	file_name: str
@@ -539,6 +604,8 @@ class FileDownloadedEvent(BaseEvent):
 class AboutBlankDVDScreensaverShownEvent(BaseEvent):
 	"""AboutBlankWatchdog has shown DVD screensaver animation on an about:blank tab."""
 
+	model_config = ConfigDict(defer_build=True)
+
 	target_id: TargetID
 	error: str | None = None
 
@@ -546,6 +613,8 @@ class AboutBlankDVDScreensaverShownEvent(BaseEvent):
 class DialogOpenedEvent(BaseEvent):
 	"""Event dispatched when a JavaScript dialog is opened and handled."""
 
+	model_config = ConfigDict(defer_build=True)
+
 	dialog_type: str  # 'alert', 'confirm', 'prompt', or 'beforeunload'
 	message: str
 	url: str
@@ -553,9 +622,8 @@ class DialogOpenedEvent(BaseEvent):
 	# target_id: TargetID   # TODO: add this to avoid needing target_id_from_frame() later
 
 
-# Note: Model rebuilding for forward references is handled in the importing modules
-# Events with 'EnhancedDOMTreeNode' forward references (ClickElementEvent, TypeTextEvent,
-# ScrollEvent, UploadFileEvent) need model_rebuild() called after imports are complete
+# Note: 'EnhancedDOMTreeNode' forward references (ClickElementEvent, TypeTextEvent, ScrollEvent,
+# UploadFileEvent, ...) resolve against this module when the deferred schema is built on first use
 
 
 def _check_event_names_dont_overlap():
@@ -591,6 +591,10 @@ class BrowserProfile(BrowserConnectArgs, BrowserLaunchPersistentContextArgs, Bro
 		description='Block navigation to URLs containing IP addresses (both IPv4 and IPv6). When True, blocks all IP-based URLs including localhost and private networks.',
 	)
 	keep_alive: bool | None = Field(default=None, description='Keep browser alive after agent run.')
+	new_browser_context: bool = Field(
+		default=False,
+		description="Open this session's tabs in a new browser context and only manage those, so several sessions can share one browser without acting on each other's tabs. The context has its own cookies and storage, and is disposed when the session disconnects.",
+	)
 
 	# --- Proxy settings ---
 	# New consolidated proxy config (typed)
@@ -651,6 +655,17 @@ class BrowserProfile(BrowserConnectArgs, BrowserLaunchPersistentContextArgs, Bro
 		default=True, description='Only show element IDs in highlights if llm_representation is less than 10 characters.'
 	)
 	paint_order_filtering: bool = Field(default=True, description='Enable paint order filtering. Slightly experimental.')
+	background_tab_state_cache: bool = Field(
+		default=False,
+		description='Snapshot the DOM of non-focused tabs in the background so switching tabs can reuse an already-serialized state instead of a cold DOM build.',
+	)
+	background_tab_state_max_age: float = Field(
+		default=30.0, ge=0, description='Seconds after which a background tab snapshot is considered stale and rebuilt.'
+	)
+	offload_dom_processing: bool = Field(
+		default=False,
+		description='Run DOM tree construction and serialization in a worker thread so long builds do not stall the event loop (CDP events, watchdog timers, other agents in the same process).',
+	)
 	interaction_highlight_color: str = Field(
 		default='rgb(255, 127, 39)',
 		description='Color to use for highlighting elements during interactions (CSS color string).',
@@ -823,12 +838,19 @@ class BrowserProfile(BrowserConnectArgs, BrowserLaunchPersistentContextArgs, Bro
 		if path_original_profile.exists():
 			import shutil
 
-			shutil.copytree(path_original_profile, path_temp_profile)
+			from browser_use.browser.profile_clone import clone_profile
+
+			# Skips regenerable caches and links/reflinks files instead of copying where possible
+			stats = clone_profile(path_original_profile, path_temp_profile)
 			local_state_src = path_original_user_data / 'Local State'
 			local_state_dst = Path(temp_dir) / 'Local State'
 			if local_state_src.exists():
 				shutil.copy(local_state_src, local_state_dst)
-			logger.info(f'Copied profile ({self.profile_directory}) and Local State to temp directory: {temp_dir}')
+			logger.info(
+				f'Copied profile ({self.profile_directory}) and Local State to temp directory: {temp_dir} '
+				f'({stats.files_copied} copied, {stats.files_linked + stats.files_reflinked} linked, '
+				f'{len(stats.skipped_dirs)} cache dirs skipped)'
+			)
 
 		else:
 			Path(temp_dir).mkdir(parents=True, exist_ok=True)
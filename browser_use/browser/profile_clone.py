@@ -0,0 +1,145 @@
+"""Fast cloning of Chrome profile directories.
+
+Copying a logged-in profile with shutil.copytree spends most of its time on caches Chrome can
+rebuild. clone_profile() instead:
+
+- skips regenerable caches (HTTP/code/GPU/shader caches, Service Worker cache storage),
+- hardlinks files Chrome writes once and never modifies in place (LevelDB .ldb tables,
+  IndexedDB blobs, unpacked extensions), so the original is never affected when the clone's
+  Chrome deletes or replaces them,
+- reflinks (copy-on-write clones) everything else where the filesystem supports it, and
+  only falls back to a real copy for files Chrome keeps writing (SQLite databases, logs, prefs).
+"""
+
+import errno
+import logging
+import os
+import shutil
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Directories Chrome recreates on demand, relative to the profile directory
+SKIPPED_PROFILE_DIRS = frozenset(
+	{
+		'Cache',
+		'Code Cache',
+		'GPUCache',
+		'DawnCache',
+		'DawnGraphiteCache',
+		'DawnWebGPUCache',
+		'GrShaderCache',
+		'ShaderCache',
+		'component_crx_cache',
+		os.path.join('Service Worker', 'CacheStorage'),
+		os.path.join('Service Worker', 'ScriptCache'),
+	}
+)
+
+# Files Chrome creates once and only ever deletes, safe to share between profiles via hardlinks
+_WRITE_ONCE_SUFFIXES = ('.ldb',)
+_WRITE_ONCE_DIR_SUFFIXES = ('.indexeddb.blob',)
+_WRITE_ONCE_DIRS = ('Extensions',)
+
+_FICLONE = 0x40049409  # linux/fs.h
+
+
+@dataclass
+class CloneStats:
+	files_linked: int = 0
+	files_reflinked: int = 0
+	files_copied: int = 0
+	bytes_copied: int = 0
+	skipped_dirs: list[str] = field(default_factory=list)
+
+
+def _is_write_once(relative_path: str) -> bool:
+	parts = Path(relative_path).parts
+	return (
+		relative_path.endswith(_WRITE_ONCE_SUFFIXES)
+		or parts[0] in _WRITE_ONCE_DIRS
+		or any(part.endswith(_WRITE_ONCE_DIR_SUFFIXES) for part in parts[:-1])
+	)
+
+
+def _reflink(src: str, dst: str) -> None:
+	"""Copy-on-write clone of src to dst, raising OSError when the filesystem can't."""
+	if sys.platform == 'linux':
+		import fcntl
+
+		with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+			try:
+				fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+			except OSError:
+				fdst.close()
+				os.unlink(dst)
+				raise
+	elif sys.platform == 'darwin':
+		import ctypes
+
+		libc = ctypes.CDLL(None, use_errno=True)
+		if libc.clonefile(os.fsencode(src), os.fsencode(dst), 0) != 0:
+			err = ctypes.get_errno()
+			raise OSError(err, os.strerror(err))
+	else:
+		raise OSError(errno.EOPNOTSUPP, 'reflinks are not supported on this platform')
+	shutil.copystat(src, dst)
+
+
+class _Cloner:
+	def __init__(self, src: Path, dst: Path, skip_dirs: frozenset[str]):
+		self.src = src
+		self.dst = dst
+		self.skip_dirs = skip_dirs
+		self.stats = CloneStats()
+		# Turned off after the first failure so unsupported filesystems don't pay a syscall per file
+		self.can_link = True
+		self.can_reflink = sys.platform in ('linux', 'darwin')
+
+	def clone_tree(self, relative_dir: str = '') -> None:
+		src_dir = os.path.join(self.src, relative_dir)
+		os.makedirs(os.path.join(self.dst, relative_dir), exist_ok=True)
+		with os.scandir(src_dir) as entries:
+			for entry in entries:
+				relative_path = os.path.join(relative_dir, entry.name)
+				if entry.is_dir():
+					if relative_path in self.skip_dirs:
+						self.stats.skipped_dirs.append(relative_path)
+					else:
+						self.clone_tree(relative_path)
+				elif entry.is_file():
+					self.clone_file(entry.path, os.path.join(self.dst, relative_path), relative_path)
+				else:
+					logger.debug(f'Skipping {entry.path} while cloning profile (not a regular file)')
+		shutil.copystat(src_dir, os.path.join(self.dst, relative_dir))
+
+	def clone_file(self, src: str, dst: str, relative_path: str) -> None:
+		if self.can_link and _is_write_once(relative_path):
+			try:
+				os.link(src, dst)
+				self.stats.files_linked += 1
+				return
+			except OSError:
+				self.can_link = False
+		if self.can_reflink:
+			try:
+				_reflink(src, dst)
+				self.stats.files_reflinked += 1
+				return
+			except OSError:
+				self.can_reflink = False
+		shutil.copy2(src, dst)
+		self.stats.files_copied += 1
+		self.stats.bytes_copied += os.path.getsize(dst)
+
+
+def clone_profile(src: str | Path, dst: str | Path, skip_dirs: frozenset[str] = SKIPPED_PROFILE_DIRS) -> CloneStats:
+	"""Clone a Chrome profile directory (e.g. <user_data_dir>/Default) to dst, which must not exist yet."""
+	dst = Path(dst)
+	if dst.exists():
+		raise FileExistsError(f'Profile clone destination already exists: {dst}')
+	cloner = _Cloner(Path(src), dst, skip_dirs)
+	cloner.clone_tree()
+	return cloner.stats
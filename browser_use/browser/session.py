@@ -17,6 +17,7 @@ from cdp_use.cdp.target import AttachedToTargetEvent, SessionID, TargetID
 from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
 from uuid_extensions import uuid7str
 
+from browser_use.browser.cdp_batch import install_round_trip_counter
 from browser_use.browser.cloud.cloud import CloudBrowserAuthError, CloudBrowserClient, CloudBrowserError
 
 # CDP logging is now handled by setup_logging() in logging_config.py
@@ -142,6 +143,7 @@ class BrowserSession(BaseModel):
 		allowed_domains: list[str] | None = None,
 		prohibited_domains: list[str] | None = None,
 		keep_alive: bool | None = None,
+		new_browser_context: bool | None = None,
 		minimum_wait_page_load_time: float | None = None,
 		wait_for_network_idle_page_load_time: float | None = None,
 		wait_between_actions: float | None = None,
@@ -175,6 +177,7 @@ class BrowserSession(BaseModel):
 		allowed_domains: list[str] | None = None,
 		prohibited_domains: list[str] | None = None,
 		keep_alive: bool | None = None,
+		new_browser_context: bool | None = None,
 		minimum_wait_page_load_time: float | None = None,
 		wait_for_network_idle_page_load_time: float | None = None,
 		wait_between_actions: float | None = None,
@@ -275,6 +278,7 @@ class BrowserSession(BaseModel):
 		allowed_domains: list[str] | None = None,
 		prohibited_domains: list[str] | None = None,
 		keep_alive: bool | None = None,
+		new_browser_context: bool | None = None,
 		proxy: ProxySettings | None = None,
 		enable_default_extensions: bool | None = None,
 		window_size: dict | None = None,
@@ -385,6 +389,11 @@ class BrowserSession(BaseModel):
 		"""CDP URL from browser profile."""
 		return self.browser_profile.cdp_url
 
+	@property
+	def browser_context_id(self) -> str | None:
+		"""Browser context the session's tabs live in with new_browser_context, None for the browser's default context."""
+		return self._browser_context_id
+
 	@property
 	def is_local(self) -> bool:
 		"""Whether this is a local browser instance from browser profile."""
@@ -414,6 +423,7 @@ class BrowserSession(BaseModel):
 
 	# Mutable private state shared between watchdogs
 	_cdp_client_root: CDPClient | None = PrivateAttr(default=None)
+	_browser_context_id: str | None = PrivateAttr(default=None)  # set with browser_profile.new_browser_context
 	_connection_lock: Any = PrivateAttr(default=None)  # asyncio.Lock for preventing concurrent connections
 
 	# PUBLIC: SessionManager instance (OWNS all targets and sessions)
@@ -497,6 +507,7 @@ class BrowserSession(BaseModel):
 				self.logger.debug(f'Error closing CDP client during reset: {e}')
 
 		self._cdp_client_root = None  # type: ignore
+		self._browser_context_id = None  # disposed by Chrome when the WebSocket closed
 		self._cached_browser_state_summary = None
 		self._cached_selector_map.clear()
 		self._downloaded_files.clear()
@@ -904,8 +915,7 @@ class BrowserSession(BaseModel):
 			else:
 				# No pages open at all, create a new one (handles switching to it automatically)
 				assert self._cdp_client_root is not None, 'CDP client root not initialized - browser may not be connected yet'
-				new_target = await self._cdp_client_root.send.Target.createTarget(params={'url': 'about:blank'})
-				target_id = new_target['targetId']
+				target_id = await self._cdp_create_new_page('about:blank')
 				# Don't await, these may circularly trigger SwitchTabEvent and could deadlock, dispatch to enqueue and return
 				self.event_bus.dispatch(TabCreatedEvent(url='about:blank', target_id=target_id))
 				self.event_bus.dispatch(AgentFocusChangedEvent(target_id=target_id, url='about:blank'))
@@ -1081,6 +1091,8 @@ class BrowserSession(BaseModel):
 		from cdp_use.cdp.target.commands import CreateTargetParameters
 
 		params: CreateTargetParameters = {'url': url or 'about:blank'}
+		if self._browser_context_id:
+			params['browserContextId'] = self._browser_context_id
 		result = await self.cdp_client.send.Target.createTarget(params)
 
 		target_id = result['targetId']
@@ -1160,12 +1172,18 @@ class BrowserSession(BaseModel):
 	async def cookies(self) -> list['Cookie']:
 		"""Get cookies, optionally filtered by URLs."""
 
-		result = await self.cdp_client.send.Storage.getCookies()
+		if self._browser_context_id:
+			result = await self.cdp_client.send.Storage.getCookies(params={'browserContextId': self._browser_context_id})
+		else:
+			result = await self.cdp_client.send.Storage.getCookies()
 		return result['cookies']
 
 	async def clear_cookies(self) -> None:
 		"""Clear all cookies."""
-		await self.cdp_client.send.Network.clearBrowserCookies()
+		if self._browser_context_id:
+			await self.cdp_client.send.Storage.clearCookies(params={'browserContextId': self._browser_context_id})
+		else:
+			await self.cdp_client.send.Network.clearBrowserCookies()
 
 	async def export_storage_state(self, output_path: str | Path | None = None) -> dict[str, Any]:
 		"""Export all browser cookies and storage to storage_state format.
@@ -1398,8 +1416,8 @@ class BrowserSession(BaseModel):
 				event_bus=self.event_bus,
 				browser_session=self,
 				# More conservative defaults when auto-enabled
-				auto_save_interval=60.0,  # 1 minute instead of 30 seconds
-				save_on_change=False,  # Only save on shutdown by default
+				auto_save_interval=60.0,  # Save changes within a minute instead of 30 seconds
+				save_on_change=False,  # No quick saves, changes are batched for up to auto_save_interval
 			)
 			self._storage_state_watchdog.attach_to_session()
 			self.logger.debug(
@@ -1537,8 +1555,14 @@ class BrowserSession(BaseModel):
 				max_ws_frame_size=200 * 1024 * 1024,  # Use 200MB limit to handle pages with very large DOMs
 			)
 			assert self._cdp_client_root is not None
+			install_round_trip_counter(self._cdp_client_root)
 			await self._cdp_client_root.start()
 
+			if self.browser_profile.new_browser_context:
+				# Disposed (with its tabs) by Chrome when this connection closes
+				context = await self._cdp_client_root.send.Target.createBrowserContext(params={'disposeOnDetach': True})
+				self._browser_context_id = context['browserContextId']
+
 			# Initialize event-driven session manager FIRST (before enabling autoAttach)
 			# SessionManager will:
 			# 1. Register attach/detach event handlers
@@ -1581,8 +1605,7 @@ class BrowserSession(BaseModel):
 
 			# Ensure we have at least one page
 			if not page_targets_from_manager:
-				new_target = await self._cdp_client_root.send.Target.createTarget(params={'url': 'about:blank'})
-				target_id = new_target['targetId']
+				target_id = await self._cdp_create_new_page('about:blank')
 				self.logger.debug(f'📄 Created new blank page: {target_id}')
 			else:
 				target_id = page_targets_from_manager[0].target_id
@@ -1770,7 +1793,7 @@ class BrowserSession(BaseModel):
 			# Auto-enable Fetch on every newly attached target to ensure auth callbacks fire
 			def _on_attached(event: AttachedToTargetEvent, session_id: SessionID | None = None):
 				sid = event.get('sessionId') or event.get('session_id') or session_id
-				if not sid:
+				if not sid or (self.session_manager and not self.session_manager._in_scope(event['targetInfo'])):
 					return
 
 				async def _enable():
@@ -2854,16 +2877,17 @@ class BrowserSession(BaseModel):
 
 	async def _cdp_create_new_page(self, url: str = 'about:blank', background: bool = False, new_window: bool = False) -> str:
 		"""Create a new page/tab using CDP Target.createTarget. Returns target ID."""
+		from cdp_use.cdp.target.commands import CreateTargetParameters
+
+		params: CreateTargetParameters = {'url': url, 'newWindow': new_window, 'background': background}
+		if self._browser_context_id:
+			params['browserContextId'] = self._browser_context_id
 		# Use the root CDP client to create tabs at the browser level
 		if self._cdp_client_root:
-			result = await self._cdp_client_root.send.Target.createTarget(
-				params={'url': url, 'newWindow': new_window, 'background': background}
-			)
+			result = await self._cdp_client_root.send.Target.createTarget(params=params)
 		else:
 			# Fallback to using cdp_client if root is not available
-			result = await self.cdp_client.send.Target.createTarget(
-				params={'url': url, 'newWindow': new_window, 'background': background}
-			)
+			result = await self.cdp_client.send.Target.createTarget(params=params)
 		return result['targetId']
 
 	async def _cdp_close_page(self, target_id: TargetID) -> None:
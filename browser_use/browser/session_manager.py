@@ -7,7 +7,7 @@ events, ensuring the session pool always reflects the current browser state.
 import asyncio
 from typing import TYPE_CHECKING
 
-from cdp_use.cdp.target import AttachedToTargetEvent, DetachedFromTargetEvent, SessionID, TargetID
+from cdp_use.cdp.target import AttachedToTargetEvent, DetachedFromTargetEvent, SessionID, TargetID, TargetInfo
 
 from browser_use.utils import create_task_with_error_handling
 
@@ -111,6 +111,11 @@ class SessionManager:
 		# Discover and initialize ALL existing targets
 		await self._initialize_existing_targets()
 
+	def _in_scope(self, target_info: TargetInfo) -> bool:
+		"""Whether a target belongs to this session: any target, or only its own browser context's with new_browser_context."""
+		context_id = self.browser_session._browser_context_id
+		return context_id is None or target_info.get('browserContextId') == context_id
+
 	def _get_session_for_target(self, target_id: TargetID) -> 'CDPSession | None':
 		"""Internal: Get ANY valid session for a target (picks first available).
 
@@ -390,6 +395,14 @@ class SessionManager:
 			)
 			return
 
+		if not self._in_scope(target_info):
+			# Another session's browser context, its own session manager and watchdogs look after it
+			try:
+				await self.browser_session._cdp_client_root.send.Target.detachFromTarget(params={'sessionId': session_id})
+			except Exception as e:
+				self.logger.debug(f'[SessionManager] Failed to detach from target {target_id[:8]}... of another context: {e}')
+			return
+
 		# Enable auto-attach for this session's children (do this FIRST, outside lock)
 		try:
 			await self.browser_session._cdp_client_root.send.Target.setAutoAttach(
@@ -475,9 +488,15 @@ class SessionManager:
 			if target_id in self._targets:
 				target = self._targets[target_id]
 
+				previous_url = target.url
 				target.title = target_info.get('title', target.title)
 				target.url = target_info.get('url', target.url)
 
+				# Background DOM snapshots of this tab are no longer valid once its URL changes
+				dom_watchdog = self.browser_session._dom_watchdog
+				if dom_watchdog and target.url != previous_url:
+					dom_watchdog.invalidate_tab_state(target_id)
+
 	async def _handle_target_detached(self, event: DetachedFromTargetEvent) -> None:
 		"""Handle Target.detachedFromTarget event.
 
@@ -560,6 +579,12 @@ class SessionManager:
 			if session_id in self._session_to_target:
 				del self._session_to_target[session_id]
 
+		# Actor element indexes route this session's DOM events, and cache lookups for the target until it is gone
+		if self.browser_session._cdp_client_root is not None:
+			from browser_use.actor.element_index import forget_element_index
+
+			forget_element_index(self.browser_session._cdp_client_root, session_id, target_id if target_fully_removed else None)
+
 		# Dispatch TabClosedEvent only for page/tab targets that are fully removed (not iframes/workers or partial detaches)
 		if target_fully_removed:
 			if target_type in ('page', 'tab'):
@@ -745,7 +770,7 @@ class SessionManager:
 
 		# Get all existing targets
 		targets_result = await cdp_client.send.Target.getTargets()
-		existing_targets = targets_result.get('targetInfos', [])
+		existing_targets = [target for target in targets_result.get('targetInfos', []) if self._in_scope(target)]
 
 		self.logger.debug(f'[SessionManager] Discovered {len(existing_targets)} existing targets')
 
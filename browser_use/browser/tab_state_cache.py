@@ -0,0 +1,93 @@
+"""Cache of serialized DOM state for non-focused tabs.
+
+Only the focused tab's DOM is built on every step, so switching tabs normally forces a cold
+DOM build. When BrowserProfile.background_tab_state_cache is enabled, DOMWatchdog snapshots
+background tabs at low priority and stores them here, so the first state request after a tab
+switch can reuse an already-serialized DOM.
+
+Snapshots are only ever taken while a tab is in the background, where the agent can't mutate it,
+and are dropped on navigation, URL change, tab close, or when older than max_age.
+"""
+
+import time
+from dataclasses import dataclass, field
+
+from cdp_use.cdp.target import TargetID
+
+from browser_use.dom.views import EnhancedDOMTreeNode, SerializedDOMState
+
+
+@dataclass
+class TabStateSnapshot:
+	"""Serialized DOM state captured for a background tab."""
+
+	target_id: TargetID
+	url: str
+	dom_state: SerializedDOMState
+	enhanced_dom_tree: EnhancedDOMTreeNode
+	captured_at: float = field(default_factory=time.monotonic)
+	build_time_ms: float = 0.0
+
+
+class TabStateCache:
+	"""Per-target background snapshot store with epoch-based invalidation.
+
+	Every invalidation bumps the target's epoch. A snapshot started under an older epoch is
+	discarded on put(), so a background build that races with a navigation or focus change
+	can never store stale state.
+	"""
+
+	def __init__(self, max_age: float = 30.0):
+		self.max_age = max_age
+		self._snapshots: dict[TargetID, TabStateSnapshot] = {}
+		self._epochs: dict[TargetID, int] = {}
+		self.hits = 0
+		self.misses = 0
+
+	def epoch(self, target_id: TargetID) -> int:
+		return self._epochs.get(target_id, 0)
+
+	def invalidate(self, target_id: TargetID) -> None:
+		self._snapshots.pop(target_id, None)
+		self._epochs[target_id] = self.epoch(target_id) + 1
+
+	def forget(self, target_id: TargetID) -> None:
+		"""Drop all bookkeeping for a closed target."""
+		self._snapshots.pop(target_id, None)
+		self._epochs.pop(target_id, None)
+
+	def clear(self) -> None:
+		for target_id in list(self._snapshots):
+			self.invalidate(target_id)
+
+	def put(self, snapshot: TabStateSnapshot, epoch: int) -> bool:
+		"""Store a snapshot if its target hasn't been invalidated since the build started."""
+		if epoch != self.epoch(snapshot.target_id):
+			return False
+		self._snapshots[snapshot.target_id] = snapshot
+		return True
+
+	def is_fresh(self, target_id: TargetID, url: str) -> bool:
+		snapshot = self._snapshots.get(target_id)
+		return snapshot is not None and snapshot.url == url and (time.monotonic() - snapshot.captured_at) <= self.max_age
+
+	def take(self, target_id: TargetID, url: str) -> TabStateSnapshot | None:
+		"""Consume the snapshot for a tab that just became focused.
+
+		Always invalidates the target (the agent is about to interact with it), and returns the
+		snapshot only if it is still fresh for the given URL.
+		"""
+		fresh = self.is_fresh(target_id, url)
+		snapshot = self._snapshots.get(target_id)
+		self.invalidate(target_id)
+		if fresh and snapshot is not None:
+			self.hits += 1
+			return snapshot
+		self.misses += 1
+		return None
+
+	def __contains__(self, target_id: TargetID) -> bool:
+		return target_id in self._snapshots
+
+	def __len__(self) -> int:
+		return len(self._snapshots)
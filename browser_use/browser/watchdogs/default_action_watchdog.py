@@ -4,8 +4,10 @@ import asyncio
 import json
 
 from cdp_use.cdp.input.commands import DispatchKeyEventParameters
+from pydantic import PrivateAttr
 
 from browser_use.actor.utils import get_key_info
+from browser_use.browser.cdp_batch import CDPRoundTripStats, pipeline, tracks_cdp_round_trips
 from browser_use.browser.events import (
 	ClickCoordinateEvent,
 	ClickElementEvent,
@@ -24,22 +26,141 @@ from browser_use.browser.events import (
 from browser_use.browser.views import BrowserError, URLNotAllowedError
 from browser_use.browser.watchdog_base import BaseWatchdog
 from browser_use.dom.service import EnhancedDOMTreeNode
+from browser_use.dom.views import DOMRect
 from browser_use.observability import observe_debug
 
-# Import EnhancedDOMTreeNode and rebuild event models that have forward references to it
-# This must be done after all imports are complete
-ClickCoordinateEvent.model_rebuild()
-ClickElementEvent.model_rebuild()
-GetDropdownOptionsEvent.model_rebuild()
-SelectDropdownOptionEvent.model_rebuild()
-TypeTextEvent.model_rebuild()
-ScrollEvent.model_rebuild()
-UploadFileEvent.model_rebuild()
+# Clears an input / textarea / contenteditable element, returns {cleared, method, finalText}
+_CLEAR_TEXT_FIELD_JS = """
+function() {
+	// Check if it's a contenteditable element
+	const hasContentEditable = this.getAttribute('contenteditable') === 'true' ||
+							this.getAttribute('contenteditable') === '' ||
+							this.isContentEditable === true;
+
+	if (hasContentEditable) {
+		// For contenteditable elements, clear all content
+		while (this.firstChild) {
+			this.removeChild(this.firstChild);
+		}
+		this.textContent = "";
+		this.innerHTML = "";
+
+		// Focus and position cursor at the beginning
+		this.focus();
+		const selection = window.getSelection();
+		const range = document.createRange();
+		range.setStart(this, 0);
+		range.setEnd(this, 0);
+		selection.removeAllRanges();
+		selection.addRange(range);
+
+		// Dispatch events
+		this.dispatchEvent(new Event("input", { bubbles: true }));
+		this.dispatchEvent(new Event("change", { bubbles: true }));
+
+		return {cleared: true, method: 'contenteditable', finalText: this.textContent};
+	} else if (this.value !== undefined) {
+		// For regular inputs with value property
+		try {
+			this.select();
+		} catch (e) {
+			// ignore
+		}
+		this.value = "";
+		this.dispatchEvent(new Event("input", { bubbles: true }));
+		this.dispatchEvent(new Event("change", { bubbles: true }));
+		return {cleared: true, method: 'value', finalText: this.value};
+	} else {
+		return {cleared: false, method: 'none', error: 'Not a supported input type'};
+	}
+}
+"""
+
+# Scrolls the element into view (instantly, so the geometry is final), optionally focuses and clears it, and returns
+# its first visible rect and the viewport size in the target's top-level coordinates (like DOM.getContentQuads and
+# Page.getLayoutMetrics) plus whether the clamped rect center is occluded, all in one Runtime.callFunctionOn
+_PREPARE_ELEMENT_JS = (
+	"""
+function(focus, clear) {
+	const clearField = """
+	+ _CLEAR_TEXT_FIELD_JS.strip()
+	+ """;
+	const win = this.ownerDocument.defaultView || window;
+	const initial = this.getBoundingClientRect();
+	if (initial.top < 0 || initial.left < 0 || initial.bottom > win.innerHeight || initial.right > win.innerWidth) {
+		this.scrollIntoView({block: 'center', inline: 'center', behavior: 'instant'});
+	}
+
+	let focused = false;
+	if (focus) {
+		try {
+			this.focus({preventScroll: true});
+		} catch (e) {
+			// ignore
+		}
+		const active = this.getRootNode().activeElement;
+		focused = active === this || (!!active && this.contains(active));
+	}
+	const cleared = clear ? clearField.call(this) : null;
+
+	// Same-origin iframes: offset by each frame's content box up to the target's top-level document
+	let offsetX = 0;
+	let offsetY = 0;
+	let topWin = win;
+	try {
+		while (topWin.frameElement) {
+			const frame = topWin.frameElement;
+			const frameRect = frame.getBoundingClientRect();
+			offsetX += frameRect.left + frame.clientLeft;
+			offsetY += frameRect.top + frame.clientTop;
+			topWin = topWin.parent;
+		}
+	} catch (e) {
+		// ignore
+	}
+	const root = topWin.document.documentElement;
+	const viewportWidth = root.clientWidth;
+	const viewportHeight = root.clientHeight;
+
+	const getElementInfo = (el) => ({
+		tagName: el.tagName,
+		id: el.id || '',
+		className: el.className || '',
+		textContent: (el.textContent || '').substring(0, 100)
+	});
+	const local = Array.from(this.getClientRects()).find(r => r.width > 0 && r.height > 0);
+	if (!local) {
+		return {rect: null, viewportWidth, viewportHeight, focused, cleared, occluded: false};
+	}
+	const rect = {x: local.left + offsetX, y: local.top + offsetY, width: local.width, height: local.height};
+	const x = Math.max(0, Math.min(viewportWidth - 1, rect.x + rect.width / 2));
+	const y = Math.max(0, Math.min(viewportHeight - 1, rect.y + rect.height / 2));
+	const elementAtPoint = this.ownerDocument.elementFromPoint(x - offsetX, y - offsetY);
+	const occluded = !elementAtPoint || !(this === elementAtPoint || this.contains(elementAtPoint) || elementAtPoint.contains(this));
+	return {
+		rect, viewportWidth, viewportHeight, focused, cleared, occluded,
+		targetInfo: getElementInfo(this),
+		elementAtPointInfo: elementAtPoint ? getElementInfo(elementAtPoint) : null
+	};
+}
+"""
+)
 
 
 class DefaultActionWatchdog(BaseWatchdog):
 	"""Handles default browser actions like click, type, and scroll using CDP."""
 
+	# Per-action CDP command / round-trip counts, see browser_use/browser/cdp_batch.py
+	_cdp_round_trip_stats: CDPRoundTripStats = PrivateAttr(default_factory=CDPRoundTripStats)
+
+	@property
+	def cdp_round_trip_stats(self) -> CDPRoundTripStats:
+		return self._cdp_round_trip_stats
+
+	def get_cdp_round_trip_summary(self) -> dict[str, dict[str, float]]:
+		"""Get per-action CDP round-trip counts, e.g. {'click_element': {'calls': 3, 'avg_round_trips': 6.0, ...}}."""
+		return self._cdp_round_trip_stats.summary()
+
 	def _is_print_related_element(self, element_node: EnhancedDOMTreeNode) -> bool:
 		"""Check if an element is related to printing (print buttons, print dialogs, etc.).
 
@@ -153,6 +274,7 @@ class DefaultActionWatchdog(BaseWatchdog):
 			return None
 
 	@observe_debug(ignore_input=True, ignore_output=True, name='click_element_event')
+	@tracks_cdp_round_trips('click_element')
 	async def on_ClickElementEvent(self, event: ClickElementEvent) -> dict | None:
 		"""Handle click request with CDP."""
 		try:
@@ -270,6 +392,7 @@ class DefaultActionWatchdog(BaseWatchdog):
 		except Exception:
 			raise
 
+	@tracks_cdp_round_trips('type_text')
 	async def on_TypeTextEvent(self, event: TypeTextEvent) -> dict | None:
 		"""Handle text input request with CDP."""
 		try:
@@ -332,6 +455,7 @@ class DefaultActionWatchdog(BaseWatchdog):
 		except Exception as e:
 			raise
 
+	@tracks_cdp_round_trips('scroll')
 	async def on_ScrollEvent(self, event: ScrollEvent) -> None:
 		"""Handle scroll request with CDP."""
 		# Check if we have a current target for scrolling
@@ -385,7 +509,9 @@ class DefaultActionWatchdog(BaseWatchdog):
 
 	# ========== Implementation Methods ==========
 
-	async def _check_element_occlusion(self, backend_node_id: int, x: float, y: float, cdp_session) -> bool:
+	async def _check_element_occlusion(
+		self, backend_node_id: int, x: float, y: float, cdp_session, object_id: str | None = None
+	) -> bool:
 		"""Check if an element is occluded by other elements at the given coordinates.
 
 		Args:
@@ -393,6 +519,7 @@ class DefaultActionWatchdog(BaseWatchdog):
 			x: X coordinate to check
 			y: Y coordinate to check
 			cdp_session: CDP session to use
+			object_id: Already-resolved remote object ID for the element (saves a DOM.resolveNode round-trip)
 
 		Returns:
 			True if element is occluded, False if clickable
@@ -400,16 +527,17 @@ class DefaultActionWatchdog(BaseWatchdog):
 		try:
 			session_id = cdp_session.session_id
 
-			# Get target element info for comparison
-			target_result = await cdp_session.cdp_client.send.DOM.resolveNode(
-				params={'backendNodeId': backend_node_id}, session_id=session_id
-			)
+			if object_id is None:
+				# Get target element info for comparison
+				target_result = await cdp_session.cdp_client.send.DOM.resolveNode(
+					params={'backendNodeId': backend_node_id}, session_id=session_id
+				)
 
-			if 'object' not in target_result:
-				self.logger.debug('Could not resolve target element, assuming occluded')
-				return True
+				if 'object' not in target_result:
+					self.logger.debug('Could not resolve target element, assuming occluded')
+					return True
 
-			object_id = target_result['object']['objectId']
+				object_id = target_result['object']['objectId']
 
 			# Get target element info
 			target_info_result = await cdp_session.cdp_client.send.Runtime.callFunctionOn(
@@ -476,6 +604,46 @@ class DefaultActionWatchdog(BaseWatchdog):
 			self.logger.debug(f'Occlusion check failed: {e}, assuming not occluded')
 			return False
 
+	async def _prepare_element(self, object_id: str, cdp_session, focus: bool = False, clear: bool = False) -> dict | None:
+		"""Scroll into view, optionally focus and clear, and locate an element in a single Runtime.callFunctionOn.
+
+		Replaces the DOM.scrollIntoViewIfNeeded + Page.getLayoutMetrics + DOM.getContentQuads + occlusion check
+		(+ DOM.focus + clear) round-trips that clicking and typing otherwise make one after another.
+
+		Returns:
+			{'rect': {'x', 'y', 'width', 'height'} | None, 'viewportWidth', 'viewportHeight', 'occluded', 'focused', 'cleared'},
+			or None if the call failed and the caller should fall back to the separate CDP calls
+		"""
+		try:
+			result = await cdp_session.cdp_client.send.Runtime.callFunctionOn(
+				params={
+					'functionDeclaration': _PREPARE_ELEMENT_JS,
+					'objectId': object_id,
+					'arguments': [{'value': focus}, {'value': clear}],
+					'returnByValue': True,
+				},
+				session_id=cdp_session.session_id,
+			)
+		except Exception as e:
+			self.logger.debug(f'Single-call element preparation failed: {type(e).__name__}: {e}')
+			return None
+
+		prepared = result.get('result', {}).get('value')
+		if not isinstance(prepared, dict) or 'viewportWidth' not in prepared:
+			self.logger.debug(f'Single-call element preparation returned no usable value: {result}')
+			return None
+
+		if prepared.get('occluded'):
+			target_info = prepared.get('targetInfo') or {}
+			element_at_point_info = prepared.get('elementAtPointInfo') or {}
+			self.logger.debug(
+				f'Element is occluded. Target: {target_info.get("tagName", "unknown")} '
+				f'(id={target_info.get("id", "none")}), '
+				f'ElementAtPoint: {element_at_point_info.get("tagName", "unknown")} '
+				f'(id={element_at_point_info.get("id", "none")})'
+			)
+		return prepared
+
 	async def _click_element_node_impl(self, element_node) -> dict | None:
 		"""
 		Click an element using pure CDP with multiple fallback methods for getting element geometry.
@@ -508,23 +676,47 @@ class DefaultActionWatchdog(BaseWatchdog):
 			# Get element bounds
 			backend_node_id = element_node.backend_node_id
 
-			# Get viewport dimensions for visibility checks
-			layout_metrics = await cdp_session.cdp_client.send.Page.getLayoutMetrics(session_id=session_id)
-			viewport_width = layout_metrics['layoutViewport']['clientWidth']
-			viewport_height = layout_metrics['layoutViewport']['clientHeight']
-
-			# Scroll element into view FIRST before getting coordinates
+			# Resolve the node once, then scroll, measure and check occlusion in a single Runtime.callFunctionOn
+			object_id: str | None = None
 			try:
-				await cdp_session.cdp_client.send.DOM.scrollIntoViewIfNeeded(
+				resolve_result = await cdp_session.cdp_client.send.DOM.resolveNode(
 					params={'backendNodeId': backend_node_id}, session_id=session_id
 				)
-				await asyncio.sleep(0.05)  # Wait for scroll to complete
-				self.logger.debug('Scrolled element into view before getting coordinates')
+				object_id = resolve_result.get('object', {}).get('objectId')
 			except Exception as e:
-				self.logger.debug(f'Failed to scroll element into view: {e}')
+				self.logger.debug(f'Failed to resolve element before clicking: {e}')
+			prepared = await self._prepare_element(object_id, cdp_session) if object_id else None
+
+			element_rect: DOMRect | None = None
+			if prepared is not None:
+				viewport_width = prepared['viewportWidth']
+				viewport_height = prepared['viewportHeight']
+				if prepared.get('rect'):
+					element_rect = DOMRect(**prepared['rect'])
+			else:
+				# Fall back to separate CDP calls; viewport metrics and scroll-into-view are pipelined in one round-trip
+				layout_metrics, scroll_result = await pipeline(
+					cdp_session.cdp_client.send.Page.getLayoutMetrics(session_id=session_id),
+					cdp_session.cdp_client.send.DOM.scrollIntoViewIfNeeded(
+						params={'backendNodeId': backend_node_id}, session_id=session_id
+					),
+				)
 
-			# Get element coordinates using the unified method AFTER scrolling
-			element_rect = await self.browser_session.get_element_coordinates(backend_node_id, cdp_session)
+				# Get viewport dimensions for visibility checks
+				if isinstance(layout_metrics, BaseException):
+					raise layout_metrics
+				viewport_width = layout_metrics['layoutViewport']['clientWidth']
+				viewport_height = layout_metrics['layoutViewport']['clientHeight']
+
+				# Scroll element into view FIRST before getting coordinates
+				if isinstance(scroll_result, BaseException):
+					self.logger.debug(f'Failed to scroll element into view: {scroll_result}')
+				else:
+					await asyncio.sleep(0.05)  # Wait for scroll to complete
+					self.logger.debug('Scrolled element into view before getting coordinates')
+
+				# Get element coordinates using the unified method AFTER scrolling
+				element_rect = await self.browser_session.get_element_coordinates(backend_node_id, cdp_session)
 
 			# Convert rect to quads format if we got coordinates
 			quads = []
@@ -551,14 +743,15 @@ class DefaultActionWatchdog(BaseWatchdog):
 			if not quads:
 				self.logger.warning('Could not get element geometry from any method, falling back to JavaScript click')
 				try:
-					result = await cdp_session.cdp_client.send.DOM.resolveNode(
-						params={'backendNodeId': backend_node_id},
-						session_id=session_id,
-					)
-					assert 'object' in result and 'objectId' in result['object'], (
-						'Failed to find DOM element based on backendNodeId, maybe page content changed?'
-					)
-					object_id = result['object']['objectId']
+					if object_id is None:
+						result = await cdp_session.cdp_client.send.DOM.resolveNode(
+							params={'backendNodeId': backend_node_id},
+							session_id=session_id,
+						)
+						assert 'object' in result and 'objectId' in result['object'], (
+							'Failed to find DOM element based on backendNodeId, maybe page content changed?'
+						)
+						object_id = result['object']['objectId']
 
 					await cdp_session.cdp_client.send.Runtime.callFunctionOn(
 						params={
@@ -622,20 +815,26 @@ class DefaultActionWatchdog(BaseWatchdog):
 			center_x = max(0, min(viewport_width - 1, center_x))
 			center_y = max(0, min(viewport_height - 1, center_y))
 
-			# Check for occlusion before attempting CDP click
-			is_occluded = await self._check_element_occlusion(backend_node_id, center_x, center_y, cdp_session)
+			# Check for occlusion before attempting CDP click (already checked at this same point when prepared in one call)
+			if prepared is not None:
+				is_occluded = bool(prepared.get('occluded'))
+			else:
+				is_occluded = await self._check_element_occlusion(
+					backend_node_id, center_x, center_y, cdp_session, object_id=object_id
+				)
 
 			if is_occluded:
 				self.logger.debug('🚫 Element is occluded, falling back to JavaScript click')
 				try:
-					result = await cdp_session.cdp_client.send.DOM.resolveNode(
-						params={'backendNodeId': backend_node_id},
-						session_id=session_id,
-					)
-					assert 'object' in result and 'objectId' in result['object'], (
-						'Failed to find DOM element based on backendNodeId'
-					)
-					object_id = result['object']['objectId']
+					if object_id is None:
+						result = await cdp_session.cdp_client.send.DOM.resolveNode(
+							params={'backendNodeId': backend_node_id},
+							session_id=session_id,
+						)
+						assert 'object' in result and 'objectId' in result['object'], (
+							'Failed to find DOM element based on backendNodeId'
+						)
+						object_id = result['object']['objectId']
 
 					await cdp_session.cdp_client.send.Runtime.callFunctionOn(
 						params={
@@ -712,14 +911,15 @@ class DefaultActionWatchdog(BaseWatchdog):
 				self.logger.warning(f'CDP click failed: {type(e).__name__}: {e}')
 				# Fall back to JavaScript click via CDP
 				try:
-					result = await cdp_session.cdp_client.send.DOM.resolveNode(
-						params={'backendNodeId': backend_node_id},
-						session_id=session_id,
-					)
-					assert 'object' in result and 'objectId' in result['object'], (
-						'Failed to find DOM element based on backendNodeId, maybe page content changed?'
-					)
-					object_id = result['object']['objectId']
+					if object_id is None:
+						result = await cdp_session.cdp_client.send.DOM.resolveNode(
+							params={'backendNodeId': backend_node_id},
+							session_id=session_id,
+						)
+						assert 'object' in result and 'objectId' in result['object'], (
+							'Failed to find DOM element based on backendNodeId, maybe page content changed?'
+						)
+						object_id = result['object']['objectId']
 
 					await cdp_session.cdp_client.send.Runtime.callFunctionOn(
 						params={
@@ -1046,6 +1246,22 @@ class DefaultActionWatchdog(BaseWatchdog):
 		# Fallback for unknown characters
 		return f'Key{char.upper()}'
 
+	def _check_clear_result(self, clear_info: dict) -> bool:
+		"""Check the {cleared, method, finalText} result of _CLEAR_TEXT_FIELD_JS."""
+		self.logger.debug(f'Clear result: {clear_info}')
+
+		if clear_info.get('cleared'):
+			final_text = clear_info.get('finalText', '')
+			if not final_text or not final_text.strip():
+				self.logger.debug(f'✅ Text field cleared successfully using {clear_info.get("method")}')
+				return True
+			else:
+				self.logger.debug(f'⚠️ JavaScript clear partially failed, field still contains: "{final_text}"')
+				return False
+		else:
+			self.logger.debug(f'❌ JavaScript clear failed: {clear_info.get("error", "Unknown error")}')
+			return False
+
 	async def _clear_text_field(self, object_id: str, cdp_session) -> bool:
 		"""Clear text field using multiple strategies, starting with the most reliable."""
 		try:
@@ -1054,51 +1270,7 @@ class DefaultActionWatchdog(BaseWatchdog):
 
 			clear_result = await cdp_session.cdp_client.send.Runtime.callFunctionOn(
 				params={
-					'functionDeclaration': """
-						function() {
-							// Check if it's a contenteditable element
-							const hasContentEditable = this.getAttribute('contenteditable') === 'true' ||
-													this.getAttribute('contenteditable') === '' ||
-													this.isContentEditable === true;
-
-							if (hasContentEditable) {
-								// For contenteditable elements, clear all content
-								while (this.firstChild) {
-									this.removeChild(this.firstChild);
-								}
-								this.textContent = "";
-								this.innerHTML = "";
-
-								// Focus and position cursor at the beginning
-								this.focus();
-								const selection = window.getSelection();
-								const range = document.createRange();
-								range.setStart(this, 0);
-								range.setEnd(this, 0);
-								selection.removeAllRanges();
-								selection.addRange(range);
-
-								// Dispatch events
-								this.dispatchEvent(new Event("input", { bubbles: true }));
-								this.dispatchEvent(new Event("change", { bubbles: true }));
-
-								return {cleared: true, method: 'contenteditable', finalText: this.textContent};
-							} else if (this.value !== undefined) {
-								// For regular inputs with value property
-								try {
-									this.select();
-								} catch (e) {
-									// ignore
-								}
-								this.value = "";
-								this.dispatchEvent(new Event("input", { bubbles: true }));
-								this.dispatchEvent(new Event("change", { bubbles: true }));
-								return {cleared: true, method: 'value', finalText: this.value};
-							} else {
-								return {cleared: false, method: 'none', error: 'Not a supported input type'};
-							}
-						}
-					""",
+					'functionDeclaration': _CLEAR_TEXT_FIELD_JS,
 					'objectId': object_id,
 					'returnByValue': True,
 				},
@@ -1106,20 +1278,7 @@ class DefaultActionWatchdog(BaseWatchdog):
 			)
 
 			# Check the clear result
-			clear_info = clear_result.get('result', {}).get('value', {})
-			self.logger.debug(f'Clear result: {clear_info}')
-
-			if clear_info.get('cleared'):
-				final_text = clear_info.get('finalText', '')
-				if not final_text or not final_text.strip():
-					self.logger.debug(f'✅ Text field cleared successfully using {clear_info.get("method")}')
-					return True
-				else:
-					self.logger.debug(f'⚠️ JavaScript clear partially failed, field still contains: "{final_text}"')
-					return False
-			else:
-				self.logger.debug(f'❌ JavaScript clear failed: {clear_info.get("error", "Unknown error")}')
-				return False
+			return self._check_clear_result(clear_result.get('result', {}).get('value', {}))
 
 		except Exception as e:
 			self.logger.debug(f'JavaScript clear failed with exception: {e}')
@@ -1466,22 +1625,8 @@ class DefaultActionWatchdog(BaseWatchdog):
 			# Track coordinates for metadata
 			input_coordinates = None
 
-			# Scroll element into view
-			try:
-				await cdp_session.cdp_client.send.DOM.scrollIntoViewIfNeeded(
-					params={'backendNodeId': backend_node_id}, session_id=cdp_session.session_id
-				)
-				await asyncio.sleep(0.01)
-			except Exception as e:
-				# Node detached errors are common with shadow DOM and dynamic content
-				# The element can still be interacted with even if scrolling fails
-				error_str = str(e)
-				if 'Node is detached from document' in error_str or 'detached from document' in error_str:
-					self.logger.debug(
-						f'Element node temporarily detached during scroll (common with shadow DOM), continuing: {element_node}'
-					)
-				else:
-					self.logger.debug(f'Failed to scroll element {element_node} into view before typing: {type(e).__name__}: {e}')
+			# Step 2 needs no CDP call: date/time inputs get direct value assignment instead of typing
+			requires_direct_assignment = self._requires_direct_value_assignment(element_node)
 
 			# Get object ID for the element
 			result = await cdp_client.send.DOM.resolveNode(
@@ -1493,36 +1638,74 @@ class DefaultActionWatchdog(BaseWatchdog):
 			)
 			object_id = result['object']['objectId']
 
-			# Get current coordinates using unified method
-			coords = await self.browser_session.get_element_coordinates(backend_node_id, cdp_session)
-			if coords:
-				center_x = coords.x + coords.width / 2
-				center_y = coords.y + coords.height / 2
+			# Scroll, locate, check occlusion, focus and clear in a single Runtime.callFunctionOn
+			clear_in_prepare = clear and not requires_direct_assignment
+			prepared = await self._prepare_element(object_id, cdp_session, focus=True, clear=clear_in_prepare)
 
-				# Check for occlusion before using coordinates for focus
-				is_occluded = await self._check_element_occlusion(backend_node_id, center_x, center_y, cdp_session)
-
-				if is_occluded:
+			if prepared is not None:
+				rect = prepared.get('rect')
+				if not rect:
+					self.logger.debug('No coordinates found for element')
+				elif prepared.get('occluded'):
 					self.logger.debug('🚫 Input element is occluded, skipping coordinate-based focus')
-					input_coordinates = None  # Force fallback to CDP-only focus
 				else:
+					center_x = rect['x'] + rect['width'] / 2
+					center_y = rect['y'] + rect['height'] / 2
 					input_coordinates = {'input_x': center_x, 'input_y': center_y}
-					self.logger.debug(f'Using unified coordinates: x={center_x:.1f}, y={center_y:.1f}')
+					self.logger.debug(f'Using prepared coordinates: x={center_x:.1f}, y={center_y:.1f}')
 			else:
-				input_coordinates = None
-				self.logger.debug('No coordinates found for element')
+				# Fall back to separate CDP calls
+				try:
+					await cdp_session.cdp_client.send.DOM.scrollIntoViewIfNeeded(
+						params={'backendNodeId': backend_node_id}, session_id=cdp_session.session_id
+					)
+					await asyncio.sleep(0.01)
+				except Exception as e:
+					# Node detached errors are common with shadow DOM and dynamic content
+					# The element can still be interacted with even if scrolling fails
+					error_str = str(e)
+					if 'Node is detached from document' in error_str or 'detached from document' in error_str:
+						self.logger.debug(
+							f'Element node temporarily detached during scroll (common with shadow DOM), continuing: {element_node}'
+						)
+					else:
+						self.logger.debug(
+							f'Failed to scroll element {element_node} into view before typing: {type(e).__name__}: {e}'
+						)
+
+				# Get current coordinates using unified method
+				coords = await self.browser_session.get_element_coordinates(backend_node_id, cdp_session)
+				if coords:
+					center_x = coords.x + coords.width / 2
+					center_y = coords.y + coords.height / 2
+
+					# Check for occlusion before using coordinates for focus
+					is_occluded = await self._check_element_occlusion(
+						backend_node_id, center_x, center_y, cdp_session, object_id=object_id
+					)
+
+					if is_occluded:
+						self.logger.debug('🚫 Input element is occluded, skipping coordinate-based focus')
+						input_coordinates = None  # Force fallback to CDP-only focus
+					else:
+						input_coordinates = {'input_x': center_x, 'input_y': center_y}
+						self.logger.debug(f'Using unified coordinates: x={center_x:.1f}, y={center_y:.1f}')
+				else:
+					input_coordinates = None
+					self.logger.debug('No coordinates found for element')
 
 			# Ensure we have a valid object_id before proceeding
 			if not object_id:
 				raise ValueError('Could not get object_id for element')
 
-			# Step 1: Focus the element using simple strategy
-			focused_successfully = await self._focus_element_simple(
-				backend_node_id=backend_node_id, object_id=object_id, cdp_session=cdp_session, input_coordinates=input_coordinates
-			)
-
-			# Step 2: Check if this element requires direct value assignment (date/time inputs)
-			requires_direct_assignment = self._requires_direct_value_assignment(element_node)
+			# Step 1: Focus the element using simple strategy, unless it already got focus above
+			if prepared is None or not prepared.get('focused'):
+				await self._focus_element_simple(
+					backend_node_id=backend_node_id,
+					object_id=object_id,
+					cdp_session=cdp_session,
+					input_coordinates=input_coordinates,
+				)
 
 			if requires_direct_assignment:
 				# Date/time inputs: use direct value assignment instead of typing
@@ -1536,7 +1719,10 @@ class DefaultActionWatchdog(BaseWatchdog):
 
 			# Step 3: Clear existing text if requested (only for regular inputs that support typing)
 			if clear:
-				cleared_successfully = await self._clear_text_field(object_id=object_id, cdp_session=cdp_session)
+				if prepared is not None and prepared.get('cleared') is not None:
+					cleared_successfully = self._check_clear_result(prepared['cleared'])
+				else:
+					cleared_successfully = await self._clear_text_field(object_id=object_id, cdp_session=cdp_session)
 				if not cleared_successfully:
 					self.logger.warning('⚠️ Text field clearing failed, typing may append to existing text')
 
@@ -2360,6 +2546,7 @@ class DefaultActionWatchdog(BaseWatchdog):
 		else:
 			raise BrowserError(f'Text not found: "{event.text}"', details={'text': event.text})
 
+	@tracks_cdp_round_trips('get_dropdown_options')
 	async def on_GetDropdownOptionsEvent(self, event: GetDropdownOptionsEvent) -> dict[str, str]:
 		"""Handle get dropdown options request with CDP."""
 		try:
@@ -2587,6 +2774,7 @@ class DefaultActionWatchdog(BaseWatchdog):
 				message=error_msg, long_term_memory=f'Failed to get dropdown options for index {index_for_logging}.'
 			)
 
+	@tracks_cdp_round_trips('select_dropdown_option')
 	async def on_SelectDropdownOptionEvent(self, event: SelectDropdownOptionEvent) -> dict[str, str]:
 		"""Handle select dropdown option request with CDP."""
 		try:
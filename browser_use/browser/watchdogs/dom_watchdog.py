@@ -2,15 +2,24 @@
 
 import asyncio
 import time
-from typing import TYPE_CHECKING
+from collections.abc import Awaitable
+from typing import TYPE_CHECKING, ClassVar, TypeVar
+
+from cdp_use.cdp.target import TargetID
+from pydantic import PrivateAttr
 
 from browser_use.browser.events import (
 	BrowserErrorEvent,
 	BrowserStateRequestEvent,
+	NavigationCompleteEvent,
+	NavigationStartedEvent,
 	ScreenshotEvent,
+	TabClosedEvent,
 	TabCreatedEvent,
 )
+from browser_use.browser.tab_state_cache import TabStateCache, TabStateSnapshot
 from browser_use.browser.watchdog_base import BaseWatchdog
+from browser_use.dom.markdown_extractor import MarkdownCaches
 from browser_use.dom.service import DomService
 from browser_use.dom.views import (
 	EnhancedDOMTreeNode,
@@ -20,7 +29,18 @@ from browser_use.observability import observe_debug
 from browser_use.utils import create_task_with_error_handling, time_execution_async
 
 if TYPE_CHECKING:
-	from browser_use.browser.views import BrowserStateSummary, NetworkRequest, PageInfo, PaginationButton
+	from browser_use.browser.views import BrowserStateSummary, NetworkRequest, PageInfo, PaginationButton, TabInfo
+
+T = TypeVar('T')
+
+
+async def _timed(coro: Awaitable[T], timing: dict[str, float], key: str) -> T:
+	"""Await coro and record how long it took in timing[key], in milliseconds."""
+	start = time.perf_counter()
+	try:
+		return await coro
+	finally:
+		timing[key] = (time.perf_counter() - start) * 1000
 
 
 class DOMWatchdog(BaseWatchdog):
@@ -31,9 +51,12 @@ class DOMWatchdog(BaseWatchdog):
 	helper methods for other watchdogs.
 	"""
 
-	LISTENS_TO = [TabCreatedEvent, BrowserStateRequestEvent]
+	LISTENS_TO = [TabCreatedEvent, TabClosedEvent, NavigationStartedEvent, NavigationCompleteEvent, BrowserStateRequestEvent]
 	EMITS = [BrowserErrorEvent]
 
+	# Max number of background tabs snapshotted at once, kept low so the focused tab always wins
+	BACKGROUND_SNAPSHOT_CONCURRENCY: ClassVar[int] = 2
+
 	# Public properties for other watchdogs
 	selector_map: dict[int, EnhancedDOMTreeNode] | None = None
 	current_dom_state: SerializedDOMState | None = None
@@ -45,10 +68,38 @@ class DOMWatchdog(BaseWatchdog):
 	# Network tracking - maps request_id to (url, start_time, method, resource_type)
 	_pending_requests: dict[str, tuple[str, float, str, str | None]] = {}
 
+	# Background tab snapshots (only used when browser_profile.background_tab_state_cache is enabled)
+	_tab_state_cache: TabStateCache = PrivateAttr(default_factory=TabStateCache)
+	_background_snapshot_task: asyncio.Task | None = PrivateAttr(default=None)
+
+	# Stage timings of the last DOM build, reported in BrowserStateSummary.timing
+	_last_dom_timing: dict[str, float] = PrivateAttr(default_factory=dict)
+
+	# Converted markdown per HTML block, per tab (see extract_clean_markdown)
+	_markdown_caches: MarkdownCaches = PrivateAttr(default_factory=MarkdownCaches)
+
 	async def on_TabCreatedEvent(self, event: TabCreatedEvent) -> None:
 		# self.logger.debug('Setting up init scripts in browser')
 		return None
 
+	async def on_TabClosedEvent(self, event: TabClosedEvent) -> None:
+		self._tab_state_cache.forget(event.target_id)
+		self._markdown_caches.forget(event.target_id)
+
+	async def on_NavigationStartedEvent(self, event: NavigationStartedEvent) -> None:
+		self._tab_state_cache.invalidate(event.target_id)
+
+	async def on_NavigationCompleteEvent(self, event: NavigationCompleteEvent) -> None:
+		self._tab_state_cache.invalidate(event.target_id)
+
+	@property
+	def markdown_caches(self) -> MarkdownCaches:
+		return self._markdown_caches
+
+	def invalidate_tab_state(self, target_id: TargetID) -> None:
+		"""Drop the background snapshot for a tab, e.g. because its URL changed."""
+		self._tab_state_cache.invalidate(target_id)
+
 	def _get_recent_events_str(self, limit: int = 10) -> str | None:
 		"""Get the most recent events from the event bus as JSON.
 
@@ -252,6 +303,9 @@ class DOMWatchdog(BaseWatchdog):
 		"""
 		from browser_use.browser.views import BrowserStateSummary, PageInfo
 
+		capture_start = time.perf_counter()
+		timing: dict[str, float] = {}
+
 		self.logger.debug('🔍 DOMWatchdog.on_BrowserStateRequestEvent: STARTING browser state request')
 		page_url = await self.browser_session.get_current_page_url()
 		self.logger.debug(f'🔍 DOMWatchdog.on_BrowserStateRequestEvent: Got page URL: {page_url}')
@@ -347,14 +401,18 @@ class DOMWatchdog(BaseWatchdog):
 					pending_network_requests=[],  # Empty page has no pending requests
 					pagination_buttons=[],  # Empty page has no pagination
 					closed_popup_messages=self.browser_session._closed_popup_messages.copy(),
+					timing={'total_ms': (time.perf_counter() - capture_start) * 1000},
 				)
 
 			# Execute DOM building and screenshot capture in parallel
 			dom_task = None
 			screenshot_task = None
 
+			# Reuse a background snapshot if this tab was captured while it was not focused
+			cached_content = self._take_background_tab_state(page_url) if event.include_dom else None
+
 			# Start DOM building task if requested
-			if event.include_dom:
+			if event.include_dom and cached_content is None:
 				self.logger.debug('🔍 DOMWatchdog.on_BrowserStateRequestEvent: 🌳 Starting DOM tree build task...')
 
 				previous_state = (
@@ -364,7 +422,7 @@ class DOMWatchdog(BaseWatchdog):
 				)
 
 				dom_task = create_task_with_error_handling(
-					self._build_dom_tree_without_highlights(previous_state),
+					_timed(self._build_dom_tree_without_highlights(previous_state), timing, 'dom_ms'),
 					name='build_dom_tree',
 					logger_instance=self.logger,
 					suppress_exceptions=True,
@@ -374,7 +432,7 @@ class DOMWatchdog(BaseWatchdog):
 			if event.include_screenshot:
 				self.logger.debug('🔍 DOMWatchdog.on_BrowserStateRequestEvent: 📸 Starting clean screenshot task...')
 				screenshot_task = create_task_with_error_handling(
-					self._capture_clean_screenshot(),
+					_timed(self._capture_clean_screenshot(), timing, 'screenshot_ms'),
 					name='capture_screenshot',
 					logger_instance=self.logger,
 					suppress_exceptions=True,
@@ -384,9 +442,12 @@ class DOMWatchdog(BaseWatchdog):
 			content = None
 			screenshot_b64 = None
 
-			if dom_task:
+			if cached_content is not None:
+				content = cached_content
+			elif dom_task:
 				try:
 					content = await dom_task
+					timing.update(self._last_dom_timing)
 					self.logger.debug('🔍 DOMWatchdog.on_BrowserStateRequestEvent: ✅ DOM tree build completed')
 				except Exception as e:
 					self.logger.warning(f'🔍 DOMWatchdog.on_BrowserStateRequestEvent: DOM build failed: {e}, using minimal state')
@@ -406,7 +467,7 @@ class DOMWatchdog(BaseWatchdog):
 			if content and content.selector_map and self.browser_session.browser_profile.dom_highlight_elements:
 				try:
 					self.logger.debug('🔍 DOMWatchdog.on_BrowserStateRequestEvent: 🎨 Adding browser-side highlights...')
-					await self.browser_session.add_highlights(content.selector_map)
+					await _timed(self.browser_session.add_highlights(content.selector_map), timing, 'highlights_ms')
 					self.logger.debug(
 						f'🔍 DOMWatchdog.on_BrowserStateRequestEvent: ✅ Added browser highlights for {len(content.selector_map)} elements'
 					)
@@ -420,6 +481,7 @@ class DOMWatchdog(BaseWatchdog):
 			# Tabs info already fetched at the beginning
 
 			# Get target title safely
+			page_info_start = time.perf_counter()
 			try:
 				self.logger.debug('🔍 DOMWatchdog.on_BrowserStateRequestEvent: Getting page title...')
 				title = await asyncio.wait_for(self.browser_session.get_current_page_title(), timeout=1.0)
@@ -452,6 +514,8 @@ class DOMWatchdog(BaseWatchdog):
 					pixels_right=0,
 				)
 
+			timing['page_info_ms'] = (time.perf_counter() - page_info_start) * 1000
+
 			# Check for PDF viewer
 			is_pdf_viewer = page_url.endswith('.pdf') or '/pdf/' in page_url
 
@@ -485,7 +549,9 @@ class DOMWatchdog(BaseWatchdog):
 				pending_network_requests=pending_requests,
 				pagination_buttons=pagination_buttons_data,
 				closed_popup_messages=self.browser_session._closed_popup_messages.copy(),
+				timing=timing,
 			)
+			timing['total_ms'] = (time.perf_counter() - capture_start) * 1000
 
 			# Cache the state
 			self.browser_session._cached_browser_state_summary = browser_state
@@ -494,6 +560,10 @@ class DOMWatchdog(BaseWatchdog):
 			if page_info:
 				self.browser_session._original_viewport_size = (page_info.viewport_width, page_info.viewport_height)
 
+			# Warm the cache for the other tabs while the agent is busy with this one
+			if self.browser_session.browser_profile.background_tab_state_cache:
+				self._schedule_background_tab_snapshots(tabs_info)
+
 			self.logger.debug('🔍 DOMWatchdog.on_BrowserStateRequestEvent: ✅ COMPLETED - Returning browser state')
 			return browser_state
 
@@ -538,21 +608,10 @@ class DOMWatchdog(BaseWatchdog):
 		try:
 			self.logger.debug('🔍 DOMWatchdog._build_dom_tree_without_highlights: STARTING DOM tree build')
 
-			# Create or reuse DOM service
-			if self._dom_service is None:
-				self._dom_service = DomService(
-					browser_session=self.browser_session,
-					logger=self.logger,
-					cross_origin_iframes=self.browser_session.browser_profile.cross_origin_iframes,
-					paint_order_filtering=self.browser_session.browser_profile.paint_order_filtering,
-					max_iframes=self.browser_session.browser_profile.max_iframes,
-					max_iframe_depth=self.browser_session.browser_profile.max_iframe_depth,
-				)
-
 			# Get serialized DOM tree using the service
 			self.logger.debug('🔍 DOMWatchdog._build_dom_tree_without_highlights: Calling DomService.get_serialized_dom_tree...')
 			start = time.time()
-			self.current_dom_state, self.enhanced_dom_tree, timing_info = await self._dom_service.get_serialized_dom_tree(
+			self.current_dom_state, self.enhanced_dom_tree, timing_info = await self._get_dom_service().get_serialized_dom_tree(
 				previous_cached_state=previous_state,
 			)
 			end = time.time()
@@ -604,10 +663,10 @@ class DOMWatchdog(BaseWatchdog):
 				assign_idx_ms = timing_info.get('assign_interactive_indices_ms', 0)
 				clickable_ms = timing_info.get('clickable_detection_time_ms', 0)
 
+				if clickable_ms > 0.01:
+					timing_lines.append(f'  │  ├─ clickable_detection: {clickable_ms:.2f}ms')
 				if create_simp_ms > 0.01:
 					timing_lines.append(f'  │  ├─ create_simplified_tree: {create_simp_ms:.2f}ms')
-					if clickable_ms > 0.01:
-						timing_lines.append(f'  │  │  └─ clickable_detection: {clickable_ms:.2f}ms')
 				if paint_order_ms > 0.01:
 					timing_lines.append(f'  │  ├─ calculate_paint_order: {paint_order_ms:.2f}ms')
 				if optimize_ms > 0.01:
@@ -641,6 +700,11 @@ class DOMWatchdog(BaseWatchdog):
 				+ get_serialized_overhead_ms
 			)
 			untracked_time_ms = total_time_ms - main_operations_ms
+			self._last_dom_timing = {
+				'cdp_ms': get_all_trees_ms,
+				'tree_build_ms': build_ax_ms + build_snapshot_ms + construct_tree_ms,
+				'serialization_ms': serialize_total_ms,
+			}
 
 			if untracked_time_ms > 1.0:  # Only log if significant
 				timing_lines.append(f'  ⚠️  untracked_time: {untracked_time_ms:.2f}ms')
@@ -672,6 +736,103 @@ class DOMWatchdog(BaseWatchdog):
 			)
 			raise
 
+	def _get_dom_service(self) -> DomService:
+		"""Create or reuse the DOM service."""
+		if self._dom_service is None:
+			self._dom_service = DomService(
+				browser_session=self.browser_session,
+				logger=self.logger,
+				cross_origin_iframes=self.browser_session.browser_profile.cross_origin_iframes,
+				paint_order_filtering=self.browser_session.browser_profile.paint_order_filtering,
+				max_iframes=self.browser_session.browser_profile.max_iframes,
+				max_iframe_depth=self.browser_session.browser_profile.max_iframe_depth,
+				offload_cpu_work=self.browser_session.browser_profile.offload_dom_processing,
+			)
+		return self._dom_service
+
+	# ========== Background Tab Snapshots ==========
+
+	def _take_background_tab_state(self, page_url: str) -> SerializedDOMState | None:
+		"""Consume the background snapshot of the focused tab, if there is a fresh one.
+
+		Always invalidates the focused tab's entry, so background builds that are still in flight
+		for it are discarded once the agent starts interacting with it.
+		"""
+		target_id = self.browser_session.agent_focus_target_id
+		if not target_id:
+			return None
+		self._tab_state_cache.max_age = self.browser_session.browser_profile.background_tab_state_max_age
+		snapshot = self._tab_state_cache.take(target_id, page_url)
+		if snapshot is None:
+			return None
+
+		age_ms = (time.monotonic() - snapshot.captured_at) * 1000
+		self.logger.debug(
+			f'⚡ Reusing background snapshot of tab #{target_id[-4:]} ({len(snapshot.dom_state.selector_map)} elements, '
+			f'{age_ms:.0f}ms old, saved ~{snapshot.build_time_ms:.0f}ms DOM build)'
+		)
+		self.current_dom_state = snapshot.dom_state
+		self.enhanced_dom_tree = snapshot.enhanced_dom_tree
+		self.selector_map = snapshot.dom_state.selector_map
+		self.browser_session.update_cached_selector_map(self.selector_map)
+		return snapshot.dom_state
+
+	def _schedule_background_tab_snapshots(self, tabs: list['TabInfo']) -> None:
+		"""Snapshot every non-focused http(s) tab that has no fresh entry, without blocking the caller."""
+		if self._background_snapshot_task and not self._background_snapshot_task.done():
+			return  # previous round still running, it will be picked up on the next state request
+
+		self._tab_state_cache.max_age = self.browser_session.browser_profile.background_tab_state_max_age
+		focused_target_id = self.browser_session.agent_focus_target_id
+		stale_tabs = [
+			tab
+			for tab in tabs
+			if tab.target_id != focused_target_id
+			and tab.url.lower().split(':', 1)[0] in ('http', 'https')
+			and not self._tab_state_cache.is_fresh(tab.target_id, tab.url)
+		]
+		if not stale_tabs:
+			return
+
+		self._background_snapshot_task = create_task_with_error_handling(
+			self._snapshot_background_tabs(stale_tabs),
+			name='snapshot_background_tabs',
+			logger_instance=self.logger,
+			suppress_exceptions=True,
+		)
+
+	async def _snapshot_background_tabs(self, tabs: list['TabInfo']) -> None:
+		semaphore = asyncio.Semaphore(self.BACKGROUND_SNAPSHOT_CONCURRENCY)
+
+		async def snapshot_tab(tab: 'TabInfo') -> None:
+			async with semaphore:
+				epoch = self._tab_state_cache.epoch(tab.target_id)
+				start = time.time()
+				try:
+					dom_state, enhanced_dom_tree, _ = await self._get_dom_service().get_serialized_dom_tree(
+						target_id=tab.target_id
+					)
+				except Exception as e:
+					self.logger.debug(f'Background snapshot of tab #{tab.target_id[-4:]} failed: {type(e).__name__}: {e}')
+					return
+				build_time_ms = (time.time() - start) * 1000
+				stored = self._tab_state_cache.put(
+					TabStateSnapshot(
+						target_id=tab.target_id,
+						url=tab.url,
+						dom_state=dom_state,
+						enhanced_dom_tree=enhanced_dom_tree,
+						build_time_ms=build_time_ms,
+					),
+					epoch=epoch,
+				)
+				self.logger.debug(
+					f'🗂️ Background snapshot of tab #{tab.target_id[-4:]} {"stored" if stored else "discarded (tab changed)"} '
+					f'in {build_time_ms:.0f}ms'
+				)
+
+		await asyncio.gather(*(snapshot_tab(tab) for tab in tabs))
+
 	@time_execution_async('capture_clean_screenshot')
 	@observe_debug(ignore_input=True, ignore_output=True, name='capture_clean_screenshot')
 	async def _capture_clean_screenshot(self) -> str:
@@ -830,7 +991,10 @@ class DOMWatchdog(BaseWatchdog):
 		return self.selector_map.get(index) if self.selector_map else None
 
 	def clear_cache(self) -> None:
-		"""Clear cached DOM state to force rebuild on next access."""
+		"""Clear cached DOM state to force rebuild on next access.
+
+		Background tab snapshots are kept, they are exactly what a tab switch wants to reuse.
+		"""
 		self.selector_map = None
 		self.current_dom_state = None
 		self.enhanced_dom_tree = None
@@ -850,6 +1014,9 @@ class DOMWatchdog(BaseWatchdog):
 
 	async def __aexit__(self, exc_type, exc_value, traceback):
 		"""Clean up DOM service on exit."""
+		if self._background_snapshot_task and not self._background_snapshot_task.done():
+			self._background_snapshot_task.cancel()
+		self._tab_state_cache.clear()
 		if self._dom_service:
 			await self._dom_service.__aexit__(exc_type, exc_value, traceback)
 			self._dom_service = None
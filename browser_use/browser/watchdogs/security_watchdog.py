@@ -4,6 +4,7 @@ from typing import TYPE_CHECKING, ClassVar
 
 from bubus import BaseEvent
 
+from browser_use.browser.domain_patterns import DomainPolicy, compile_domain_policy
 from browser_use.browser.events import (
 	BrowserErrorEvent,
 	NavigateToUrlEvent,
@@ -209,11 +210,8 @@ class SecurityWatchdog(BaseWatchdog):
 				host_variant, host_alt = self._get_domain_variants(host)
 				return host_variant in allowed_domains or host_alt in allowed_domains
 			else:
-				# Slow path: O(n) pattern matching for lists
-				for pattern in allowed_domains:
-					if self._is_url_match(url, host, parsed.scheme, pattern):
-						return True
-				return False
+				# Pattern lists are compiled once and cached per (scheme, host)
+				return self._domain_policy(allowed_domains).matches(url, host, parsed.scheme)
 
 		# Check prohibited domains (fast path for sets, slow path for lists with patterns)
 		if self.browser_session.browser_profile.prohibited_domains:
@@ -224,16 +222,20 @@ class SecurityWatchdog(BaseWatchdog):
 				host_variant, host_alt = self._get_domain_variants(host)
 				return host_variant not in prohibited_domains and host_alt not in prohibited_domains
 			else:
-				# Slow path: O(n) pattern matching for lists
-				for pattern in prohibited_domains:
-					if self._is_url_match(url, host, parsed.scheme, pattern):
-						return False
-				return True
+				# Pattern lists are compiled once and cached per (scheme, host)
+				return not self._domain_policy(prohibited_domains).matches(url, host, parsed.scheme)
 
 		return True
 
+	def _domain_policy(self, patterns: list[str]) -> DomainPolicy:
+		"""Compiled matcher for a domain list, equivalent to checking each pattern with _is_url_match."""
+		policy = compile_domain_policy(tuple(patterns))
+		if policy.has_globs:
+			self._log_glob_warning()
+		return policy
+
 	def _is_url_match(self, url: str, host: str, scheme: str, pattern: str) -> bool:
-		"""Check if a URL matches a pattern."""
+		"""Check if a URL matches a single pattern (reference rules compiled by DomainPolicy)."""
 
 		# Full URL for matching (scheme + host)
 		full_url_pattern = f'{scheme}://{host}'
@@ -3,32 +3,45 @@
 import asyncio
 import json
 import os
+import shutil
 from pathlib import Path
 from typing import Any, ClassVar
 
 from bubus import BaseEvent
 from cdp_use.cdp.network import Cookie
+from cdp_use.cdp.network.events import ResponseReceivedExtraInfoEvent
 from pydantic import Field, PrivateAttr
 
 from browser_use.browser.events import (
 	BrowserConnectedEvent,
 	BrowserStopEvent,
 	LoadStorageStateEvent,
+	NavigationCompleteEvent,
 	SaveStorageStateEvent,
 	StorageStateLoadedEvent,
 	StorageStateSavedEvent,
+	TabCreatedEvent,
 )
 from browser_use.browser.watchdog_base import BaseWatchdog
 from browser_use.utils import create_task_with_error_handling
 
 
 class StorageStateWatchdog(BaseWatchdog):
-	"""Monitors and persists browser storage state including cookies and localStorage."""
+	"""Monitors and persists browser storage state including cookies and localStorage.
+
+	Changes are detected from CDP events instead of polling: Set-Cookie response headers, finished
+	navigations (pages may set cookies from JS) and DOMStorage item events. Changes are coalesced
+	and flushed together, a flush only re-reads what changed (the cookie jar and/or the touched
+	origins), and the file is only rewritten (atomically) when the merged state differs from what
+	is on disk. A session with no storage activity does no CDP calls and no disk writes.
+	"""
 
 	# Event contracts
 	LISTENS_TO: ClassVar[list[type[BaseEvent]]] = [
 		BrowserConnectedEvent,
 		BrowserStopEvent,
+		TabCreatedEvent,
+		NavigationCompleteEvent,
 		SaveStorageStateEvent,
 		LoadStorageStateEvent,
 	]
@@ -38,13 +51,18 @@ class StorageStateWatchdog(BaseWatchdog):
 	]
 
 	# Configuration
-	auto_save_interval: float = Field(default=30.0)  # Auto-save every 30 seconds
-	save_on_change: bool = Field(default=True)  # Save immediately when cookies change
+	auto_save_interval: float = Field(default=30.0)  # Save changes at most this long after they happen
+	save_on_change: bool = Field(default=True)  # Save changes soon (after save_debounce) instead
+	save_debounce: float = Field(default=1.0)  # Changes within this window are saved together
 
 	# Private state
-	_monitoring_task: asyncio.Task | None = PrivateAttr(default=None)
-	_last_cookie_state: list[dict] = PrivateAttr(default_factory=list)
+	_flush_task: asyncio.Task | None = PrivateAttr(default=None)
 	_save_lock: asyncio.Lock = PrivateAttr(default_factory=asyncio.Lock)
+	_cdp_handlers_registered: bool = PrivateAttr(default=False)
+	_tracked_targets: set[str] = PrivateAttr(default_factory=set)  # Targets with DOMStorage events enabled
+	_cookies_dirty: bool = PrivateAttr(default=False)
+	_dirty_origins: dict[tuple[str, bool], str] = PrivateAttr(default_factory=dict)  # (origin, is_local) -> session id
+	_saved_state: tuple[Path, float, dict[str, Any]] | None = PrivateAttr(default=None)  # (path, mtime, state) on disk
 
 	async def on_BrowserConnectedEvent(self, event: BrowserConnectedEvent) -> None:
 		"""Start monitoring when browser starts."""
@@ -61,6 +79,16 @@ class StorageStateWatchdog(BaseWatchdog):
 		self.logger.debug('[StorageStateWatchdog] Stopping storage_state monitoring')
 		await self._stop_monitoring()
 
+	async def on_TabCreatedEvent(self, event: TabCreatedEvent) -> None:
+		"""Receive localStorage/sessionStorage change events from new tabs."""
+		if self._cdp_handlers_registered:
+			await self._track_target(event.target_id)
+
+	async def on_NavigationCompleteEvent(self, event: NavigationCompleteEvent) -> None:
+		"""Pages can set cookies from JS, which produces no CDP event, so recheck them after navigating."""
+		if self._cdp_handlers_registered:
+			self._mark_cookies_dirty()
+
 	async def on_SaveStorageStateEvent(self, event: SaveStorageStateEvent) -> None:
 		"""Handle storage state save request."""
 		# Use provided path or fall back to profile default
@@ -85,87 +113,188 @@ class StorageStateWatchdog(BaseWatchdog):
 				path = None  # Skip loading if no path available
 		await self._load_storage_state(path)
 
+	def _storage_state_path(self, path: str | None = None) -> Path | None:
+		"""The storage_state file to save to, None when saving to a file is not configured."""
+		save_path = path or self.browser_session.browser_profile.storage_state
+		if not save_path or isinstance(save_path, dict):
+			return None
+		return Path(save_path).expanduser().resolve()
+
 	async def _start_monitoring(self) -> None:
-		"""Start the monitoring task."""
-		if self._monitoring_task and not self._monitoring_task.done():
+		"""Subscribe to the CDP events that indicate storage changes."""
+		if self._cdp_handlers_registered or self._storage_state_path() is None:
 			return
 
-		assert self.browser_session.cdp_client is not None
+		cdp_client = self.browser_session.cdp_client
+		cdp_client.register.Network.responseReceivedExtraInfo(self._on_response_extra_info)
+		cdp_client.register.DOMStorage.domStorageItemAdded(self._on_dom_storage_event)
+		cdp_client.register.DOMStorage.domStorageItemUpdated(self._on_dom_storage_event)
+		cdp_client.register.DOMStorage.domStorageItemRemoved(self._on_dom_storage_event)
+		cdp_client.register.DOMStorage.domStorageItemsCleared(self._on_dom_storage_event)
+		self._cdp_handlers_registered = True
 
-		self._monitoring_task = create_task_with_error_handling(
-			self._monitor_storage_changes(), name='monitor_storage_changes', logger_instance=self.logger, suppress_exceptions=True
-		)
-		# self.logger'[StorageStateWatchdog] Started storage monitoring task')
+		# Tabs that already exist, later ones are tracked from TabCreatedEvent
+		if self.browser_session.session_manager:
+			for target in self.browser_session.session_manager.get_all_page_targets():
+				await self._track_target(target.target_id)
 
 	async def _stop_monitoring(self) -> None:
-		"""Stop the monitoring task."""
-		if self._monitoring_task and not self._monitoring_task.done():
-			self._monitoring_task.cancel()
+		"""Drop pending changes, the stop sequence saves the full state right before this."""
+		if self._flush_task and not self._flush_task.done():
+			self._flush_task.cancel()
 			try:
-				await self._monitoring_task
+				await self._flush_task
 			except asyncio.CancelledError:
 				pass
-			# self.logger.debug('[StorageStateWatchdog] Stopped storage monitoring task')
-
-	async def _check_for_cookie_changes_cdp(self, event: dict) -> None:
-		"""Check if a CDP network event indicates cookie changes.
-
-		This would be called by Network.responseReceivedExtraInfo events
-		if we set up CDP event listeners.
-		"""
+		self._flush_task = None
+		self._cdp_handlers_registered = False
+		self._tracked_targets.clear()
+		self._cookies_dirty = False
+		self._dirty_origins.clear()
+
+	async def _track_target(self, target_id: str) -> None:
+		"""Enable DOMStorage events for a target (Network is already enabled for every page)."""
 		try:
-			# Check for Set-Cookie headers in the response
-			headers = event.get('headers', {})
-			if 'set-cookie' in headers or 'Set-Cookie' in headers:
-				self.logger.debug('[StorageStateWatchdog] Cookie change detected via CDP')
-
-				# If save on change is enabled, trigger save immediately
-				if self.save_on_change:
-					await self._save_storage_state()
+			cdp_session = await self.browser_session.get_or_create_cdp_session(target_id, focus=False)
+			await cdp_session.cdp_client.send.DOMStorage.enable(session_id=cdp_session.session_id)
+			self._tracked_targets.add(target_id)
 		except Exception as e:
-			self.logger.warning(f'[StorageStateWatchdog] Error checking for cookie changes: {e}')
+			self.logger.debug(f'[StorageStateWatchdog] Could not enable DOMStorage events for target {target_id[-4:]}: {e}')
 
-	async def _monitor_storage_changes(self) -> None:
-		"""Periodically check for storage changes and auto-save."""
-		while True:
-			try:
-				await asyncio.sleep(self.auto_save_interval)
+	def _on_response_extra_info(self, event: ResponseReceivedExtraInfoEvent, session_id: str | None = None) -> None:
+		if any(name.lower() == 'set-cookie' for name in event.get('headers', {})):
+			self._mark_cookies_dirty()
 
-				# Check if cookies have changed
-				if await self._have_cookies_changed():
-					self.logger.debug('[StorageStateWatchdog] Detected changes to sync with storage_state.json')
-					await self._save_storage_state()
+	def _on_dom_storage_event(self, event: dict[str, Any], session_id: str | None = None) -> None:
+		storage_id = event.get('storageId', {})
+		origin = storage_id.get('securityOrigin') or storage_id.get('storageKey', '').rstrip('/')
+		if not origin or not session_id:
+			return
+		self._dirty_origins[(origin, storage_id.get('isLocalStorage', True))] = session_id
+		self._schedule_flush()
 
-			except asyncio.CancelledError:
-				break
-			except Exception as e:
-				self.logger.error(f'[StorageStateWatchdog] Error in monitoring loop: {e}')
+	def _mark_cookies_dirty(self) -> None:
+		self._cookies_dirty = True
+		self._schedule_flush()
 
-	async def _have_cookies_changed(self) -> bool:
-		"""Check if cookies have changed since last save."""
-		if not self.browser_session.cdp_client:
-			return False
+	def _schedule_flush(self) -> None:
+		"""Save pending changes after a delay, changes arriving meanwhile are saved in the same flush."""
+		if self._flush_task and not self._flush_task.done():
+			return
+		delay = self.save_debounce if self.save_on_change else self.auto_save_interval
+		self._flush_task = create_task_with_error_handling(
+			self._flush_after(delay), name='flush_storage_state', logger_instance=self.logger, suppress_exceptions=True
+		)
 
-		try:
-			# Get current cookies using CDP
-			current_cookies = await self.browser_session._cdp_get_cookies()
+	async def _flush_after(self, delay: float) -> None:
+		while self._cookies_dirty or self._dirty_origins:
+			await asyncio.sleep(delay)
+			try:
+				await self._flush_changes()
+			except Exception as e:
+				self.logger.error(f'[StorageStateWatchdog] Failed to save storage state changes: {e}')
 
-			# Convert to comparable format, using .get() for optional fields
-			current_cookie_set = {
-				(c.get('name', ''), c.get('domain', ''), c.get('path', '')): c.get('value', '') for c in current_cookies
-			}
+	async def _flush_changes(self) -> None:
+		"""Merge the changed cookies/origins into the saved state and write it if anything differs."""
+		json_path = self._storage_state_path()
+		async with self._save_lock:
+			cookies_dirty, self._cookies_dirty = self._cookies_dirty, False
+			dirty_origins, self._dirty_origins = self._dirty_origins, {}
+			if json_path is None or not (cookies_dirty or dirty_origins):
+				return
 
-			last_cookie_set = {
-				(c.get('name', ''), c.get('domain', ''), c.get('path', '')): c.get('value', '') for c in self._last_cookie_state
-			}
+			saved_state = self._read_saved_state(json_path)
+			new_state = dict(saved_state)
+			if cookies_dirty:
+				cookies = [dict(cookie) for cookie in await self.browser_session._cdp_get_cookies()]
+				new_state['cookies'] = self._merge_storage_states(saved_state, {'cookies': cookies})['cookies']
+
+			if dirty_origins:
+				origins = {origin['origin']: origin for origin in saved_state.get('origins', [])}
+				for (origin, is_local_storage), session_id in dirty_origins.items():
+					items = await self._get_storage_items(origin, is_local_storage, session_id)
+					if items is None:
+						continue
+					entry = dict(origins.get(origin, {'origin': origin}))
+					storage_type = 'localStorage' if is_local_storage else 'sessionStorage'
+					if items:
+						entry[storage_type] = items
+					else:
+						entry.pop(storage_type, None)
+					if 'localStorage' in entry or 'sessionStorage' in entry:
+						origins[origin] = entry
+					else:
+						origins.pop(origin, None)
+				new_state['origins'] = list(origins.values())
+
+			if new_state == saved_state:
+				return
+			self._write_storage_state(json_path, new_state)
+			self.logger.debug(
+				f'[StorageStateWatchdog] Saved storage state changes to {json_path} '
+				f'(cookies: {"changed" if cookies_dirty else "unchanged"}, {len(dirty_origins)} origins touched)'
+			)
 
-			return current_cookie_set != last_cookie_set
+	async def _get_storage_items(self, origin: str, is_local_storage: bool, session_id: str) -> list[dict[str, str]] | None:
+		"""Current items of one origin's storage, read through the session that reported the change."""
+		try:
+			result = await self.browser_session.cdp_client.send.DOMStorage.getDOMStorageItems(
+				params={'storageId': {'securityOrigin': origin, 'isLocalStorage': is_local_storage}},
+				session_id=session_id,
+			)
 		except Exception as e:
-			self.logger.debug(f'[StorageStateWatchdog] Error comparing cookies: {e}')
-			return False
+			self.logger.debug(f'[StorageStateWatchdog] Failed to read storage of {origin}: {e}')
+			return None
+		return [{'name': item[0], 'value': item[1]} for item in result.get('entries', []) if len(item) == 2]
+
+	def _read_saved_state(self, json_path: Path) -> dict[str, Any]:
+		"""The state currently in the file, re-read only if the file changed since we last saw it."""
+		try:
+			mtime = json_path.stat().st_mtime
+		except FileNotFoundError:
+			return {'cookies': [], 'origins': []}
+		if self._saved_state and self._saved_state[0] == json_path and self._saved_state[1] == mtime:
+			return self._saved_state[2]
+		try:
+			state = json.loads(json_path.read_text())
+		except Exception as e:
+			self.logger.error(f'[StorageStateWatchdog] Failed to read existing state: {e}')
+			state = {'cookies': [], 'origins': []}
+		self._saved_state = (json_path, mtime, state)
+		return state
+
+	def _write_storage_state(self, json_path: Path, state: dict[str, Any]) -> None:
+		"""Atomically replace the file (keeping the previous version as .bak) and announce it."""
+		json_path.parent.mkdir(parents=True, exist_ok=True)
+		temp_path = json_path.with_suffix('.json.tmp')
+		with open(temp_path, 'w') as f:
+			f.write(json.dumps(state, indent=4))
+			f.flush()
+			os.fsync(f.fileno())
+
+		# Backup existing file, the original path always exists while we swap
+		if json_path.exists():
+			backup_path = json_path.with_suffix('.json.bak')
+			backup_path.unlink(missing_ok=True)
+			try:
+				os.link(json_path, backup_path)
+			except OSError:
+				shutil.copy2(json_path, backup_path)
+
+		# Move temp to final
+		temp_path.replace(json_path)
+		self._saved_state = (json_path, json_path.stat().st_mtime, state)
+
+		self.event_bus.dispatch(
+			StorageStateSavedEvent(
+				path=str(json_path),
+				cookies_count=len(state.get('cookies', [])),
+				origins_count=len(state.get('origins', [])),
+			)
+		)
 
 	async def _save_storage_state(self, path: str | None = None) -> None:
-		"""Save browser storage state to file."""
+		"""Save the full browser storage state to file."""
 		async with self._save_lock:
 			# Check if CDP client is available
 			assert await self.browser_session.get_or_create_cdp_session(target_id=None)
@@ -181,45 +310,22 @@ class StorageStateWatchdog(BaseWatchdog):
 				return
 
 			try:
+				json_path = self._storage_state_path(str(save_path))
+				assert json_path is not None
+				if json_path == self._storage_state_path():
+					# Everything pending is part of this full snapshot
+					self._cookies_dirty = False
+					self._dirty_origins.clear()
+
 				# Get current storage state using CDP
 				storage_state = await self.browser_session._cdp_get_storage_state()
 
-				# Update our last known state
-				self._last_cookie_state = storage_state.get('cookies', []).copy()
-
-				# Convert path to Path object
-				json_path = Path(save_path).expanduser().resolve()
-				json_path.parent.mkdir(parents=True, exist_ok=True)
-
 				# Merge with existing state if file exists
 				merged_state = storage_state
 				if json_path.exists():
-					try:
-						existing_state = json.loads(json_path.read_text())
-						merged_state = self._merge_storage_states(existing_state, dict(storage_state))
-					except Exception as e:
-						self.logger.error(f'[StorageStateWatchdog] Failed to merge with existing state: {e}')
+					merged_state = self._merge_storage_states(self._read_saved_state(json_path), dict(storage_state))
 
-				# Write atomically
-				temp_path = json_path.with_suffix('.json.tmp')
-				temp_path.write_text(json.dumps(merged_state, indent=4))
-
-				# Backup existing file
-				if json_path.exists():
-					backup_path = json_path.with_suffix('.json.bak')
-					json_path.replace(backup_path)
-
-				# Move temp to final
-				temp_path.replace(json_path)
-
-				# Emit success event
-				self.event_bus.dispatch(
-					StorageStateSavedEvent(
-						path=str(json_path),
-						cookies_count=len(merged_state.get('cookies', [])),
-						origins_count=len(merged_state.get('origins', [])),
-					)
-				)
+				self._write_storage_state(json_path, merged_state)
 
 				self.logger.debug(
 					f'[StorageStateWatchdog] Saved storage state to {json_path} '
@@ -230,6 +336,11 @@ class StorageStateWatchdog(BaseWatchdog):
 			except Exception as e:
 				self.logger.error(f'[StorageStateWatchdog] Failed to save storage state: {e}')
 
+		# Reading origins disables DOMStorage on the focused target, turn its change events back on
+		focused_target_id = self.browser_session.agent_focus_target_id
+		if focused_target_id and focused_target_id in self._tracked_targets:
+			await self._track_target(focused_target_id)
+
 	async def _load_storage_state(self, path: str | None = None) -> None:
 		"""Load browser storage state from file."""
 		if not self.browser_session.cdp_client:
@@ -250,7 +361,6 @@ class StorageStateWatchdog(BaseWatchdog):
 			# Apply cookies if present
 			if 'cookies' in storage and storage['cookies']:
 				await self.browser_session._cdp_set_cookies(storage['cookies'])
-				self._last_cookie_state = storage['cookies'].copy()
 				self.logger.debug(f'[StorageStateWatchdog] Added {len(storage["cookies"])} cookies from storage state')
 
 			# Apply origins (localStorage/sessionStorage) if present
@@ -1,5 +1,6 @@
 """Code-use mode - Jupyter notebook-like code execution for browser automation."""
 
+from browser_use.code_use.journal import NotebookJournal, load_history
 from browser_use.code_use.namespace import create_namespace
 from browser_use.code_use.notebook_export import export_to_ipynb, session_to_python_script
 from browser_use.code_use.service import CodeAgent
@@ -9,6 +10,8 @@ __all__ = [
 	'CodeAgent',
 	'create_namespace',
 	'export_to_ipynb',
+	'load_history',
+	'NotebookJournal',
 	'session_to_python_script',
 	'CodeCell',
 	'ExecutionStatus',
@@ -0,0 +1,180 @@
+"""On-disk journal of a CodeAgent run.
+
+Each executed cell is appended to notebook.ipynb (kept valid after every append) and to
+cells.jsonl, and each history step to history.jsonl, as soon as it completes. A crashed run
+leaves everything up to its last step on disk, and JournaledHistory reads steps back from
+history.jsonl on demand instead of keeping them all in memory. Screenshots are referenced by
+path, never embedded.
+"""
+
+import json
+import logging
+import os
+from collections.abc import Iterator, MutableSequence
+from pathlib import Path
+from typing import Any, overload
+
+from .notebook_export import NOTEBOOK_METADATA, cell_to_notebook_cell, setup_notebook_cell
+from .views import CodeAgentHistory, CodeAgentHistoryList, CodeCell
+
+logger = logging.getLogger(__name__)
+
+_NOTEBOOK_TAIL = b'\n ]\n}\n'
+
+
+def _append_line(path: Path, record: dict[str, Any]) -> int:
+	"""Append one JSON line, returning its byte offset."""
+	data = json.dumps(record, ensure_ascii=False).encode() + b'\n'
+	with open(path, 'ab') as f:
+		offset = f.tell()
+		f.write(data)
+		f.flush()
+		os.fsync(f.fileno())
+	return offset
+
+
+def _scan_lines(path: Path) -> Iterator[tuple[int, dict[str, Any]]]:
+	"""Yield (offset, record) for every complete line, truncating a torn last line left by a crash."""
+	if not path.exists():
+		return
+	offset = 0
+	with open(path, 'rb+') as f:
+		for line in f:
+			try:
+				if not line.endswith(b'\n'):
+					raise ValueError('missing newline')
+				record = json.loads(line)
+			except ValueError:
+				logger.warning(f'Dropping incomplete journal record at {path}:{offset}')
+				f.truncate(offset)
+				return
+			yield offset, record
+			offset += len(line)
+
+
+class JournaledHistory(MutableSequence[CodeAgentHistory]):
+	"""CodeAgent history stored in a JSONL file and read back one step at a time.
+
+	Steps can be appended and replaced (the replacement is appended and wins on load), but not
+	inserted or deleted. Only the most recently used step is cached.
+	"""
+
+	def __init__(self, path: Path):
+		self.path = path
+		self._offsets: list[int] = []
+		self._cached: tuple[int, CodeAgentHistory] | None = None
+		for offset, record in _scan_lines(path):
+			index = record['index']
+			if index == len(self._offsets):
+				self._offsets.append(offset)
+			elif index < len(self._offsets):
+				self._offsets[index] = offset
+
+	def __len__(self) -> int:
+		return len(self._offsets)
+
+	@overload
+	def __getitem__(self, index: int) -> CodeAgentHistory: ...
+
+	@overload
+	def __getitem__(self, index: slice) -> list[CodeAgentHistory]: ...
+
+	def __getitem__(self, index: int | slice) -> CodeAgentHistory | list[CodeAgentHistory]:
+		if isinstance(index, slice):
+			return [self[i] for i in range(*index.indices(len(self)))]
+		index = self._normalize(index)
+		if self._cached is not None and self._cached[0] == index:
+			return self._cached[1]
+		with open(self.path, 'rb') as f:
+			f.seek(self._offsets[index])
+			record = json.loads(f.readline())
+		item = CodeAgentHistory.model_validate(record['entry'])
+		self._cached = (index, item)
+		return item
+
+	def __setitem__(self, index: int, value: CodeAgentHistory) -> None:  # type: ignore[override]
+		index = self._normalize(index)
+		self._offsets[index] = _append_line(self.path, {'index': index, 'entry': value.model_dump()})
+		self._cached = (index, value)
+
+	def __delitem__(self, index: int | slice) -> None:
+		raise TypeError('Journaled history steps cannot be deleted')
+
+	def insert(self, index: int, value: CodeAgentHistory) -> None:
+		if index != len(self):
+			raise TypeError('Journaled history only supports appending steps')
+		self._offsets.append(_append_line(self.path, {'index': index, 'entry': value.model_dump()}))
+		self._cached = (index, value)
+
+	def _normalize(self, index: int) -> int:
+		if index < 0:
+			index += len(self)
+		if not 0 <= index < len(self):
+			raise IndexError('history index out of range')
+		return index
+
+
+class NotebookJournal:
+	"""Streams a CodeAgent run to a directory; opening an existing directory resumes it."""
+
+	def __init__(self, directory: str | Path):
+		self.directory = Path(directory)
+		self.directory.mkdir(parents=True, exist_ok=True)
+		self.notebook_path = self.directory / 'notebook.ipynb'
+		self.cells_path = self.directory / 'cells.jsonl'
+		self.history = JournaledHistory(self.directory / 'history.jsonl')
+		if not self.notebook_path.exists():
+			self._create_notebook()
+		elif not self._notebook_is_complete():
+			# A crash in the middle of append_cell, rebuild the notebook from cells.jsonl
+			logger.warning(f'Rebuilding incomplete notebook {self.notebook_path}')
+			self._create_notebook()
+			for cell in self.cells():
+				self._append_notebook_cell(cell)
+
+	def append_cell(self, cell: CodeCell) -> None:
+		"""Record a finished cell in cells.jsonl and notebook.ipynb."""
+		_append_line(self.cells_path, cell.model_dump(mode='json'))
+		self._append_notebook_cell(cell)
+
+	def _append_notebook_cell(self, cell: CodeCell) -> None:
+		notebook_cell = json.dumps(cell_to_notebook_cell(cell), ensure_ascii=False).encode()
+		# Overwrite the closing brackets so the notebook stays valid JSON after every cell
+		with open(self.notebook_path, 'rb+') as f:
+			f.seek(-len(_NOTEBOOK_TAIL), os.SEEK_END)
+			f.write(b',\n  ' + notebook_cell + _NOTEBOOK_TAIL)
+			f.flush()
+			os.fsync(f.fileno())
+
+	def cells(self) -> list[CodeCell]:
+		"""Cells in execution order, with later records of the same cell replacing earlier ones."""
+		cells: dict[str, CodeCell] = {}
+		for _, record in _scan_lines(self.cells_path):
+			cell = CodeCell.model_validate(record)
+			cells[cell.id] = cell
+		return list(cells.values())
+
+	def history_list(self) -> CodeAgentHistoryList:
+		return CodeAgentHistoryList(self.history, None)
+
+	def _notebook_is_complete(self) -> bool:
+		with open(self.notebook_path, 'rb') as f:
+			f.seek(0, os.SEEK_END)
+			if f.tell() < len(_NOTEBOOK_TAIL):
+				return False
+			f.seek(-len(_NOTEBOOK_TAIL), os.SEEK_END)
+			return f.read() == _NOTEBOOK_TAIL
+
+	def _create_notebook(self) -> None:
+		header = {'nbformat': 4, 'nbformat_minor': 5, 'metadata': NOTEBOOK_METADATA}
+		with open(self.notebook_path, 'wb') as f:
+			f.write(json.dumps(header, ensure_ascii=False)[:-1].encode())
+			f.write(b',\n "cells": [\n  ' + json.dumps(setup_notebook_cell()).encode() + _NOTEBOOK_TAIL)
+
+
+def load_history(directory: str | Path) -> CodeAgentHistoryList:
+	"""Open the history of a (possibly crashed) run journaled to directory."""
+	path = Path(directory) / 'history.jsonl'
+	if not path.exists():
+		raise FileNotFoundError(f'No CodeAgent history journal at {path}')
+	return CodeAgentHistoryList(JournaledHistory(path), None)
@@ -0,0 +1,820 @@
+"""Cell execution kernels for code-use mode.
+
+InProcessKernel runs cells in the agent's namespace on the agent's event loop. SubprocessKernel
+runs them in a dedicated Python process instead: user variables live in that process, browser
+tools are proxied back to the agent over a JSON-lines channel, and every cell can be given CPU
+time and memory limits. A CPU-heavy cell then only blocks its own process, and cells of agents
+sharing one host can't see or stall each other.
+
+This module only imports the standard library because it is also the kernel process entry point.
+"""
+
+import ast
+import asyncio
+import builtins
+import importlib
+import importlib.util
+import inspect
+import io
+import itertools
+import json
+import logging
+import math
+import os
+import re
+import signal
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from typing import Any, Literal, NamedTuple, TextIO
+
+logger = logging.getLogger(__name__)
+
+# Largest JSON line the agent accepts from a kernel process
+_MAX_MESSAGE_BYTES = 256 * 1024 * 1024
+
+_KERNEL_SCRIPT = os.path.abspath(__file__)
+
+KernelMode = Literal['in_process', 'subprocess']
+
+
+class EvaluateError(Exception):
+	"""Special exception raised by evaluate() to stop Python execution immediately."""
+
+	pass
+
+
+class CPULimitExceeded(Exception):
+	"""Raised inside a cell that used up its CPU time budget."""
+
+
+class KernelError(Exception):
+	"""The kernel process died or stopped responding."""
+
+
+@dataclass
+class CellResult:
+	"""Outcome of executing one cell."""
+
+	output: str | None = None
+	error: str | None = None  # formatted for the LLM
+	error_type: str | None = None  # exception class name, None if the cell succeeded
+	duration: float = 0.0  # wall-clock seconds
+	cpu_time: float | None = None  # CPU seconds, only measured by SubprocessKernel
+	peak_memory_mb: float | None = None  # peak RSS of the kernel process so far, only SubprocessKernel
+
+
+class VariableInfo(NamedTuple):
+	"""What the agent needs to know about a user variable without holding its value."""
+
+	type_name: str
+	length: int | None  # len() of list and dict values
+
+
+# ---------- Output capture ----------
+
+_cell_output: ContextVar[io.StringIO | None] = ContextVar('cell_output', default=None)
+
+
+class _CellStdout(io.TextIOBase):
+	"""sys.stdout replacement that sends writes made by a running cell to that cell's buffer."""
+
+	def __init__(self, fallback: TextIO):
+		self.fallback = fallback
+
+	def write(self, s: str) -> int:
+		buffer = _cell_output.get()
+		return (buffer if buffer is not None else self.fallback).write(s)
+
+	def flush(self) -> None:
+		if _cell_output.get() is None:
+			self.fallback.flush()
+
+	def writable(self) -> bool:
+		return True
+
+
+_router: _CellStdout | None = None
+_active_captures = 0
+
+
+@contextmanager
+def capture_output() -> Iterator[io.StringIO]:
+	"""Collect everything printed by the current task (and tasks it starts) into a buffer.
+
+	Unlike swapping sys.stdout for a StringIO, concurrent cells each get their own buffer and
+	prints from unrelated code still reach the real stdout.
+	"""
+	global _router, _active_captures
+	if _active_captures == 0:
+		_router = _CellStdout(sys.stdout)
+		sys.stdout = _router
+	_active_captures += 1
+	buffer = io.StringIO()
+	token = _cell_output.set(buffer)
+	try:
+		yield buffer
+	finally:
+		_cell_output.reset(token)
+		_active_captures -= 1
+		if _active_captures == 0 and _router is not None:
+			if sys.stdout is _router:
+				sys.stdout = _router.fallback
+			_router = None
+
+
+# ---------- Cell execution ----------
+
+
+async def run_cell(namespace: dict[str, Any], code: str) -> None:
+	"""Execute code in namespace like a notebook cell, supporting top-level await."""
+	# Add asyncio to namespace if not already there
+	if 'asyncio' not in namespace:
+		namespace['asyncio'] = asyncio
+
+	# Check if code contains await expressions - if so, wrap in async function
+	# This mimics how Jupyter/IPython handles top-level await
+	try:
+		tree = ast.parse(code, mode='exec')
+		has_await = any(isinstance(node, (ast.Await, ast.AsyncWith, ast.AsyncFor)) for node in ast.walk(tree))
+	except SyntaxError:
+		# If parse fails, let exec handle the error
+		tree = None
+		has_await = False
+
+	if not has_await or tree is None:
+		# No await - execute directly at module level for natural variable scoping
+		# This means x = x + 10 will work without needing 'global x'
+		exec(compile(code, '<code>', 'exec'), namespace, namespace)
+		return
+
+	# When code has await, we must wrap in async function
+	# To make variables persist naturally (like Jupyter without needing 'global'):
+	# 1. Extract all assigned variable names from the code
+	# 2. Inject 'global' declarations for variables that already exist in namespace
+	# 3. Extract user's explicit global declarations and pre-define those vars
+	# 4. Return locals() so we can update namespace with new variables
+	assigned_names: set[str] = set()
+	user_global_names: set[str] = set()
+	for node in ast.walk(tree):
+		if isinstance(node, ast.Assign):
+			for target in node.targets:
+				if isinstance(target, ast.Name):
+					assigned_names.add(target.id)
+		elif isinstance(node, ast.AugAssign) and isinstance(node.target, ast.Name):
+			assigned_names.add(node.target.id)
+		elif isinstance(node, (ast.AnnAssign, ast.NamedExpr)):
+			if isinstance(node.target, ast.Name):
+				assigned_names.add(node.target.id)
+		elif isinstance(node, ast.Global):
+			# Track user's explicit global declarations
+			user_global_names.update(node.names)
+
+	# Pre-define any user-declared globals that don't exist yet
+	# This prevents NameError when user writes "global foo" before "foo = ..."
+	for name in user_global_names:
+		if name not in namespace:
+			namespace[name] = None
+
+	# Filter to only existing namespace vars (like Jupyter does)
+	# Include both: assigned vars that exist + user's explicit globals
+	existing_vars = {name for name in (assigned_names | user_global_names) if name in namespace}
+
+	global_decl = f'    global {", ".join(sorted(existing_vars))}\n' if existing_vars else ''
+	indented_code = '\n'.join('    ' + line if line.strip() else line for line in code.split('\n'))
+	wrapped_code = f"""async def __code_exec__():
+{global_decl}{indented_code}
+    # Return locals so we can update the namespace
+    return locals()
+
+__code_exec_coro__ = __code_exec__()
+"""
+	# Store whether we added a global declaration (needed for error line mapping)
+	namespace['_has_global_decl'] = bool(existing_vars)
+
+	# Compile and execute wrapper at module level
+	exec(compile(wrapped_code, '<code>', 'exec'), namespace, namespace)
+
+	# Get and await the coroutine, then update namespace with new/modified variables
+	coro = namespace.get('__code_exec_coro__')
+	if coro:
+		result_locals = await coro
+		# Update namespace with all variables from the function's locals
+		# This makes variable assignments persist across cells
+		if result_locals:
+			for key, value in result_locals.items():
+				if not key.startswith('_'):
+					namespace[key] = value
+
+		# Clean up temporary variables
+		namespace.pop('__code_exec_coro__', None)
+		namespace.pop('__code_exec__', None)
+
+
+def format_cell_error(e: BaseException, code: str) -> str:
+	"""Turn an exception raised by a cell into the error message shown to the LLM."""
+	if isinstance(e, EvaluateError):
+		return str(e)
+
+	if not isinstance(e, SyntaxError):
+		error_str = str(e)
+		return f'{type(e).__name__}: {error_str}' if error_str else f'{type(e).__name__} occurred'
+
+	# For syntax errors and common parsing errors, show just the error message
+	# without the full traceback to keep output clean
+	error_msg = e.msg if e.msg else str(e)
+	error = f'{type(e).__name__}: {error_msg}'
+
+	# Detect common f-string issues with JSON/JavaScript code
+	if 'unterminated' in error_msg.lower() and 'string' in error_msg.lower() and code:
+		# Check if code contains f-strings with potential JSON/JavaScript content
+		has_fstring = bool(re.search(r'\bf["\']', code))
+		has_json_pattern = bool(re.search(r'json\.dumps|"[^"]*\{[^"]*\}[^"]*"|\'[^\']*\{[^\']*\}[^\']*\'', code))
+		has_js_pattern = bool(re.search(r'evaluate\(|await evaluate', code))
+
+		if has_fstring and (has_json_pattern or has_js_pattern):
+			error += (
+				'\n\n💡 TIP: Detected f-string with JSON/JavaScript code containing {}.\n'
+				'   Use separate ```js or ```markdown blocks instead of f-strings to avoid escaping issues.\n'
+				'   If your code block needs ``` inside it, wrap with 4+ backticks: ````markdown code`\n'
+			)
+
+	# Detect and provide helpful hints for common string literal errors
+	if 'unterminated' in error_msg.lower() and 'string' in error_msg.lower():
+		# Detect what type of string literal is unterminated
+		is_triple = 'triple-quoted' in error_msg.lower()
+		msg_lower = error_msg.lower()
+
+		# Detect prefix type from error message
+		if 'f-string' in msg_lower and 'raw' in msg_lower:
+			prefix = 'rf or fr'
+			desc = 'raw f-string'
+		elif 'f-string' in msg_lower:
+			prefix = 'f'
+			desc = 'f-string'
+		elif 'raw' in msg_lower and 'bytes' in msg_lower:
+			prefix = 'rb or br'
+			desc = 'raw bytes'
+		elif 'raw' in msg_lower:
+			prefix = 'r'
+			desc = 'raw string'
+		elif 'bytes' in msg_lower:
+			prefix = 'b'
+			desc = 'bytes'
+		else:
+			prefix = ''
+			desc = 'string'
+
+		# Build hint based on triple-quoted vs single/double quoted
+		if is_triple:
+			if prefix:
+				hint = f"Hint: Unterminated {prefix}'''...''' or {prefix}\"\"\"...\"\" ({desc}). Check for missing closing quotes or unescaped quotes inside."
+			else:
+				hint = "Hint: Unterminated '''...''' or \"\"\"...\"\" detected. Check for missing closing quotes or unescaped quotes inside."
+			hint += (
+				'\n      If you need ``` inside your string, use a ````markdown varname` code block with 4+ backticks instead.'
+			)
+		else:
+			if prefix:
+				hint = f'Hint: Unterminated {prefix}\'...\' or {prefix}"..." ({desc}). Check for missing closing quote or unescaped quotes inside.'
+			else:
+				hint = 'Hint: Unterminated \'...\' or "..." detected. Check for missing closing quote or unescaped quotes inside the string.'
+		error += f'\n{hint}'
+
+	# Show the problematic line from the code
+	if e.text:
+		error += f'\n{e.text}'
+	elif e.lineno and code:
+		# If e.text is empty, extract the line from the code
+		lines = code.split('\n')
+		if 0 < e.lineno <= len(lines):
+			error += f'\n{lines[e.lineno - 1]}'
+
+	return error
+
+
+async def execute_cell(namespace: dict[str, Any], code: str) -> CellResult:
+	"""Run one cell, capturing its output and timing and formatting any error it raises."""
+	start = time.perf_counter()
+	with capture_output() as buffer:
+		try:
+			await run_cell(namespace, code)
+		except Exception as e:
+			return CellResult(
+				output=buffer.getvalue() or None,
+				error=format_cell_error(e, code),
+				error_type=type(e).__name__,
+				duration=time.perf_counter() - start,
+			)
+	return CellResult(output=buffer.getvalue() or None, duration=time.perf_counter() - start)
+
+
+def describe_variables(namespace: dict[str, Any], exclude: frozenset[str] = frozenset()) -> dict[str, VariableInfo]:
+	"""Summarize the public variables of a namespace."""
+	return {
+		name: VariableInfo(type(value).__name__, len(value) if isinstance(value, (list, dict)) else None)
+		for name, value in namespace.items()
+		if not name.startswith('_') and name not in exclude
+	}
+
+
+# ---------- Kernels ----------
+
+
+class CodeKernel(ABC):
+	"""Executes notebook cells for a CodeAgent."""
+
+	async def start(self) -> None:
+		pass
+
+	@abstractmethod
+	async def execute(self, code: str, inject: dict[str, Any] | None = None) -> CellResult:
+		"""Run code as the next cell. inject holds agent-side values the cell should see (e.g. code block variables)."""
+
+	@abstractmethod
+	def variables(self) -> dict[str, VariableInfo]:
+		"""The public variables defined in the kernel."""
+
+	async def close(self) -> None:
+		pass
+
+
+class InProcessKernel(CodeKernel):
+	"""Runs cells directly in the agent's namespace on the agent's event loop."""
+
+	def __init__(self, namespace: dict[str, Any], cell_timeout: float | None = None):
+		self.namespace = namespace
+		self.cell_timeout = cell_timeout
+
+	async def execute(self, code: str, inject: dict[str, Any] | None = None) -> CellResult:
+		if inject:
+			self.namespace.update(inject)
+		if self.cell_timeout is None:
+			return await execute_cell(self.namespace, code)
+		try:
+			return await asyncio.wait_for(execute_cell(self.namespace, code), self.cell_timeout)
+		except TimeoutError:
+			return CellResult(
+				error=f'TimeoutError: Cell did not finish within {self.cell_timeout:g}s and was cancelled.',
+				error_type='TimeoutError',
+				duration=self.cell_timeout,
+			)
+
+	def variables(self) -> dict[str, VariableInfo]:
+		return describe_variables(self.namespace)
+
+
+class SubprocessKernel(CodeKernel):
+	"""Runs cells in a dedicated Python process and serves its browser tool calls.
+
+	Every coroutine function in the agent namespace (navigate, evaluate, done, ...) is exposed in
+	the kernel as a proxy: calling it sends the JSON-encoded arguments back here, the real tool
+	runs on the agent's event loop and its return value, output and exception are sent back.
+	Other agent-side objects (browser, file_system, ...) can't be proxied, using them in a cell
+	raises a NameError saying they need kernel='in_process'.
+	If a cell exceeds cell_timeout or the process dies, the process is restarted and the cell
+	fails with an error telling the LLM that its variables are gone.
+	"""
+
+	def __init__(
+		self,
+		namespace: dict[str, Any],
+		cell_timeout: float | None = None,
+		cpu_time_limit: float | None = None,
+		memory_limit_mb: int | None = None,
+		startup_timeout: float = 60.0,
+	):
+		if (cpu_time_limit or memory_limit_mb) and importlib.util.find_spec('resource') is None:
+			raise ValueError('Kernel CPU and memory limits need the resource module, which is not available on this platform')
+		self.namespace = namespace
+		self.cell_timeout = cell_timeout
+		self.cpu_time_limit = cpu_time_limit
+		self.memory_limit_mb = memory_limit_mb
+		self.startup_timeout = startup_timeout
+		self.restarts = 0
+
+		self._process: asyncio.subprocess.Process | None = None
+		self._reader: asyncio.Task[None] | None = None
+		self._ready: asyncio.Future[None] | None = None
+		self._cells: dict[int, asyncio.Future[dict[str, Any]]] = {}
+		self._calls: set[asyncio.Task[None]] = set()
+		self._ids = itertools.count(1)
+		self._write_lock = asyncio.Lock()
+		self._variables: dict[str, VariableInfo] = {}
+
+	@property
+	def pid(self) -> int | None:
+		return self._process.pid if self._process is not None else None
+
+	async def start(self) -> None:
+		if self._process is not None and self._process.returncode is None:
+			return
+		self._ready = asyncio.get_running_loop().create_future()
+		# -P keeps this file's directory off the kernel's sys.path
+		self._process = await asyncio.create_subprocess_exec(
+			sys.executable,
+			'-P',
+			_KERNEL_SCRIPT,
+			stdin=asyncio.subprocess.PIPE,
+			stdout=asyncio.subprocess.PIPE,
+			limit=_MAX_MESSAGE_BYTES,
+		)
+		self._reader = asyncio.create_task(self._read_messages(self._process), name='code_kernel_reader')
+		public = {name: value for name, value in self.namespace.items() if not name.startswith('_')}
+		tools = sorted(name for name, value in public.items() if inspect.iscoroutinefunction(value))
+		agent_only = sorted(name for name, value in public.items() if not inspect.iscoroutinefunction(value))
+		try:
+			await self._send(
+				{
+					'op': 'init',
+					'tools': tools,
+					'agent_only': agent_only,
+					'cpu_time_limit': self.cpu_time_limit,
+					'memory_limit_mb': self.memory_limit_mb,
+				}
+			)
+			await asyncio.wait_for(self._ready, self.startup_timeout)
+		except (ConnectionError, KernelError, TimeoutError) as e:
+			await self._stop(graceful=False)
+			raise KernelError(f'Code kernel process failed to start: {type(e).__name__}: {e}') from e
+		logger.debug(f'Started code kernel process {self._process.pid} with {len(tools)} tools')
+
+	async def execute(self, code: str, inject: dict[str, Any] | None = None) -> CellResult:
+		if self._process is None or self._process.returncode is not None:
+			await self._restart()
+
+		cell_id = next(self._ids)
+		future: asyncio.Future[dict[str, Any]] = asyncio.get_running_loop().create_future()
+		self._cells[cell_id] = future
+		start = time.perf_counter()
+		try:
+			await self._send({'op': 'execute', 'id': cell_id, 'code': code, 'inject': inject or {}})
+			message = await asyncio.wait_for(future, self.cell_timeout)
+		except TimeoutError:
+			await self._restart()
+			return CellResult(
+				error=f'TimeoutError: Cell did not finish within {self.cell_timeout:g}s. '
+				'The kernel was restarted and variables from earlier cells are gone.',
+				error_type='TimeoutError',
+				duration=time.perf_counter() - start,
+			)
+		except (ConnectionError, KernelError) as e:
+			await self._restart()
+			return CellResult(
+				error=f'KernelError: The kernel process died ({e}). It was restarted and variables from earlier cells are gone.',
+				error_type='KernelError',
+				duration=time.perf_counter() - start,
+			)
+		finally:
+			self._cells.pop(cell_id, None)
+
+		self._variables = {name: VariableInfo(*info) for name, info in message['variables'].items()}
+		return CellResult(**message['result'])
+
+	def variables(self) -> dict[str, VariableInfo]:
+		return self._variables
+
+	async def close(self) -> None:
+		await self._stop(graceful=True)
+
+	async def _restart(self) -> None:
+		if self._process is not None:
+			logger.warning(f'Restarting code kernel process {self._process.pid}')
+			self.restarts += 1
+		await self._stop(graceful=False)
+		self._variables = {}
+		await self.start()
+
+	async def _stop(self, graceful: bool) -> None:
+		process, self._process = self._process, None
+		if process is None:
+			return
+		if graceful and process.returncode is None:
+			try:
+				await self._send({'op': 'shutdown'}, process)
+				await asyncio.wait_for(process.wait(), 2)
+			except (ConnectionError, TimeoutError):
+				pass
+		if process.returncode is None:
+			process.kill()
+			await process.wait()
+		for task in list(self._calls):
+			task.cancel()
+		if self._reader is not None:
+			self._reader.cancel()
+			await asyncio.gather(self._reader, *self._calls, return_exceptions=True)
+			self._reader = None
+
+	async def _send(self, message: dict[str, Any], process: asyncio.subprocess.Process | None = None) -> None:
+		process = process or self._process
+		if process is None or process.stdin is None:
+			raise KernelError('kernel process is not running')
+		data = (json.dumps(message, default=str) + '\n').encode()
+		async with self._write_lock:
+			process.stdin.write(data)
+			await process.stdin.drain()
+
+	async def _read_messages(self, process: asyncio.subprocess.Process) -> None:
+		assert process.stdout is not None
+		reason = 'exited'
+		try:
+			while line := await process.stdout.readline():
+				message = json.loads(line)
+				op = message['op']
+				if op == 'call':
+					task = asyncio.create_task(self._handle_call(message))
+					self._calls.add(task)
+					task.add_done_callback(self._calls.discard)
+				elif op == 'result':
+					future = self._cells.get(message['id'])
+					if future is not None and not future.done():
+						future.set_result(message)
+				elif op == 'ready' and self._ready is not None and not self._ready.done():
+					self._ready.set_result(None)
+		except ValueError as e:
+			# Oversized or garbled line, the channel can't be trusted anymore
+			reason = f'sent an invalid message: {e}'
+			process.kill()
+		finally:
+			if process.returncode is not None:
+				reason = f'exit code {process.returncode}'
+			for future in [self._ready, *self._cells.values()]:
+				if future is not None and not future.done():
+					future.set_exception(KernelError(reason))
+
+	async def _handle_call(self, message: dict[str, Any]) -> None:
+		name = message['name']
+		function = self.namespace.get(name)
+		with capture_output() as buffer:
+			try:
+				if not callable(function):
+					raise NameError(f"name '{name}' is not defined")
+				value = await function(*message['args'], **message['kwargs'])
+				reply: dict[str, Any] = {'op': 'reply', 'id': message['id'], 'ok': True, 'value': value}
+			except Exception as e:
+				reply = {'op': 'reply', 'id': message['id'], 'ok': False, 'error_type': type(e).__name__, 'message': str(e)}
+		reply['output'] = buffer.getvalue()
+		try:
+			await self._send(reply)
+		except (ConnectionError, KernelError):
+			pass
+
+
+def create_kernel(
+	mode: KernelMode,
+	namespace: dict[str, Any],
+	cell_timeout: float | None = None,
+	cpu_time_limit: float | None = None,
+	memory_limit_mb: int | None = None,
+) -> CodeKernel:
+	if mode == 'subprocess':
+		return SubprocessKernel(namespace, cell_timeout, cpu_time_limit, memory_limit_mb)
+	if mode != 'in_process':
+		raise ValueError(f"Unknown kernel mode {mode!r}, expected 'in_process' or 'subprocess'")
+	if cpu_time_limit or memory_limit_mb:
+		raise ValueError("CPU and memory limits need kernel='subprocess'")
+	return InProcessKernel(namespace, cell_timeout)
+
+
+# ---------- Kernel process ----------
+
+# (module, attribute, names) of the optional libraries code-use namespaces provide when installed
+_OPTIONAL_LIBRARIES: tuple[tuple[str, str | None, tuple[str, ...]], ...] = (
+	('requests', None, ('requests',)),
+	('numpy', None, ('np', 'numpy')),
+	('pandas', None, ('pd', 'pandas')),
+	('matplotlib.pyplot', None, ('plt', 'matplotlib')),
+	('bs4', 'BeautifulSoup', ('BeautifulSoup', 'bs4')),
+	('pypdf', 'PdfReader', ('PdfReader', 'pypdf')),
+	('tabulate', 'tabulate', ('tabulate',)),
+)
+
+_remote_error_types: dict[str, type[Exception]] = {}
+
+
+def _remote_error(type_name: str, message: str) -> Exception:
+	"""Rebuild an exception raised by a tool in the agent process."""
+	if type_name == 'EvaluateError':
+		return EvaluateError(message)
+	builtin = getattr(builtins, type_name, None)
+	if isinstance(builtin, type) and issubclass(builtin, Exception):
+		return builtin(message)
+	if type_name not in _remote_error_types:
+		_remote_error_types[type_name] = type(type_name, (RuntimeError,), {})
+	return _remote_error_types[type_name](message)
+
+
+def _base_namespace() -> dict[str, Any]:
+	import csv
+	import datetime
+	from pathlib import Path
+
+	namespace: dict[str, Any] = {'json': json, 'asyncio': asyncio, 'Path': Path, 'csv': csv, 're': re, 'datetime': datetime}
+	for module_name, attribute, names in _OPTIONAL_LIBRARIES:
+		try:
+			value = importlib.import_module(module_name)
+			if attribute:
+				value = getattr(value, attribute)
+		except Exception:
+			continue
+		for name in names:
+			namespace[name] = value
+	return namespace
+
+
+def _peak_rss_mb() -> float | None:
+	try:
+		import resource
+	except ImportError:
+		return None
+	# ru_maxrss is in KiB on Linux and in bytes on macOS
+	scale = 1024 * 1024 if sys.platform == 'darwin' else 1024
+	return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+
+
+class _AgentOnly:
+	"""Stands in for an agent-side object that can't be used from the kernel process."""
+
+	def __init__(self, name: str):
+		self._name = name
+
+	def _error(self) -> NameError:
+		return NameError(
+			f"'{self._name}' is not available with kernel='subprocess', only the tool functions (navigate, evaluate, ...) "
+			f"are proxied to the kernel process. Use those, or run the agent with kernel='in_process'."
+		)
+
+	def __getattr__(self, attribute: str) -> Any:
+		raise self._error()
+
+	def __call__(self, *args: Any, **kwargs: Any) -> Any:
+		raise self._error()
+
+	def __repr__(self) -> str:
+		return f"<{self._name}: not available with kernel='subprocess'>"
+
+
+class _KernelProcess:
+	"""The kernel side of SubprocessKernel."""
+
+	def __init__(self, channel_in: io.BufferedReader, channel_out: io.BufferedWriter):
+		self.channel_in = channel_in
+		self.channel_out = channel_out
+		self.namespace: dict[str, Any] = {}
+		self.base_names: frozenset[str] = frozenset()
+		self.cpu_time_limit: float | None = None
+		self._calls: dict[int, asyncio.Future[dict[str, Any]]] = {}
+		self._call_ids = itertools.count(1)
+		self._tasks: set[asyncio.Task[None]] = set()
+		self._cpu_limit_armed = False
+
+	async def serve(self) -> None:
+		loop = asyncio.get_running_loop()
+		messages: asyncio.Queue[dict[str, Any] | None] = asyncio.Queue()
+
+		def read() -> None:
+			for line in self.channel_in:
+				loop.call_soon_threadsafe(messages.put_nowait, json.loads(line))
+			loop.call_soon_threadsafe(messages.put_nowait, None)
+
+		threading.Thread(target=read, name='kernel_channel', daemon=True).start()
+		while (message := await messages.get()) is not None:
+			op = message['op']
+			if op == 'init':
+				self._init(message)
+			elif op == 'execute':
+				task = asyncio.create_task(self._execute(message))
+				self._tasks.add(task)
+				task.add_done_callback(self._tasks.discard)
+			elif op == 'reply':
+				future = self._calls.get(message['id'])
+				if future is not None and not future.done():
+					future.set_result(message)
+			elif op == 'shutdown':
+				break
+
+	def _write(self, message: dict[str, Any]) -> None:
+		self.channel_out.write((json.dumps(message, default=str) + '\n').encode())
+		self.channel_out.flush()
+
+	def _init(self, message: dict[str, Any]) -> None:
+		self.namespace = _base_namespace()
+		for name in message['tools']:
+			self.namespace[name] = self._make_proxy(name)
+		for name in message.get('agent_only', ()):
+			# Modules and libraries the kernel imports itself are real, everything else fails with a clear error
+			self.namespace.setdefault(name, _AgentOnly(name))
+		self.base_names = frozenset(self.namespace)
+
+		self.cpu_time_limit = message.get('cpu_time_limit')
+		if self.cpu_time_limit:
+			signal.signal(signal.SIGXCPU, self._on_cpu_limit)
+		if memory_limit_mb := message.get('memory_limit_mb'):
+			import resource
+
+			limit = int(memory_limit_mb * 1024 * 1024)
+			resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+		self._write({'op': 'ready'})
+
+	def _make_proxy(self, name: str) -> Any:
+		async def proxy(*args: Any, **kwargs: Any) -> Any:
+			return await self._call(name, args, kwargs)
+
+		proxy.__name__ = proxy.__qualname__ = name
+		return proxy
+
+	async def _call(self, name: str, args: tuple[Any, ...], kwargs: dict[str, Any]) -> Any:
+		call_id = next(self._call_ids)
+		try:
+			message = json.dumps({'op': 'call', 'id': call_id, 'name': name, 'args': args, 'kwargs': kwargs})
+		except (TypeError, ValueError) as e:
+			raise TypeError(f'Arguments of {name}() must be JSON serializable: {e}') from None
+
+		future: asyncio.Future[dict[str, Any]] = asyncio.get_running_loop().create_future()
+		self._calls[call_id] = future
+		try:
+			self.channel_out.write(message.encode() + b'\n')
+			self.channel_out.flush()
+			reply = await future
+		finally:
+			self._calls.pop(call_id, None)
+
+		if reply.get('output'):
+			# Prints made by the tool in the agent process belong to this cell's output
+			print(reply['output'], end='')
+		if reply['ok']:
+			return reply['value']
+		raise _remote_error(reply['error_type'], reply['message'])
+
+	async def _execute(self, message: dict[str, Any]) -> None:
+		self.namespace.update(message.get('inject') or {})
+		cpu_start = time.process_time()
+		self._arm_cpu_limit()
+		try:
+			result = await execute_cell(self.namespace, message['code'])
+		except asyncio.CancelledError:
+			raise
+		except BaseException as e:
+			# SystemExit from user code, or a limit hit outside the user's own frames
+			result = CellResult(error=f'{type(e).__name__}: {e}', error_type=type(e).__name__)
+		finally:
+			self._disarm_cpu_limit()
+		result.cpu_time = time.process_time() - cpu_start
+		result.peak_memory_mb = _peak_rss_mb()
+		self._write(
+			{
+				'op': 'result',
+				'id': message['id'],
+				'result': asdict(result),
+				'variables': describe_variables(self.namespace, self.base_names),
+			}
+		)
+
+	def _arm_cpu_limit(self) -> None:
+		if not self.cpu_time_limit:
+			return
+		import resource
+
+		usage = resource.getrusage(resource.RUSAGE_SELF)
+		_, hard = resource.getrlimit(resource.RLIMIT_CPU)
+		soft = math.ceil(usage.ru_utime + usage.ru_stime + self.cpu_time_limit)
+		if hard != resource.RLIM_INFINITY:
+			soft = min(soft, hard)
+		resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+		self._cpu_limit_armed = True
+
+	def _disarm_cpu_limit(self) -> None:
+		if not self.cpu_time_limit:
+			return
+		import resource
+
+		self._cpu_limit_armed = False
+		_, hard = resource.getrlimit(resource.RLIMIT_CPU)
+		resource.setrlimit(resource.RLIMIT_CPU, (hard, hard))
+
+	def _on_cpu_limit(self, signum: int, frame: Any) -> None:
+		# SIGXCPU repeats every second past the soft limit, only interrupt the cell once
+		if self._cpu_limit_armed:
+			self._cpu_limit_armed = False
+			raise CPULimitExceeded(f'Cell used more than {self.cpu_time_limit:g}s of CPU time')
+
+
+def _kernel_main() -> None:
+	# Keep the channel on private copies of stdin/stdout so user code that prints or reads
+	# can't corrupt it: fd 1 now goes to stderr and fd 0 reads from /dev/null
+	channel_in = os.fdopen(os.dup(0), 'rb')
+	channel_out = os.fdopen(os.dup(1), 'wb')
+	os.dup2(2, 1)
+	devnull = os.open(os.devnull, os.O_RDONLY)
+	os.dup2(devnull, 0)
+	os.close(devnull)
+	asyncio.run(_KernelProcess(channel_in, channel_out).serve())
+
+
+if __name__ == '__main__':
+	_kernel_main()
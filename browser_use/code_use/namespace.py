@@ -16,6 +16,7 @@ from typing import Any
 import requests
 
 from browser_use.browser import BrowserSession
+from browser_use.code_use.kernel import EvaluateError
 from browser_use.filesystem.file_system import FileSystem
 from browser_use.llm.base import BaseChatModel
 from browser_use.tools.service import CodeAgentTools, Tools
@@ -87,12 +88,6 @@ def _strip_js_comments(js_code: str) -> str:
 	return js_code
 
 
-class EvaluateError(Exception):
-	"""Special exception raised by evaluate() to stop Python execution immediately."""
-
-	pass
-
-
 async def validate_task_completion(
 	task: str,
 	output: str | None,
@@ -3,52 +3,28 @@
 import json
 import re
 from pathlib import Path
-
-from browser_use.code_use.service import CodeAgent
-
-from .views import CellType, NotebookExport
-
-
-def export_to_ipynb(agent: CodeAgent, output_path: str | Path) -> Path:
-	"""
-	Export a NotebookSession to a Jupyter notebook (.ipynb) file.
-	Now includes JavaScript code blocks that were stored in the namespace.
-
-	Args:
-		session: The NotebookSession to export
-		output_path: Path where to save the notebook file
-		agent: Optional CodeAgent instance to access namespace for JavaScript blocks
-
-	Returns:
-		Path to the saved notebook file
-
-	Example:
-		```python
-	        session = await agent.run()
-	        notebook_path = export_to_ipynb(agent, 'my_automation.ipynb')
-	        print(f'Notebook saved to {notebook_path}')
-		```
-	"""
-	output_path = Path(output_path)
-
-	# Create notebook structure
-	notebook = NotebookExport(
-		metadata={
-			'kernelspec': {'display_name': 'Python 3', 'language': 'python', 'name': 'python3'},
-			'language_info': {
-				'name': 'python',
-				'version': '3.11.0',
-				'mimetype': 'text/x-python',
-				'codemirror_mode': {'name': 'ipython', 'version': 3},
-				'pygments_lexer': 'ipython3',
-				'nbconvert_exporter': 'python',
-				'file_extension': '.py',
-			},
-		}
-	)
-
-	# Add setup cell at the beginning with proper type hints
-	setup_code = """import asyncio
+from typing import TYPE_CHECKING, Any
+
+from .views import CellType, CodeCell, NotebookExport
+
+if TYPE_CHECKING:
+	from browser_use.code_use.service import CodeAgent
+
+NOTEBOOK_METADATA: dict[str, Any] = {
+	'kernelspec': {'display_name': 'Python 3', 'language': 'python', 'name': 'python3'},
+	'language_info': {
+		'name': 'python',
+		'version': '3.11.0',
+		'mimetype': 'text/x-python',
+		'codemirror_mode': {'name': 'ipython', 'version': 3},
+		'pygments_lexer': 'ipython3',
+		'nbconvert_exporter': 'python',
+		'file_extension': '.py',
+	},
+}
+
+# Setup cell at the beginning with proper type hints
+SETUP_CODE = """import asyncio
 import json
 from typing import Any
 from browser_use import BrowserSession
@@ -70,14 +46,88 @@ globals().update(namespace)
 print("Browser-use environment initialized!")
 print("Available functions: navigate, click, input, evaluate, search, extract, done, etc.")"""
 
-	setup_cell = {
+
+def setup_notebook_cell() -> dict[str, Any]:
+	return {
 		'cell_type': 'code',
 		'metadata': {},
-		'source': setup_code.split('\n'),
+		'source': SETUP_CODE.split('\n'),
 		'execution_count': None,
 		'outputs': [],
 	}
-	notebook.cells.append(setup_cell)
+
+
+def cell_to_notebook_cell(cell: CodeCell) -> dict[str, Any]:
+	"""Convert a CodeCell to an .ipynb cell dict."""
+	notebook_cell: dict[str, Any] = {
+		'cell_type': cell.cell_type.value,
+		'metadata': {},
+		'source': cell.source.splitlines(keepends=True),
+	}
+
+	if cell.cell_type == CellType.CODE:
+		notebook_cell['execution_count'] = cell.execution_count
+		notebook_cell['outputs'] = []
+
+		# Add output if available
+		if cell.output:
+			notebook_cell['outputs'].append(
+				{
+					'output_type': 'stream',
+					'name': 'stdout',
+					'text': cell.output.split('\n'),
+				}
+			)
+
+		# Add error if available
+		if cell.error:
+			notebook_cell['outputs'].append(
+				{
+					'output_type': 'error',
+					'ename': 'Error',
+					'evalue': cell.error.split('\n')[0] if cell.error else '',
+					'traceback': cell.error.split('\n') if cell.error else [],
+				}
+			)
+
+		# Add browser state as a separate output
+		if cell.browser_state:
+			notebook_cell['outputs'].append(
+				{
+					'output_type': 'stream',
+					'name': 'stdout',
+					'text': [f'Browser State:\n{cell.browser_state}'],
+				}
+			)
+
+	return notebook_cell
+
+
+def export_to_ipynb(agent: 'CodeAgent', output_path: str | Path) -> Path:
+	"""
+	Export a NotebookSession to a Jupyter notebook (.ipynb) file.
+	Now includes JavaScript code blocks that were stored in the namespace.
+
+	Args:
+		session: The NotebookSession to export
+		output_path: Path where to save the notebook file
+		agent: Optional CodeAgent instance to access namespace for JavaScript blocks
+
+	Returns:
+		Path to the saved notebook file
+
+	Example:
+		```python
+	        session = await agent.run()
+	        notebook_path = export_to_ipynb(agent, 'my_automation.ipynb')
+	        print(f'Notebook saved to {notebook_path}')
+		```
+	"""
+	output_path = Path(output_path)
+
+	# Create notebook structure
+	notebook = NotebookExport(metadata=NOTEBOOK_METADATA)
+	notebook.cells.append(setup_notebook_cell())
 
 	# Add JavaScript code blocks as variables FIRST
 	if hasattr(agent, 'namespace') and agent.namespace:
@@ -120,51 +170,8 @@ print("Available functions: navigate, click, input, evaluate, search, extract, d
 					notebook.cells.append(js_cell)
 
 	# Convert cells
-	python_cell_count = 0
 	for cell in agent.session.cells:
-		notebook_cell: dict = {
-			'cell_type': cell.cell_type.value,
-			'metadata': {},
-			'source': cell.source.splitlines(keepends=True),
-		}
-
-		if cell.cell_type == CellType.CODE:
-			python_cell_count += 1
-			notebook_cell['execution_count'] = cell.execution_count
-			notebook_cell['outputs'] = []
-
-			# Add output if available
-			if cell.output:
-				notebook_cell['outputs'].append(
-					{
-						'output_type': 'stream',
-						'name': 'stdout',
-						'text': cell.output.split('\n'),
-					}
-				)
-
-			# Add error if available
-			if cell.error:
-				notebook_cell['outputs'].append(
-					{
-						'output_type': 'error',
-						'ename': 'Error',
-						'evalue': cell.error.split('\n')[0] if cell.error else '',
-						'traceback': cell.error.split('\n') if cell.error else [],
-					}
-				)
-
-			# Add browser state as a separate output
-			if cell.browser_state:
-				notebook_cell['outputs'].append(
-					{
-						'output_type': 'stream',
-						'name': 'stdout',
-						'text': [f'Browser State:\n{cell.browser_state}'],
-					}
-				)
-
-		notebook.cells.append(notebook_cell)
+		notebook.cells.append(cell_to_notebook_cell(cell))
 
 	# Write to file
 	output_path.parent.mkdir(parents=True, exist_ok=True)
@@ -174,7 +181,7 @@ print("Available functions: navigate, click, input, evaluate, search, extract, d
 	return output_path
 
 
-def session_to_python_script(agent: CodeAgent) -> str:
+def session_to_python_script(agent: 'CodeAgent') -> str:
 	"""
 	Convert a CodeAgent session to a Python script.
 	Now includes JavaScript code blocks that were stored in the namespace.
@@ -5,8 +5,8 @@ import datetime
 import html
 import json
 import logging
-import re
 import traceback
+from collections.abc import Collection, MutableSequence
 from pathlib import Path
 from typing import Any
 
@@ -25,6 +25,7 @@ from browser_use.llm.messages import (
 	ImageURL,
 	UserMessage,
 )
+from browser_use.profiler import CODE_AGENT_PHASES, SamplingProfiler
 from browser_use.screenshots.service import ScreenshotService
 from browser_use.telemetry.service import ProductTelemetry
 from browser_use.telemetry.views import AgentTelemetryEvent
@@ -34,7 +35,9 @@ from browser_use.tools.service import CodeAgentTools, Tools
 from browser_use.utils import get_browser_use_version
 
 from .formatting import format_browser_state_for_llm
-from .namespace import EvaluateError, create_namespace
+from .journal import NotebookJournal
+from .kernel import CodeKernel, InProcessKernel, KernelMode, create_kernel, describe_variables
+from .namespace import create_namespace
 from .utils import detect_token_limit_issue, extract_code_blocks, extract_url_from_task, truncate_message_content
 from .views import (
 	CellType,
@@ -44,6 +47,7 @@ from .views import (
 	CodeAgentResult,
 	CodeAgentState,
 	CodeAgentStepMetadata,
+	CodeCell,
 	ExecutionStatus,
 	NotebookSession,
 )
@@ -79,6 +83,11 @@ class CodeAgent:
 		use_vision: bool = True,
 		calculate_cost: bool = False,
 		demo_mode: bool | None = None,
+		kernel: KernelMode = 'in_process',
+		cell_timeout: float | None = None,
+		cell_cpu_limit: float | None = None,
+		kernel_memory_limit_mb: int | None = None,
+		journal_dir: str | Path | None = None,
 		**kwargs,
 	):
 		"""
@@ -100,6 +109,15 @@ class CodeAgent:
 			use_vision: Whether to include screenshots in LLM messages (default: True)
 			calculate_cost: Whether to calculate token costs (default: False)
 			demo_mode: Enable the in-browser demo panel for live logging (default: False)
+			kernel: Where cells run: 'in_process' on the agent's event loop, or 'subprocess' in a
+				dedicated Python process that proxies browser tools back to the agent (default: 'in_process').
+				With 'subprocess' cells only get the tool functions (navigate, evaluate, done, ...), not the
+				browser and file_system objects, using those raises a NameError naming the kernel mode
+			cell_timeout: Wall-clock seconds a cell may run before it is cancelled (default: no limit)
+			cell_cpu_limit: CPU seconds a cell may use, requires kernel='subprocess' (default: no limit)
+			kernel_memory_limit_mb: Address space limit of the kernel process, requires kernel='subprocess'
+			journal_dir: Directory to stream cells (as notebook.ipynb and cells.jsonl) and history steps to as
+				they complete. History is then read back from disk instead of kept in memory (default: None)
 			llm: Optional ChatBrowserUse LLM instance (will create default if not provided)
 			**kwargs: Additional keyword arguments for compatibility (ignored)
 		"""
@@ -157,11 +175,18 @@ class CodeAgent:
 		self.max_failures = max_failures
 		self.max_validations = max_validations
 		self.use_vision = use_vision
+		self.kernel_mode: KernelMode = kernel
+		self.cell_timeout = cell_timeout
+		self.cell_cpu_limit = cell_cpu_limit
+		self.kernel_memory_limit_mb = kernel_memory_limit_mb
 
 		self.session = NotebookSession()
 		self.namespace: dict[str, Any] = {}
+		self._kernel: CodeKernel | None = None
 		self._llm_messages: list[BaseMessage] = []  # Internal LLM conversation history
-		self.complete_history: list[CodeAgentHistory] = []  # Type-safe history with model_output and result
+		self.journal = NotebookJournal(journal_dir) if journal_dir is not None else None
+		# Type-safe history with model_output and result
+		self.complete_history: MutableSequence[CodeAgentHistory] = self.journal.history if self.journal else []
 		self.dom_service: DomService | None = None
 		self._last_browser_state_text: str | None = None  # Track last browser state text
 		self._last_screenshot: str | None = None  # Track last screenshot (base64)
@@ -171,6 +196,7 @@ class CodeAgent:
 		self._step_start_time = 0.0  # Track step start time for duration calculation
 		self.usage_summary: UsageSummary | None = None  # Track usage summary across run for history property
 		self._sample_output_added = False  # Track whether preview cell already created
+		self.profiler: SamplingProfiler | None = None  # Set by run(profile=...)
 
 		# Initialize screenshot service for eval tracking
 		self.id = uuid7str()
@@ -200,16 +226,47 @@ class CodeAgent:
 		# Telemetry
 		self.telemetry = ProductTelemetry()
 
-	async def run(self, max_steps: int | None = None) -> NotebookSession:
+	async def run(
+		self,
+		max_steps: int | None = None,
+		profile: bool | str | Path = False,
+		profile_steps: Collection[int] | None = None,
+	) -> NotebookSession:
 		"""
 		Run the agent to complete the task.
 
 		Args:
 			max_steps: Optional override for maximum number of steps (uses __init__ value if not provided)
+			profile: Sample the run with a SamplingProfiler and write profile.speedscope.json and
+				profile.collapsed.txt next to the journal (or to the agent directory), a path is used
+				as the file prefix instead
+			profile_steps: Only sample these step numbers
 
 		Returns:
 			The notebook session with all executed cells
 		"""
+		if not profile:
+			return await self._run(max_steps)
+
+		self.profiler = SamplingProfiler(
+			step=lambda: len(self.complete_history) + 1, steps=profile_steps, phases=CODE_AGENT_PHASES
+		)
+		self.profiler.start()
+		try:
+			return await self._run(max_steps)
+		finally:
+			self.profiler.stop()
+			if profile is True:
+				path_prefix = (self.journal.directory if self.journal else self.agent_directory) / 'profile'
+			else:
+				path_prefix = Path(profile)
+			try:
+				speedscope_path, _ = self.profiler.save(path_prefix)
+				logger.info(f'🔥 Saved run profile to {speedscope_path}')
+			except OSError as e:
+				logger.warning(f'Failed to save run profile to {path_prefix}: {e}')
+
+	async def _run(self, max_steps: int | None) -> NotebookSession:
 		# Use override if provided, otherwise use value from __init__
 		steps_to_run = max_steps if max_steps is not None else self.max_steps
 		self.max_steps = steps_to_run
@@ -241,6 +298,14 @@ class CodeAgent:
 			available_file_paths=self.available_file_paths,
 			sensitive_data=self.sensitive_data,
 		)
+		self._kernel = create_kernel(
+			self.kernel_mode,
+			self.namespace,
+			cell_timeout=self.cell_timeout,
+			cpu_time_limit=self.cell_cpu_limit,
+			memory_limit_mb=self.kernel_memory_limit_mb,
+		)
+		await self._kernel.start()
 
 		# Initialize conversation with task
 		self._llm_messages.append(UserMessage(content=f'Task: {self.task}'))
@@ -273,6 +338,7 @@ class CodeAgent:
 						cell.browser_state = browser_state_text
 					except Exception as state_error:
 						logger.debug(f'Failed to capture browser state for initial navigation cell: {state_error}')
+				self._record_cell(cell)
 
 			except Exception as e:
 				logger.warning(f'Failed to navigate to extracted URL {initial_url}: {e}')
@@ -282,6 +348,7 @@ class CodeAgent:
 				cell.status = ExecutionStatus.ERROR
 				cell.execution_count = self.session.increment_execution_count()
 				cell.error = str(e)
+				self._record_cell(cell)
 
 		# Get initial browser state before first LLM call
 		if self.browser_session and self.dom_service:
@@ -592,12 +659,12 @@ class CodeAgent:
 
 			# Add any accumulated variables that might contain useful data
 			data_vars = []
-			for var_name in sorted(self.namespace.keys()):
-				if not var_name.startswith('_') and var_name not in {'json', 'asyncio', 'csv', 're', 'datetime', 'Path'}:
-					var_value = self.namespace[var_name]
-					# Check if it's a list or dict that might contain collected data
-					if isinstance(var_value, (list, dict)) and var_value:
-						data_vars.append(f'  - {var_name}: {type(var_value).__name__} with {len(var_value)} items')
+			variables = self._kernel.variables() if self._kernel else describe_variables(self.namespace)
+			for var_name, info in sorted(variables.items()):
+				if var_name not in {'json', 'asyncio', 'csv', 're', 'datetime', 'Path'}:
+					# Non-empty lists and dicts might contain collected data
+					if info.length:
+						data_vars.append(f'  - {var_name}: {info.type_name} with {info.length} items')
 
 			if data_vars:
 				partial_result_parts.append('\nVariables in namespace that may contain partial data:')
@@ -610,6 +677,7 @@ class CodeAgent:
 				last_result.extracted_content = partial_result
 				last_result.is_done = False
 				last_result.success = False
+				self.complete_history[-1] = last_step
 
 			logger.info(f'\nPartial result captured from last step:\n{partial_result}')
 			if self._demo_mode_enabled:
@@ -807,7 +875,7 @@ class CodeAgent:
 
 	async def _execute_code(self, code: str) -> tuple[str | None, str | None, str | None]:
 		"""
-		Execute Python code in the namespace.
+		Execute Python code in the kernel.
 
 		Args:
 			code: The Python code to execute
@@ -820,269 +888,62 @@ class CodeAgent:
 		cell.status = ExecutionStatus.RUNNING
 		cell.execution_count = self.session.increment_execution_count()
 
-		output = None
-		error = None
-		browser_state = None
-
-		try:
-			# Capture output
-			import ast
-			import io
-			import sys
-
-			old_stdout = sys.stdout
-			sys.stdout = io.StringIO()
-
-			try:
-				# Add asyncio to namespace if not already there
-				if 'asyncio' not in self.namespace:
-					self.namespace['asyncio'] = asyncio
-
-				# Store the current code in namespace for done() validation
-				self.namespace['_current_cell_code'] = code
-				# Store consecutive errors count for done() validation
-				self.namespace['_consecutive_errors'] = self._consecutive_errors
-
-				# Check if code contains await expressions - if so, wrap in async function
-				# This mimics how Jupyter/IPython handles top-level await
-				try:
-					tree = ast.parse(code, mode='exec')
-					has_await = any(isinstance(node, (ast.Await, ast.AsyncWith, ast.AsyncFor)) for node in ast.walk(tree))
-				except SyntaxError:
-					# If parse fails, let exec handle the error
-					has_await = False
-
-				if has_await:
-					# When code has await, we must wrap in async function
-					# To make variables persist naturally (like Jupyter without needing 'global'):
-					# 1. Extract all assigned variable names from the code
-					# 2. Inject 'global' declarations for variables that already exist in namespace
-					# 3. Extract user's explicit global declarations and pre-define those vars
-					# 4. Return locals() so we can update namespace with new variables
-
-					# Find all variable names being assigned + user's explicit globals
-					try:
-						assigned_names = set()
-						user_global_names = set()
-
-						for node in ast.walk(tree):
-							if isinstance(node, ast.Assign):
-								for target in node.targets:
-									if isinstance(target, ast.Name):
-										assigned_names.add(target.id)
-							elif isinstance(node, ast.AugAssign) and isinstance(node.target, ast.Name):
-								assigned_names.add(node.target.id)
-							elif isinstance(node, (ast.AnnAssign, ast.NamedExpr)):
-								if hasattr(node, 'target') and isinstance(node.target, ast.Name):
-									assigned_names.add(node.target.id)
-							elif isinstance(node, ast.Global):
-								# Track user's explicit global declarations
-								user_global_names.update(node.names)
-
-						# Pre-define any user-declared globals that don't exist yet
-						# This prevents NameError when user writes "global foo" before "foo = ..."
-						for name in user_global_names:
-							if name not in self.namespace:
-								self.namespace[name] = None
-
-						# Filter to only existing namespace vars (like Jupyter does)
-						# Include both: assigned vars that exist + user's explicit globals
-						existing_vars = {name for name in (assigned_names | user_global_names) if name in self.namespace}
-					except Exception as e:
-						existing_vars = set()
-
-					# Build global declaration if needed
-					global_decl = ''
-					has_global_decl = False
-					if existing_vars:
-						vars_str = ', '.join(sorted(existing_vars))
-						global_decl = f'    global {vars_str}\n'
-						has_global_decl = True
-
-					indented_code = '\n'.join('    ' + line if line.strip() else line for line in code.split('\n'))
-					wrapped_code = f"""async def __code_exec__():
-{global_decl}{indented_code}
-    # Return locals so we can update the namespace
-    return locals()
-
-__code_exec_coro__ = __code_exec__()
-"""
-					# Store whether we added a global declaration (needed for error line mapping)
-					self.namespace['_has_global_decl'] = has_global_decl
-
-					# Compile and execute wrapper at module level
-					compiled_code = compile(wrapped_code, '<code>', 'exec')
-					exec(compiled_code, self.namespace, self.namespace)
-
-					# Get and await the coroutine, then update namespace with new/modified variables
-					coro = self.namespace.get('__code_exec_coro__')
-					if coro:
-						result_locals = await coro
-						# Update namespace with all variables from the function's locals
-						# This makes variable assignments persist across cells
-						if result_locals:
-							for key, value in result_locals.items():
-								if not key.startswith('_'):
-									self.namespace[key] = value
-									# Variable info is tracked in "Available" section, no need for verbose inline output
-
-						# Clean up temporary variables
-						self.namespace.pop('__code_exec_coro__', None)
-						self.namespace.pop('__code_exec__', None)
-				else:
-					# No await - execute directly at module level for natural variable scoping
-					# This means x = x + 10 will work without needing 'global x'
-
-					# Track variables before execution
-					vars_before = set(self.namespace.keys())
-
-					compiled_code = compile(code, '<code>', 'exec')
-					exec(compiled_code, self.namespace, self.namespace)
-
-					# Track newly created/modified variables (info shown in "Available" section)
-					vars_after = set(self.namespace.keys())
-					new_vars = vars_after - vars_before
+		# Store the current code in namespace for done() validation
+		self.namespace['_current_cell_code'] = code
+		# Store consecutive errors count for done() validation
+		self.namespace['_consecutive_errors'] = self._consecutive_errors
 
-				# Get output
-				output_value = sys.stdout.getvalue()
-				if output_value:
-					output = output_value
+		if self._kernel is None:
+			self._kernel = InProcessKernel(self.namespace)
+		# Code block variables are injected into the agent namespace, the kernel may run elsewhere
+		code_block_vars = {
+			name: self.namespace[name] for name in self.namespace.get('_code_block_vars', ()) if name in self.namespace
+		}
+		result = await self._kernel.execute(code, inject=code_block_vars)
 
-			finally:
-				sys.stdout = old_stdout
+		cell.execution_time = result.duration
+		cell.cpu_time = result.cpu_time
+		cell.peak_memory_mb = result.peak_memory_mb
 
-			# Wait 2 seconds for page to stabilize after code execution
+		if result.error_type is None:
+			# Wait for page to stabilize after code execution
 			await asyncio.sleep(0.5)
 
 			# Note: Browser state is now fetched right before LLM call instead of after each execution
 			# This reduces unnecessary state fetches for operations that don't affect the browser
 
 			cell.status = ExecutionStatus.SUCCESS
-			cell.output = output
+			cell.output = result.output
 			cell.browser_state = None  # Will be captured in next iteration before LLM call
+			self._record_cell(cell)
+			return result.output, None, None
 
-		except Exception as e:
-			# Handle EvaluateError specially - JavaScript execution failed
-			if isinstance(e, EvaluateError):
-				error = str(e)
-				cell.status = ExecutionStatus.ERROR
-				cell.error = error
-				logger.error(f'Code execution error: {error}')
-
-				await asyncio.sleep(1)
-
-				# Browser state will be fetched before next LLM call
-				# Return immediately - do not continue executing code
-				return output, error, None
+		cell.status = ExecutionStatus.ERROR
 
-			# Handle NameError specially - check for code block variable confusion
-			if isinstance(e, NameError):
-				error_msg = str(e)
-				cell.status = ExecutionStatus.ERROR
-				cell.error = error
-
-				# Browser state will be fetched before next LLM call
-				await asyncio.sleep(0.5)
-				return output, error, None
-
-			# For syntax errors and common parsing errors, show just the error message
-			# without the full traceback to keep output clean
-			if isinstance(e, SyntaxError):
-				error_msg = e.msg if e.msg else str(e)
-				error = f'{type(e).__name__}: {error_msg}'
-
-				# Detect common f-string issues with JSON/JavaScript code
-				if 'unterminated' in error_msg.lower() and 'string' in error_msg.lower() and code:
-					# Check if code contains f-strings with potential JSON/JS content
-					has_fstring = bool(re.search(r'\bf["\']', code))
-					has_json_pattern = bool(re.search(r'json\.dumps|"[^"]*\{[^"]*\}[^"]*"|\'[^\']*\{[^\']*\}[^\']*\'', code))
-					has_js_pattern = bool(re.search(r'evaluate\(|await evaluate', code))
-
-					if has_fstring and (has_json_pattern or has_js_pattern):
-						error += (
-							'\n\n💡 TIP: Detected f-string with JSON/JavaScript code containing {}.\n'
-							'   Use separate ```js or ```markdown blocks instead of f-strings to avoid escaping issues.\n'
-							'   If your code block needs ``` inside it, wrap with 4+ backticks: ````markdown code`\n'
-						)
-
-				# Detect and provide helpful hints for common string literal errors
-				if 'unterminated' in error_msg.lower() and 'string' in error_msg.lower():
-					# Detect what type of string literal is unterminated
-					is_triple = 'triple-quoted' in error_msg.lower()
-					msg_lower = error_msg.lower()
-
-					# Detect prefix type from error message
-					if 'f-string' in msg_lower and 'raw' in msg_lower:
-						prefix = 'rf or fr'
-						desc = 'raw f-string'
-					elif 'f-string' in msg_lower:
-						prefix = 'f'
-						desc = 'f-string'
-					elif 'raw' in msg_lower and 'bytes' in msg_lower:
-						prefix = 'rb or br'
-						desc = 'raw bytes'
-					elif 'raw' in msg_lower:
-						prefix = 'r'
-						desc = 'raw string'
-					elif 'bytes' in msg_lower:
-						prefix = 'b'
-						desc = 'bytes'
-					else:
-						prefix = ''
-						desc = 'string'
-
-					# Build hint based on triple-quoted vs single/double quoted
-					if is_triple:
-						if prefix:
-							hint = f"Hint: Unterminated {prefix}'''...''' or {prefix}\"\"\"...\"\" ({desc}). Check for missing closing quotes or unescaped quotes inside."
-						else:
-							hint = "Hint: Unterminated '''...''' or \"\"\"...\"\" detected. Check for missing closing quotes or unescaped quotes inside."
-						hint += '\n      If you need ``` inside your string, use a ````markdown varname` code block with 4+ backticks instead.'
-					else:
-						if prefix:
-							hint = f'Hint: Unterminated {prefix}\'...\' or {prefix}"..." ({desc}). Check for missing closing quote or unescaped quotes inside.'
-						else:
-							hint = 'Hint: Unterminated \'...\' or "..." detected. Check for missing closing quote or unescaped quotes inside the string.'
-					error += f'\n{hint}'
-
-				# Show the problematic line from the code
-				if e.text:
-					error += f'\n{e.text}'
-				elif e.lineno and code:
-					# If e.text is empty, extract the line from the code
-					lines = code.split('\n')
-					if 0 < e.lineno <= len(lines):
-						error += f'\n{lines[e.lineno - 1]}'
-
-			else:
-				# For other errors, try to extract useful information
-				error_str = str(e)
-				error = f'{type(e).__name__}: {error_str}' if error_str else f'{type(e).__name__} occurred'
-
-				# For RuntimeError or other exceptions, try to extract traceback info
-				# to show which line in the user's code actually failed
-				if hasattr(e, '__traceback__'):
-					# Walk the traceback to find the frame with '<code>' filename
-					tb = e.__traceback__
-					user_code_lineno = None
-					while tb is not None:
-						frame = tb.tb_frame
-						if frame.f_code.co_filename == '<code>':
-							# Found the frame executing user code
-							# Get the line number from the traceback
-							user_code_lineno = tb.tb_lineno
-							break
-						tb = tb.tb_next
+		# NameErrors are not reported back as step errors
+		if result.error_type in ('NameError', 'UnboundLocalError'):
+			self._record_cell(cell)
+			# Browser state will be fetched before next LLM call
+			await asyncio.sleep(0.5)
+			return None, None, None
 
-			cell.status = ExecutionStatus.ERROR
-			cell.error = error
-			logger.error(f'Code execution error: {error}')
+		cell.error = result.error
+		self._record_cell(cell)
+		logger.error(f'Code execution error: {result.error}')
 
-			await asyncio.sleep(1)
+		await asyncio.sleep(1)
 
-			# Browser state will be fetched before next LLM call
+		# Browser state will be fetched before next LLM call
+		return None, result.error, None
 
-		return output, error, None
+	def _record_cell(self, cell: CodeCell) -> None:
+		"""Append a finished cell to the journal, if there is one."""
+		if self.journal is None:
+			return
+		try:
+			self.journal.append_cell(cell)
+		except OSError as e:
+			logger.warning(f'Failed to journal cell {cell.execution_count}: {e}')
 
 	async def _get_browser_state(self) -> tuple[str, str | None]:
 		"""Get the current browser state as text with ultra-minimal DOM structure for code agents.
@@ -1098,9 +959,12 @@ __code_exec_coro__ = __code_exec__()
 			include_screenshot = True
 			state = await self.browser_session.get_browser_state_summary(include_screenshot=include_screenshot)
 
-			# Format browser state with namespace context
+			# Format browser state with namespace context, including variables that live in a kernel process
+			namespace = self.namespace
+			if self._kernel is not None and not isinstance(self._kernel, InProcessKernel):
+				namespace = {**dict.fromkeys(self._kernel.variables()), **self.namespace}
 			browser_state_text = await format_browser_state_for_llm(
-				state=state, namespace=self.namespace, browser_session=self.browser_session
+				state=state, namespace=namespace, browser_session=self.browser_session
 			)
 
 			screenshot = state.screenshot if include_screenshot else None
@@ -1306,6 +1170,7 @@ __code_exec_coro__ = __code_exec__()
 		sample_cell.execution_count = None
 		escaped = html.escape(sample_content)
 		sample_cell.output = f'<pre>{escaped}</pre>'
+		self._record_cell(sample_cell)
 
 		self._sample_output_added = True
 
@@ -1419,7 +1284,9 @@ __code_exec_coro__ = __code_exec__()
 		return CodeAgentHistoryList(self.complete_history, self.usage_summary)
 
 	async def close(self) -> None:
-		"""Close the browser session."""
+		"""Stop the kernel and close the browser session."""
+		if self._kernel is not None:
+			await self._kernel.close()
 		if self.browser_session:
 			# Check if we should close the browser based on keep_alive setting
 			if not self.browser_session.browser_profile.keep_alive:
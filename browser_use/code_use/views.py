@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import json
+from collections.abc import MutableSequence
 from enum import Enum
 from pathlib import Path
 from typing import Any
@@ -42,6 +43,11 @@ class CodeCell(BaseModel):
 	status: ExecutionStatus = Field(default=ExecutionStatus.PENDING)
 	error: str | None = Field(default=None, description='Error message if execution failed')
 	browser_state: str | None = Field(default=None, description='Browser state after execution')
+	execution_time: float | None = Field(default=None, description='Wall-clock seconds spent executing the cell')
+	cpu_time: float | None = Field(default=None, description='CPU seconds used by the cell (subprocess kernel only)')
+	peak_memory_mb: float | None = Field(
+		default=None, description='Peak memory of the kernel process in MB (subprocess kernel only)'
+	)
 
 
 class NotebookSession(BaseModel):
@@ -53,7 +59,7 @@ class NotebookSession(BaseModel):
 	cells: list[CodeCell] = Field(default_factory=list)
 	current_execution_count: int = Field(default=0)
 	namespace: dict[str, Any] = Field(default_factory=dict, description='Current namespace state')
-	_complete_history: list[CodeAgentHistory] = PrivateAttr(default_factory=list)
+	_complete_history: MutableSequence[CodeAgentHistory] = PrivateAttr(default_factory=list)
 	_usage_summary: UsageSummary | None = PrivateAttr(default=None)
 
 	def add_cell(self, source: str) -> CodeCell:
@@ -187,13 +193,13 @@ class CodeAgentHistory(BaseModel):
 class CodeAgentHistoryList:
 	"""Compatibility wrapper for CodeAgentHistory that provides AgentHistoryList-like API."""
 
-	def __init__(self, complete_history: list[CodeAgentHistory], usage_summary: UsageSummary | None) -> None:
-		"""Initialize with CodeAgent history data."""
+	def __init__(self, complete_history: MutableSequence[CodeAgentHistory], usage_summary: UsageSummary | None) -> None:
+		"""Initialize with CodeAgent history data (a list, or a JournaledHistory read from disk)."""
 		self._complete_history = complete_history
 		self._usage_summary = usage_summary
 
 	@property
-	def history(self) -> list[CodeAgentHistory]:
+	def history(self) -> MutableSequence[CodeAgentHistory]:
 		"""Get the raw history list."""
 		return self._complete_history
 
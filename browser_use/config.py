@@ -3,6 +3,7 @@
 import json
 import logging
 import os
+import threading
 from datetime import datetime
 from functools import cache
 from pathlib import Path
@@ -349,54 +350,178 @@ def load_and_migrate_config(config_path: Path) -> DBStyleConfigJSON:
 		return new_config
 
 
+# Settings computed by OldConfig, and the ones only FlatEnvConfig knows about (these can also come from .env)
+_OLD_CONFIG_SETTINGS = tuple(name for name, value in vars(OldConfig).items() if isinstance(value, property))
+_ENV_ONLY_SETTINGS = tuple(name for name in FlatEnvConfig.model_fields if name not in _OLD_CONFIG_SETTINGS)
+# Settings whose access used to create the config/profiles/extensions directories
+_DIR_SETTINGS = frozenset(
+	{
+		'BROWSER_USE_CONFIG_DIR',
+		'BROWSER_USE_CONFIG_FILE',
+		'BROWSER_USE_PROFILES_DIR',
+		'BROWSER_USE_DEFAULT_USER_DATA_DIR',
+		'BROWSER_USE_EXTENSIONS_DIR',
+	}
+)
+
+
+def _environ_data() -> Any:
+	"""The mapping behind os.environ, cheap to compare against a copy."""
+	return getattr(os.environ, '_data', os.environ)
+
+
+def _dotenv_mtime() -> int | None:
+	"""Modification time of the .env file FlatEnvConfig reads, None if there is none."""
+	try:
+		return Path('.env').stat().st_mtime_ns
+	except OSError:
+		return None
+
+
+class ConfigSnapshot:
+	"""All settings read once, as plain read-only attributes.
+
+	Settings only FlatEnvConfig knows about are read (together with .env) on first access to any
+	of them. A setting with an invalid value raises its error when accessed, not when snapshotting.
+	"""
+
+	def __init__(self):
+		old_config = OldConfig()
+		old_config._dirs_created = True  # snapshotting has no side effects, see Config._ensure_dirs()
+		errors: dict[str, Exception] = {}
+		for name in _OLD_CONFIG_SETTINGS:
+			try:
+				object.__setattr__(self, name, getattr(old_config, name))
+			except AssertionError as e:
+				errors[name] = e
+		object.__setattr__(self, '_errors', errors)
+		object.__setattr__(self, '_env_config', None)
+
+	def env_config(self) -> FlatEnvConfig:
+		"""The FlatEnvConfig (environment + .env file) this snapshot was taken with."""
+		if self._env_config is None:
+			env_config = FlatEnvConfig()
+			for name in _ENV_ONLY_SETTINGS:
+				object.__setattr__(self, name, getattr(env_config, name))
+			for name, value in (env_config.model_extra or {}).items():
+				if not hasattr(type(self), name) and name not in self.__dict__:
+					object.__setattr__(self, name, value)
+			object.__setattr__(self, '_env_config', env_config)
+		return self._env_config
+
+	def __getattr__(self, name: str) -> Any:
+		# Only called for names that aren't set (yet)
+		if name.startswith('_'):
+			raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{name}'")
+		if name in self._errors:
+			raise self._errors[name]
+		if self._env_config is None:
+			self.env_config()
+			if name in self.__dict__:
+				return self.__dict__[name]
+		raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{name}'")
+
+	def __setattr__(self, name: str, value: Any) -> None:
+		raise AttributeError('ConfigSnapshot is read-only, use CONFIG.reload() to pick up changes')
+
+
 class Config:
 	"""Backward-compatible configuration class that merges all config sources.
 
-	Re-reads environment variables on every access to maintain compatibility.
+	Values are served from a ConfigSnapshot that is rebuilt by reload(), and automatically on the
+	next access after os.environ changed (one dict comparison instead of re-reading every variable).
+	Changes to a .env file are picked up by reload() or by watch().
+
+	Hot paths can take `CONFIG.snapshot` once and read its plain attributes.
 	"""
 
 	def __init__(self):
-		# Cache for directory creation tracking only
-		self._dirs_created = False
+		self._snapshot: ConfigSnapshot | None = None
+		self._environ: dict[Any, Any] = {}
+		self._dotenv_mtime: int | None = None
+		self._dirs_ensured_for: ConfigSnapshot | None = None
+		self._watcher: threading.Thread | None = None
+		self._stop_watching = threading.Event()
 
-	def __getattr__(self, name: str) -> Any:
-		"""Dynamically proxy all attributes to fresh instances.
+	@property
+	def snapshot(self) -> ConfigSnapshot:
+		"""The current settings, re-read if the environment changed since they were taken."""
+		snapshot = self._snapshot
+		if snapshot is None or _environ_data() != self._environ:
+			snapshot = self.reload()
+		return snapshot
+
+	def reload(self) -> ConfigSnapshot:
+		"""Re-read the environment and .env file."""
+		environ, dotenv_mtime = dict(_environ_data()), _dotenv_mtime()
+		snapshot = ConfigSnapshot()
+		self._snapshot, self._environ, self._dotenv_mtime = snapshot, environ, dotenv_mtime
+		return snapshot
 
-		This ensures env vars are re-read on every access.
-		"""
+	def __getattr__(self, name: str) -> Any:
 		# Special handling for internal attributes
 		if name.startswith('_'):
 			raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{name}'")
 
-		# Create fresh instances on every access
-		old_config = OldConfig()
-
-		# Always use old config for all attributes (it handles env vars with proper transformations)
-		if hasattr(old_config, name):
-			return getattr(old_config, name)
-
-		# For new MCP-specific attributes not in old config
-		env_config = FlatEnvConfig()
-		if hasattr(env_config, name):
-			return getattr(env_config, name)
-
-		# Handle special methods
-		if name == 'get_default_profile':
-			return lambda: self._get_default_profile()
-		elif name == 'get_default_llm':
-			return lambda: self._get_default_llm()
-		elif name == 'get_default_agent':
-			return lambda: self._get_default_agent()
-		elif name == 'load_config':
-			return lambda: self._load_config()
-		elif name == '_ensure_dirs':
-			return lambda: old_config._ensure_dirs()
-
-		raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{name}'")
+		snapshot = self.snapshot
+		try:
+			value = getattr(snapshot, name)
+		except AttributeError:
+			raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{name}'") from None
+		if name in _DIR_SETTINGS and self._dirs_ensured_for is not snapshot:
+			self._ensure_dirs(snapshot)
+		return value
+
+	def _ensure_dirs(self, snapshot: ConfigSnapshot | None = None) -> None:
+		"""Create the config, profiles and extensions directories (once per snapshot)"""
+		snapshot = snapshot or self.snapshot
+		for path in (snapshot.BROWSER_USE_CONFIG_DIR, snapshot.BROWSER_USE_PROFILES_DIR, snapshot.BROWSER_USE_EXTENSIONS_DIR):
+			path.mkdir(parents=True, exist_ok=True)
+		self._dirs_ensured_for = snapshot
+
+	def watch(self, interval: float = 1.0) -> None:
+		"""Reload in a background thread whenever the environment or the .env file changes.
+
+		For long-running processes that want configuration changes without a restart.
+		"""
+		if self._watcher and self._watcher.is_alive():
+			return
+		self._stop_watching.clear()
+		self._watcher = threading.Thread(
+			target=self._watch_loop, args=(interval,), name='browser-use-config-watcher', daemon=True
+		)
+		self._watcher.start()
+
+	def stop_watching(self) -> None:
+		"""Stop the watcher started by watch()."""
+		self._stop_watching.set()
+		if self._watcher and self._watcher is not threading.current_thread():
+			self._watcher.join()
+		self._watcher = None
+
+	def _watch_loop(self, interval: float) -> None:
+		while not self._stop_watching.wait(interval):
+			if _dotenv_mtime() != self._dotenv_mtime or _environ_data() != self._environ:
+				try:
+					self.reload()
+				except Exception as e:
+					logger.warning(f'Failed to reload browser-use config: {type(e).__name__}: {e}')
+
+	def get_default_profile(self) -> dict[str, Any]:
+		return self._get_default_profile()
+
+	def get_default_llm(self) -> dict[str, Any]:
+		return self._get_default_llm()
+
+	def get_default_agent(self) -> dict[str, Any]:
+		return self._get_default_agent()
+
+	def load_config(self) -> dict[str, Any]:
+		return self._load_config()
 
 	def _get_config_path(self) -> Path:
-		"""Get config path from fresh env config."""
-		env_config = FlatEnvConfig()
+		"""Get config path from the env config."""
+		env_config = self.snapshot.env_config()
 		if env_config.BROWSER_USE_CONFIG_PATH:
 			return Path(env_config.BROWSER_USE_CONFIG_PATH).expanduser()
 		elif env_config.BROWSER_USE_CONFIG_DIR:
@@ -457,8 +582,8 @@ class Config:
 			'agent': self._get_default_agent(),
 		}
 
-		# Fresh env config for overrides
-		env_config = FlatEnvConfig()
+		# Env config for overrides
+		env_config = self.snapshot.env_config()
 
 		# Apply MCP-specific env var overrides
 		if env_config.BROWSER_USE_HEADLESS is not None:
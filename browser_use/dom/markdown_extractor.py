@@ -5,11 +5,13 @@ This module provides a unified interface for extracting clean markdown from brow
 used by both the tools service and page actor.
 """
 
-import re
+import hashlib
+from collections import OrderedDict
 from typing import TYPE_CHECKING, Any
 
 from browser_use.dom.serializer.html_serializer import HTMLSerializer
 from browser_use.dom.service import DomService
+from browser_use.dom.views import EnhancedDOMTreeNode, NodeType
 
 if TYPE_CHECKING:
 	from browser_use.browser.session import BrowserSession
@@ -44,11 +46,13 @@ async def extract_clean_markdown(
 		if dom_service is not None or target_id is not None:
 			raise ValueError('Cannot specify both browser_session and dom_service/target_id')
 		# Browser session path (tools service)
+		session = browser_session
 		enhanced_dom_tree = await _get_enhanced_dom_tree_from_browser_session(browser_session)
 		current_url = await browser_session.get_current_page_url()
 		method = 'enhanced_dom_tree'
 	elif dom_service is not None and target_id is not None:
 		# DOM service path (page actor)
+		session = dom_service.browser_session
 		# Lazy fetch all_frames inside get_dom_tree if needed (for cross-origin iframes)
 		enhanced_dom_tree, _ = await dom_service.get_dom_tree(target_id=target_id, all_frames=None)
 		current_url = None  # Not available via DOM service
@@ -56,38 +60,21 @@ async def extract_clean_markdown(
 	else:
 		raise ValueError('Must provide either browser_session or both dom_service and target_id')
 
-	# Use the HTML serializer with the enhanced DOM tree
+	# Split the page into block-level HTML units and convert only the units not already cached for this target
 	html_serializer = HTMLSerializer(extract_links=extract_links)
-	page_html = html_serializer.serialize(enhanced_dom_tree)
+	blocks = _collect_html_blocks(enhanced_dom_tree, html_serializer)
+	original_html_length = sum(len(block) for block in blocks)
 
-	original_html_length = len(page_html)
-
-	# Use markdownify for clean markdown conversion
-	from markdownify import markdownify as md
-
-	content = md(
-		page_html,
-		heading_style='ATX',  # Use # style headings
-		strip=['script', 'style'],  # Remove these tags
-		bullets='-',  # Use - for unordered lists
-		code_language='',  # Don't add language to code blocks
-		escape_asterisks=False,  # Don't escape asterisks (cleaner output)
-		escape_underscores=False,  # Don't escape underscores (cleaner output)
-		escape_misc=False,  # Don't escape other characters (cleaner output)
-		autolinks=False,  # Don't convert URLs to <> format
-		default_title=False,  # Don't add default title attributes
-		keep_inline_images_in=[],  # Don't keep inline images in any tags (we already filter base64 in HTML)
-	)
-
-	initial_markdown_length = len(content)
-
-	# Minimal cleanup - markdownify already does most of the work
-	content = re.sub(r'%[0-9A-Fa-f]{2}', '', content)  # Remove any remaining URL encoding
-
-	# Apply light preprocessing to clean up excessive whitespace
-	content, chars_filtered = _preprocess_markdown_content(content)
+	# Cached blocks live on the session's DOMWatchdog, without one (watchdogs not attached) nothing is reused
+	cache_key = target_id or session.agent_focus_target_id
+	dom_watchdog: DOMWatchdog | None = session._dom_watchdog
+	cache = dom_watchdog.markdown_caches.get(cache_key) if dom_watchdog is not None else MarkdownBlockCache()
+	converted, reused_blocks = cache.convert(blocks)
 
+	initial_markdown_length = sum(raw_length for raw_length, _ in converted)
+	content = '\n'.join(markdown for _, markdown in converted if markdown)
 	final_filtered_length = len(content)
+	chars_filtered = initial_markdown_length - final_filtered_length
 
 	# Content statistics
 	stats = {
@@ -96,6 +83,8 @@ async def extract_clean_markdown(
 		'initial_markdown_chars': initial_markdown_length,
 		'filtered_chars_removed': chars_filtered,
 		'final_filtered_chars': final_filtered_length,
+		'markdown_blocks': len(blocks),
+		'markdown_blocks_reused': reused_blocks,
 	}
 
 	# Add URL to stats if available
@@ -124,47 +113,345 @@ async def _get_enhanced_dom_tree_from_browser_session(browser_session: 'BrowserS
 	return enhanced_dom_tree
 
 
-# Legacy aliases removed - all code now uses the unified extract_clean_markdown function
+# Layout-only containers: they add no markdown of their own, so their children are converted independently
+_CONTAINER_TAGS = frozenset(
+	{'html', 'body', 'main', 'div', 'section', 'article', 'header', 'footer', 'nav', 'aside', 'form', 'center'}
+)
+
+# Elements that start their own markdown block, everything else is grouped with adjacent inline content
+_BLOCK_TAGS = _CONTAINER_TAGS | {
+	'p',
+	'h1',
+	'h2',
+	'h3',
+	'h4',
+	'h5',
+	'h6',
+	'ul',
+	'ol',
+	'dl',
+	'table',
+	'pre',
+	'blockquote',
+	'hr',
+	'figure',
+	'fieldset',
+	'details',
+	'address',
+	'iframe',
+	'frame',
+}
+
+# Containers whose blocks add up to less than this are kept as one unit instead of many tiny cache entries
+_MIN_BLOCK_CHARS = 2048
+
+# Marker paragraph placed between blocks so cache misses can be converted in a single markdownify call
+_BLOCK_SEPARATOR = 'browserusemarkdownblockseparator'
+
+_MARKDOWNIFY_OPTIONS: dict[str, Any] = {
+	'heading_style': 'ATX',  # Use # style headings
+	'strip': ['script', 'style'],  # Remove these tags
+	'bullets': '-',  # Use - for unordered lists
+	'code_language': '',  # Don't add language to code blocks
+	'escape_asterisks': False,  # Don't escape asterisks (cleaner output)
+	'escape_underscores': False,  # Don't escape underscores (cleaner output)
+	'escape_misc': False,  # Don't escape other characters (cleaner output)
+	'autolinks': False,  # Don't convert URLs to <> format
+	'default_title': False,  # Don't add default title attributes
+	'keep_inline_images_in': [],  # Don't keep inline images in any tags (we already filter base64 in HTML)
+}
+
+
+def _collect_html_blocks(node: EnhancedDOMTreeNode, html_serializer: HTMLSerializer) -> list[str]:
+	"""Serialize a DOM tree into block-level HTML units, in document order.
+
+	Layout containers (html, body, div, section, ...) are descended into so that each block
+	element, or run of adjacent inline content, becomes its own unit whose markdown can be
+	cached independently. Small containers are kept whole to avoid very fine-grained units.
+	"""
+	if node.node_type == NodeType.DOCUMENT_NODE:
+		children = node.children_and_shadow_roots
+	elif node.node_type == NodeType.ELEMENT_NODE and node.tag_name in _CONTAINER_TAGS:
+		children = [*(node.shadow_roots or []), *node.children]
+	else:
+		html = html_serializer.serialize(node)
+		return [html] if html else []
+
+	blocks: list[str] = []
+	inline_run: list[str] = []
+
+	def flush_inline_run() -> None:
+		run = ''.join(inline_run)
+		inline_run.clear()
+		if run.strip():
+			blocks.append(run)
+
+	for child in children:
+		if child.node_type == NodeType.ELEMENT_NODE and child.tag_name in _CONTAINER_TAGS:
+			flush_inline_run()
+			blocks.extend(_collect_html_blocks(child, html_serializer))
+			continue
+
+		html = html_serializer.serialize(child)
+		if not html:
+			continue
+		is_block = child.node_type == NodeType.DOCUMENT_FRAGMENT_NODE or (
+			child.node_type == NodeType.ELEMENT_NODE and child.tag_name in _BLOCK_TAGS
+		)
+		if is_block:
+			flush_inline_run()
+			blocks.append(html)
+		else:
+			inline_run.append(html)
+	flush_inline_run()
+
+	if len(blocks) > 1 and sum(len(block) for block in blocks) < _MIN_BLOCK_CHARS:
+		return [''.join(blocks)]
+	return blocks
+
+
+class MarkdownBlockCache:
+	"""LRU cache of converted markdown per HTML block, keyed on a hash of the block's HTML.
+
+	Unchanged parts of a page hash to the same keys on every extraction, so only new or
+	modified blocks go through markdownify. Entries store the raw markdown length (for the
+	content statistics) and the cleaned markdown.
+	"""
+
+	def __init__(self, max_entries: int = 4096):
+		self.max_entries = max_entries
+		self._entries: OrderedDict[bytes, tuple[int, str]] = OrderedDict()
+
+	@staticmethod
+	def block_key(html: str) -> bytes:
+		return hashlib.blake2b(html.encode('utf-8', errors='replace'), digest_size=16).digest()
+
+	def convert(self, blocks: list[str]) -> tuple[list[tuple[int, str]], int]:
+		"""Return (raw_markdown_length, cleaned_markdown) for every block, and how many were cached."""
+		keys = [self.block_key(block) for block in blocks]
+		results: list[tuple[int, str] | None] = []
+		missing: dict[bytes, str] = {}
+		for key, block in zip(keys, blocks):
+			cached = self._entries.get(key)
+			if cached is not None:
+				self._entries.move_to_end(key)
+			else:
+				missing.setdefault(key, block)
+			results.append(cached)
+		reused = sum(result is not None for result in results)
+
+		converted = dict(zip(missing, _convert_html_blocks(list(missing.values())))) if missing else {}
+		self._entries.update(converted)
+		while len(self._entries) > self.max_entries:
+			self._entries.popitem(last=False)
+
+		return [result if result is not None else converted[key] for key, result in zip(keys, results)], reused
+
+	def __len__(self) -> int:
+		return len(self._entries)
+
+
+class MarkdownCaches:
+	"""Block caches per target, so pages in different tabs don't evict each other.
+
+	Owned by a browser session's DOMWatchdog, which forgets a target's cache when its tab closes.
+	"""
+
+	def __init__(self, max_targets: int = 16):
+		self.max_targets = max_targets
+		self._caches: OrderedDict[str | None, MarkdownBlockCache] = OrderedDict()
+
+	def get(self, target_id: str | None) -> MarkdownBlockCache:
+		cache = self._caches.get(target_id)
+		if cache is None:
+			cache = self._caches[target_id] = MarkdownBlockCache()
+		self._caches.move_to_end(target_id)
+		while len(self._caches) > self.max_targets:
+			self._caches.popitem(last=False)
+		return cache
+
+	def forget(self, target_id: str | None) -> None:
+		"""Drop the cache of a closed target."""
+		self._caches.pop(target_id, None)
+
+	def __len__(self) -> int:
+		return len(self._caches)
+
+
+def _convert_html_blocks(blocks: list[str]) -> list[tuple[int, str]]:
+	"""Convert HTML blocks to cleaned markdown with a single markdownify call.
+
+	Each block is wrapped in its own <div> and followed by a separator paragraph, so the
+	markdown of each block can be split back out of the combined output.
+	"""
+	from markdownify import markdownify as md
+
+	html = ''.join(f'<div>{block}</div><p>{_BLOCK_SEPARATOR}</p>' for block in blocks)
+	parts = md(html, **_MARKDOWNIFY_OPTIONS).split(_BLOCK_SEPARATOR)[: len(blocks)]
+	if len(parts) != len(blocks):
+		# A block contained the separator text itself, convert one by one instead
+		parts = [md(f'<div>{block}</div>', **_MARKDOWNIFY_OPTIONS) for block in blocks]
+
+	converted = []
+	for part in parts:
+		raw = part.strip('\n')
+		cleaned, _ = _preprocess_markdown_content(raw)
+		converted.append((len(raw), cleaned))
+	return converted
 
 
-def _preprocess_markdown_content(content: str, max_newlines: int = 3) -> tuple[str, int]:
+class MarkdownStreamFilter:
+	"""Single-pass cleanup of markdown text, fed incrementally as it is produced.
+
+	Drops whitespace-only lines, JSON-looking lines over 100 chars, inline-code JSON
+	(`{"..."}`, which may continue over several lines of a paragraph), large {"$type": ...}
+	and {"key":{...}} objects embedded in text, and leftover URL-encoded sequences (%XX).
+	These are mostly SPA state blobs (LinkedIn, Facebook, etc.).
+	"""
+
+	def __init__(self):
+		self._lines: list[str] = []
+		self._pending = ''
+		# Kept prefix plus held-back lines of an inline-code JSON span that hasn't been closed yet
+		self._open_code_json: list[str] | None = None
+
+	def feed(self, text: str) -> None:
+		lines = (self._pending + text).split('\n')
+		self._pending = lines.pop()
+		for line in lines:
+			self._push_line(line)
+
+	def finish(self) -> str:
+		if self._pending:
+			self._push_line(self._pending)
+			self._pending = ''
+		if self._open_code_json is not None:
+			self._release_open_code_json()
+		return '\n'.join(self._lines).strip()
+
+	def _push_line(self, line: str) -> None:
+		line = _strip_url_encoding(line)
+		if self._open_code_json is not None:
+			end = line.find('}`')
+			if end != -1:
+				prefix = self._open_code_json[0]
+				self._open_code_json = None
+				rest = self._strip_code_json(line[end + 2 :])
+				if rest is None:
+					# Another span opened on the same line, keep what came before both
+					self._open_code_json[0] = prefix + self._open_code_json[0]
+				else:
+					self._emit(prefix + rest)
+			elif line.strip():
+				self._open_code_json.append(line)
+			else:
+				# Code spans can't cross a blank line, so this wasn't inline-code JSON after all
+				self._release_open_code_json()
+			return
+
+		line = self._strip_code_json(line)
+		if line is not None:
+			self._emit(line)
+
+	def _release_open_code_json(self) -> None:
+		assert self._open_code_json is not None
+		prefix, opening, *held_lines = self._open_code_json
+		self._open_code_json = None
+		for line in (prefix + opening, *held_lines):
+			self._emit(line)
+
+	def _strip_code_json(self, line: str) -> str | None:
+		"""Remove `{"..."}` spans, returns None when a span stays open past the end of the line."""
+		out: list[str] = []
+		pos = 0
+		while (start := line.find('`{', pos)) != -1:
+			first = line[start + 2 : start + 3]
+			if not (first == '"' or first == '_' or first.isalnum()):
+				out.append(line[pos : start + 1])
+				pos = start + 1
+				continue
+			out.append(line[pos:start])
+			end = line.find('}`', start + 3)
+			if end == -1:
+				self._open_code_json = [''.join(out), line[start:]]
+				return None
+			pos = end + 2
+		out.append(line[pos:])
+		return ''.join(out)
+
+	def _emit(self, line: str) -> None:
+		line = _strip_json_objects(line)
+		stripped = line.strip()
+		if not stripped:
+			return
+		# Skip lines that look like JSON (start with { or [ and are very long)
+		if stripped[0] in '{[' and len(stripped) > 100:
+			return
+		self._lines.append(line)
+
+
+def _strip_url_encoding(line: str) -> str:
+	"""Remove %XX URL-encoded sequences."""
+	if '%' not in line:
+		return line
+	out: list[str] = []
+	pos = 0
+	while (i := line.find('%', pos)) != -1:
+		if _is_hex(line[i + 1 : i + 3]):
+			out.append(line[pos:i])
+			pos = i + 3
+		else:
+			out.append(line[pos : i + 1])
+			pos = i + 1
+	out.append(line[pos:])
+	return ''.join(out)
+
+
+def _is_hex(chars: str) -> bool:
+	return len(chars) == 2 and all(c in '0123456789abcdefABCDEF' for c in chars)
+
+
+def _strip_json_objects(line: str) -> str:
+	"""Remove {"$type":...} and {"key":{...}} objects with at least 100 chars of body."""
+	if '{"' not in line:
+		return line
+	out: list[str] = []
+	pos = 0
+	while (start := line.find('{"', pos)) != -1:
+		end = -1
+		if line.startswith('{"$type":', start):
+			close = line.find('}', start + 9)
+			if close - (start + 9) >= 100:
+				end = close
+		else:
+			key_end = line.find('":{', start + 2)
+			if key_end - (start + 2) >= 5 and '"' not in line[start + 2 : key_end]:
+				close = line.find('}', key_end + 3)
+				if close - (key_end + 3) >= 100:
+					end = close
+		if end == -1:
+			out.append(line[pos : start + 1])
+			pos = start + 1
+		else:
+			out.append(line[pos:start])
+			pos = end + 1
+	out.append(line[pos:])
+	return ''.join(out)
+
+
+def _preprocess_markdown_content(content: str) -> tuple[str, int]:
 	"""
 	Light preprocessing of markdown output - minimal cleanup with JSON blob removal.
 
+	Whitespace-only lines are dropped, so runs of newlines collapse to a single line break.
+
 	Args:
 	    content: Markdown content to lightly filter
-	    max_newlines: Maximum consecutive newlines to allow
 
 	Returns:
 	    tuple: (filtered_content, chars_filtered)
 	"""
-	original_length = len(content)
-
-	# Remove JSON blobs (common in SPAs like LinkedIn, Facebook, etc.)
-	# These are often embedded as `{"key":"value",...}` and can be massive
-	# Match JSON objects/arrays that are at least 100 chars long
-	# This catches SPA state/config data without removing small inline JSON
-	content = re.sub(r'`\{["\w].*?\}`', '', content, flags=re.DOTALL)  # Remove JSON in code blocks
-	content = re.sub(r'\{"\$type":[^}]{100,}\}', '', content)  # Remove JSON with $type fields (common pattern)
-	content = re.sub(r'\{"[^"]{5,}":\{[^}]{100,}\}', '', content)  # Remove nested JSON objects
-
-	# Compress consecutive newlines (4+ newlines become max_newlines)
-	content = re.sub(r'\n{4,}', '\n' * max_newlines, content)
-
-	# Remove lines that are only whitespace
-	lines = content.split('\n')
-	filtered_lines = []
-	for line in lines:
-		stripped = line.strip()
-		# Keep all non-empty lines
-		if stripped:
-			# Skip lines that look like JSON (start with { or [ and are very long)
-			if (stripped.startswith('{') or stripped.startswith('[')) and len(stripped) > 100:
-				continue
-			filtered_lines.append(line)
-
-	content = '\n'.join(filtered_lines)
-	content = content.strip()
-
-	chars_filtered = original_length - len(content)
-	return content, chars_filtered
+	stream_filter = MarkdownStreamFilter()
+	stream_filter.feed(content)
+	filtered = stream_filter.finish()
+	return filtered, len(content) - len(filtered)
@@ -1,3 +1,5 @@
+import re
+
 from browser_use.dom.views import EnhancedDOMTreeNode, NodeType
 
 
@@ -198,3 +200,144 @@ class ClickableElementDetector:
 			return True
 
 		return False
+
+
+# Rules of ClickableElementDetector.is_interactive, precompiled for CompiledClickableElementDetector.
+# All multi-word search indicators ('search-icon', 'searchbox', ...) contain 'search', so these are enough.
+_SEARCH_INDICATORS_RE = re.compile('search|magnify|glass|lookup|find|query')
+_INTERACTIVE_TAGS = frozenset({'button', 'input', 'select', 'textarea', 'a', 'details', 'summary', 'option', 'optgroup'})
+_INTERACTIVE_ATTRIBUTES = frozenset({'onclick', 'onmousedown', 'onmouseup', 'onkeydown', 'onkeyup', 'tabindex'})
+_INTERACTIVE_ROLES = frozenset(
+	{
+		'button',
+		'link',
+		'menuitem',
+		'option',
+		'radio',
+		'checkbox',
+		'tab',
+		'textbox',
+		'combobox',
+		'slider',
+		'spinbutton',
+		'search',
+		'searchbox',
+	}
+)
+_INTERACTIVE_AX_ROLES = _INTERACTIVE_ROLES | {'listbox'}
+_ICON_ATTRIBUTES = frozenset({'class', 'role', 'onclick', 'data-action', 'aria-label'})
+
+# AX property name -> what it decides, checked in property order
+_AX_REJECT_IF_SET, _AX_ACCEPT_IF_SET, _AX_ACCEPT = 0, 1, 2
+_AX_PROPERTY_RULES = {
+	'disabled': _AX_REJECT_IF_SET,
+	'hidden': _AX_REJECT_IF_SET,
+	'focusable': _AX_ACCEPT_IF_SET,
+	'editable': _AX_ACCEPT_IF_SET,
+	'settable': _AX_ACCEPT_IF_SET,
+	'checked': _AX_ACCEPT,
+	'expanded': _AX_ACCEPT,
+	'pressed': _AX_ACCEPT,
+	'selected': _AX_ACCEPT,
+	'required': _AX_ACCEPT_IF_SET,
+	'autocomplete': _AX_ACCEPT_IF_SET,
+	'keyshortcuts': _AX_ACCEPT_IF_SET,
+}
+
+_TAG_SKIPPED, _TAG_FRAME, _TAG_INTERACTIVE, _TAG_OTHER = 0, 1, 2, 3
+
+
+class CompiledClickableElementDetector:
+	"""Same decisions as ClickableElementDetector.is_interactive, with the rules precompiled.
+
+	Search indicators are one regex over all searched attribute values, attribute checks are set
+	operations, tag checks are memoized per node name, and the only order-dependent part (iframe
+	and search accepts before AX disabled/hidden rejects) keeps its order. Everything after the AX
+	properties is an OR, so it runs cheapest first.
+	"""
+
+	def __init__(self):
+		self._tag_kinds: dict[str, int] = {}
+
+	def _tag_kind(self, node_name: str) -> int:
+		kind = self._tag_kinds.get(node_name)
+		if kind is None:
+			tag_name = node_name.lower()
+			if tag_name in {'html', 'body'}:
+				kind = _TAG_SKIPPED
+			elif tag_name.upper() in ('IFRAME', 'FRAME'):
+				kind = _TAG_FRAME
+			elif tag_name in _INTERACTIVE_TAGS:
+				kind = _TAG_INTERACTIVE
+			else:
+				kind = _TAG_OTHER
+			self._tag_kinds[node_name] = kind
+		return kind
+
+	def is_interactive(self, node: EnhancedDOMTreeNode) -> bool:
+		"""Check if this node is clickable/interactive (see ClickableElementDetector.is_interactive)."""
+		if node.node_type != NodeType.ELEMENT_NODE:
+			return False
+		kind = self._tag_kind(node.node_name)
+		if kind == _TAG_SKIPPED:
+			return False
+
+		snapshot_node = node.snapshot_node
+		bounds = snapshot_node.bounds if snapshot_node else None
+		if kind == _TAG_FRAME and bounds and bounds.width > 100 and bounds.height > 100:
+			return True
+
+		attributes = node.attributes
+		if attributes:
+			searched = [attributes.get('class', ''), attributes.get('id', '')]
+			searched.extend(value for name, value in attributes.items() if name.startswith('data-'))
+			# Indicators never contain whitespace, so matching across the joined values is safe
+			if _SEARCH_INDICATORS_RE.search('\n'.join(searched).lower()):
+				return True
+
+		ax_node = node.ax_node
+		if ax_node and ax_node.properties:
+			for prop in ax_node.properties:
+				rule = _AX_PROPERTY_RULES.get(prop.name)
+				if rule is None:
+					continue
+				if rule == _AX_ACCEPT:
+					return True
+				if prop.value:
+					return rule == _AX_ACCEPT_IF_SET
+
+		if kind == _TAG_INTERACTIVE:
+			return True
+		if snapshot_node and snapshot_node.cursor_style == 'pointer':
+			return True
+		if attributes:
+			if not _INTERACTIVE_ATTRIBUTES.isdisjoint(attributes) or attributes.get('role') in _INTERACTIVE_ROLES:
+				return True
+			if bounds and 10 <= bounds.width <= 50 and 10 <= bounds.height <= 50 and not _ICON_ATTRIBUTES.isdisjoint(attributes):
+				return True
+		return bool(ax_node and ax_node.role in _INTERACTIVE_AX_ROLES)
+
+	def classify_tree(self, root: EnhancedDOMTreeNode) -> dict[int, bool]:
+		"""is_interactive for every node under root (children, shadow roots and iframe documents), by node_id.
+
+		node_ids are only unique per CDP session, so ids that occur more than once in the tree
+		(cross-origin iframes) are left out and have to be classified per node.
+		"""
+		results: dict[int, bool] = {}
+		duplicates: set[int] = set()
+		stack = [root]
+		while stack:
+			node = stack.pop()
+			if node.node_id in results:
+				duplicates.add(node.node_id)
+			else:
+				results[node.node_id] = self.is_interactive(node)
+			if node.children_nodes:
+				stack.extend(node.children_nodes)
+			if node.shadow_roots:
+				stack.extend(node.shadow_roots)
+			if node.content_document:
+				stack.append(node.content_document)
+		for node_id in duplicates:
+			del results[node_id]
+		return results
@@ -2,7 +2,7 @@
 
 from typing import Any
 
-from browser_use.dom.serializer.clickable_elements import ClickableElementDetector
+from browser_use.dom.serializer.clickable_elements import CompiledClickableElementDetector
 from browser_use.dom.serializer.paint_order import PaintOrderRemover
 from browser_use.dom.utils import cap_text_length
 from browser_use.dom.views import (
@@ -37,6 +37,8 @@ SVG_ELEMENTS = {
 	'tspan',
 }
 
+_CLICKABLE_DETECTOR = CompiledClickableElementDetector()
+
 
 class DOMTreeSerializer:
 	"""Serializes enhanced DOM trees to string format."""
@@ -106,7 +108,10 @@ class DOMTreeSerializer:
 		self._interactive_counter = 1
 		self._selector_map = {}
 		self._semantic_groups = []
-		self._clickable_cache = {}  # Clear cache for new serialization
+		# Classify the whole tree in one pass instead of timing each detector call
+		start_clickable = time.time()
+		self._clickable_cache = _CLICKABLE_DETECTOR.classify_tree(self.root_node)
+		self.timing_info['clickable_detection_time'] = time.time() - start_clickable
 
 		# Step 1: Create simplified tree (includes clickable element detection)
 		start_step1 = time.time()
@@ -415,22 +420,12 @@ class DOMTreeSerializer:
 		return {'count': len(options), 'first_options': first_options, 'format_hint': format_hint}
 
 	def _is_interactive_cached(self, node: EnhancedDOMTreeNode) -> bool:
-		"""Cached version of clickable element detection to avoid redundant calls."""
-
-		if node.node_id not in self._clickable_cache:
-			import time
-
-			start_time = time.time()
-			result = ClickableElementDetector.is_interactive(node)
-			end_time = time.time()
-
-			if 'clickable_detection_time' not in self.timing_info:
-				self.timing_info['clickable_detection_time'] = 0
-			self.timing_info['clickable_detection_time'] += end_time - start_time
-
-			self._clickable_cache[node.node_id] = result
-
-		return self._clickable_cache[node.node_id]
+		"""Clickable element detection, precomputed for the whole tree by serialize_accessible_elements()."""
+		result = self._clickable_cache.get(node.node_id)
+		if result is None:
+			# Nodes classify_tree() couldn't key uniquely, or serializers used without serialize_accessible_elements()
+			result = self._clickable_cache[node.node_id] = _CLICKABLE_DETECTOR.is_interactive(node)
+		return result
 
 	def _create_simplified_tree(self, node: EnhancedDOMTreeNode, depth: int = 0) -> SimplifiedNode | None:
 		"""Step 1: Create a simplified tree with enhanced element detection."""
@@ -1,7 +1,8 @@
 import asyncio
 import logging
 import time
-from typing import TYPE_CHECKING
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any, TypeVar
 
 from cdp_use.cdp.accessibility.commands import GetFullAXTreeReturns
 from cdp_use.cdp.accessibility.types import AXNode
@@ -28,6 +29,8 @@ from browser_use.utils import create_task_with_error_handling
 if TYPE_CHECKING:
 	from browser_use.browser.session import BrowserSession
 
+T = TypeVar('T')
+
 # Note: iframe limits are now configurable via BrowserProfile.max_iframes and BrowserProfile.max_iframe_depth
 
 
@@ -50,6 +53,7 @@ class DomService:
 		paint_order_filtering: bool = True,
 		max_iframes: int = 100,
 		max_iframe_depth: int = 5,
+		offload_cpu_work: bool = False,
 	):
 		self.browser_session = browser_session
 		self.logger = logger or browser_session.logger
@@ -57,6 +61,7 @@ class DomService:
 		self.paint_order_filtering = paint_order_filtering
 		self.max_iframes = max_iframes
 		self.max_iframe_depth = max_iframe_depth
+		self.offload_cpu_work = offload_cpu_work
 
 	async def __aenter__(self):
 		return self
@@ -420,6 +425,62 @@ class DomService:
 			},
 		)
 
+	async def _run_cpu_stage(self, func: Callable[..., T], *args: Any) -> T:
+		"""Run a pure-Python DOM processing stage, in a worker thread when offload_cpu_work is enabled.
+
+		The stages still hold the GIL while they run, but the interpreter switches threads every few
+		milliseconds, so the event loop keeps processing CDP events and timers instead of stalling
+		for the whole build.
+		"""
+		if self.offload_cpu_work:
+			return await asyncio.to_thread(func, *args)
+		return func(*args)
+
+	async def _build_cross_origin_iframes(
+		self,
+		iframes: list[tuple[EnhancedDOMTreeNode, str | None, DOMRect]],
+		all_frames: dict | None,
+		iframe_depth: int,
+	) -> None:
+		"""Build and attach the content documents of visible cross-origin iframes found during construction."""
+		for dom_tree_node, frame_id, total_frame_offset in iframes:
+			if not frame_id:
+				continue
+
+			# Lazy fetch all_frames only when actually needed (for cross-origin iframes)
+			if all_frames is None:
+				all_frames, _ = await self.browser_session.get_all_frames()
+
+			# Use pre-fetched all_frames to find the iframe's target (no redundant CDP call)
+			frame_info = all_frames.get(frame_id)
+			iframe_document_target = None
+			if frame_info and frame_info.get('frameTargetId'):
+				iframe_target_id = frame_info['frameTargetId']
+				iframe_target = self.browser_session.session_manager.get_target(iframe_target_id)
+				if iframe_target:
+					iframe_document_target = {
+						'targetId': iframe_target.target_id,
+						'url': iframe_target.url,
+						'title': iframe_target.title,
+						'type': iframe_target.target_type,
+					}
+
+			# if target actually exists in one of the frames, just recursively build the dom tree for it
+			if iframe_document_target:
+				self.logger.debug(f'Getting content document for iframe {frame_id} at depth {iframe_depth + 1}')
+				content_document, _ = await self.get_dom_tree(
+					target_id=iframe_document_target['targetId'],
+					all_frames=all_frames,
+					# TODO: experiment with this values -> not sure whether the whole cross origin iframe should be ALWAYS included as soon as some part of it is visible or not.
+					# Current config: if the cross origin iframe is AT ALL visible, then just include everything inside of it!
+					# initial_html_frames=updated_html_frames,
+					initial_total_frame_offset=total_frame_offset,
+					iframe_depth=iframe_depth + 1,
+				)
+
+				dom_tree_node.content_document = content_document
+				dom_tree_node.content_document.parent_node = dom_tree_node
+
 	@observe_debug(ignore_input=True, ignore_output=True, name='get_dom_tree')
 	async def get_dom_tree(
 		self,
@@ -456,6 +517,14 @@ class DomService:
 		snapshot = trees.snapshot
 		device_pixel_ratio = trees.device_pixel_ratio
 
+		# The session is the same for every node of this target, resolve it once up front
+		try:
+			session = await self.browser_session.get_or_create_cdp_session(target_id, focus=False)
+			session_id: str | None = session.session_id
+		except ValueError:
+			# Target may have detached during DOM construction
+			session_id = None
+
 		# Build AX tree lookup
 		start_ax = time.time()
 		ax_tree_lookup: dict[int, AXNode] = {
@@ -468,23 +537,27 @@ class DomService:
 
 		# Parse snapshot data with everything calculated upfront
 		start_snapshot = time.time()
-		snapshot_lookup = build_snapshot_lookup(snapshot, device_pixel_ratio)
+		snapshot_lookup = await self._run_cpu_stage(build_snapshot_lookup, snapshot, device_pixel_ratio)
 		timing_info['build_snapshot_lookup_ms'] = (time.time() - start_snapshot) * 1000
 
-		async def _construct_enhanced_node(
+		# Cross-origin iframes need CDP calls, so construction only collects them (iframe node, frame id,
+		# frame offset) and their content documents are built on the event loop afterwards
+		cross_origin_iframes: list[tuple[EnhancedDOMTreeNode, str | None, DOMRect]] = []
+
+		def _construct_enhanced_node(
 			node: Node,
 			html_frames: list[EnhancedDOMTreeNode] | None,
 			total_frame_offset: DOMRect | None,
-			all_frames: dict | None,
 		) -> EnhancedDOMTreeNode:
 			"""
 			Recursively construct enhanced DOM tree nodes.
 
+			Pure Python over the CDP payloads, so it can run in a worker thread (see DomService.offload_cpu_work).
+
 			Args:
 				node: The DOM node to construct
 				html_frames: List of HTML frame nodes encountered so far
 				total_frame_offset: Accumulated coordinate translation from parent iframes (includes scroll corrections)
-				all_frames: Pre-fetched frame hierarchy to avoid redundant CDP calls
 			"""
 
 			# Initialize lists if not provided
@@ -553,13 +626,6 @@ class DomService:
 					height=snapshot_data.bounds.height,
 				)
 
-			try:
-				session = await self.browser_session.get_or_create_cdp_session(target_id, focus=False)
-				session_id = session.session_id
-			except ValueError:
-				# Target may have detached during DOM construction
-				session_id = None
-
 			dom_tree_node = EnhancedDOMTreeNode(
 				node_id=node['nodeId'],
 				backend_node_id=node['backendNodeId'],
@@ -616,8 +682,8 @@ class DomService:
 					total_frame_offset.y += snapshot_data.bounds.y
 
 			if 'contentDocument' in node and node['contentDocument']:
-				dom_tree_node.content_document = await _construct_enhanced_node(
-					node['contentDocument'], updated_html_frames, total_frame_offset, all_frames
+				dom_tree_node.content_document = _construct_enhanced_node(
+					node['contentDocument'], updated_html_frames, total_frame_offset
 				)
 				dom_tree_node.content_document.parent_node = dom_tree_node
 				# forcefully set the parent node to the content document node (helps traverse the tree)
@@ -625,9 +691,7 @@ class DomService:
 			if 'shadowRoots' in node and node['shadowRoots']:
 				dom_tree_node.shadow_roots = []
 				for shadow_root in node['shadowRoots']:
-					shadow_root_node = await _construct_enhanced_node(
-						shadow_root, updated_html_frames, total_frame_offset, all_frames
-					)
+					shadow_root_node = _construct_enhanced_node(shadow_root, updated_html_frames, total_frame_offset)
 					# forcefully set the parent node to the shadow root node (helps traverse the tree)
 					shadow_root_node.parent_node = dom_tree_node
 					dom_tree_node.shadow_roots.append(shadow_root_node)
@@ -644,9 +708,7 @@ class DomService:
 					# Skip shadow roots - they should only be in shadow_roots list
 					if child['nodeId'] in shadow_root_node_ids:
 						continue
-					dom_tree_node.children_nodes.append(
-						await _construct_enhanced_node(child, updated_html_frames, total_frame_offset, all_frames)
-					)
+					dom_tree_node.children_nodes.append(_construct_enhanced_node(child, updated_html_frames, total_frame_offset))
 
 			# Set visibility using the collected HTML frames
 			dom_tree_node.is_visible = self.is_element_visible_according_to_all_parents(dom_tree_node, updated_html_frames)
@@ -706,54 +768,29 @@ class DomService:
 						self.logger.debug('Skipping invisible cross-origin iframe')
 
 					if should_process_iframe:
-						# Lazy fetch all_frames only when actually needed (for cross-origin iframes)
-						if all_frames is None:
-							all_frames, _ = await self.browser_session.get_all_frames()
-
-						# Use pre-fetched all_frames to find the iframe's target (no redundant CDP call)
-						frame_id = node.get('frameId', None)
-						if frame_id:
-							frame_info = all_frames.get(frame_id)
-							iframe_document_target = None
-							if frame_info and frame_info.get('frameTargetId'):
-								iframe_target_id = frame_info['frameTargetId']
-								iframe_target = self.browser_session.session_manager.get_target(iframe_target_id)
-								if iframe_target:
-									iframe_document_target = {
-										'targetId': iframe_target.target_id,
-										'url': iframe_target.url,
-										'title': iframe_target.title,
-										'type': iframe_target.target_type,
-									}
-						else:
-							iframe_document_target = None
-						# if target actually exists in one of the frames, just recursively build the dom tree for it
-						if iframe_document_target:
-							self.logger.debug(
-								f'Getting content document for iframe {node.get("frameId", None)} at depth {iframe_depth + 1}'
+						cross_origin_iframes.append(
+							(
+								dom_tree_node,
+								node.get('frameId', None),
+								DOMRect(
+									total_frame_offset.x,
+									total_frame_offset.y,
+									total_frame_offset.width,
+									total_frame_offset.height,
+								),
 							)
-							content_document, _ = await self.get_dom_tree(
-								target_id=iframe_document_target['targetId'],
-								all_frames=all_frames,
-								# TODO: experiment with this values -> not sure whether the whole cross origin iframe should be ALWAYS included as soon as some part of it is visible or not.
-								# Current config: if the cross origin iframe is AT ALL visible, then just include everything inside of it!
-								# initial_html_frames=updated_html_frames,
-								initial_total_frame_offset=total_frame_offset,
-								iframe_depth=iframe_depth + 1,
-							)
-
-							dom_tree_node.content_document = content_document
-							dom_tree_node.content_document.parent_node = dom_tree_node
+						)
 
 			return dom_tree_node
 
 		# Build enhanced DOM tree recursively
-		# Note: all_frames stays None and will be lazily fetched inside _construct_enhanced_node
-		# only if/when a cross-origin iframe is encountered
 		start_construct = time.time()
-		enhanced_dom_tree_node = await _construct_enhanced_node(
-			dom_tree['root'], initial_html_frames, initial_total_frame_offset, all_frames
+		enhanced_dom_tree_node = await self._run_cpu_stage(
+			_construct_enhanced_node, dom_tree['root'], initial_html_frames, initial_total_frame_offset
 		)
+		# Note: all_frames stays None and is only fetched lazily if a visible cross-origin iframe was found
+		if cross_origin_iframes:
+			await self._build_cross_origin_iframes(cross_origin_iframes, all_frames, iframe_depth)
 		timing_info['construct_enhanced_tree_ms'] = (time.time() - start_construct) * 1000
 
 		# Calculate total time for get_dom_tree
@@ -775,10 +812,14 @@ class DomService:
 
 	@observe_debug(ignore_input=True, ignore_output=True, name='get_serialized_dom_tree')
 	async def get_serialized_dom_tree(
-		self, previous_cached_state: SerializedDOMState | None = None
+		self, previous_cached_state: SerializedDOMState | None = None, target_id: TargetID | None = None
 	) -> tuple[SerializedDOMState, EnhancedDOMTreeNode, dict[str, float]]:
 		"""Get the serialized DOM tree representation for LLM consumption.
 
+		Args:
+			previous_cached_state: Previous serialized state, used to mark new elements.
+			target_id: Target to build the DOM for. Defaults to the agent's focused target.
+
 		Returns:
 			Tuple of (serialized_dom_state, enhanced_dom_tree_root, timing_info)
 		"""
@@ -786,14 +827,16 @@ class DomService:
 		start_total = time.time()
 
 		# Use current target (None means use current)
-		assert self.browser_session.agent_focus_target_id is not None
+		if target_id is None:
+			assert self.browser_session.agent_focus_target_id is not None
+			target_id = self.browser_session.agent_focus_target_id
 
 		session_id = self.browser_session.id
 
 		# Build DOM tree (includes CDP calls for snapshot, DOM, AX tree)
 		# Note: all_frames is fetched lazily inside get_dom_tree only if cross-origin iframes need it
 		enhanced_dom_tree, dom_tree_timing = await self.get_dom_tree(
-			target_id=self.browser_session.agent_focus_target_id,
+			target_id=target_id,
 			all_frames=None,  # Lazy - will fetch if needed
 		)
 
@@ -803,9 +846,10 @@ class DomService:
 		# Serialize DOM tree for LLM
 		start_serialize = time.time()
 
-		serialized_dom_state, serializer_timing = DOMTreeSerializer(
+		serializer = DOMTreeSerializer(
 			enhanced_dom_tree, previous_cached_state, paint_order_filtering=self.paint_order_filtering, session_id=session_id
-		).serialize_accessible_elements()
+		)
+		serialized_dom_state, serializer_timing = await self._run_cpu_stage(serializer.serialize_accessible_elements)
 		total_serialization_ms = (time.time() - start_serialize) * 1000
 
 		# Add serializer sub-timings (convert to ms)
@@ -4,15 +4,36 @@ import os
 import re
 import shutil
 from abc import ABC, abstractmethod
+from collections.abc import Callable
 from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any
+from typing import Any, ClassVar, TypeVar
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr, computed_field
+
+from browser_use.filesystem.paged_reader import read_document_window, read_text_window
+from browser_use.utils import create_task_with_error_handling
 
 INVALID_FILENAME_ERROR_MESSAGE = 'Error: Invalid filename format. Must be alphanumeric with supported extension.'
 DEFAULT_FILE_SYSTEM_PATH = 'browseruse_agent_data'
 
+T = TypeVar('T')
+
+# One small pool shared by all files, instead of spinning up a new executor for every write
+_io_executor: ThreadPoolExecutor | None = None
+
+
+def _get_io_executor() -> ThreadPoolExecutor:
+	global _io_executor
+	if _io_executor is None:
+		_io_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='browser_use_fs')
+	return _io_executor
+
+
+async def _run_io(func: Callable[[], T]) -> T:
+	"""Run blocking file I/O on the shared file system executor."""
+	return await asyncio.get_running_loop().run_in_executor(_get_io_executor(), func)
+
 
 class FileSystemError(Exception):
 	"""Custom exception for file system operations that should be shown to LLM"""
@@ -21,10 +42,38 @@ class FileSystemError(Exception):
 
 
 class BaseFile(BaseModel, ABC):
-	"""Base class for all file types"""
+	"""Base class for all file types
+
+	Content is kept as a list of chunks, so appends are O(1) and the chunks are only joined when the
+	content is read. On disk, text files are journaled: appends are written with a true file append
+	and only writes/replacements rewrite the whole file.
+	"""
 
 	name: str
-	content: str = ''
+
+	# Text formats can be appended to in place, binary formats (PDF, DOCX) are regenerated on every sync
+	supports_disk_append: ClassVar[bool] = True
+
+	_chunks: list[str] = PrivateAttr(default_factory=list)
+	# Appended chunks not yet written to disk, and whether the file on disk must be rewritten entirely
+	_unsynced_chunks: list[str] = PrivateAttr(default_factory=list)
+	_needs_rewrite: bool = PrivateAttr(default=True)
+	_io_lock: asyncio.Lock = PrivateAttr(default_factory=asyncio.Lock)
+
+	def __init__(self, content: str = '', **data: Any):
+		super().__init__(**data)
+		self._chunks = [content] if content else []
+
+	@computed_field
+	@property
+	def content(self) -> str:
+		if len(self._chunks) > 1:
+			self._chunks = [''.join(self._chunks)]
+		return self._chunks[0] if self._chunks else ''
+
+	@content.setter
+	def content(self, value: str) -> None:
+		self._chunks = [value] if value else []
 
 	# --- Subclass must define this ---
 	@property
@@ -39,29 +88,61 @@ class BaseFile(BaseModel, ABC):
 
 	def append_file_content(self, content: str) -> None:
 		"""Append content to internal content"""
-		self.update_content(self.content + content)
+		if not content:
+			return
+		self._chunks.append(content)
+		self._unsynced_chunks.append(content)
 
 	# --- These are shared and implemented here ---
 
 	def update_content(self, content: str) -> None:
 		self.content = content
+		self._unsynced_chunks = []
+		self._needs_rewrite = True
 
-	def sync_to_disk_sync(self, path: Path) -> None:
+	@property
+	def has_unsynced_changes(self) -> bool:
+		return self._needs_rewrite or bool(self._unsynced_chunks)
+
+	def _write_to_disk(self, path: Path, content: str) -> None:
+		"""Write the full content to disk, subclasses override this for binary formats."""
 		file_path = path / self.full_name
-		file_path.write_text(self.content)
+		file_path.write_text(content)
+
+	def sync_to_disk_sync(self, path: Path) -> None:
+		self._write_to_disk(path, self.content)
+		self._unsynced_chunks = []
+		self._needs_rewrite = False
 
 	async def sync_to_disk(self, path: Path) -> None:
-		file_path = path / self.full_name
-		with ThreadPoolExecutor() as executor:
-			await asyncio.get_event_loop().run_in_executor(executor, lambda: file_path.write_text(self.content))
+		"""Bring the file on disk up to date, appending only the new chunks when possible."""
+		async with self._io_lock:
+			# Snapshot on the event loop, so appends made while the write runs are kept for the next sync
+			if self._needs_rewrite or not self.supports_disk_append:
+				content = self.content
+				self._unsynced_chunks, self._needs_rewrite = [], False
+				try:
+					await _run_io(lambda: self._write_to_disk(path, content))
+				except Exception:
+					self._needs_rewrite = True
+					raise
+			elif self._unsynced_chunks:
+				pending, self._unsynced_chunks = self._unsynced_chunks, []
+				file_path = path / self.full_name
+				try:
+					await _run_io(lambda: _append_text(file_path, ''.join(pending)))
+				except Exception:
+					self._unsynced_chunks[:0] = pending
+					raise
 
 	async def write(self, content: str, path: Path) -> None:
 		self.write_file_content(content)
 		await self.sync_to_disk(path)
 
-	async def append(self, content: str, path: Path) -> None:
+	async def append(self, content: str, path: Path, sync: bool = True) -> None:
 		self.append_file_content(content)
-		await self.sync_to_disk(path)
+		if sync:
+			await self.sync_to_disk(path)
 
 	def read(self) -> str:
 		return self.content
@@ -72,13 +153,18 @@ class BaseFile(BaseModel, ABC):
 
 	@property
 	def get_size(self) -> int:
-		return len(self.content)
+		return sum(len(chunk) for chunk in self._chunks)
 
 	@property
 	def get_line_count(self) -> int:
 		return len(self.content.splitlines())
 
 
+def _append_text(file_path: Path, text: str) -> None:
+	with file_path.open('a') as f:
+		f.write(text)
+
+
 class MarkdownFile(BaseFile):
 	"""Markdown file implementation"""
 
@@ -122,11 +208,13 @@ class JsonlFile(BaseFile):
 class PdfFile(BaseFile):
 	"""PDF file implementation"""
 
+	supports_disk_append: ClassVar[bool] = False
+
 	@property
 	def extension(self) -> str:
 		return 'pdf'
 
-	def sync_to_disk_sync(self, path: Path) -> None:
+	def _write_to_disk(self, path: Path, content: str) -> None:
 		# Lazy import reportlab
 		from reportlab.lib.pagesizes import letter
 		from reportlab.lib.styles import getSampleStyleSheet
@@ -142,7 +230,7 @@ class PdfFile(BaseFile):
 			# Convert markdown content to simple text and add to PDF
 			# For basic implementation, we'll treat content as plain text
 			# This avoids the AGPL license issue while maintaining functionality
-			content_lines = self.content.split('\n')
+			content_lines = content.split('\n')
 
 			for line in content_lines:
 				if line.strip():
@@ -163,19 +251,17 @@ class PdfFile(BaseFile):
 		except Exception as e:
 			raise FileSystemError(f"Error: Could not write to file '{self.full_name}'. {str(e)}")
 
-	async def sync_to_disk(self, path: Path) -> None:
-		with ThreadPoolExecutor() as executor:
-			await asyncio.get_event_loop().run_in_executor(executor, lambda: self.sync_to_disk_sync(path))
-
 
 class DocxFile(BaseFile):
 	"""DOCX file implementation"""
 
+	supports_disk_append: ClassVar[bool] = False
+
 	@property
 	def extension(self) -> str:
 		return 'docx'
 
-	def sync_to_disk_sync(self, path: Path) -> None:
+	def _write_to_disk(self, path: Path, content: str) -> None:
 		file_path = path / self.full_name
 		try:
 			from docx import Document
@@ -183,7 +269,7 @@ class DocxFile(BaseFile):
 			doc = Document()
 
 			# Convert content to DOCX paragraphs
-			content_lines = self.content.split('\n')
+			content_lines = content.split('\n')
 
 			for line in content_lines:
 				if line.strip():
@@ -203,10 +289,6 @@ class DocxFile(BaseFile):
 		except Exception as e:
 			raise FileSystemError(f"Error: Could not write to file '{self.full_name}'. {str(e)}")
 
-	async def sync_to_disk(self, path: Path) -> None:
-		with ThreadPoolExecutor() as executor:
-			await asyncio.get_event_loop().run_in_executor(executor, lambda: self.sync_to_disk_sync(path))
-
 
 class FileSystemState(BaseModel):
 	"""Serializable state of the file system"""
@@ -219,7 +301,14 @@ class FileSystemState(BaseModel):
 class FileSystem:
 	"""Enhanced file system with in-memory storage and multiple file type support"""
 
-	def __init__(self, base_dir: str | Path, create_default_files: bool = True):
+	def __init__(self, base_dir: str | Path, create_default_files: bool = True, append_flush_interval: float | None = None):
+		"""
+		Args:
+			base_dir: Directory in which the agent data folder is created
+			create_default_files: Whether to create todo.md
+			append_flush_interval: If set, appends are batched in memory and written to disk at most every
+				this many seconds (call flush() to force a write, close() on shutdown). Reads always see the latest content.
+		"""
 		# Handle the Path conversion before calling super().__init__
 		self.base_dir = Path(base_dir) if isinstance(base_dir, str) else base_dir
 		self.base_dir.mkdir(parents=True, exist_ok=True)
@@ -248,6 +337,9 @@ class FileSystem:
 
 		self.extracted_content_count = 0
 
+		self.append_flush_interval = append_flush_interval
+		self._flush_task: asyncio.Task | None = None
+
 	def get_allowed_extensions(self) -> list[str]:
 		"""Get allowed extensions"""
 		return list(self._file_types.keys())
@@ -308,13 +400,19 @@ class FileSystem:
 
 		return file_obj.read()
 
-	async def read_file_structured(self, full_filename: str, external_file: bool = False) -> dict[str, Any]:
+	async def read_file_structured(
+		self, full_filename: str, external_file: bool = False, start: int | None = None, end: int | None = None
+	) -> dict[str, Any]:
 		"""Read file and return structured data including images if applicable.
 
+		start and end select a 1-based, inclusive range of lines (text files) or pages (PDF/DOCX).
+		Large external files are read one window at a time, see paged_reader.
+
 		Returns:
 			dict with keys:
 				- 'message': str - The message to display
 				- 'images': list[dict] | None - Image data if file is an image: [{"name": str, "data": base64_str}]
+				- 'total_lines' / 'total_pages': int - Size of the file, for paged reads
 		"""
 		result: dict[str, Any] = {'message': '', 'images': None}
 
@@ -328,36 +426,15 @@ class FileSystem:
 					)
 					return result
 
-				if extension in ['md', 'txt', 'json', 'jsonl', 'csv']:
-					import anyio
-
-					async with await anyio.open_file(full_filename, 'r') as f:
-						content = await f.read()
-						result['message'] = f'Read from file {full_filename}.\n<content>\n{content}\n</content>'
-						return result
-
-				elif extension == 'docx':
-					from docx import Document
-
-					doc = Document(full_filename)
-					content = '\n'.join([para.text for para in doc.paragraphs])
-					result['message'] = f'Read from file {full_filename}.\n<content>\n{content}\n</content>'
-					return result
-
-				elif extension == 'pdf':
-					import pypdf
-
-					reader = pypdf.PdfReader(full_filename)
-					num_pages = len(reader.pages)
-					MAX_PDF_PAGES = 20
-					extra_pages = num_pages - MAX_PDF_PAGES
-					extracted_text = ''
-					for page in reader.pages[:MAX_PDF_PAGES]:
-						extracted_text += page.extract_text()
-					extra_pages_text = f'{extra_pages} more pages...' if extra_pages > 0 else ''
-					result['message'] = (
-						f'Read from file {full_filename}.\n<content>\n{extracted_text}\n{extra_pages_text}</content>'
-					)
+				if extension in ['md', 'txt', 'json', 'jsonl', 'csv', 'docx', 'pdf']:
+					if extension in ['docx', 'pdf']:
+						window = await read_document_window(full_filename, extension, start=start or 1, end=end)
+						result['total_pages'] = window.total
+					else:
+						window = await _run_io(lambda: read_text_window(full_filename, start=start or 1, end=end))
+						result['total_lines'] = window.total
+					range_text = f'\n{window.describe_range()}' if window.is_partial else ''
+					result['message'] = f'Read from file {full_filename}.\n<content>\n{window.content}\n</content>{range_text}'
 					return result
 
 				elif extension in ['jpg', 'jpeg', 'png']:
@@ -399,6 +476,12 @@ class FileSystem:
 
 		try:
 			content = file_obj.read()
+			if start is not None or end is not None:
+				lines = content.split('\n')
+				first = max(start or 1, 1)
+				last = min(end or len(lines), len(lines))
+				content = '\n'.join(lines[first - 1 : last])
+				result['total_lines'] = len(lines)
 			result['message'] = f'Read from file {full_filename}.\n<content>\n{content}\n</content>'
 			return result
 		except FileSystemError as e:
@@ -408,12 +491,14 @@ class FileSystem:
 			result['message'] = f"Error: Could not read file '{full_filename}'. {str(e)}"
 			return result
 
-	async def read_file(self, full_filename: str, external_file: bool = False) -> str:
+	async def read_file(
+		self, full_filename: str, external_file: bool = False, start: int | None = None, end: int | None = None
+	) -> str:
 		"""Read file content using file-specific read method and return appropriate message to LLM.
 
 		Note: For image files, use read_file_structured() to get image data.
 		"""
-		result = await self.read_file_structured(full_filename, external_file)
+		result = await self.read_file_structured(full_filename, external_file, start=start, end=end)
 		return result['message']
 
 	async def write_file(self, full_filename: str, content: str) -> str:
@@ -452,13 +537,45 @@ class FileSystem:
 			return f"File '{full_filename}' not found."
 
 		try:
-			await file_obj.append(content, self.data_dir)
+			if self.append_flush_interval is None:
+				await file_obj.append(content, self.data_dir)
+			else:
+				await file_obj.append(content, self.data_dir, sync=False)
+				self._schedule_flush()
 			return f'Data appended to file {full_filename} successfully.'
 		except FileSystemError as e:
 			return str(e)
 		except Exception as e:
 			return f"Error: Could not append to file '{full_filename}'. {str(e)}"
 
+	def _schedule_flush(self) -> None:
+		"""Start a delayed flush of batched appends, unless one is already pending."""
+		if self._flush_task is not None and not self._flush_task.done():
+			return
+
+		async def _flush_later() -> None:
+			await asyncio.sleep(self.append_flush_interval or 0)
+			await self.flush()
+
+		self._flush_task = create_task_with_error_handling(_flush_later(), name='file_system_flush', suppress_exceptions=True)
+
+	async def flush(self) -> None:
+		"""Write all batched appends to disk."""
+		for file_obj in list(self.files.values()):
+			if file_obj.has_unsynced_changes:
+				await file_obj.sync_to_disk(self.data_dir)
+
+	async def close(self) -> None:
+		"""Stop the pending delayed flush and write all batched appends to disk."""
+		flush_task, self._flush_task = self._flush_task, None
+		if flush_task is not None and not flush_task.done():
+			flush_task.cancel()
+			try:
+				await flush_task
+			except asyncio.CancelledError:
+				pass
+		await self.flush()
+
 	async def replace_file_str(self, full_filename: str, old_str: str, new_str: str) -> str:
 		"""Replace old_str with new_str in file_name"""
 		if not self._is_valid_filename(full_filename):
@@ -580,7 +697,9 @@ class FileSystem:
 		)
 
 	def nuke(self) -> None:
-		"""Delete the file system directory"""
+		"""Delete the file system directory, discarding batched appends (await close() first to keep them)"""
+		if self._flush_task is not None:
+			self._flush_task.cancel()
 		shutil.rmtree(self.data_dir)
 
 	@classmethod
@@ -0,0 +1,215 @@
+"""Paged reads of large external files for FileSystem.read_file_structured.
+
+Text files are memory-mapped and indexed by line offsets, so a window of lines can be returned
+without loading or decoding the whole file. PDF and DOCX files are parsed in a worker thread,
+keeping pypdf/python-docx off the event loop, and the extracted text is cached per page, keyed
+on the file's mtime and size. Every window reports the total line/page count so the agent can
+ask for a specific range next.
+"""
+
+import asyncio
+import logging
+import mmap
+import os
+import threading
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Literal
+
+logger = logging.getLogger(__name__)
+
+# Windows returned when no explicit end is requested
+DEFAULT_MAX_CHARS = 50_000
+DEFAULT_MAX_PAGES = 20
+
+# DOCX has no stored page layout, paragraphs are grouped into pages of about this many characters
+DOCX_PAGE_CHARS = 3_000
+
+_MAX_CACHED_FILES = 16
+
+
+@dataclass
+class FileWindow:
+	"""A range of lines or pages read from a file. start and end are 1-based and inclusive."""
+
+	content: str
+	unit: Literal['line', 'page']
+	start: int
+	end: int
+	total: int
+	truncated: bool = False  # the window was cut at max_chars inside a single very long line
+
+	@property
+	def is_partial(self) -> bool:
+		return self.truncated or self.start > 1 or self.end < self.total
+
+	def describe_range(self) -> str:
+		if self.total == 0:
+			return f'File has 0 {self.unit}s.'
+		text = f'Showing {self.unit}s {self.start}-{self.end} of {self.total}.'
+		if self.truncated:
+			text += f' {self.unit.capitalize()} {self.end} was cut off because it is too long.'
+		if self.end < self.total:
+			text += f' Use start={self.end + 1} to read further.'
+		return text
+
+
+def _file_key(path: str) -> tuple[str, int, int]:
+	stat = os.stat(path)
+	return os.path.abspath(path), stat.st_mtime_ns, stat.st_size
+
+
+# ---------- Text files ----------
+
+
+class _LineIndex:
+	"""Byte offset of the start of every line of a file."""
+
+	def __init__(self, mm: mmap.mmap, size: int):
+		self.offsets = array('q', [0])
+		pos = mm.find(b'\n')
+		while pos != -1:
+			self.offsets.append(pos + 1)
+			pos = mm.find(b'\n', pos + 1)
+		# A trailing newline doesn't start another line
+		if self.offsets[-1] == size:
+			self.offsets.pop()
+		self.size = size
+
+	@property
+	def line_count(self) -> int:
+		return len(self.offsets) if self.size else 0
+
+	def line_end(self, line: int) -> int:
+		"""Byte offset just past the given 0-based line (including its newline)."""
+		return self.offsets[line + 1] if line + 1 < len(self.offsets) else self.size
+
+
+_line_indexes: OrderedDict[tuple[str, int, int], _LineIndex] = OrderedDict()
+_line_indexes_lock = threading.Lock()  # windows are read from worker threads
+
+
+def read_text_window(path: str, start: int = 1, end: int | None = None, max_chars: int = DEFAULT_MAX_CHARS) -> FileWindow:
+	"""Read lines start..end (1-based, inclusive) of a text file through a memory map.
+
+	Without an end, lines are added until max_chars is reached. A single line longer than
+	max_chars is cut at a byte boundary, so minified JSON or CSV without newlines stays readable.
+	"""
+	key = _file_key(path)
+	size = key[2]
+	if size == 0:
+		return FileWindow(content='', unit='line', start=1, end=0, total=0)
+
+	with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+		with _line_indexes_lock:
+			index = _line_indexes.get(key)
+			if index is not None:
+				_line_indexes.move_to_end(key)
+		if index is None:
+			index = _LineIndex(mm, size)
+			with _line_indexes_lock:
+				_line_indexes[key] = index
+				while len(_line_indexes) > _MAX_CACHED_FILES:
+					_line_indexes.popitem(last=False)
+
+		total = index.line_count
+		first = min(max(start, 1), total) - 1
+		if end is not None:
+			last = min(max(end, first + 1), total) - 1
+		else:
+			# Grow the window line by line until it would exceed max_chars (bytes approximate chars)
+			last = first
+			while last + 1 < total and index.line_end(last + 1) - index.offsets[first] <= max_chars:
+				last += 1
+
+		byte_start = index.offsets[first]
+		byte_end = index.line_end(last)
+		truncated = False
+		if byte_end - byte_start > max_chars and last == first:
+			byte_end = byte_start + max_chars
+			truncated = True
+		content = mm[byte_start:byte_end].decode('utf-8', errors='replace')
+
+	return FileWindow(
+		content=content.removesuffix('\n'), unit='line', start=first + 1, end=last + 1, total=total, truncated=truncated
+	)
+
+
+# ---------- PDF / DOCX ----------
+
+
+def _extract_pdf_pages(path: str, pages: list[int]) -> tuple[int, dict[int, str]]:
+	import pypdf
+
+	reader = pypdf.PdfReader(path)
+	total = len(reader.pages)
+	return total, {i: reader.pages[i].extract_text() for i in pages if 0 <= i < total}
+
+
+def _extract_docx_pages(path: str) -> tuple[int, dict[int, str]]:
+	from docx import Document
+
+	pages: list[str] = []
+	current: list[str] = []
+	current_chars = 0
+	for paragraph in Document(path).paragraphs:
+		current.append(paragraph.text)
+		current_chars += len(paragraph.text) + 1
+		if current_chars >= DOCX_PAGE_CHARS:
+			pages.append('\n'.join(current))
+			current, current_chars = [], 0
+	if current or not pages:
+		pages.append('\n'.join(current))
+	return len(pages), dict(enumerate(pages))
+
+
+def _extract_pages(path: str, extension: str, pages: list[int]) -> tuple[int, dict[int, str]]:
+	"""Returns (total_pages, {page_index: text}) for the requested pages, run off the event loop."""
+	if extension == 'pdf':
+		return _extract_pdf_pages(path, pages)
+	return _extract_docx_pages(path)
+
+
+@dataclass
+class _DocumentPages:
+	total: int
+	pages: dict[int, str]
+
+
+_document_pages: OrderedDict[tuple[str, int, int], _DocumentPages] = OrderedDict()
+
+
+async def _run_extraction(path: str, extension: str, pages: list[int]) -> tuple[int, dict[int, str]]:
+	return await asyncio.to_thread(_extract_pages, path, extension, pages)
+
+
+async def read_document_window(
+	path: str, extension: Literal['pdf', 'docx'], start: int = 1, end: int | None = None, max_pages: int = DEFAULT_MAX_PAGES
+) -> FileWindow:
+	"""Read pages start..end (1-based, inclusive) of a PDF or DOCX file, parsing only uncached pages."""
+	key = _file_key(path)
+	first = max(start, 1) - 1
+	count = max(end - first, 1) if end is not None else max_pages
+
+	cached = _document_pages.get(key)
+	if cached is None:
+		total, pages = await _run_extraction(path, extension, list(range(first, first + count)))
+		cached = _document_pages[key] = _DocumentPages(total=total, pages=pages)
+		# Entries for older versions of the same file fall out of the LRU
+		while len(_document_pages) > _MAX_CACHED_FILES:
+			_document_pages.popitem(last=False)
+	_document_pages.move_to_end(key)
+
+	if cached.total == 0:
+		return FileWindow(content='', unit='page', start=1, end=0, total=0)
+	first = min(first, cached.total - 1)
+	last = min(first + count, cached.total) - 1
+
+	missing = [i for i in range(first, last + 1) if i not in cached.pages]
+	if missing:
+		_, pages = await _run_extraction(path, extension, missing)
+		cached.pages.update(pages)
+
+	content = '\n'.join(cached.pages.get(i, '') for i in range(first, last + 1))
+	return FileWindow(content=content, unit='page', start=first + 1, end=last + 1, total=cached.total)
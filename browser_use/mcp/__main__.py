@@ -2,11 +2,29 @@
 
 Usage:
     python -m browser_use.mcp
+    python -m browser_use.mcp --http --port 8000 --max-sessions 8
 """
 
+import argparse
 import asyncio
 
 from browser_use.mcp.server import main
 
 if __name__ == '__main__':
-	asyncio.run(main())
+	parser = argparse.ArgumentParser(description='browser-use MCP server')
+	parser.add_argument('--http', action='store_true', help='Serve streamable HTTP at /mcp instead of stdio')
+	parser.add_argument('--host', default='127.0.0.1', help='HTTP host (default: 127.0.0.1)')
+	parser.add_argument('--port', type=int, default=8000, help='HTTP port (default: 8000)')
+	parser.add_argument('--max-sessions', type=int, default=4, help='Maximum concurrent browser sessions (default: 4)')
+	parser.add_argument('--session-timeout', type=int, default=10, help='Close sessions idle for this many minutes')
+	args = parser.parse_args()
+
+	asyncio.run(
+		main(
+			session_timeout_minutes=args.session_timeout,
+			transport='http' if args.http else 'stdio',
+			host=args.host,
+			port=args.port,
+			max_sessions=args.max_sessions,
+		)
+	)
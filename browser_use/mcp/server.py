@@ -6,9 +6,15 @@ This server provides tools for:
 - Content extraction from web pages
 - File system operations
 
+Each MCP client gets its own browser session from a bounded pool (see session_pool.py), so calls
+from different clients, or with different session_id arguments, run concurrently.
+
 Usage:
     uvx browser-use --mcp
 
+Or over streamable HTTP for many clients:
+    python -m browser_use.mcp --http --port 8000 --max-sessions 8
+
 Or as an MCP server in Claude Desktop or other MCP clients:
     {
         "mcpServers": {
@@ -26,8 +32,6 @@ Or as an MCP server in Claude Desktop or other MCP clients:
 import os
 import sys
 
-from browser_use.llm import ChatAWSBedrock
-
 # Set environment variables BEFORE any browser_use imports to prevent early logging
 os.environ['BROWSER_USE_LOGGING_LEVEL'] = 'critical'
 os.environ['BROWSER_USE_SETUP_LOGGING'] = 'false'
@@ -36,8 +40,11 @@ import asyncio
 import json
 import logging
 import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any, Literal
 
 # Configure logging for MCP mode - redirect to stderr but preserve critical diagnostics
 logging.basicConfig(
@@ -94,9 +101,14 @@ from browser_use import ActionModel, Agent
 from browser_use.browser import BrowserProfile, BrowserSession
 from browser_use.config import get_default_llm, get_default_profile, load_browser_use_config
 from browser_use.filesystem.file_system import FileSystem
-from browser_use.llm.openai.chat import ChatOpenAI
+from browser_use.mcp.session_pool import PoolEntry, SessionPool
 from browser_use.tools.service import Tools
 
+if TYPE_CHECKING:
+	from starlette.applications import Starlette
+
+	from browser_use.llm.openai.chat import ChatOpenAI
+
 logger = logging.getLogger(__name__)
 
 
@@ -184,38 +196,103 @@ def get_parent_process_cmdline() -> str | None:
 		return None
 
 
+DEFAULT_SESSION_KEY = 'default'
+
+# Tools that run against a pooled browser session and accept a session_id argument
+_SESSION_SCOPED_TOOLS = {
+	'browser_navigate',
+	'browser_click',
+	'browser_type',
+	'browser_get_state',
+	'browser_extract_content',
+	'browser_scroll',
+	'browser_go_back',
+	'browser_close',
+	'browser_list_tabs',
+	'browser_switch_tab',
+	'browser_close_tab',
+}
+
+_SESSION_ID_PROPERTY = {
+	'type': 'string',
+	'description': 'Optional browser session to run in. Calls with different session_ids use separate browsers and run in '
+	'parallel. Defaults to one session per client connection.',
+}
+
+
+@dataclass
+class ClientBrowser:
+	"""Browser state owned by one MCP client or session_id."""
+
+	browser_session: BrowserSession
+	tools: Tools
+	file_system: FileSystem
+
+
+# Pool entry of the tool call being handled. Every MCP request runs in its own task, so concurrent
+# calls for different sessions each see their own browser through the properties below.
+_current_browser: ContextVar[PoolEntry[ClientBrowser] | None] = ContextVar('mcp_current_browser', default=None)
+
+
 class BrowserUseServer:
 	"""MCP Server for browser-use capabilities."""
 
-	def __init__(self, session_timeout_minutes: int = 10):
+	def __init__(self, session_timeout_minutes: int = 10, max_sessions: int = 4):
 		# Ensure all logging goes to stderr (in case new loggers were created)
 		_ensure_all_loggers_use_stderr()
 
 		self.server = Server('browser-use')
 		self.config = load_browser_use_config()
 		self.agent: Agent | None = None
-		self.browser_session: BrowserSession | None = None
-		self.tools: Tools | None = None
-		self.llm: ChatOpenAI | None = None
-		self.file_system: FileSystem | None = None
+		self.llm: 'ChatOpenAI | None' = None
 		self._telemetry = ProductTelemetry()
 		self._start_time = time.time()
 
 		# Session management
-		self.active_sessions: dict[str, dict[str, Any]] = {}  # session_id -> session info
+		self.pool: SessionPool[ClientBrowser] = SessionPool(
+			self._create_client_browser, self._close_client_browser, max_sessions=max_sessions
+		)
 		self.session_timeout_minutes = session_timeout_minutes
 		self._cleanup_task: Any = None
 
 		# Setup handlers
 		self._setup_handlers()
 
+	@property
+	def browser_session(self) -> BrowserSession | None:
+		entry = _current_browser.get()
+		return entry.value.browser_session if entry else None
+
+	@property
+	def tools(self) -> Tools | None:
+		entry = _current_browser.get()
+		return entry.value.tools if entry else None
+
+	@property
+	def file_system(self) -> FileSystem | None:
+		entry = _current_browser.get()
+		return entry.value.file_system if entry else None
+
+	def _session_key(self, arguments: dict[str, Any]) -> str:
+		"""Pool key for a tool call: explicit session_id, else the HTTP client's MCP session, else the stdio client."""
+		if session_id := arguments.get('session_id'):
+			return str(session_id)
+		try:
+			request = getattr(self.server.request_context, 'request', None)
+		except LookupError:
+			return DEFAULT_SESSION_KEY
+		headers = getattr(request, 'headers', None)
+		if headers is not None and (mcp_session_id := headers.get('mcp-session-id')):
+			return mcp_session_id
+		return DEFAULT_SESSION_KEY
+
 	def _setup_handlers(self):
 		"""Setup MCP server handlers."""
 
 		@self.server.list_tools()
 		async def handle_list_tools() -> list[types.Tool]:
 			"""List all available browser-use tools."""
-			return [
+			tools = [
 				# Agent tools
 				# Direct browser control tools
 				types.Tool(
@@ -405,6 +482,10 @@ class BrowserUseServer:
 					inputSchema={'type': 'object', 'properties': {}},
 				),
 			]
+			for tool in tools:
+				if tool.name in _SESSION_SCOPED_TOOLS:
+					tool.inputSchema['properties']['session_id'] = _SESSION_ID_PROPERTY
+			return tools
 
 		@self.server.list_resources()
 		async def handle_list_resources() -> list[types.Resource]:
@@ -464,56 +545,61 @@ class BrowserUseServer:
 		elif tool_name == 'browser_close_all':
 			return await self._close_all_sessions()
 
-		# Direct browser control tools (require active session)
+		elif tool_name == 'browser_close':
+			# Closed through the pool instead of inside pool.session(), so the slot is freed only once the browser is gone
+			return await self._close_browser(self._session_key(arguments))
+
+		# Direct browser control tools, run in the caller's pooled browser session
 		elif tool_name.startswith('browser_'):
-			# Ensure browser session exists
-			if not self.browser_session:
-				await self._init_browser_session()
+			async with self.pool.session(self._session_key(arguments)) as entry:
+				token = _current_browser.set(entry)
+				try:
+					return await self._execute_browser_tool(tool_name, arguments)
+				finally:
+					_current_browser.reset(token)
 
-			if tool_name == 'browser_navigate':
-				return await self._navigate(arguments['url'], arguments.get('new_tab', False))
+		return f'Unknown tool: {tool_name}'
 
-			elif tool_name == 'browser_click':
-				return await self._click(arguments['index'], arguments.get('new_tab', False))
+	async def _execute_browser_tool(self, tool_name: str, arguments: dict[str, Any]) -> str:
+		"""Execute a direct browser control tool in the current pooled session."""
+		if tool_name == 'browser_navigate':
+			return await self._navigate(arguments['url'], arguments.get('new_tab', False))
 
-			elif tool_name == 'browser_type':
-				return await self._type_text(arguments['index'], arguments['text'])
+		elif tool_name == 'browser_click':
+			return await self._click(arguments['index'], arguments.get('new_tab', False))
 
-			elif tool_name == 'browser_get_state':
-				return await self._get_browser_state(arguments.get('include_screenshot', False))
+		elif tool_name == 'browser_type':
+			return await self._type_text(arguments['index'], arguments['text'])
 
-			elif tool_name == 'browser_extract_content':
-				return await self._extract_content(arguments['query'], arguments.get('extract_links', False))
+		elif tool_name == 'browser_get_state':
+			return await self._get_browser_state(arguments.get('include_screenshot', False))
 
-			elif tool_name == 'browser_scroll':
-				return await self._scroll(arguments.get('direction', 'down'))
+		elif tool_name == 'browser_extract_content':
+			return await self._extract_content(arguments['query'], arguments.get('extract_links', False))
 
-			elif tool_name == 'browser_go_back':
-				return await self._go_back()
+		elif tool_name == 'browser_scroll':
+			return await self._scroll(arguments.get('direction', 'down'))
 
-			elif tool_name == 'browser_close':
-				return await self._close_browser()
+		elif tool_name == 'browser_go_back':
+			return await self._go_back()
 
-			elif tool_name == 'browser_list_tabs':
-				return await self._list_tabs()
+		elif tool_name == 'browser_list_tabs':
+			return await self._list_tabs()
 
-			elif tool_name == 'browser_switch_tab':
-				return await self._switch_tab(arguments['tab_id'])
+		elif tool_name == 'browser_switch_tab':
+			return await self._switch_tab(arguments['tab_id'])
 
-			elif tool_name == 'browser_close_tab':
-				return await self._close_tab(arguments['tab_id'])
+		elif tool_name == 'browser_close_tab':
+			return await self._close_tab(arguments['tab_id'])
 
 		return f'Unknown tool: {tool_name}'
 
-	async def _init_browser_session(self, allowed_domains: list[str] | None = None, **kwargs):
-		"""Initialize browser session using config"""
-		if self.browser_session:
-			return
-
+	async def _create_client_browser(self, key: str) -> ClientBrowser:
+		"""Start a browser session for one pool key using config"""
 		# Ensure all logging goes to stderr before browser initialization
 		_ensure_all_loggers_use_stderr()
 
-		logger.debug('Initializing browser session...')
+		logger.debug(f'Initializing browser session {key}...')
 
 		# Get profile config
 		profile_config = get_default_profile(self.config)
@@ -530,46 +616,46 @@ class BrowserUseServer:
 			**profile_config,  # Config values override defaults
 		}
 
-		# Tool parameter overrides (highest priority)
-		if allowed_domains is not None:
-			profile_data['allowed_domains'] = allowed_domains
-
-		# Merge any additional kwargs that are valid BrowserProfile fields
-		for key, value in kwargs.items():
-			profile_data[key] = value
+		# Chrome can't open one profile twice, additional sessions get a fresh temporary profile
+		if key != DEFAULT_SESSION_KEY:
+			profile_data['user_data_dir'] = None
 
 		# Create browser profile
 		profile = BrowserProfile(**profile_data)
 
 		# Create browser session
-		self.browser_session = BrowserSession(browser_profile=profile)
-		await self.browser_session.start()
-
-		# Track the session for management
-		self._track_session(self.browser_session)
+		browser_session = BrowserSession(browser_profile=profile)
+		await browser_session.start()
 
-		# Create tools for direct actions
-		self.tools = Tools()
+		# Initialize LLM from config, shared by all sessions
+		if self.llm is None:
+			llm_config = get_default_llm(self.config)
+			base_url = llm_config.get('base_url', None)
+			kwargs = {}
+			if base_url:
+				kwargs['base_url'] = base_url
+			if api_key := llm_config.get('api_key'):
+				from browser_use.llm.openai.chat import ChatOpenAI
+
+				self.llm = ChatOpenAI(
+					model=llm_config.get('model', 'gpt-o4-mini'),
+					api_key=api_key,
+					temperature=llm_config.get('temperature', 0.7),
+					**kwargs,
+				)
 
-		# Initialize LLM from config
-		llm_config = get_default_llm(self.config)
-		base_url = llm_config.get('base_url', None)
-		kwargs = {}
-		if base_url:
-			kwargs['base_url'] = base_url
-		if api_key := llm_config.get('api_key'):
-			self.llm = ChatOpenAI(
-				model=llm_config.get('model', 'gpt-o4-mini'),
-				api_key=api_key,
-				temperature=llm_config.get('temperature', 0.7),
-				**kwargs,
-			)
+		# Initialize FileSystem for extraction actions, one directory per session
+		file_system_path = Path(profile_config.get('file_system_path', '~/.browser-use-mcp')).expanduser()
+		if key != DEFAULT_SESSION_KEY:
+			file_system_path = file_system_path / 'sessions' / ''.join(c if c.isalnum() or c in '-_' else '_' for c in key)
+		file_system = FileSystem(base_dir=file_system_path)
 
-		# Initialize FileSystem for extraction actions
-		file_system_path = profile_config.get('file_system_path', '~/.browser-use-mcp')
-		self.file_system = FileSystem(base_dir=Path(file_system_path).expanduser())
+		logger.debug(f'Browser session {key} initialized')
+		# Create tools for direct actions
+		return ClientBrowser(browser_session=browser_session, tools=Tools(), file_system=file_system)
 
-		logger.debug('Browser session initialized')
+	async def _close_client_browser(self, client_browser: ClientBrowser) -> None:
+		await client_browser.browser_session.kill()
 
 	async def _retry_with_browser_use_agent(
 		self,
@@ -594,6 +680,8 @@ class BrowserUseServer:
 			aws_region = llm_config.get('region') or os.getenv('REGION')
 			if not aws_region:
 				aws_region = 'us-east-1'
+			from browser_use.llm.aws.chat_bedrock import ChatAWSBedrock
+
 			llm = ChatAWSBedrock(
 				model=llm_model,  # or any Bedrock model
 				aws_region=aws_region,
@@ -614,6 +702,8 @@ class BrowserUseServer:
 			kwargs = {}
 			if base_url:
 				kwargs['base_url'] = base_url
+			from browser_use.llm.openai.chat import ChatOpenAI
+
 			llm = ChatOpenAI(
 				model=llm_model,
 				api_key=api_key,
@@ -679,9 +769,6 @@ class BrowserUseServer:
 		if not self.browser_session:
 			return 'Error: No browser session active'
 
-		# Update session activity
-		self._update_session_activity(self.browser_session.id)
-
 		from browser_use.browser.events import NavigateToUrlEvent
 
 		if new_tab:
@@ -698,9 +785,6 @@ class BrowserUseServer:
 		if not self.browser_session:
 			return 'Error: No browser session active'
 
-		# Update session activity
-		self._update_session_activity(self.browser_session.id)
-
 		# Get the element
 		element = await self.browser_session.get_dom_element_by_index(index)
 		if not element:
@@ -892,15 +976,9 @@ class BrowserUseServer:
 		await event
 		return 'Navigated back'
 
-	async def _close_browser(self) -> str:
-		"""Close the browser session."""
-		if self.browser_session:
-			from browser_use.browser.events import BrowserStopEvent
-
-			event = self.browser_session.event_bus.dispatch(BrowserStopEvent())
-			await event
-			self.browser_session = None
-			self.tools = None
+	async def _close_browser(self, key: str) -> str:
+		"""Close the caller's browser session, the next call for this session starts a new browser."""
+		if await self.pool.close(key):
 			return 'Browser closed'
 		return 'No browser session to close'
 
@@ -941,119 +1019,68 @@ class BrowserUseServer:
 		current_url = await self.browser_session.get_current_page_url()
 		return f'Closed tab # {tab_id}, now on {current_url}'
 
-	def _track_session(self, session: BrowserSession) -> None:
-		"""Track a browser session for management."""
-		self.active_sessions[session.id] = {
-			'session': session,
-			'created_at': time.time(),
-			'last_activity': time.time(),
-			'url': getattr(session, 'current_url', None),
-		}
-
-	def _update_session_activity(self, session_id: str) -> None:
-		"""Update the last activity time for a session."""
-		if session_id in self.active_sessions:
-			self.active_sessions[session_id]['last_activity'] = time.time()
+	def _find_session_key(self, session_id: str) -> str | None:
+		"""Resolve a pool key or a BrowserSession id to a pool key."""
+		if session_id in self.pool:
+			return session_id
+		for entry in self.pool.entries():
+			if entry.value.browser_session.id == session_id:
+				return entry.key
+		return None
 
 	async def _list_sessions(self) -> str:
 		"""List all active browser sessions."""
-		if not self.active_sessions:
+		entries = self.pool.entries()
+		if not entries:
 			return 'No active browser sessions'
 
 		sessions_info = []
-		for session_id, session_data in self.active_sessions.items():
-			session = session_data['session']
-			created_at = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(session_data['created_at']))
-			last_activity = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(session_data['last_activity']))
+		for entry in entries:
+			session = entry.value.browser_session
+			created_at = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(entry.created_at))
+			last_activity = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(entry.last_activity))
 
 			# Check if session is still active
 			is_active = hasattr(session, 'cdp_client') and session.cdp_client is not None
 
 			sessions_info.append(
 				{
-					'session_id': session_id,
+					'session_id': entry.key,
+					'browser_session_id': session.id,
 					'created_at': created_at,
 					'last_activity': last_activity,
 					'active': is_active,
-					'current_url': session_data.get('url', 'Unknown'),
-					'age_minutes': (time.time() - session_data['created_at']) / 60,
+					'busy': entry.in_use > 0,
+					'age_minutes': (time.time() - entry.created_at) / 60,
 				}
 			)
 
 		return json.dumps(sessions_info, indent=2)
 
 	async def _close_session(self, session_id: str) -> str:
-		"""Close a specific browser session."""
-		if session_id not in self.active_sessions:
+		"""Close a specific browser session, waiting for its current tool call to finish."""
+		key = self._find_session_key(session_id)
+		if key is None:
 			return f'Session {session_id} not found'
 
-		session_data = self.active_sessions[session_id]
-		session = session_data['session']
-
 		try:
-			# Close the session
-			if hasattr(session, 'kill'):
-				await session.kill()
-			elif hasattr(session, 'close'):
-				await session.close()
-
-			# Remove from tracking
-			del self.active_sessions[session_id]
-
-			# If this was the current session, clear it
-			if self.browser_session and self.browser_session.id == session_id:
-				self.browser_session = None
-				self.tools = None
-
+			await self.pool.close(key)
 			return f'Successfully closed session {session_id}'
 		except Exception as e:
 			return f'Error closing session {session_id}: {str(e)}'
 
 	async def _close_all_sessions(self) -> str:
 		"""Close all active browser sessions."""
-		if not self.active_sessions:
+		if not len(self.pool):
 			return 'No active sessions to close'
 
-		closed_count = 0
-		errors = []
-
-		for session_id in list(self.active_sessions.keys()):
-			try:
-				result = await self._close_session(session_id)
-				if 'Successfully closed' in result:
-					closed_count += 1
-				else:
-					errors.append(f'{session_id}: {result}')
-			except Exception as e:
-				errors.append(f'{session_id}: {str(e)}')
-
-		# Clear current session references
-		self.browser_session = None
-		self.tools = None
-
-		result = f'Closed {closed_count} sessions'
-		if errors:
-			result += f'. Errors: {"; ".join(errors)}'
-
-		return result
+		closed_count = await self.pool.close_all()
+		return f'Closed {closed_count} sessions'
 
 	async def _cleanup_expired_sessions(self) -> None:
 		"""Background task to clean up expired sessions."""
-		current_time = time.time()
-		timeout_seconds = self.session_timeout_minutes * 60
-
-		expired_sessions = []
-		for session_id, session_data in self.active_sessions.items():
-			last_activity = session_data['last_activity']
-			if current_time - last_activity > timeout_seconds:
-				expired_sessions.append(session_id)
-
-		for session_id in expired_sessions:
-			try:
-				await self._close_session(session_id)
-				logger.info(f'Auto-closed expired session {session_id}')
-			except Exception as e:
-				logger.error(f'Error auto-closing session {session_id}: {e}')
+		for session_id in await self.pool.close_idle(self.session_timeout_minutes * 60):
+			logger.info(f'Auto-closed expired session {session_id}')
 
 	async def _start_cleanup_task(self) -> None:
 		"""Start the background cleanup task."""
@@ -1070,32 +1097,69 @@ class BrowserUseServer:
 
 		self._cleanup_task = create_task_with_error_handling(cleanup_loop(), name='mcp_cleanup_loop', suppress_exceptions=True)
 
-	async def run(self):
-		"""Run the MCP server."""
+	def _initialization_options(self) -> InitializationOptions:
+		return InitializationOptions(
+			server_name='browser-use',
+			server_version='0.1.0',
+			capabilities=self.server.get_capabilities(
+				notification_options=NotificationOptions(),
+				experimental_capabilities={},
+			),
+		)
+
+	async def run(self, transport: Literal['stdio', 'http'] = 'stdio', host: str = '127.0.0.1', port: int = 8000):
+		"""Run the MCP server over stdio (one client) or streamable HTTP (many clients)."""
 		# Start the cleanup task
 		await self._start_cleanup_task()
 
-		async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
-			await self.server.run(
-				read_stream,
-				write_stream,
-				InitializationOptions(
-					server_name='browser-use',
-					server_version='0.1.0',
-					capabilities=self.server.get_capabilities(
-						notification_options=NotificationOptions(),
-						experimental_capabilities={},
-					),
-				),
-			)
+		try:
+			if transport == 'http':
+				await self._run_http(host, port)
+			else:
+				async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
+					await self.server.run(read_stream, write_stream, self._initialization_options())
+		finally:
+			if self._cleanup_task:
+				self._cleanup_task.cancel()
+			await self.pool.close_all()
+
+	async def _run_http(self, host: str, port: int) -> None:
+		"""Serve the streamable HTTP transport at http://host:port/mcp, each client gets its own MCP session id."""
+		import uvicorn
+
+		await uvicorn.Server(uvicorn.Config(self._http_app(), host=host, port=port, log_level='warning')).serve()
+
+	def _http_app(self) -> 'Starlette':
+		"""ASGI app serving the streamable HTTP transport at /mcp."""
+		from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+		from starlette.applications import Starlette
+		from starlette.routing import Mount
+
+		session_manager = StreamableHTTPSessionManager(app=self.server)
+
+		async def handle_streamable_http(scope, receive, send) -> None:
+			await session_manager.handle_request(scope, receive, send)
+
+		@asynccontextmanager
+		async def lifespan(app: Starlette):
+			async with session_manager.run():
+				yield
+
+		return Starlette(routes=[Mount('/mcp', app=handle_streamable_http)], lifespan=lifespan)
 
 
-async def main(session_timeout_minutes: int = 10):
+async def main(
+	session_timeout_minutes: int = 10,
+	transport: Literal['stdio', 'http'] = 'stdio',
+	host: str = '127.0.0.1',
+	port: int = 8000,
+	max_sessions: int = 4,
+):
 	if not MCP_AVAILABLE:
 		print('MCP SDK is required. Install with: pip install mcp', file=sys.stderr)
 		sys.exit(1)
 
-	server = BrowserUseServer(session_timeout_minutes=session_timeout_minutes)
+	server = BrowserUseServer(session_timeout_minutes=session_timeout_minutes, max_sessions=max_sessions)
 	server._telemetry.capture(
 		MCPServerTelemetryEvent(
 			version=get_browser_use_version(),
@@ -1105,7 +1169,7 @@ async def main(session_timeout_minutes: int = 10):
 	)
 
 	try:
-		await server.run()
+		await server.run(transport=transport, host=host, port=port)
 	finally:
 		duration = time.time() - server._start_time
 		server._telemetry.capture(
@@ -0,0 +1,176 @@
+"""Bounded pool of per-client browser sessions for the MCP server.
+
+Every MCP client (or explicit session_id) gets its own entry. Calls for the same key run one at a
+time, calls for different keys run concurrently. When the pool is full, the least recently used
+idle entry is closed to make room; if every entry is busy, new keys wait for one to finish.
+An entry that is being closed keeps its slot until its value is closed, and a new value is only
+created once a slot is free, so there are never more than max_sessions live values.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Generic, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+
+@dataclass
+class PoolEntry(Generic[T]):
+	"""A pooled value and its usage bookkeeping."""
+
+	key: str
+	value: T
+	created_at: float = field(default_factory=time.time)
+	last_activity: float = field(default_factory=time.time)
+	in_use: int = 0  # callers holding or waiting for the entry
+	lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+class SessionPool(Generic[T]):
+	"""Keyed pool that creates values on demand with factory(key) and closes them with closer(value)."""
+
+	def __init__(
+		self,
+		factory: Callable[[str], Awaitable[T]],
+		closer: Callable[[T], Awaitable[None]],
+		max_sessions: int = 4,
+	):
+		if max_sessions < 1:
+			raise ValueError('max_sessions must be at least 1')
+		self.factory = factory
+		self.closer = closer
+		self.max_sessions = max_sessions
+		self._entries: dict[str, PoolEntry[T]] = {}
+		self._creating: set[str] = set()
+		self._closing = 0  # entries removed from the pool whose value is still being closed
+		self._changed = asyncio.Condition()
+
+	@asynccontextmanager
+	async def session(self, key: str) -> AsyncIterator[PoolEntry[T]]:
+		"""Hold the entry for key exclusively, creating it (and evicting an idle one) if needed."""
+		while True:
+			entry = await self._checkout(key)
+			try:
+				await entry.lock.acquire()
+			except BaseException:
+				entry.in_use -= 1
+				raise
+			if self._entries.get(key) is entry:
+				break
+			# Closed while we were waiting for the previous call, start over with a fresh session
+			entry.lock.release()
+			entry.in_use -= 1
+		try:
+			entry.last_activity = time.time()
+			yield entry
+		finally:
+			entry.lock.release()
+			entry.in_use -= 1
+			entry.last_activity = time.time()
+			async with self._changed:
+				self._changed.notify_all()
+
+	async def _checkout(self, key: str) -> PoolEntry[T]:
+		victim: PoolEntry[T] | None = None
+		async with self._changed:
+			while True:
+				if entry := self._entries.get(key):
+					entry.in_use += 1
+					break
+				if key in self._creating:
+					await self._changed.wait()
+				elif len(self._entries) + len(self._creating) + self._closing < self.max_sessions:
+					self._creating.add(key)
+					entry = None
+					break
+				elif idle := [e for e in self._entries.values() if e.in_use == 0]:
+					victim = min(idle, key=lambda e: e.last_activity)
+					logger.info(f'Browser session pool is full ({self.max_sessions}), closing idle session {victim.key}')
+					del self._entries[victim.key]
+					# Take over the victim's slot now, but only create the new value once the victim is closed
+					self._creating.add(key)
+					self._closing += 1
+					entry = None
+					break
+				else:
+					await self._changed.wait()
+
+		if entry is not None:
+			return entry
+
+		try:
+			if victim is not None:
+				try:
+					await self._close_value(victim)
+				finally:
+					async with self._changed:
+						self._closing -= 1
+						self._changed.notify_all()
+			value = await self.factory(key)
+		except BaseException:
+			async with self._changed:
+				self._creating.discard(key)
+				self._changed.notify_all()
+			raise
+		async with self._changed:
+			self._creating.discard(key)
+			entry = self._entries[key] = PoolEntry(key=key, value=value, in_use=1)
+			self._changed.notify_all()
+		return entry
+
+	async def close(self, key: str) -> bool:
+		"""Close the entry for key once its current call finishes. Returns False if there is no such entry."""
+		entry = self._entries.get(key)
+		if entry is None:
+			return False
+		async with entry.lock:
+			if self._entries.get(key) is not entry:
+				return False
+			del self._entries[key]
+			self._closing += 1
+		try:
+			await self._close_value(entry)
+		finally:
+			async with self._changed:
+				self._closing -= 1
+				self._changed.notify_all()
+		return True
+
+	def discard(self, key: str) -> None:
+		"""Forget an entry whose value the caller already closed."""
+		self._entries.pop(key, None)
+
+	async def close_all(self) -> int:
+		keys = list(self._entries)
+		closed = await asyncio.gather(*(self.close(key) for key in keys))
+		return sum(closed)
+
+	async def close_idle(self, max_idle_seconds: float) -> list[str]:
+		"""Close entries that haven't been used for max_idle_seconds."""
+		cutoff = time.time() - max_idle_seconds
+		expired = [e.key for e in self._entries.values() if e.in_use == 0 and e.last_activity < cutoff]
+		return [key for key in expired if await self.close(key)]
+
+	async def _close_value(self, entry: PoolEntry[T]) -> None:
+		try:
+			await self.closer(entry.value)
+		except Exception as e:
+			logger.warning(f'Error closing pooled session {entry.key}: {type(e).__name__}: {e}')
+
+	def entries(self) -> list[PoolEntry[T]]:
+		return list(self._entries.values())
+
+	def get(self, key: str) -> PoolEntry[T] | None:
+		return self._entries.get(key)
+
+	def __contains__(self, key: str) -> bool:
+		return key in self._entries
+
+	def __len__(self) -> int:
+		return len(self._entries)
@@ -0,0 +1,235 @@
+"""Sampling profiler for agent runs.
+
+A daemon thread samples the event loop thread every `interval` seconds through sys._current_frames(),
+so the profiled code is never instrumented and the overhead stays at one stack walk per sample.
+
+Samples are asyncio-task-aware: while the loop is running Python code the sample is the thread's call
+stack, while it is idle in the selector (waiting on the LLM, CDP or a sleep) the sample is the await
+chain of the profiled task instead, so waiting time shows up under the coroutine that is waiting.
+Every sample is tagged with the agent's step number and phase, the phase being the innermost agent
+method (see AGENT_PHASES) on the sampled stack or, while another task runs, on the agent's await chain.
+
+Results are exported as speedscope JSON (https://www.speedscope.app, one profile per step) and as
+collapsed stacks for flamegraph.pl / inferno.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable, Collection, Mapping
+from pathlib import Path
+from types import CodeType, FrameType
+
+logger = logging.getLogger(__name__)
+
+# Innermost matching method on the sampled stack -> phase the sample is tagged with
+AGENT_PHASES: Mapping[str, str] = {
+	'Agent._prepare_context': 'prepare_context',
+	'Agent._get_next_action': 'llm',
+	'Agent.multi_act': 'actions',
+	'Agent._post_process': 'post_process',
+	'Agent._finalize': 'finalize',
+}
+CODE_AGENT_PHASES: Mapping[str, str] = {
+	'CodeAgent._get_browser_state': 'browser_state',
+	'CodeAgent._get_code_from_llm': 'llm',
+	'CodeAgent._execute_code': 'execute_code',
+	'CodeAgent._capture_screenshot': 'finalize',
+	'CodeAgent._add_step_to_complete_history': 'finalize',
+}
+
+IDLE_FRAME = '[awaiting]'
+NO_PHASE = 'other'
+
+# Where an idle event loop blocks (uvloop blocks in C, its idle time is reported as running)
+_SELECTOR_FUNCTIONS = frozenset({'select', '_poll'})
+_SELECTOR_FILES = ('selectors.py', 'windows_events.py')
+
+
+def _is_idle(frame: FrameType) -> bool:
+	code = frame.f_code
+	return code.co_name in _SELECTOR_FUNCTIONS and code.co_filename.endswith(_SELECTOR_FILES)
+
+
+def _await_chain(task: asyncio.Task | None, max_depth: int) -> list[FrameType]:
+	"""Frames of the coroutines task is suspended in, outermost first, continuing into awaited tasks."""
+	frames: list[FrameType] = []
+	while task is not None and len(frames) < max_depth:
+		awaitable = task.get_coro()
+		while awaitable is not None and len(frames) < max_depth:
+			frame = getattr(awaitable, 'cr_frame', None) or getattr(awaitable, 'gi_frame', None)
+			if frame is None:
+				break
+			frames.append(frame)
+			awaitable = getattr(awaitable, 'cr_await', None) or getattr(awaitable, 'gi_yieldfrom', None)
+		# The future a suspended task waits on, another task when it awaits one (directly or via wait_for)
+		waiter = getattr(task, '_fut_waiter', None)
+		task = waiter if isinstance(waiter, asyncio.Task) else None
+	return frames
+
+
+def _thread_stack(frame: FrameType | None, max_depth: int) -> list[FrameType]:
+	frames: list[FrameType] = []
+	while frame is not None and len(frames) < max_depth:
+		frames.append(frame)
+		frame = frame.f_back
+	frames.reverse()
+	return frames
+
+
+class SamplingProfiler:
+	"""Samples the event loop thread of an agent run, tagged with step number and phase."""
+
+	def __init__(
+		self,
+		interval: float = 0.01,
+		step: Callable[[], int] | None = None,
+		steps: Collection[int] | None = None,
+		phases: Mapping[str, str] = AGENT_PHASES,
+		max_depth: int = 128,
+	):
+		self.interval = interval
+		self.steps = set(steps) if steps is not None else None
+		self.phases = phases
+		self.max_depth = max_depth
+		self._step = step
+		self._thread_id: int | None = None
+		self._task: asyncio.Task | None = None
+		self._thread: threading.Thread | None = None
+		self._stop = threading.Event()
+		# Consecutive identical samples are merged: [step, phase, stack, milliseconds]
+		self._samples: list[list] = []
+		self._labels: dict[CodeType, str] = {}
+		self._frames: dict[str, tuple[str, str, int]] = {}  # label -> (name, file, line)
+
+	@property
+	def running(self) -> bool:
+		return self._thread is not None
+
+	def start(self, task: asyncio.Task | None = None) -> None:
+		"""Start sampling the calling thread's event loop and task (must be called from inside the loop)."""
+		if self._thread is not None:
+			return
+		self._thread_id = threading.get_ident()
+		self._task = task or asyncio.current_task()
+		self._stop.clear()
+		self._thread = threading.Thread(target=self._sample_loop, name='browser-use-profiler', daemon=True)
+		self._thread.start()
+
+	def stop(self) -> None:
+		if self._thread is None:
+			return
+		self._stop.set()
+		self._thread.join()
+		self._thread = None
+		self._task = None
+
+	def _sample_loop(self) -> None:
+		last = time.perf_counter()
+		while not self._stop.wait(self.interval):
+			now = time.perf_counter()
+			try:
+				self._sample((now - last) * 1000)
+			except Exception as e:
+				logger.debug(f'Profiler sample failed: {type(e).__name__}: {e}')
+			last = now
+
+	def _sample(self, weight_ms: float) -> None:
+		assert self._thread_id is not None
+		frame = sys._current_frames().get(self._thread_id)
+		if frame is None:
+			return
+		step = self._step() if self._step else 0
+		if self.steps is not None and step not in self.steps:
+			return
+
+		await_chain = _await_chain(self._task, self.max_depth)
+		if _is_idle(frame):
+			frames = await_chain
+			stack = (IDLE_FRAME, *(self._label(f) for f in frames))
+		else:
+			# The running task's own frames are only on the thread stack, other tasks leave the agent suspended
+			frames = _thread_stack(frame, self.max_depth) + await_chain
+			stack = tuple(self._label(f) for f in frames[: len(frames) - len(await_chain)])
+
+		phase = NO_PHASE
+		for candidate in reversed(frames):
+			if (matched := self.phases.get(candidate.f_code.co_qualname)) is not None:
+				phase = matched
+				break
+
+		last = self._samples[-1] if self._samples else None
+		if last is not None and last[0] == step and last[1] == phase and last[2] == stack:
+			last[3] += weight_ms
+		else:
+			self._samples.append([step, phase, stack, weight_ms])
+
+	def _label(self, frame: FrameType) -> str:
+		code = frame.f_code
+		label = self._labels.get(code)
+		if label is None:
+			file = code.co_filename
+			short_file = os.path.join(*Path(file).parts[-2:]) if file else '?'
+			label = f'{code.co_qualname} ({short_file}:{code.co_firstlineno})'
+			self._labels[code] = label
+			self._frames[label] = (code.co_qualname, file, code.co_firstlineno)
+		return label
+
+	def collapsed(self) -> str:
+		"""Collapsed stacks (`step 3;llm;frame;frame <microseconds>`), one line per distinct stack."""
+		totals: Counter[str] = Counter()
+		for step, phase, stack, weight_ms in self._samples:
+			totals[';'.join((f'step {step}', phase, *stack))] += weight_ms
+		return ''.join(f'{stack} {round(weight_ms * 1000)}\n' for stack, weight_ms in totals.items())
+
+	def speedscope(self, name: str = 'browser-use agent run') -> dict:
+		"""Speedscope file with one sampled profile per step, phases as root frames, in time order."""
+		frames: list[dict] = []
+		frame_index: dict[str, int] = {}
+
+		def index(label: str) -> int:
+			if label not in frame_index:
+				frame_index[label] = len(frames)
+				func_name, file, line = self._frames.get(label, (label, '', 0))
+				frames.append({'name': func_name, 'file': file, 'line': line} if file else {'name': label})
+			return frame_index[label]
+
+		profiles: dict[int, dict] = {}
+		for step, phase, stack, weight_ms in self._samples:
+			profile = profiles.get(step)
+			if profile is None:
+				profile = profiles[step] = {
+					'type': 'sampled',
+					'name': f'step {step}',
+					'unit': 'milliseconds',
+					'startValue': 0,
+					'endValue': 0,
+					'samples': [],
+					'weights': [],
+				}
+			profile['samples'].append([index(f'phase: {phase}'), *(index(label) for label in stack)])
+			profile['weights'].append(weight_ms)
+			profile['endValue'] += weight_ms
+		return {
+			'$schema': 'https://www.speedscope.app/file-format-schema.json',
+			'name': name,
+			'exporter': 'browser-use',
+			'activeProfileIndex': 0,
+			'shared': {'frames': frames},
+			'profiles': [profiles[step] for step in sorted(profiles)],
+		}
+
+	def save(self, path_prefix: str | Path) -> tuple[Path, Path]:
+		"""Write <path_prefix>.speedscope.json and <path_prefix>.collapsed.txt, returning both paths."""
+		path_prefix = Path(path_prefix)
+		path_prefix.parent.mkdir(parents=True, exist_ok=True)
+		speedscope_path = path_prefix.with_name(f'{path_prefix.name}.speedscope.json')
+		collapsed_path = path_prefix.with_name(f'{path_prefix.name}.collapsed.txt')
+		speedscope_path.write_text(json.dumps(self.speedscope(name=path_prefix.name)), encoding='utf-8')
+		collapsed_path.write_text(self.collapsed(), encoding='utf-8')
+		return speedscope_path, collapsed_path
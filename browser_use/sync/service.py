@@ -3,12 +3,14 @@ Cloud sync service for sending events to the Browser Use cloud.
 """
 
 import logging
+from pathlib import Path
 
 import httpx
 from bubus import BaseEvent
 
 from browser_use.config import CONFIG
 from browser_use.sync.auth import TEMP_USER_ID, DeviceAuthClient
+from browser_use.sync.uploader import EventUploader
 
 logger = logging.getLogger(__name__)
 
@@ -16,7 +18,20 @@ logger = logging.getLogger(__name__)
 class CloudSync:
 	"""Service for syncing events to the Browser Use cloud"""
 
-	def __init__(self, base_url: str | None = None, allow_session_events_for_auth: bool = False):
+	def __init__(
+		self,
+		base_url: str | None = None,
+		allow_session_events_for_auth: bool = False,
+		batch_uploads: bool = False,
+		spool_dir: Path | str | None = None,
+	):
+		"""
+		Args:
+			batch_uploads: Queue events and upload them in compressed batches from a background task
+				instead of one request per event. Call flush() or close() before exiting.
+			spool_dir: Where batch uploads spill events while the API is unreachable,
+				defaults to <config dir>/cloud_sync_spool. Each instance uses its own subdirectory.
+		"""
 		# Backend API URL for all API requests - can be passed directly or defaults to env var
 		self.base_url = base_url or CONFIG.BROWSER_USE_CLOUD_API_URL
 		self.auth_client = DeviceAuthClient(base_url=self.base_url)
@@ -25,6 +40,17 @@ class CloudSync:
 		self.auth_flow_active = False  # Flag to indicate auth flow is running
 		# Check if cloud sync is actually enabled - if not, we should remain silent
 		self.enabled = CONFIG.BROWSER_USE_CLOUD_SYNC
+		self.uploader: EventUploader | None = None
+		if batch_uploads:
+			self.uploader = EventUploader(
+				endpoint=self._events_url,
+				spool_dir=spool_dir or CONFIG.BROWSER_USE_CONFIG_DIR / 'cloud_sync_spool',
+				headers=self.auth_client.get_headers,
+			)
+
+	@property
+	def _events_url(self) -> str:
+		return f'{self.base_url.rstrip("/")}/api/v1/events'
 
 	async def handle_event(self, event: BaseEvent) -> None:
 		"""Handle an event by sending it to the cloud"""
@@ -71,19 +97,24 @@ class CloudSync:
 				if not hasattr(event, 'user_id') or not getattr(event, 'user_id', None):
 					setattr(event, 'user_id', TEMP_USER_ID)
 
+			# Serialize event and add device_id to all events
+			event_data = event.model_dump(mode='json')
+			if self.auth_client and self.auth_client.device_id:
+				event_data['device_id'] = self.auth_client.device_id
+
+			if self.uploader is not None:
+				# Sent in the background with the next batch
+				self.uploader.enqueue(event_data)
+				return
+
 			# Add auth headers if available
 			if self.auth_client:
 				headers.update(self.auth_client.get_headers())
 
 			# Send event (batch format with direct BaseEvent serialization)
 			async with httpx.AsyncClient() as client:
-				# Serialize event and add device_id to all events
-				event_data = event.model_dump(mode='json')
-				if self.auth_client and self.auth_client.device_id:
-					event_data['device_id'] = self.auth_client.device_id
-
 				response = await client.post(
-					f'{self.base_url.rstrip("/")}/api/v1/events',
+					self._events_url,
 					json={'events': [event_data]},
 					headers=headers,
 					timeout=10.0,
@@ -138,6 +169,17 @@ class CloudSync:
 	# 	except Exception as e:
 	# 		logger.warning(f'Failed to update WAL user IDs: {e}')
 
+	async def flush(self, timeout: float | None = 10.0) -> bool:
+		"""Wait for batched events to be uploaded. Returns False if some are still queued or spooled."""
+		if self.uploader is None:
+			return True
+		return await self.uploader.flush(timeout)
+
+	async def close(self) -> None:
+		"""Upload or spool any batched events and close the upload connection."""
+		if self.uploader is not None:
+			await self.uploader.close()
+
 	def set_auth_flow_active(self) -> None:
 		"""Mark auth flow as active to allow all events"""
 		self.auth_flow_active = True
@@ -0,0 +1,378 @@
+"""
+Background batch uploader for cloud sync events.
+
+Events are queued in memory and posted in gzip-compressed batches over one persistent HTTP
+connection (HTTP/2 when the optional h2 package is installed). Batches that can't be delivered
+because the endpoint is slow, down or overloaded are spilled to an on-disk spool, one file per
+batch, and replayed in order once the endpoint recovers, including after a restart.
+
+Every uploader spools into its own subdirectory of the spool directory, named after its process
+(<pid>-<process start ms>-<id>), so uploaders in other processes never replay batches that are
+still being written or sent. Subdirectories left behind by uploaders that are no longer running
+are claimed file by file with an atomic rename before replaying, so each batch is replayed once.
+"""
+
+import asyncio
+import gzip
+import importlib.util
+import json
+import logging
+import os
+import time
+import weakref
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import anyio
+import httpx
+import psutil
+from uuid_extensions import uuid7str
+
+from browser_use.utils import create_task_with_error_handling
+
+logger = logging.getLogger(__name__)
+
+# Responses that mean "try again later" rather than "this batch is bad"
+_RETRYABLE_STATUS = {408, 425, 429, 500, 502, 503, 504}
+
+_SPOOL_SUFFIX = '.jsonl'
+
+# Uploaders of this process that haven't been closed, their spool subdirectories are never claimed
+_live_uploaders: 'weakref.WeakSet[EventUploader]' = weakref.WeakSet()
+
+
+def _process_start_ms(pid: int) -> int | None:
+	try:
+		return int(psutil.Process(pid).create_time() * 1000)
+	except psutil.NoSuchProcess:
+		return None
+
+
+def _spool_owner_alive(name: str, live_names: set[str]) -> bool:
+	"""Whether the uploader owning spool subdirectory <pid>-<process start ms>-<id> may still be using it."""
+	try:
+		pid, started_ms, _ = name.split('-', 2)
+		pid, started_ms = int(pid), int(started_ms)
+	except ValueError:
+		return True  # not a spool subdirectory, leave it alone
+	try:
+		actual_ms = _process_start_ms(pid)
+	except psutil.Error:
+		return True  # e.g. access denied: the process exists
+	if actual_ms is None or abs(actual_ms - started_ms) > 1000:
+		return False  # exited, or the pid was reused by another process
+	if pid == os.getpid():
+		return name in live_names
+	return True
+
+
+@dataclass
+class UploaderStats:
+	"""Counters and upload latency samples of an EventUploader."""
+
+	events_enqueued: int = 0
+	events_sent: int = 0
+	events_dropped: int = 0
+	events_spooled: int = 0
+	batches_sent: int = 0
+	failed_requests: int = 0
+	bytes_sent: int = 0
+	latencies_ms: deque[float] = field(default_factory=lambda: deque(maxlen=256))
+
+	def latency_summary(self) -> dict[str, float]:
+		if not self.latencies_ms:
+			return {'samples': 0, 'mean_ms': 0.0, 'p95_ms': 0.0, 'max_ms': 0.0}
+		ordered = sorted(self.latencies_ms)
+		return {
+			'samples': len(ordered),
+			'mean_ms': sum(ordered) / len(ordered),
+			'p95_ms': ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+			'max_ms': ordered[-1],
+		}
+
+
+class EventUploader:
+	"""Queues serialized events and uploads them in batches from a background task.
+
+	A batch is sent when it reaches max_batch_events or max_batch_bytes, or flush_interval
+	seconds after its first event. Only one request is in flight at a time so events arrive
+	in order. While spooled batches exist, new batches are appended to the spool behind them.
+	"""
+
+	def __init__(
+		self,
+		endpoint: str,
+		spool_dir: Path | str | None = None,
+		headers: Callable[[], dict[str, str]] | None = None,
+		max_batch_events: int = 100,
+		max_batch_bytes: int = 1_000_000,
+		flush_interval: float = 1.0,
+		max_pending_events: int = 1_000,
+		request_timeout: float = 10.0,
+		retry_backoff: float = 1.0,
+		max_retry_backoff: float = 60.0,
+		compress: bool = True,
+	):
+		self.endpoint = endpoint
+		self.spool_dir = Path(spool_dir) if spool_dir else None
+		self._headers = headers or dict
+		self.max_batch_events = max_batch_events
+		self.max_batch_bytes = max_batch_bytes
+		self.flush_interval = flush_interval
+		self.max_pending_events = max_pending_events
+		self.request_timeout = request_timeout
+		self.retry_backoff = retry_backoff
+		self.max_retry_backoff = max_retry_backoff
+		self.compress = compress
+		self.stats = UploaderStats()
+
+		self._pending: deque[bytes] = deque()
+		self._pending_bytes = 0
+		self._first_pending_at: float | None = None
+		self._spool_files: deque[Path] = deque()
+		self._spool_seq = 0
+		self._spool_name = f'{os.getpid()}-{_process_start_ms(os.getpid()) or 0}-{uuid7str()[-12:]}'
+		self._own_spool_dir = self.spool_dir / self._spool_name if self.spool_dir else None
+		self._backoff = 0.0
+		self._flushing = False  # flush() makes every batch due immediately until the queue is drained
+		self._wakeup = asyncio.Event()
+		self._idle = asyncio.Event()
+		self._task: asyncio.Task[None] | None = None
+		self._client: httpx.AsyncClient | None = None
+		self._in_flight: list[bytes] | None = None  # memory batch being posted, spooled if close() interrupts it
+		_live_uploaders.add(self)
+
+	# ---------- Public API ----------
+
+	def enqueue(self, event_data: dict[str, Any]) -> None:
+		"""Queue one event for upload. Never blocks and never raises on network errors."""
+		item = json.dumps(event_data, separators=(',', ':')).encode()
+		self._pending.append(item)
+		self._pending_bytes += len(item)
+		if self._first_pending_at is None:
+			self._first_pending_at = time.monotonic()
+		self.stats.events_enqueued += 1
+		self._idle.clear()
+		self._ensure_started()
+		if len(self._pending) >= self.max_batch_events or self._pending_bytes >= self.max_batch_bytes:
+			self._wakeup.set()
+
+	@property
+	def backlog(self) -> dict[str, int]:
+		"""Events waiting in memory and on disk."""
+		return {'pending_events': len(self._pending), 'spooled_batches': len(self._spool_files)}
+
+	async def flush(self, timeout: float | None = None) -> bool:
+		"""Send everything queued so far, including batches spooled by earlier runs.
+
+		Returns False if the backlog couldn't be drained within timeout.
+		"""
+		self._ensure_started()
+		self._flushing = True
+		self._wakeup.set()
+		try:
+			await asyncio.wait_for(self._idle.wait(), timeout)
+			return True
+		except TimeoutError:
+			return False
+
+	async def close(self, timeout: float = 5.0) -> None:
+		"""Try to send the backlog, spool whatever is left, and close the connection."""
+		await self.flush(timeout)
+		if self._task is not None:
+			self._task.cancel()
+			try:
+				await self._task
+			except asyncio.CancelledError:
+				pass
+			self._task = None
+		if self._in_flight:
+			await self._spool(self._in_flight)
+			self._in_flight = None
+		while self._pending:
+			await self._spool(self._take_batch())
+		if self._client is not None:
+			await self._client.aclose()
+			self._client = None
+		# From now on a later uploader may claim what's left in the spool subdirectory
+		_live_uploaders.discard(self)
+		if self._own_spool_dir is not None and not self._spool_files:
+			try:
+				await anyio.Path(self._own_spool_dir).rmdir()
+			except OSError:
+				pass
+
+	# ---------- Background loop ----------
+
+	def _ensure_started(self) -> None:
+		if self._task is None or self._task.done():
+			self._task = create_task_with_error_handling(self._run(), name='cloud_sync_uploader', suppress_exceptions=True)
+
+	async def _run(self) -> None:
+		await self._load_spool()
+		while True:
+			if self._backoff:
+				await asyncio.sleep(self._backoff)
+
+			if self._spool_files:
+				# Keep the memory queue bounded while the spool drains
+				if len(self._pending) >= self.max_pending_events or self._batch_due():
+					await self._spool(self._take_batch())
+				await self._send_spooled(self._spool_files[0])
+			elif self._pending and self._batch_due():
+				batch = self._in_flight = self._take_batch()
+				if not await self._send(batch):
+					await self._spool(batch)
+				self._in_flight = None
+			elif not self._pending:
+				self._flushing = False
+				self._idle.set()
+				self._wakeup.clear()
+				await self._wakeup.wait()
+			else:
+				self._wakeup.clear()
+				assert self._first_pending_at is not None
+				delay = self._first_pending_at + self.flush_interval - time.monotonic()
+				try:
+					await asyncio.wait_for(self._wakeup.wait(), max(delay, 0))
+				except TimeoutError:
+					pass
+
+	def _batch_due(self) -> bool:
+		if self._flushing or len(self._pending) >= self.max_batch_events or self._pending_bytes >= self.max_batch_bytes:
+			return True
+		return self._first_pending_at is not None and time.monotonic() - self._first_pending_at >= self.flush_interval
+
+	def _take_batch(self) -> list[bytes]:
+		batch: list[bytes] = []
+		size = 0
+		while self._pending and len(batch) < self.max_batch_events:
+			item = self._pending[0]
+			if batch and size + len(item) > self.max_batch_bytes:
+				break
+			batch.append(self._pending.popleft())
+			size += len(item)
+		self._pending_bytes -= size
+		self._first_pending_at = time.monotonic() if self._pending else None
+		return batch
+
+	# ---------- HTTP ----------
+
+	def _get_client(self) -> httpx.AsyncClient:
+		if self._client is None:
+			# HTTP/2 needs the optional h2 package, otherwise keep-alive HTTP/1.1 is used
+			http2 = importlib.util.find_spec('h2') is not None
+			self._client = httpx.AsyncClient(http2=http2, timeout=self.request_timeout)
+		return self._client
+
+	async def _send(self, batch: list[bytes]) -> bool:
+		"""Post one batch. Returns False if it should be retried later."""
+		body = b'{"events":[' + b','.join(batch) + b']}'
+		headers = {**self._headers(), 'Content-Type': 'application/json'}
+		if self.compress:
+			body = gzip.compress(body, compresslevel=5)
+			headers['Content-Encoding'] = 'gzip'
+
+		start = time.monotonic()
+		try:
+			response = await self._get_client().post(self.endpoint, content=body, headers=headers)
+		except httpx.HTTPError as e:
+			logger.debug(f'Cloud sync upload of {len(batch)} events failed: {type(e).__name__}: {e}')
+			return self._failed()
+		self.stats.latencies_ms.append((time.monotonic() - start) * 1000)
+
+		if response.status_code in _RETRYABLE_STATUS:
+			logger.debug(f'Cloud sync upload got {response.status_code}, will retry {len(batch)} events later')
+			return self._failed()
+
+		self._backoff = 0.0
+		if response.status_code >= 400:
+			# The batch itself was rejected, retrying won't help
+			logger.debug(f'Failed to send sync events: POST {self.endpoint} {response.status_code} - {response.text}')
+			self.stats.events_dropped += len(batch)
+			return True
+
+		self.stats.events_sent += len(batch)
+		self.stats.batches_sent += 1
+		self.stats.bytes_sent += len(body)
+		return True
+
+	def _failed(self) -> bool:
+		self.stats.failed_requests += 1
+		self._backoff = min(max(self._backoff * 2, self.retry_backoff), self.max_retry_backoff)
+		return False
+
+	# ---------- Spool ----------
+
+	async def _load_spool(self) -> None:
+		"""Claim batches left on disk by uploaders that are no longer running, oldest first."""
+		if self.spool_dir is None or self._own_spool_dir is None or self._spool_files:
+			return
+		spool_dir, own_dir = self.spool_dir, self._own_spool_dir
+		live_names = {uploader._spool_name for uploader in _live_uploaders}
+
+		def claim() -> list[Path]:
+			if not spool_dir.is_dir():
+				return []
+			for owner_dir in spool_dir.iterdir():
+				if not owner_dir.is_dir() or owner_dir == own_dir or _spool_owner_alive(owner_dir.name, live_names):
+					continue
+				for path in owner_dir.iterdir():
+					if path.suffix != _SPOOL_SUFFIX:
+						continue
+					own_dir.mkdir(parents=True, exist_ok=True)
+					try:
+						# Atomic: when several uploaders claim the same directory each file goes to exactly one
+						path.rename(own_dir / path.name)
+					except OSError:
+						continue
+				try:
+					owner_dir.rmdir()
+				except OSError:
+					pass
+			if not own_dir.is_dir():
+				return []
+			return sorted(p for p in own_dir.iterdir() if p.suffix == _SPOOL_SUFFIX)
+
+		files = await asyncio.to_thread(claim)
+		if files:
+			logger.debug(f'Replaying {len(files)} spooled cloud sync batches from {spool_dir}')
+			self._spool_files.extend(files)
+
+	async def _spool(self, batch: list[bytes]) -> None:
+		if not batch:
+			return
+		if self.spool_dir is None:
+			logger.debug(f'Dropping {len(batch)} cloud sync events, endpoint unavailable and no spool directory')
+			self.stats.events_dropped += len(batch)
+			return
+		assert self._own_spool_dir is not None
+		self._spool_seq += 1
+		# time_ns first so files claimed from earlier runs sort before this one's
+		path = self._own_spool_dir / f'{time.time_ns():020d}-{os.getpid()}-{self._spool_seq:06d}{_SPOOL_SUFFIX}'
+		try:
+			await anyio.Path(self._own_spool_dir).mkdir(parents=True, exist_ok=True)
+			await anyio.Path(path).write_bytes(b'\n'.join(batch) + b'\n')
+		except OSError as e:
+			logger.debug(f'Could not spool {len(batch)} cloud sync events to {path}: {e}')
+			self.stats.events_dropped += len(batch)
+			return
+		self._spool_files.append(path)
+		self.stats.events_spooled += len(batch)
+
+	async def _send_spooled(self, path: Path) -> None:
+		try:
+			batch = (await anyio.Path(path).read_bytes()).splitlines()
+		except OSError as e:
+			logger.debug(f'Skipping unreadable cloud sync spool file {path}: {e}')
+			self._spool_files.popleft()
+			return
+		if await self._send([line for line in batch if line]):
+			self._spool_files.popleft()
+			try:
+				await anyio.Path(path).unlink()
+			except OSError:
+				pass
@@ -2,7 +2,6 @@ import logging
 import os
 
 from dotenv import load_dotenv
-from posthog import Posthog
 from uuid_extensions import uuid7str
 
 from browser_use.telemetry.views import BaseTelemetryEvent
@@ -43,6 +42,8 @@ class ProductTelemetry:
 			self._posthog_client = None
 		else:
 			logger.info('Using anonymized telemetry, see https://docs.browser-use.com/development/telemetry.')
+			from posthog import Posthog  # imported only when telemetry is enabled, it's slow to import
+
 			self._posthog_client = Posthog(
 				project_api_key=self.PROJECT_API_KEY,
 				host=self.HOST,
@@ -0,0 +1,103 @@
+"""
+Process-wide pricing index shared by all TokenCost instances.
+
+The LiteLLM pricing JSON has thousands of models with ~20 fields each. It is loaded once per
+process, reduced to the handful of price fields TokenCost needs, and ModelPricing objects are
+only built (and memoized) for the models that are actually looked up.
+"""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Any, NamedTuple
+
+from browser_use.tokens.custom_pricing import CUSTOM_MODEL_PRICING
+from browser_use.tokens.mappings import MODEL_TO_LITELLM
+from browser_use.tokens.views import ModelPricing
+
+logger = logging.getLogger(__name__)
+
+
+class _Prices(NamedTuple):
+	input_cost_per_token: float | None
+	output_cost_per_token: float | None
+	cache_read_input_token_cost: float | None
+	cache_creation_input_token_cost: float | None
+	max_tokens: int | None
+	max_input_tokens: int | None
+	max_output_tokens: int | None
+
+	@classmethod
+	def from_entry(cls, data: dict[str, Any]) -> '_Prices':
+		return cls(*(data.get(field) for field in cls._fields))
+
+
+class PricingIndex:
+	"""Compact model -> price table, loaded lazily and at most once per process (until refreshed)."""
+
+	def __init__(self):
+		self._prices: dict[str, _Prices] = {}
+		self._resolved: dict[str, ModelPricing | None] = {}
+		self._loaded = False
+		self._load_task: asyncio.Task[None] | None = None
+
+	@property
+	def is_loaded(self) -> bool:
+		return self._loaded
+
+	def __len__(self) -> int:
+		return len(self._prices)
+
+	def load(self, data: dict[str, Any]) -> None:
+		"""Replace the index with the price fields of a LiteLLM pricing dict."""
+		# sample_spec documents the schema, it isn't a model
+		self._prices = {
+			name: _Prices.from_entry(entry) for name, entry in data.items() if isinstance(entry, dict) and name != 'sample_spec'
+		}
+		self._resolved.clear()
+		# An empty table means the fetch failed, leave it unloaded so the next TokenCost retries
+		self._loaded = bool(self._prices)
+
+	async def ensure_loaded(self, loader: Callable[[], Awaitable[dict[str, Any]]]) -> None:
+		"""Load the index with loader() unless it is already loaded or being loaded.
+
+		Concurrent callers on the same event loop share a single load.
+		"""
+		if self._loaded:
+			return
+		loop = asyncio.get_running_loop()
+		task = self._load_task
+		if task is None or task.done() or task.get_loop() is not loop:
+			task = self._load_task = loop.create_task(self._run_loader(loader))
+		# shield: one cancelled caller must not cancel the load the others are waiting on
+		await asyncio.shield(task)
+
+	async def _run_loader(self, loader: Callable[[], Awaitable[dict[str, Any]]]) -> None:
+		self.load(await loader())
+		logger.debug(f'Loaded pricing for {len(self._prices)} models')
+
+	def get(self, model_name: str) -> ModelPricing | None:
+		"""Pricing for a model, checking custom pricing first, then the LiteLLM table."""
+		if model_name in self._resolved:
+			return self._resolved[model_name]
+
+		if model_name in CUSTOM_MODEL_PRICING:
+			prices = _Prices.from_entry(CUSTOM_MODEL_PRICING[model_name])
+		else:
+			prices = self._prices.get(MODEL_TO_LITELLM.get(model_name, model_name))
+			if prices is None and not self._loaded:
+				# Not loaded yet, don't memoize the miss
+				return None
+
+		pricing = ModelPricing(model=model_name, **prices._asdict()) if prices is not None else None
+		self._resolved[model_name] = pricing
+		return pricing
+
+	def clear(self) -> None:
+		self._prices = {}
+		self._resolved.clear()
+		self._loaded = False
+		self._load_task = None
+
+
+pricing_index = PricingIndex()
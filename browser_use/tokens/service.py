@@ -1,12 +1,15 @@
 """
 Token cost service that tracks LLM token usage and costs.
 
-Fetches pricing data from LiteLLM repository and caches it for 1 day.
-Automatically tracks token usage when LLMs are registered and invoked.
+Fetches pricing data from LiteLLM repository and caches it for 1 day. The pricing table is
+loaded once per process into a shared PricingIndex.
+Automatically tracks token usage when LLMs are registered and invoked, and keeps running
+per-model totals so usage summaries don't re-scan the whole history.
 """
 
 import logging
 import os
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any
@@ -17,8 +20,7 @@ from dotenv import load_dotenv
 
 from browser_use.llm.base import BaseChatModel
 from browser_use.llm.views import ChatInvokeUsage
-from browser_use.tokens.custom_pricing import CUSTOM_MODEL_PRICING
-from browser_use.tokens.mappings import MODEL_TO_LITELLM
+from browser_use.tokens.pricing_index import pricing_index
 from browser_use.tokens.views import (
 	CachedPricingData,
 	ModelPricing,
@@ -45,6 +47,35 @@ def xdg_cache_home() -> Path:
 	return default
 
 
+@dataclass
+class _ModelTotals:
+	"""Running token totals for one model, updated on every add_usage."""
+
+	prompt_tokens: int = 0
+	prompt_cached_tokens: int = 0
+	prompt_cache_creation_tokens: int = 0
+	completion_tokens: int = 0
+	invocations: int = 0
+
+	def add(self, usage: ChatInvokeUsage) -> None:
+		self.prompt_tokens += usage.prompt_tokens
+		self.prompt_cached_tokens += usage.prompt_cached_tokens or 0
+		self.prompt_cache_creation_tokens += usage.prompt_cache_creation_tokens or 0
+		self.completion_tokens += usage.completion_tokens
+		self.invocations += 1
+
+	def as_usage(self) -> ChatInvokeUsage:
+		"""The totals as a single usage record. Costs are linear in tokens, so pricing it equals the sum of per-call costs."""
+		return ChatInvokeUsage(
+			prompt_tokens=self.prompt_tokens,
+			prompt_cached_tokens=self.prompt_cached_tokens,
+			prompt_cache_creation_tokens=self.prompt_cache_creation_tokens,
+			prompt_image_tokens=None,
+			completion_tokens=self.completion_tokens,
+			total_tokens=self.prompt_tokens + self.completion_tokens,
+		)
+
+
 class TokenCost:
 	"""Service for tracking token usage and calculating costs"""
 
@@ -57,7 +88,7 @@ class TokenCost:
 
 		self.usage_history: list[TokenUsageEntry] = []
 		self.registered_llms: dict[str, BaseChatModel] = {}
-		self._pricing_data: dict[str, Any] | None = None
+		self._totals_by_model: dict[str, _ModelTotals] = {}
 		self._initialized = False
 		self._cache_dir = xdg_cache_home() / self.CACHE_DIR_NAME
 
@@ -69,14 +100,17 @@ class TokenCost:
 			self._initialized = True
 
 	async def _load_pricing_data(self) -> None:
-		"""Load pricing data from cache or fetch from GitHub"""
+		"""Load the shared pricing index, unless another TokenCost in this process already did"""
+		await pricing_index.ensure_loaded(self._read_pricing_data)
+
+	async def _read_pricing_data(self) -> dict[str, Any]:
+		"""Read pricing data from cache or fetch from GitHub"""
 		# Try to find a valid cache file
 		cache_file = await self._find_valid_cache()
 
 		if cache_file:
-			await self._load_from_cache(cache_file)
-		else:
-			await self._fetch_and_cache_pricing_data()
+			return await self._load_from_cache(cache_file)
+		return await self._fetch_and_cache_pricing_data()
 
 	async def _find_valid_cache(self) -> Path | None:
 		"""Find the most recent valid cache file"""
@@ -122,28 +156,28 @@ class TokenCost:
 		except Exception:
 			return False
 
-	async def _load_from_cache(self, cache_file: Path) -> None:
+	async def _load_from_cache(self, cache_file: Path) -> dict[str, Any]:
 		"""Load pricing data from a specific cache file"""
 		try:
 			content = await anyio.Path(cache_file).read_text()
 			cached = CachedPricingData.model_validate_json(content)
-			self._pricing_data = cached.data
+			return cached.data
 		except Exception as e:
 			logger.debug(f'Error loading cached pricing data from {cache_file}: {e}')
 			# Fall back to fetching
-			await self._fetch_and_cache_pricing_data()
+			return await self._fetch_and_cache_pricing_data()
 
-	async def _fetch_and_cache_pricing_data(self) -> None:
+	async def _fetch_and_cache_pricing_data(self) -> dict[str, Any]:
 		"""Fetch pricing data from LiteLLM GitHub and cache it with timestamp"""
 		try:
 			async with httpx.AsyncClient() as client:
 				response = await client.get(self.PRICING_URL, timeout=30)
 				response.raise_for_status()
 
-				self._pricing_data = response.json()
+				pricing_data = response.json()
 
 			# Create cache object with timestamp
-			cached = CachedPricingData(timestamp=datetime.now(), data=self._pricing_data or {})
+			cached = CachedPricingData(timestamp=datetime.now(), data=pricing_data or {})
 
 			# Ensure cache directory exists
 			self._cache_dir.mkdir(parents=True, exist_ok=True)
@@ -153,10 +187,11 @@ class TokenCost:
 			cache_file = self._cache_dir / f'pricing_{timestamp_str}.json'
 
 			await anyio.Path(cache_file).write_text(cached.model_dump_json(indent=2))
+			return cached.data
 		except Exception as e:
 			logger.debug(f'Error fetching pricing data: {e}')
 			# Fall back to empty pricing data
-			self._pricing_data = {}
+			return {}
 
 	async def get_model_pricing(self, model_name: str) -> ModelPricing | None:
 		"""Get pricing information for a specific model"""
@@ -164,37 +199,7 @@ class TokenCost:
 		if not self._initialized:
 			await self.initialize()
 
-		# Check custom pricing first
-		if model_name in CUSTOM_MODEL_PRICING:
-			data = CUSTOM_MODEL_PRICING[model_name]
-			return ModelPricing(
-				model=model_name,
-				input_cost_per_token=data.get('input_cost_per_token'),
-				output_cost_per_token=data.get('output_cost_per_token'),
-				max_tokens=data.get('max_tokens'),
-				max_input_tokens=data.get('max_input_tokens'),
-				max_output_tokens=data.get('max_output_tokens'),
-				cache_read_input_token_cost=data.get('cache_read_input_token_cost'),
-				cache_creation_input_token_cost=data.get('cache_creation_input_token_cost'),
-			)
-
-		# Map model name to LiteLLM model name if needed
-		litellm_model_name = MODEL_TO_LITELLM.get(model_name, model_name)
-
-		if not self._pricing_data or litellm_model_name not in self._pricing_data:
-			return None
-
-		data = self._pricing_data[litellm_model_name]
-		return ModelPricing(
-			model=model_name,
-			input_cost_per_token=data.get('input_cost_per_token'),
-			output_cost_per_token=data.get('output_cost_per_token'),
-			max_tokens=data.get('max_tokens'),
-			max_input_tokens=data.get('max_input_tokens'),
-			max_output_tokens=data.get('max_output_tokens'),
-			cache_read_input_token_cost=data.get('cache_read_input_token_cost'),
-			cache_creation_input_token_cost=data.get('cache_creation_input_token_cost'),
-		)
+		return pricing_index.get(model_name)
 
 	async def calculate_cost(self, model: str, usage: ChatInvokeUsage) -> TokenCostCalculated | None:
 		if not self.include_cost:
@@ -233,6 +238,7 @@ class TokenCost:
 		)
 
 		self.usage_history.append(entry)
+		self._totals_by_model.setdefault(model, _ModelTotals()).add(usage)
 
 		return entry
 
@@ -364,76 +370,60 @@ class TokenCost:
 
 	def get_usage_tokens_for_model(self, model: str) -> ModelUsageTokens:
 		"""Get usage tokens for a specific model"""
-		filtered_usage = [u for u in self.usage_history if u.model == model]
+		totals = self._totals_by_model.get(model, _ModelTotals())
 
 		return ModelUsageTokens(
 			model=model,
-			prompt_tokens=sum(u.usage.prompt_tokens for u in filtered_usage),
-			prompt_cached_tokens=sum(u.usage.prompt_cached_tokens or 0 for u in filtered_usage),
-			completion_tokens=sum(u.usage.completion_tokens for u in filtered_usage),
-			total_tokens=sum(u.usage.prompt_tokens + u.usage.completion_tokens for u in filtered_usage),
+			prompt_tokens=totals.prompt_tokens,
+			prompt_cached_tokens=totals.prompt_cached_tokens,
+			completion_tokens=totals.completion_tokens,
+			total_tokens=totals.prompt_tokens + totals.completion_tokens,
 		)
 
 	async def get_usage_summary(self, model: str | None = None, since: datetime | None = None) -> UsageSummary:
-		"""Get summary of token usage and costs (costs calculated on-the-fly)"""
-		filtered_usage = self.usage_history
-
-		if model:
-			filtered_usage = [u for u in filtered_usage if u.model == model]
-
+		"""Get summary of token usage and costs (costs calculated on-the-fly from the per-model totals)"""
 		if since:
-			filtered_usage = [u for u in filtered_usage if u.timestamp >= since]
-
-		if not filtered_usage:
-			return UsageSummary(
-				total_prompt_tokens=0,
-				total_prompt_cost=0.0,
-				total_prompt_cached_tokens=0,
-				total_prompt_cached_cost=0.0,
-				total_completion_tokens=0,
-				total_completion_cost=0.0,
-				total_tokens=0,
-				total_cost=0.0,
-				entry_count=0,
-			)
-
-		# Calculate totals
-		total_prompt = sum(u.usage.prompt_tokens for u in filtered_usage)
-		total_completion = sum(u.usage.completion_tokens for u in filtered_usage)
-		total_tokens = total_prompt + total_completion
-		total_prompt_cached = sum(u.usage.prompt_cached_tokens or 0 for u in filtered_usage)
-		models = list({u.model for u in filtered_usage})
+			# The running totals cover the whole history, a time filter needs a scan
+			totals_by_model: dict[str, _ModelTotals] = {}
+			for entry in self.usage_history:
+				if entry.timestamp >= since and (not model or entry.model == model):
+					totals_by_model.setdefault(entry.model, _ModelTotals()).add(entry.usage)
+		elif model:
+			totals_by_model = {model: self._totals_by_model[model]} if model in self._totals_by_model else {}
+		else:
+			totals_by_model = self._totals_by_model
 
-		# Calculate per-model stats with record-by-record cost calculation
 		model_stats: dict[str, ModelUsageStats] = {}
+		total_prompt = 0
+		total_completion = 0
+		total_prompt_cached = 0
+		entry_count = 0
 		total_prompt_cost = 0.0
 		total_completion_cost = 0.0
 		total_prompt_cached_cost = 0.0
 
-		for entry in filtered_usage:
-			if entry.model not in model_stats:
-				model_stats[entry.model] = ModelUsageStats(model=entry.model)
-
-			stats = model_stats[entry.model]
-			stats.prompt_tokens += entry.usage.prompt_tokens
-			stats.completion_tokens += entry.usage.completion_tokens
-			stats.total_tokens += entry.usage.prompt_tokens + entry.usage.completion_tokens
-			stats.invocations += 1
+		for model_name, totals in totals_by_model.items():
+			stats = model_stats[model_name] = ModelUsageStats(
+				model=model_name,
+				prompt_tokens=totals.prompt_tokens,
+				completion_tokens=totals.completion_tokens,
+				total_tokens=totals.prompt_tokens + totals.completion_tokens,
+				invocations=totals.invocations,
+				average_tokens_per_invocation=(totals.prompt_tokens + totals.completion_tokens) / totals.invocations,
+			)
+			total_prompt += totals.prompt_tokens
+			total_completion += totals.completion_tokens
+			total_prompt_cached += totals.prompt_cached_tokens
+			entry_count += totals.invocations
 
 			if self.include_cost:
-				# Calculate cost record by record using the updated calculate_cost function
-				cost = await self.calculate_cost(entry.model, entry.usage)
+				cost = await self.calculate_cost(model_name, totals.as_usage())
 				if cost:
-					stats.cost += cost.total_cost
+					stats.cost = cost.total_cost
 					total_prompt_cost += cost.prompt_cost
 					total_completion_cost += cost.completion_cost
 					total_prompt_cached_cost += cost.prompt_read_cached_cost or 0
 
-		# Calculate averages
-		for stats in model_stats.values():
-			if stats.invocations > 0:
-				stats.average_tokens_per_invocation = stats.total_tokens / stats.invocations
-
 		return UsageSummary(
 			total_prompt_tokens=total_prompt,
 			total_prompt_cost=total_prompt_cost,
@@ -441,9 +431,9 @@ class TokenCost:
 			total_prompt_cached_cost=total_prompt_cached_cost,
 			total_completion_tokens=total_completion,
 			total_completion_cost=total_completion_cost,
-			total_tokens=total_tokens,
+			total_tokens=total_prompt + total_completion,
 			total_cost=total_prompt_cost + total_completion_cost + total_prompt_cached_cost,
-			entry_count=len(filtered_usage),
+			entry_count=entry_count,
 			by_model=model_stats,
 		)
 
@@ -506,18 +496,10 @@ class TokenCost:
 
 			# Format cost display (only if cost tracking is enabled)
 			if self.include_cost:
-				# Calculate per-model costs on-the-fly
-				total_model_cost = 0.0
-				model_prompt_cost = 0.0
-				model_completion_cost = 0.0
-
-				# Calculate costs for this model
-				for entry in self.usage_history:
-					if entry.model == model:
-						cost = await self.calculate_cost(entry.model, entry.usage)
-						if cost:
-							model_prompt_cost += cost.prompt_cost
-							model_completion_cost += cost.completion_cost
+				# Calculate per-model costs on-the-fly from the running totals
+				cost = await self.calculate_cost(model, self._totals_by_model[model].as_usage())
+				model_prompt_cost = cost.prompt_cost if cost else 0.0
+				model_completion_cost = cost.completion_cost if cost else 0.0
 
 				total_model_cost = model_prompt_cost + model_completion_cost
 
@@ -548,11 +530,15 @@ class TokenCost:
 	def clear_history(self) -> None:
 		"""Clear usage history"""
 		self.usage_history = []
+		self._totals_by_model = {}
 
 	async def refresh_pricing_data(self) -> None:
 		"""Force refresh of pricing data from GitHub"""
 		if self.include_cost:
-			await self._fetch_and_cache_pricing_data()
+			pricing_data = await self._fetch_and_cache_pricing_data()
+			# Keep the current table if the fetch failed
+			if pricing_data:
+				pricing_index.load(pricing_data)
 
 	async def clean_old_caches(self, keep_count: int = 3) -> None:
 		"""Clean up old cache files, keeping only the most recent ones"""
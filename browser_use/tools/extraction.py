@@ -0,0 +1,178 @@
+"""Chunked map-reduce extraction and result caching for the extract action.
+
+Pages whose markdown exceeds the extract action's character limit are normally truncated,
+so the agent has to call extract again with start_from_char, one serial step per chunk.
+In map-reduce mode the markdown is instead split at structural boundaries (headings,
+paragraphs, lines), every chunk is sent to the page extraction LLM concurrently, and the
+partial results are merged with a final reduce call.
+"""
+
+import asyncio
+import hashlib
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from browser_use.llm.base import BaseChatModel
+from browser_use.llm.messages import SystemMessage, UserMessage
+
+logger = logging.getLogger(__name__)
+
+# Boundaries to split at, from most to least structural
+_SPLIT_BOUNDARIES = ('\n# ', '\n## ', '\n### ', '\n#### ', '\n\n', '\n', '. ')
+
+MAP_SYSTEM_PROMPT = """
+You are an expert at extracting data from the markdown of a webpage.
+
+<input>
+You will be given a query and ONE CHUNK of the markdown of a long webpage that has been filtered to remove noise and advertising content.
+Other chunks of the same page are processed separately and your output will be merged with theirs.
+</input>
+
+<instructions>
+- Extract ALL information from this chunk that is relevant to the query.
+- You should ONLY use the information available in the chunk. Do not make up information or provide guess from your own knowledge.
+- If the chunk contains nothing relevant to the query, respond with exactly: NO_RELEVANT_CONTENT
+- If the query asks for all items, products, etc., list every one of them that appears in this chunk.
+</instructions>
+
+<output>
+- Directly output the relevant information, no conversational text.
+</output>
+""".strip()
+
+REDUCE_SYSTEM_PROMPT = """
+You are an expert at merging partial data extractions.
+
+<input>
+You will be given a query and the extraction results for consecutive chunks of one long webpage, in page order.
+</input>
+
+<instructions>
+- Merge the partial results into one answer to the query.
+- Keep ALL relevant information and items, in page order. Remove exact duplicates caused by chunk boundaries.
+- Do not add information that is not in the partial results.
+- If no partial result contains relevant information, say that the information is not available on the page.
+</instructions>
+
+<output>
+- Directly output the merged information, no conversational text.
+</output>
+""".strip()
+
+NO_RELEVANT_CONTENT = 'NO_RELEVANT_CONTENT'
+
+
+@dataclass
+class MarkdownChunk:
+	"""A slice of page markdown, start is the character offset in the full content."""
+
+	start: int
+	content: str
+
+	@property
+	def end(self) -> int:
+		return self.start + len(self.content)
+
+
+def split_markdown_into_chunks(content: str, max_chars: int) -> list[MarkdownChunk]:
+	"""Split markdown into chunks of at most max_chars, preferring structural boundaries.
+
+	Each chunk ends at the most structural boundary (heading > paragraph > line > sentence) found
+	in the second half of the window, falling back to a hard cut. Chunks concatenate back to the
+	original content exactly.
+	"""
+	if max_chars <= 0:
+		raise ValueError('max_chars must be positive')
+
+	chunks: list[MarkdownChunk] = []
+	start = 0
+	while start < len(content):
+		end = min(start + max_chars, len(content))
+		if end < len(content):
+			min_end = start + max_chars // 2
+			for boundary in _SPLIT_BOUNDARIES:
+				split_at = content.rfind(boundary, min_end, end)
+				if split_at > start:
+					# headings start a new chunk, other boundaries stay with the chunk they end
+					end = split_at if boundary.startswith('\n#') else split_at + len(boundary)
+					break
+		chunks.append(MarkdownChunk(start=start, content=content[start:end]))
+		start = end
+	return chunks
+
+
+class ExtractionCache:
+	"""Small LRU cache of extraction results keyed on (url, query, options, content hash).
+
+	Keying on a hash of the extracted markdown makes repeated extractions on an unchanged page
+	free, while any change to the page content automatically misses.
+	"""
+
+	def __init__(self, max_entries: int = 64):
+		self.max_entries = max_entries
+		self._entries: OrderedDict[str, str] = OrderedDict()
+
+	@staticmethod
+	def make_key(url: str, query: str, content: str, **options: object) -> str:
+		content_hash = hashlib.sha256(content.encode('utf-8', errors='replace')).hexdigest()
+		options_str = ','.join(f'{k}={options[k]}' for k in sorted(options))
+		return f'{url}\x00{query}\x00{options_str}\x00{content_hash}'
+
+	def get(self, key: str) -> str | None:
+		result = self._entries.get(key)
+		if result is not None:
+			self._entries.move_to_end(key)
+		return result
+
+	def set(self, key: str, result: str) -> None:
+		self._entries[key] = result
+		self._entries.move_to_end(key)
+		while len(self._entries) > self.max_entries:
+			self._entries.popitem(last=False)
+
+	def __len__(self) -> int:
+		return len(self._entries)
+
+
+async def map_reduce_extract(
+	llm: BaseChatModel,
+	query: str,
+	chunks: list[MarkdownChunk],
+	stats_summary: str,
+	max_concurrency: int = 4,
+	timeout: float = 120.0,
+) -> str:
+	"""Run the extraction LLM over all chunks concurrently and merge the results."""
+	semaphore = asyncio.Semaphore(max_concurrency)
+	total = len(chunks)
+
+	async def map_chunk(i: int, chunk: MarkdownChunk) -> str:
+		prompt = (
+			f'<query>\n{query}\n</query>\n\n<content_stats>\n{stats_summary}\n'
+			f'Chunk {i + 1} of {total}: chars {chunk.start:,}-{chunk.end:,}\n</content_stats>\n\n'
+			f'<webpage_content>\n{chunk.content}\n</webpage_content>'
+		)
+		async with semaphore:
+			response = await asyncio.wait_for(
+				llm.ainvoke([SystemMessage(content=MAP_SYSTEM_PROMPT), UserMessage(content=prompt)]),
+				timeout=timeout,
+			)
+		return response.completion.strip()
+
+	partial_results = await asyncio.gather(*(map_chunk(i, chunk) for i, chunk in enumerate(chunks)))
+	relevant = [(i, result) for i, result in enumerate(partial_results) if result and result != NO_RELEVANT_CONTENT]
+	logger.debug(f'🗺️ Map-reduce extraction: {len(relevant)}/{total} chunks had relevant content')
+
+	if not relevant:
+		return 'The information relevant to the query is not available on the page.'
+	if len(relevant) == 1:
+		return relevant[0][1]
+
+	partials = '\n\n'.join(f'<chunk_result index="{i + 1}">\n{result}\n</chunk_result>' for i, result in relevant)
+	reduce_prompt = f'<query>\n{query}\n</query>\n\n<partial_results>\n{partials}\n</partial_results>'
+	response = await asyncio.wait_for(
+		llm.ainvoke([SystemMessage(content=REDUCE_SYSTEM_PROMPT), UserMessage(content=reduce_prompt)]),
+		timeout=timeout,
+	)
+	return response.completion
@@ -12,6 +12,7 @@ import pyotp
 from pydantic import BaseModel, Field, RootModel, create_model
 
 from browser_use.browser import BrowserSession
+from browser_use.browser.domain_patterns import compile_domain_patterns
 from browser_use.filesystem.file_system import FileSystem
 from browser_use.llm.base import BaseChatModel
 from browser_use.observability import observe_debug
@@ -22,7 +23,7 @@ from browser_use.tools.registry.views import (
 	RegisteredAction,
 	SpecialActionParameters,
 )
-from browser_use.utils import is_new_tab_page, match_url_with_domain_pattern, time_execution_async
+from browser_use.utils import is_new_tab_page, time_execution_async
 
 Context = TypeVar('Context')
 
@@ -433,15 +434,18 @@ class Registry(Generic[Context]):
 
 		# Process sensitive data based on format and current URL
 		applicable_secrets = {}
+		matching_domains: set[str] = set()
+		if current_url and not is_new_tab_page(current_url):
+			# it's a real url, check it using our custom allowed_domains scheme://*.example.com glob matching
+			domain_patterns = tuple(key for key, content in sensitive_data.items() if isinstance(content, dict))
+			matching_domains = set(compile_domain_patterns(domain_patterns).matching(current_url))
 
 		for domain_or_key, content in sensitive_data.items():
 			if isinstance(content, dict):
 				# New format: {domain_pattern: {key: value}}
 				# Only include secrets for domains that match the current URL
-				if current_url and not is_new_tab_page(current_url):
-					# it's a real url, check it using our custom allowed_domains scheme://*.example.com glob matching
-					if match_url_with_domain_pattern(current_url, domain_or_key):
-						applicable_secrets.update(content)
+				if domain_or_key in matching_domains:
+					applicable_secrets.update(content)
 			else:
 				# Old format: {key: value}, expose to all domains (only allowed for legacy reasons)
 				applicable_secrets[domain_or_key] = content
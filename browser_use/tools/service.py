@@ -32,6 +32,7 @@ from browser_use.filesystem.file_system import FileSystem
 from browser_use.llm.base import BaseChatModel
 from browser_use.llm.messages import SystemMessage, UserMessage
 from browser_use.observability import observe_debug
+from browser_use.tools.extraction import ExtractionCache, map_reduce_extract, split_markdown_into_chunks
 from browser_use.tools.registry.service import Registry
 from browser_use.tools.utils import get_click_description
 from browser_use.tools.views import (
@@ -56,13 +57,6 @@ from browser_use.utils import create_task_with_error_handling, sanitize_surrogat
 
 logger = logging.getLogger(__name__)
 
-# Import EnhancedDOMTreeNode and rebuild event models that have forward references to it
-# This must be done after all imports are complete
-ClickElementEvent.model_rebuild()
-TypeTextEvent.model_rebuild()
-ScrollEvent.model_rebuild()
-UploadFileEvent.model_rebuild()
-
 Context = TypeVar('Context')
 
 T = TypeVar('T', bound=BaseModel)
@@ -108,12 +102,21 @@ class Tools(Generic[Context]):
 		exclude_actions: list[str] | None = None,
 		output_model: type[T] | None = None,
 		display_files_in_done_text: bool = True,
+		map_reduce_extraction: bool = False,
+		max_extraction_chunks: int = 10,
+		max_concurrent_extraction_calls: int = 4,
 	):
 		self.registry = Registry[Context](exclude_actions if exclude_actions is not None else [])
 		self.display_files_in_done_text = display_files_in_done_text
 		self._output_model: type[BaseModel] | None = output_model
 		self._coordinate_clicking_enabled: bool = False
 
+		# extract: split oversized pages into chunks processed concurrently instead of truncating them
+		self.map_reduce_extraction = map_reduce_extraction
+		self.max_extraction_chunks = max_extraction_chunks
+		self.max_concurrent_extraction_calls = max_concurrent_extraction_calls
+		self._extraction_cache = ExtractionCache()
+
 		"""Register all default browser actions"""
 
 		self._register_done_action(output_model)
@@ -689,9 +692,21 @@ class Tools(Generic[Context]):
 				content = content[start_from_char:]
 				content_stats['started_from_char'] = start_from_char
 
-			# Smart truncation with context preservation
+			# Map-reduce mode: process oversized pages in chunks instead of truncating at MAX_CHAR_LIMIT
+			chunks = None
 			truncated = False
-			if len(content) > MAX_CHAR_LIMIT:
+			if self.map_reduce_extraction and len(content) > MAX_CHAR_LIMIT:
+				chunks = split_markdown_into_chunks(content, MAX_CHAR_LIMIT)
+				if len(chunks) > self.max_extraction_chunks:
+					truncate_at = chunks[self.max_extraction_chunks].start
+					chunks = chunks[: self.max_extraction_chunks]
+					content = content[:truncate_at]
+					truncated = True
+					content_stats['truncated_at_char'] = truncate_at
+					content_stats['next_start_char'] = (start_from_char or 0) + truncate_at
+
+			# Smart truncation with context preservation
+			elif len(content) > MAX_CHAR_LIMIT:
 				# Try to truncate at a natural break point (paragraph, sentence)
 				truncate_at = MAX_CHAR_LIMIT
 
@@ -719,6 +734,8 @@ class Tools(Generic[Context]):
 			stats_summary = f"""Content processed: {original_html_length:,} HTML chars → {initial_markdown_length:,} initial markdown → {final_filtered_length:,} filtered markdown"""
 			if start_from_char > 0:
 				stats_summary += f' (started from char {start_from_char:,})'
+			if chunks:
+				stats_summary += f' → split into {len(chunks)} chunks'
 			if truncated:
 				stats_summary += f' → {len(content):,} final chars (truncated, use start_from_char={content_stats["next_start_char"]} to continue)'
 			elif chars_filtered > 0:
@@ -752,15 +769,33 @@ You will be given a query and the markdown of a webpage that has been filtered t
 			prompt = f'<query>\n{query}\n</query>\n\n<content_stats>\n{stats_summary}\n</content_stats>\n\n<webpage_content>\n{content}\n</webpage_content>'
 
 			try:
-				response = await asyncio.wait_for(
-					page_extraction_llm.ainvoke([SystemMessage(content=system_prompt), UserMessage(content=prompt)]),
-					timeout=120.0,
-				)
-
 				current_url = await browser_session.get_current_page_url()
-				extracted_content = (
-					f'<url>\n{current_url}\n</url>\n<query>\n{query}\n</query>\n<result>\n{response.completion}\n</result>'
+
+				# Repeated extractions of the same query on an unchanged page are served from cache
+				cache_key = ExtractionCache.make_key(
+					current_url, query, content, extract_links=extract_links, start_from_char=start_from_char
 				)
+				completion = self._extraction_cache.get(cache_key)
+				if completion is not None:
+					logger.debug(f'📄 Extraction cache hit for query: {query}')
+				elif chunks:
+					logger.info(f'📄 Extracting from {len(chunks)} chunks concurrently ({len(content):,} chars)')
+					completion = await map_reduce_extract(
+						page_extraction_llm,
+						query,
+						[chunk for chunk in chunks if chunk.content.strip()],
+						stats_summary,
+						max_concurrency=self.max_concurrent_extraction_calls,
+					)
+				else:
+					response = await asyncio.wait_for(
+						page_extraction_llm.ainvoke([SystemMessage(content=system_prompt), UserMessage(content=prompt)]),
+						timeout=120.0,
+					)
+					completion = response.completion
+				self._extraction_cache.set(cache_key, completion)
+
+				extracted_content = f'<url>\n{current_url}\n</url>\n<query>\n{query}\n</query>\n<result>\n{completion}\n</result>'
 
 				# Simple memory handling
 				MAX_MEMORY_LENGTH = 1000
@@ -1055,13 +1090,19 @@ You will be given a query and the markdown of a webpage that has been filtered t
 			return ActionResult(extracted_content=result, long_term_memory=result)
 
 		@self.registry.action(
-			'Read the complete content of a file. Use this to view file contents before editing or to retrieve data from files. Supports text files (txt, md, json, csv, jsonl), documents (pdf, docx), and images (jpg, png).'
+			'Read the content of a file. Use this to view file contents before editing or to retrieve data from files. Supports text files (txt, md, json, csv, jsonl), documents (pdf, docx), and images (jpg, png). Large files are returned in windows: use start and end (1-based, inclusive) to read a range of lines, or of pages for pdf/docx.'
 		)
-		async def read_file(file_name: str, available_file_paths: list[str], file_system: FileSystem):
+		async def read_file(
+			file_name: str,
+			available_file_paths: list[str],
+			file_system: FileSystem,
+			start: int | None = None,
+			end: int | None = None,
+		):
 			if available_file_paths and file_name in available_file_paths:
-				structured_result = await file_system.read_file_structured(file_name, external_file=True)
+				structured_result = await file_system.read_file_structured(file_name, external_file=True, start=start, end=end)
 			else:
-				structured_result = await file_system.read_file_structured(file_name)
+				structured_result = await file_system.read_file_structured(file_name, start=start, end=end)
 
 			result = structured_result['message']
 			images = structured_result.get('images')
@@ -756,6 +756,66 @@ def create_task_with_error_handling(
 	return task
 
 
+class LoopLagMonitor:
+	"""Measure event loop lag: how late a periodic timer fires compared to when it was due.
+
+	A blocked loop (e.g. a long synchronous DOM build) shows up as large lag samples, which
+	delays CDP event handling, watchdog timeouts and every other agent sharing the loop.
+
+	Example:
+		async with LoopLagMonitor() as monitor:
+			await agent.run()
+		print(monitor.summary())  # {'samples': ..., 'mean_ms': ..., 'p95_ms': ..., 'max_ms': ...}
+	"""
+
+	def __init__(self, interval: float = 0.01):
+		self.interval = interval
+		self.samples: list[float] = []
+		self._task: asyncio.Task | None = None
+		self._due: float | None = None
+
+	def start(self) -> None:
+		if self._task is None:
+			self._task = asyncio.create_task(self._run(), name='loop_lag_monitor')
+
+	async def stop(self) -> None:
+		if self._task is not None:
+			# A stall that is still in progress when stopping never got to wake the timer, count it here
+			if self._due is not None and (overdue := time.perf_counter() - self._due) > 0:
+				self.samples.append(overdue)
+			self._task.cancel()
+			try:
+				await self._task
+			except asyncio.CancelledError:
+				pass
+			self._task = None
+			self._due = None
+
+	async def _run(self) -> None:
+		while True:
+			self._due = time.perf_counter() + self.interval
+			await asyncio.sleep(self.interval)
+			self.samples.append(max(0.0, time.perf_counter() - self._due))
+
+	def summary(self) -> dict[str, float]:
+		if not self.samples:
+			return {'samples': 0, 'mean_ms': 0.0, 'p95_ms': 0.0, 'max_ms': 0.0}
+		ordered = sorted(self.samples)
+		return {
+			'samples': len(ordered),
+			'mean_ms': sum(ordered) / len(ordered) * 1000,
+			'p95_ms': ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+			'max_ms': ordered[-1] * 1000,
+		}
+
+	async def __aenter__(self) -> 'LoopLagMonitor':
+		self.start()
+		return self
+
+	async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+		await self.stop()
+
+
 def sanitize_surrogates(text: str) -> str:
 	"""Remove surrogate characters that can't be encoded in UTF-8.
 
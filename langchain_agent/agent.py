@@ -35,7 +35,7 @@ PRODUCT PAGE (URL contains /dp/ or /gp/product/):
 13. After clicking "Add to Cart", observe_dom again to confirm the action was successful.
 
 GENERAL:
-14. NEVER guess or assume element indices. Always use the exact indices from the most recent observe_dom output.
+14. NEVER guess or assume element indices. Always use the exact indices from observe_dom output. On the same page observe_dom only lists elements that changed since the previous call - unchanged elements keep their indices, and elements listed as "No longer available" must not be used. Call observe_dom with full=true if you need the complete list again.
 15. If observe_dom shows no product links on search page, scroll down 2-3 pages, then observe_dom again."""
             ),
             ("human", "{input}"),
@@ -1,58 +1,27 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Annotated, Optional
 import uvicorn
 import json
-import asyncio
+import os
 
-# Import from the same directory
-from gr import add_to_cart, ProductDetailPage
-
-app = FastAPI(title="Amazon Cart API", version="1.0.0")
-
-# Enable CORS for Streamlit
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # In production, specify your Streamlit URL
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-
-class AddToCartRequest(BaseModel):
-    product_name: str = Field(..., description="Product name to search and add to cart")
-
-
-class AddToCartResponse(BaseModel):
-    success: bool
-    message: str
-    cart: Optional[ProductDetailPage] = None
-    error: Optional[str] = None
-
-
-@app.get("/")
-async def root():
-    return {"message": "Amazon Cart API is running"}
+from fastapi import Header
+from browser_use import Agent, BrowserProfile, BrowserSession, ChatOpenAI
+from browser_use.agent.views import AgentOutput
 
+# Import from the same directory
+from gr import ProductDetailPage
+from jobs import Job, JobQueue, QueueFullError
 
-@app.get("/health")
-async def health():
-    return {"status": "healthy"}
+# One LLM client for all jobs, browsers come from the job queue's pool
+llm = ChatOpenAI(model="gpt-4o-mini")
 
 
-async def stream_add_to_cart(product_name: str):
-    """Async generator function that yields progress updates as the agent runs."""
-    try:
-        from browser_use import Agent, Browser, ChatOpenAI
-        from gr import ProductDetailPage
-        
-        browser = Browser(headless=False)
-        llm = ChatOpenAI(model="gpt-4o-mini")
-        
-        task = f"""
+def build_task(product_name: str) -> str:
+    return f"""
         Go to https://www.amazon.in
         Search for "{product_name}" on Amazon.in at the home page.
         Wait for search results to load completely.
@@ -93,121 +62,210 @@ async def stream_add_to_cart(product_name: str):
         - If navigate doesn't work, use evaluate with JavaScript: (function(){{const url="PRODUCT_URL";const link=Array.from(document.querySelectorAll('a')).find(a=>a.href===url||a.href.includes(url.split('/dp/')[1]?.split('/')[0]));if(link){{link.click();return"clicked"}}return"not found"}})()
         - If product page doesn't load, use go_back and try a different product URL
         """
-        
-        agent = Agent(
-            browser=browser,
-            llm=llm,
-            task=task,
-            output_model_schema=ProductDetailPage,
-            max_steps=50,  # Limit steps to prevent infinite loops
-            step_timeout=120,  # 2 minutes per step timeout
-        )
-        
-        yield f"data: {json.dumps({'type': 'status', 'message': '🚀 Starting agent...', 'step': 0})}\n\n"
-        
-        # Run agent and monitor progress
-        previous_steps = 0
-        agent_task = asyncio.create_task(agent.run())
-        
-        # Monitor progress
-        while not agent_task.done():
-            if hasattr(agent, 'history') and agent.history:
-                current_steps = len(agent.history.history)
-                if current_steps > previous_steps:
-                    step_info = agent.history.history[-1]
-                    previous_steps = current_steps
-                    
-                    # Get action info
-                    action_name = "Processing..."
-                    if step_info.model_output:
-                        if hasattr(step_info.model_output, 'action') and step_info.model_output.action:
-                            action = step_info.model_output.action[0]
-                            # Action is typically a Pydantic model, get its action name from model_dump
-                            action_dict = action.model_dump(exclude_none=True, mode='json') if hasattr(action, 'model_dump') else {}
-                            # Action name is usually the first key in the dict
-                            if action_dict:
-                                action_name = list(action_dict.keys())[0] if action_dict else str(action)
-                            else:
-                                action_name = str(action)
-                        elif hasattr(step_info.model_output, 'current_state'):
-                            state = step_info.model_output.current_state
-                            if hasattr(state, 'next_goal') and state.next_goal:
-                                action_name = state.next_goal[:50] + "..." if len(state.next_goal) > 50 else state.next_goal
-                    
-                    yield f"data: {json.dumps({'type': 'progress', 'step': current_steps, 'action': action_name, 'message': f'✅ Step {current_steps} completed'})}\n\n"
-            
-            await asyncio.sleep(0.3)  # Check every 300ms
-        
-        # Get result
-        result = await agent_task
-        
-        # Send completion
-        if result and result.structured_output:
-            cart = result.structured_output
-            yield f"data: {json.dumps({'type': 'complete', 'success': True, 'message': f'✅ Successfully added {cart.product_name} to cart', 'cart': cart.model_dump()})}\n\n"
-        else:
-            yield f"data: {json.dumps({'type': 'complete', 'success': False, 'message': '⚠️ Agent completed but no structured output', 'error': 'No structured output available'})}\n\n"
-            
-    except Exception as e:
-        import traceback
-        error_msg = f"{str(e)}\n{traceback.format_exc()}"
-        yield f"data: {json.dumps({'type': 'error', 'success': False, 'message': '❌ An error occurred', 'error': error_msg})}\n\n"
 
 
-@app.post("/add-to-cart")
-async def add_to_cart_endpoint(request: AddToCartRequest):
-    """
-    Search for products on Amazon.in and add them to cart.
-    Returns streaming updates with real-time progress.
-    """
+def describe_step(model_output: Optional[AgentOutput]) -> str:
+    """Name of the step's first action, or its next goal when it has no actions."""
+    if model_output is None:
+        return "Processing..."
+    if model_output.action:
+        # An action model has exactly one action set, no need to dump it to find out which
+        action = model_output.action[0]
+        action = getattr(action, 'root', action)  # union action models wrap the chosen action
+        return next((name for name in action.model_fields_set if getattr(action, name) is not None), str(action))
+    next_goal = model_output.next_goal
+    if next_goal:
+        return next_goal[:50] + "..." if len(next_goal) > 50 else next_goal
+    return "Processing..."
+
+
+async def publish_step(job: Job, agent: Agent) -> None:
+    """on_step_end hook: push the finished step to everyone following the job."""
+    steps = agent.history.history
+    if not steps:
+        return
+    job.publish({
+        'type': 'progress',
+        'step': len(steps),
+        'action': describe_step(steps[-1].model_output),
+        'message': f'✅ Step {len(steps)} completed',
+    })
+
+
+async def run_add_to_cart(job: Job, browser_session: BrowserSession) -> dict:
+    """Run the add-to-cart agent for a job in one of the pooled browsers, publishing its progress."""
+    agent = Agent(
+        browser_session=browser_session,
+        llm=llm,
+        task=build_task(job.product_name),
+        output_model_schema=ProductDetailPage,
+        max_steps=50,  # Limit steps to prevent infinite loops
+        step_timeout=120,  # 2 minutes per step timeout
+    )
+
+    # Progress is pushed from the agent's step hook into the job's channel as each step finishes
+    result = await agent.run(on_step_end=lambda agent: publish_step(job, agent))
+
+    if result and result.structured_output:
+        cart = result.structured_output
+        return {'success': True, 'message': f'✅ Successfully added {cart.product_name} to cart', 'cart': cart.model_dump()}
+    return {'success': False, 'message': '⚠️ Agent completed but no structured output', 'error': 'No structured output available'}
+
+
+job_queue = JobQueue(
+    run_add_to_cart,
+    workers=int(os.getenv("CART_API_WORKERS", "2")),
+    max_queued=int(os.getenv("CART_API_MAX_QUEUED", "20")),
+    browser_profile=BrowserProfile(headless=os.getenv("CART_API_HEADLESS", "false").lower() == "true", user_data_dir=None),
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await job_queue.start()
+    yield
+    await job_queue.stop()
+
+
+app = FastAPI(title="Amazon Cart API", version="1.0.0", lifespan=lifespan)
+
+# Enable CORS for Streamlit
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],  # In production, specify your Streamlit URL
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+
+class AddToCartRequest(BaseModel):
+    product_name: str = Field(..., description="Product name to search and add to cart")
+
+
+class AddToCartResponse(BaseModel):
+    success: bool
+    message: str
+    cart: Optional[ProductDetailPage] = None
+    error: Optional[str] = None
+
+
+@app.get("/")
+async def root():
+    return {"message": "Amazon Cart API is running"}
+
+
+@app.get("/health")
+async def health():
+    return {"status": "healthy"}
+
+
+class JobSubmitted(BaseModel):
+    job_id: str
+    status: str
+    queue_depth: int
+
+
+def submit_job(request: AddToCartRequest) -> Job:
     if not request.product_name or not request.product_name.strip():
         raise HTTPException(status_code=400, detail="Product name cannot be empty")
-    
+    try:
+        return job_queue.submit(request.product_name.strip())
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "30"})
+
+
+async def stream_job(job: Job, after: int = 0):
+    """Server-sent events for a job: everything published so far, then live updates until it finishes.
+
+    Each event carries its index as SSE id, so a reconnecting client (Last-Event-ID) resumes where it left off.
+    """
+    async for index, event in job.stream(after):
+        yield f"id: {index}\ndata: {json.dumps(event)}\n\n"
+
+
+def event_stream_response(job: Job, after: int = 0) -> StreamingResponse:
     return StreamingResponse(
-        stream_add_to_cart(request.product_name),
+        stream_job(job, after),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
             "Connection": "keep-alive",
-            "X-Accel-Buffering": "no"
+            "X-Accel-Buffering": "no",
+            "X-Job-Id": job.id,
         }
     )
 
 
+def get_job(job_id: str) -> Job:
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job {job_id}")
+    return job
+
+
+@app.post("/jobs", response_model=JobSubmitted, status_code=202)
+async def submit_job_endpoint(request: AddToCartRequest):
+    """
+    Queue an add-to-cart job and return its id right away.
+    Follow it with GET /jobs/{job_id} (polling) or GET /jobs/{job_id}/events (streaming).
+    """
+    job = submit_job(request)
+    return JobSubmitted(job_id=job.id, status=job.status.value, queue_depth=job_queue.metrics()["queue_depth"])
+
+
+@app.get("/jobs/{job_id}")
+async def job_status_endpoint(job_id: str):
+    return get_job(job_id).to_dict()
+
+
+@app.get("/jobs/{job_id}/events")
+async def job_events_endpoint(job_id: str, last_event_id: Annotated[Optional[str], Header()] = None):
+    # Job.stream() clamps an id past the end of the history, so the events still to come keep their own ids
+    after = int(last_event_id) + 1 if last_event_id and last_event_id.isdigit() else 0
+    return event_stream_response(get_job(job_id), after)
+
+
+@app.get("/metrics")
+async def metrics_endpoint():
+    """Queue depth, wait and run times of the job queue, for autoscaling."""
+    return job_queue.metrics()
+
+
+@app.post("/add-to-cart")
+async def add_to_cart_endpoint(request: AddToCartRequest):
+    """
+    Search for products on Amazon.in and add them to cart.
+    Queues a job and returns streaming updates with real-time progress.
+    """
+    return event_stream_response(submit_job(request))
+
+
 @app.post("/add-to-cart-sync", response_model=AddToCartResponse)
 async def add_to_cart_sync_endpoint(request: AddToCartRequest):
     """
     Search for products on Amazon.in and add them to cart.
-    Returns structured data about the items added (synchronous version).
+    Returns structured data about the items added (waits for the queued job to finish).
     """
-    try:
-        if not request.product_name or not request.product_name.strip():
-            raise HTTPException(status_code=400, detail="Product name cannot be empty")
-        
-        # Run the agent
-        result = await add_to_cart(request.product_name)
-        
-        # Extract structured output
-        if result and result.structured_output:
-            cart = result.structured_output
-            return AddToCartResponse(
-                success=True,
-                message=f"Successfully added {cart.product_name} to cart",
-                cart=cart
-            )
-        else:
-            return AddToCartResponse(
-                success=False,
-                message="Agent completed but no structured output was returned",
-                error="No structured output available"
-            )
-    
-    except Exception as e:
+    job = await submit_job(request).wait()
+    if job.error:
         return AddToCartResponse(
             success=False,
             message="An error occurred while processing the request",
-            error=str(e)
+            error=job.error
         )
+    result = job.result or {}
+    if result.get("success"):
+        return AddToCartResponse(
+            success=True,
+            message=f"Successfully added {result['cart']['product_name']} to cart",
+            cart=result["cart"]
+        )
+    return AddToCartResponse(
+        success=False,
+        message="Agent completed but no structured output was returned",
+        error="No structured output available"
+    )
 
 
 if __name__ == "__main__":
@@ -1,8 +1,12 @@
 import asyncio
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from pathlib import Path
 
 from pydantic import BaseModel, Field
 
-from browser_use import Agent, Browser, ChatOpenAI
+from browser_use import Agent, BrowserProfile, BrowserSession, ChatOpenAI
 
 
 class GroceryItem(BaseModel):
@@ -21,27 +25,51 @@ class GroceryCart(BaseModel):
 	items: list[GroceryItem] = Field(default_factory=list, description='All grocery items found')
 
 
-async def add_to_cart(items: list[str] = []):
-	browser = Browser(headless=False)
+class ItemResult(BaseModel):
+	"""Outcome of the agent run for one requested item"""
 
-	llm = ChatOpenAI(model="gpt-4o-mini")
+	item: str
+	added: list[GroceryItem] = Field(default_factory=list)
+	error: str | None = None
+	steps: int = 0
+	seconds: float = 0.0
 
-	# Task prompt
-	task = f"""
+
+class CartResult(BaseModel):
+	"""Per-item results of a batch, aggregated into one GroceryCart"""
+
+	results: list[ItemResult] = Field(default_factory=list)
+	seconds: float = 0.0
+
+	@property
+	def structured_output(self) -> GroceryCart | None:
+		"""Every item added across the batch, None when nothing was added"""
+		items = [grocery_item for result in self.results for grocery_item in result.added]
+		return GroceryCart(items=items) if items else None
+
+	def has_errors(self) -> bool:
+		return any(result.error for result in self.results)
+
+	def number_of_steps(self) -> int:
+		return sum(result.steps for result in self.results)
+
+
+def build_task(item: str) -> str:
+	return f"""
     Go to https://www.amazon.in
     Wait for the page to fully load.
 
     STEP-BY-STEP PROCESS:
     0. SEARCH ON AMAZON (CRITICAL - DO THIS FIRST):
        a) Find the search input box (usually has id="twotabsearchtextbox" or placeholder like "Search Amazon.in")
-       b) Use the INPUT action (NOT click) to type "{items[0] if items else 'product'}" into the search input box
+       b) Use the INPUT action (NOT click) to type "{item}" into the search input box
        c) After typing, click the search button (usually a magnifying glass icon or "Go" button) OR use send_keys with "Enter" to submit
        d) Wait for search results page to load completely (URL should change to include /s?k=)
        e) Verify you are on the search results page before proceeding
     1. Once on search results page, use the extract action to list first 10 products on the page with their COMPLETE product URLs (full URL starting with https://), product names, prices, brands (if visible), sizes (if visible), and identify which ones are "Sponsored" and which are NOT sponsored.
     2. From the extracted list, identify the first product that:
        - Is NOT marked as "Sponsored"
-       - Has a product name that matches or closely matches "{items[0] if items else 'product'}" (the search term)
+       - Has a product name that matches or closely matches "{item}" (the search term)
        - Note its complete URL
     3. Scroll down if needed to see all products clearly.
     4. ALTERNATIVE METHODS TO OPEN PRODUCT (try in this order):
@@ -75,7 +103,7 @@ async def add_to_cart(items: list[str] = []):
     - NEVER click on any product that has "Sponsored" can appear as text, badge, aria-label, or small label above the title.
     - If any sponsored indicator exists, exclude the product.
     - ALWAYS use extract first to verify which products are sponsored
-    - The unsponsored product should have the exact product name or closely match "{items[0] if items else 'product'}" (the product name you provided)
+    - The unsponsored product should have the exact product name or closely match "{item}" (the product name you provided)
     - The first unsponsored product is usually after 2-4 sponsored products
     - PREFER using navigate action with the extracted product URL instead of click by index
     - If click by index fails with "element index not available", IMMEDIATELY switch to navigate with URL
@@ -114,19 +142,98 @@ async def add_to_cart(items: list[str] = []):
       * The most common scenario: You click "Add to Cart", get an error about the button, but the page actually changed to show "Added to cart" - this is SUCCESS, not failure
     """
 
-	# Create agent with structured output
+
+@asynccontextmanager
+async def shared_browser(
+	sessions: int, headless: bool = False, user_data_dir: str | Path | None = None
+) -> AsyncIterator[list[BrowserSession]]:
+	"""One browser driven through `sessions` BrowserSessions, each in a browser context of its own.
+
+	A session only manages the tabs of its own context, so one agent's tab handling (focus
+	recovery, about:blank tabs, dialogs) never touches another agent's tabs. Contexts don't share
+	cookies: each one is seeded with the cookies of the profile at `user_data_dir`, so with a
+	logged-in profile every item ends up in the same account cart, while anonymous carts are
+	per session.
+	"""
+	owner = BrowserSession(
+		browser_profile=BrowserProfile(headless=headless, user_data_dir=user_data_dir, keep_alive=True, new_browser_context=True)
+	)
+	await owner.start()
+	attached: list[BrowserSession] = []
+	try:
+		for _ in range(sessions - 1):
+			browser_session = BrowserSession(cdp_url=owner.cdp_url, keep_alive=True, new_browser_context=True)
+			attached.append(browser_session)
+			await browser_session.start()
+		# The profile's cookies live in the browser's default context, none of the sessions use it
+		profile_cookies = (await owner.cdp_client.send.Storage.getCookies())['cookies']
+		if profile_cookies:
+			for browser_session in (owner, *attached):
+				await browser_session.cdp_client.send.Storage.setCookies(
+					params={'cookies': profile_cookies, 'browserContextId': browser_session.browser_context_id}
+				)
+		yield [owner, *attached]
+	finally:
+		for browser_session in attached:
+			await browser_session.stop()
+		await owner.kill()
+
+
+async def add_item(item: str, browser_session: BrowserSession, llm: ChatOpenAI) -> ItemResult:
+	"""Search for one item and add it to the cart in the session's tab"""
+	started = time.monotonic()
 	agent = Agent(
-		browser=browser,
+		browser_session=browser_session,
 		llm=llm,
-		task=task,
+		task=build_task(item),
 		output_model_schema=GroceryCart,
 		max_steps=50,  # Limit steps to prevent infinite loops
 		step_timeout=120,  # 2 minutes per step timeout
 	)
+	try:
+		history = await agent.run()
+	except Exception as e:
+		return ItemResult(item=item, error=f'{type(e).__name__}: {e}', seconds=time.monotonic() - started)
+
+	cart = history.structured_output
+	return ItemResult(
+		item=item,
+		added=cart.items if cart else [],
+		error=None if cart else 'Agent completed but no structured output was returned',
+		steps=history.number_of_steps(),
+		seconds=time.monotonic() - started,
+	)
+
+
+async def add_to_cart(
+	items: list[str] = [], max_concurrency: int = 5, headless: bool = False, user_data_dir: str | Path | None = None
+) -> CartResult:
+	"""Add every item to the cart, running up to `max_concurrency` agents at once in one shared browser.
+
+	Each item gets its own agent run, so the wall time approaches that of the slowest item
+	(with max_concurrency >= len(items)) instead of the sum of all of them.
+	"""
+	started = time.monotonic()
+	if not items:
+		return CartResult()
 
-	# Run the agent
-	result = await agent.run()
-	return result
+	llm = ChatOpenAI(model='gpt-4o-mini')
+	pending: asyncio.Queue[int] = asyncio.Queue()
+	for index in range(len(items)):
+		pending.put_nowait(index)
+	results: list[ItemResult | None] = [None] * len(items)
+
+	async def worker(browser_session: BrowserSession) -> None:
+		while not pending.empty():
+			index = pending.get_nowait()
+			results[index] = await add_item(items[index], browser_session, llm)
+
+	async with shared_browser(
+		min(max_concurrency, len(items)), headless=headless, user_data_dir=user_data_dir
+	) as browser_sessions:
+		await asyncio.gather(*(worker(browser_session) for browser_session in browser_sessions))
+
+	return CartResult(results=[result for result in results if result], seconds=time.monotonic() - started)
 
 
 if __name__ == '__main__':
@@ -141,28 +248,28 @@ if __name__ == '__main__':
 	result = asyncio.run(add_to_cart(items))
 
 	# Access structured output
-	if result and result.structured_output:
-		cart = result.structured_output
-
+	cart = result.structured_output
+	if cart:
 		print(f'\n{"=" * 60}')
 		print('✅ Items Added to Cart')
 		print(f'{"=" * 60}\n')
 
-		if cart.items:
-			for item in cart.items:
-				print(f'Name: {item.name}')
-				print(f'Price: ${item.price}')
-				if item.brand:
-					print(f'Brand: {item.brand}')
-				if item.size:
-					print(f'Size: {item.size}')
-				print(f'URL: {item.url}')
-				print(f'{"-" * 60}')
-		else:
-			print('⚠️ No items were found in the cart')
+		for item in cart.items:
+			print(f'Name: {item.name}')
+			print(f'Price: ${item.price}')
+			if item.brand:
+				print(f'Brand: {item.brand}')
+			if item.size:
+				print(f'Size: {item.size}')
+			print(f'URL: {item.url}')
+			print(f'{"-" * 60}')
 	else:
 		print('\n⚠️ Agent completed but no structured output was returned')
-		if result:
-			print(f'Number of steps: {result.number_of_steps()}')
-			if result.has_errors():
-				print('Errors occurred during execution')
\ No newline at end of file
+		print(f'Number of steps: {result.number_of_steps()}')
+		if result.has_errors():
+			print('Errors occurred during execution')
+
+	for item_result in result.results:
+		status = f'❌ {item_result.error}' if item_result.error else f'✅ {len(item_result.added)} added'
+		print(f'{item_result.item}: {status} ({item_result.steps} steps, {item_result.seconds:.0f}s)')
+	print(f'Total wall time: {result.seconds:.0f}s')
@@ -55,16 +55,18 @@ async def add_to_cart_endpoint(request: AddToCartRequest):
         if not request.items:
             raise HTTPException(status_code=400, detail="Items list cannot be empty")
         
-        # Run the agent
+        # Run one agent per item, concurrently in a shared browser
         result = await add_to_cart(request.items)
         
         # Extract structured output
-        if result and result.structured_output:
-            cart = result.structured_output
+        cart = result.structured_output
+        if cart:
+            failed = [f"{item_result.item}: {item_result.error}" for item_result in result.results if item_result.error]
             return AddToCartResponse(
-                success=True,
+                success=not failed,
                 message=f"Successfully processed {len(cart.items)} item(s)",
-                cart=cart
+                cart=cart,
+                error="; ".join(failed) or None
             )
         else:
             return AddToCartResponse(
@@ -0,0 +1,351 @@
+"""Job queue with a bounded pool of warm browsers for the cart API.
+
+Requests no longer run an agent inline: `JobQueue.submit()` returns a `Job` right away and a
+fixed number of workers pick jobs off a bounded queue. Each worker keeps one `BrowserSession`
+alive between jobs and replaces it after a failure or after `max_jobs_per_browser` jobs.
+
+Browsers are headed by default, like the per-request `Browser(headless=False)` this replaces;
+pass a `browser_profile` to change that. Between jobs extra tabs are closed and, unless
+`clear_cookies=False`, cookies are cleared: every job starts with an empty anonymous cart, as it
+did with a fresh browser per request, instead of inheriting the previous job's cart and session.
+
+Progress is pushed: the job runner publishes events into the job's `JobChannel`, which fans
+them out to every subscriber. Clients follow a job by polling `Job.to_dict()` or by iterating
+`Job.stream()`, which replays the events published so far and then receives new ones.
+"""
+
+import asyncio
+import logging
+import statistics
+import time
+import uuid
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional, Union
+
+from browser_use import BrowserProfile, BrowserSession
+from browser_use.browser.events import CloseTabEvent
+
+logger = logging.getLogger(__name__)
+
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class _Subscriber:
+    __slots__ = ("queue", "detached")
+
+    def __init__(self, backlog: list[dict], max_buffered: int):
+        self.queue: "asyncio.Queue[Union[dict, object]]" = asyncio.Queue(maxsize=max(max_buffered, len(backlog) + 1))
+        for event in backlog:
+            self.queue.put_nowait(event)
+        self.detached = False
+
+
+_CLOSED = object()
+
+
+class JobChannel:
+    """Fan-out of one job's events to any number of subscribers.
+
+    publish() never waits: it appends to `history` and puts the event into every subscriber's
+    bounded buffer without blocking, so a stalled client can't hold up the job that publishes
+    from its agent step hook. A subscriber whose buffer is full is detached from the live feed
+    and, once it has drained its buffer, catches up from `history`. Subscribing replays `history`
+    first, so late subscribers see every event exactly once.
+    """
+
+    def __init__(self, max_buffered: int = 32):
+        self.max_buffered = max_buffered
+        self.history: list[dict] = []
+        self.closed = asyncio.Event()
+        self._subscribers: set[_Subscriber] = set()
+
+    def publish(self, event: dict) -> None:
+        self.history.append(event)
+        for subscriber in list(self._subscribers):
+            try:
+                subscriber.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                self._detach(subscriber)
+
+    def close(self) -> None:
+        """Mark the end of the stream, subscribers finish after the events already published."""
+        self.closed.set()
+        for subscriber in list(self._subscribers):
+            try:
+                subscriber.queue.put_nowait(_CLOSED)
+            except asyncio.QueueFull:
+                self._detach(subscriber)
+
+    async def subscribe(self, after: int = 0) -> AsyncIterator[tuple[int, dict]]:
+        """(index, event) pairs starting at history index `after`, until the channel is closed."""
+        sent = min(max(after, 0), len(self.history))  # an index past the end resumes at the next event
+        while True:
+            subscriber = self._attach(sent)
+            try:
+                while True:
+                    if subscriber.detached and subscriber.queue.empty():
+                        break  # fell behind: re-attach from history where we are
+                    item = await subscriber.queue.get()
+                    if item is _CLOSED:
+                        return
+                    yield sent, item  # type: ignore[misc]
+                    sent += 1
+            finally:
+                self._subscribers.discard(subscriber)
+
+    def _attach(self, after: int) -> _Subscriber:
+        subscriber = _Subscriber(self.history[after:], self.max_buffered)
+        if self.closed.is_set():
+            subscriber.queue.put_nowait(_CLOSED)
+        else:
+            self._subscribers.add(subscriber)
+        return subscriber
+
+    def _detach(self, subscriber: _Subscriber) -> None:
+        subscriber.detached = True
+        self._subscribers.discard(subscriber)
+
+
+@dataclass
+class Job:
+    product_name: str
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    status: JobStatus = JobStatus.QUEUED
+    result: Optional[dict] = None
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.monotonic)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    channel: JobChannel = field(default_factory=JobChannel, repr=False)
+
+    @property
+    def done(self) -> bool:
+        return self.status in (JobStatus.SUCCEEDED, JobStatus.FAILED)
+
+    @property
+    def events(self) -> list[dict]:
+        return self.channel.history
+
+    @property
+    def wait_time(self) -> Optional[float]:
+        """Seconds spent queued before a worker picked the job up."""
+        return None if self.started_at is None else self.started_at - self.created_at
+
+    @property
+    def run_time(self) -> Optional[float]:
+        if self.started_at is None:
+            return None
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    def publish(self, event: dict) -> None:
+        """Push a progress event to everyone following this job, without waiting for them."""
+        self.channel.publish(event)
+
+    def stream(self, after: int = 0) -> AsyncIterator[tuple[int, dict]]:
+        """(index, event) pairs of the job, the ones published so far first, until it finishes."""
+        return self.channel.subscribe(after)
+
+    async def wait(self) -> "Job":
+        await self.channel.closed.wait()
+        return self
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "product_name": self.product_name,
+            "status": self.status.value,
+            "result": self.result,
+            "error": self.error,
+            "wait_time": self.wait_time,
+            "run_time": self.run_time,
+            "events": self.events,
+        }
+
+
+class QueueFullError(Exception):
+    """Raised by JobQueue.submit() when max_queued jobs are already waiting."""
+
+
+# Runs one job in a browser session, publishing progress on the job and returning its result
+JobRunner = Callable[[Job, BrowserSession], Awaitable[Optional[dict]]]
+
+
+def _summary(values: "deque[float]") -> dict[str, Optional[float]]:
+    if not values:
+        return {"avg": None, "p50": None, "p95": None, "max": None}
+    ordered = sorted(values)
+    return {
+        "avg": statistics.fmean(ordered),
+        "p50": ordered[len(ordered) // 2],
+        "p95": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+        "max": ordered[-1],
+    }
+
+
+class JobQueue:
+    def __init__(
+        self,
+        run_job: JobRunner,
+        workers: int = 2,
+        max_queued: int = 20,
+        max_jobs_per_browser: int = 25,
+        browser_profile: Optional[BrowserProfile] = None,
+        clear_cookies: bool = True,
+        keep_finished: int = 500,
+        metrics_window: int = 200,
+    ):
+        self.run_job = run_job
+        self.workers = workers
+        self.max_jobs_per_browser = max_jobs_per_browser
+        self.browser_profile = browser_profile or BrowserProfile(headless=False, user_data_dir=None)
+        self.clear_cookies = clear_cookies
+        self.keep_finished = keep_finished
+        self._queue: "asyncio.Queue[Job]" = asyncio.Queue(maxsize=max_queued)
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._worker_tasks: list[asyncio.Task] = []
+        self._sessions: dict[int, BrowserSession] = {}
+        self._running = 0
+        self._counts = {JobStatus.SUCCEEDED: 0, JobStatus.FAILED: 0}
+        self._browser_starts = 0
+        self._wait_times: "deque[float]" = deque(maxlen=metrics_window)
+        self._run_times: "deque[float]" = deque(maxlen=metrics_window)
+
+    async def start(self) -> None:
+        """Start the workers, each launching its browser right away so the first jobs find it warm."""
+        for worker_id in range(self.workers):
+            self._worker_tasks.append(asyncio.create_task(self._worker(worker_id), name=f"job-worker-{worker_id}"))
+
+    async def stop(self) -> None:
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks.clear()
+        # Nobody will pick up the jobs still waiting, finish them so their followers don't hang
+        while not self._queue.empty():
+            job = self._queue.get_nowait()
+            job.status, job.error, job.finished_at = JobStatus.FAILED, "Queue stopped", time.monotonic()
+            self._counts[job.status] += 1
+            job.channel.publish(self._final_event(job))
+            job.channel.close()
+        await asyncio.gather(*(self._close_session(worker_id) for worker_id in list(self._sessions)))
+
+    def submit(self, product_name: str) -> Job:
+        job = Job(product_name=product_name)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise QueueFullError(f"{self._queue.qsize()} jobs are already queued, try again later") from None
+        self._jobs[job.id] = job
+        job.channel.publish({"type": "status", "message": f"⏳ Queued (position {self._queue.qsize()})", "step": 0})
+        self._forget_finished()
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def metrics(self) -> dict[str, Any]:
+        """Load figures to autoscale on: a growing queue_depth / oldest_queued_wait means more workers are needed."""
+        now = time.monotonic()
+        queued = [job for job in self._jobs.values() if job.status == JobStatus.QUEUED]
+        return {
+            "workers": self.workers,
+            "busy_workers": self._running,
+            "utilization": self._running / self.workers if self.workers else 0.0,
+            "queue_depth": self._queue.qsize(),
+            "queue_capacity": self._queue.maxsize,
+            "oldest_queued_wait": max((now - job.created_at for job in queued), default=0.0),
+            "jobs_succeeded": self._counts[JobStatus.SUCCEEDED],
+            "jobs_failed": self._counts[JobStatus.FAILED],
+            "browser_starts": self._browser_starts,
+            "wait_time": _summary(self._wait_times),
+            "run_time": _summary(self._run_times),
+        }
+
+    async def _worker(self, worker_id: int) -> None:
+        jobs_in_browser = 0
+        try:
+            await self._get_session(worker_id)
+        except Exception as e:
+            logger.warning(f"Worker {worker_id} could not pre-start its browser: {type(e).__name__}: {e}")
+        while True:
+            job = await self._queue.get()
+            self._running += 1
+            job.status, job.started_at = JobStatus.RUNNING, time.monotonic()
+            self._wait_times.append(job.wait_time or 0.0)
+            keep_browser = False
+            try:
+                browser_session = await self._get_session(worker_id)
+                job.publish({"type": "status", "message": "🚀 Starting agent...", "step": 0})
+                job.result = await self.run_job(job, browser_session)
+                job.status = JobStatus.SUCCEEDED
+                jobs_in_browser += 1
+                keep_browser = jobs_in_browser < self.max_jobs_per_browser and await self._clean_session(browser_session)
+            except asyncio.CancelledError:
+                job.status, job.error = JobStatus.FAILED, "Worker stopped"
+                raise
+            except Exception as e:
+                logger.exception(f"Job {job.id} failed")
+                job.status, job.error = JobStatus.FAILED, f"{type(e).__name__}: {e}"
+            finally:
+                job.finished_at = time.monotonic()
+                self._run_times.append(job.run_time or 0.0)
+                self._counts[job.status] += 1
+                self._running -= 1
+                self._queue.task_done()
+                job.channel.publish(self._final_event(job))
+                job.channel.close()
+                if not keep_browser:
+                    # The browser may be in a bad state after a failure, and long-lived ones are recycled
+                    jobs_in_browser = 0
+                    await self._close_session(worker_id)
+
+    @staticmethod
+    def _final_event(job: Job) -> dict:
+        if job.status == JobStatus.FAILED:
+            return {"type": "error", "success": False, "message": "❌ An error occurred", "error": job.error}
+        return {"type": "complete", **(job.result or {"success": False, "message": "⚠️ Agent completed without a result"})}
+
+    async def _get_session(self, worker_id: int) -> BrowserSession:
+        browser_session = self._sessions.get(worker_id)
+        if browser_session is None:
+            profile = self.browser_profile.model_copy(update={"keep_alive": True})
+            browser_session = BrowserSession(browser_profile=profile)
+            await browser_session.start()
+            self._browser_starts += 1
+            self._sessions[worker_id] = browser_session
+        return browser_session
+
+    async def _clean_session(self, browser_session: BrowserSession) -> bool:
+        """Leave one blank tab (and no cookies) for the next job, False if the browser should be replaced."""
+        try:
+            for tab in await browser_session.get_tabs():
+                if tab.target_id != browser_session.agent_focus_target_id:
+                    await browser_session.event_bus.dispatch(CloseTabEvent(target_id=tab.target_id))
+            await browser_session.navigate_to("about:blank")
+            if self.clear_cookies:
+                await browser_session.clear_cookies()
+            return True
+        except Exception as e:
+            logger.warning(f"Replacing browser that could not be cleaned up: {type(e).__name__}: {e}")
+            return False
+
+    async def _close_session(self, worker_id: int) -> None:
+        browser_session = self._sessions.pop(worker_id, None)
+        if browser_session is None:
+            return
+        try:
+            await browser_session.kill()
+        except Exception as e:
+            logger.warning(f"Error closing browser of worker {worker_id}: {type(e).__name__}: {e}")
+
+    def _forget_finished(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.done]
+        for job_id in finished[: max(0, len(finished) - self.keep_finished)]:
+            del self._jobs[job_id]
@@ -1,7 +1,10 @@
+import re
 from langchain_core.tools import BaseTool
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 from typing import Any, Optional
 from browser_use.browser.session import BrowserSession
+from browser_use.browser.views import BrowserStateSummary
+from browser_use.dom.views import EnhancedDOMTreeNode, NodeType
 
 
 class OpenURLInput(BaseModel):
@@ -46,153 +49,302 @@ class OpenURLTool(BaseTool):
 
 class ObserveDOMInput(BaseModel):
     unused: str = Field(default="", description="Optional parameter (not used)")
+    full: bool = Field(default=False, description="List every element instead of only the changes since the last observation")
+
+
+ADD_TO_CART_TEXT = re.compile(r"add to cart|add to basket|add to bag|buy now|add to shopping cart|add item to cart")
+ADD_TO_CART_ATTRIBUTE = re.compile(r"add-to-cart|addtocart|add-to-basket|buy-now|add-to-bag")
+ADD_TO_CART_ARIA_LABEL = re.compile(r"add to cart|add to basket|buy now")
+ADD_TO_CART_TAGS = frozenset({"button", "input", "span", "a", "div"})
+
+# Events after which the page may look different, so the next observation needs a fresh DOM snapshot
+PAGE_CHANGING_EVENTS = (
+    "NavigateToUrlEvent", "ClickElementEvent", "ClickCoordinateEvent", "TypeTextEvent", "ScrollEvent",
+    "ScrollToTextEvent", "SendKeysEvent", "UploadFileEvent", "SelectDropdownOptionEvent", "GoBackEvent",
+    "GoForwardEvent", "RefreshEvent", "WaitEvent", "SwitchTabEvent", "CloseTabEvent", "TabCreatedEvent",
+    "TabClosedEvent", "AgentFocusChangedEvent", "NavigationCompleteEvent", "DialogOpenedEvent", "TargetCrashedEvent",
+)
+
+# Tells whether the page still has the DOM a snapshot was taken of, when no action ran in between:
+# the document (an id kept on window), its URL, element count and DOM mutations seen since then
+DOM_FINGERPRINT_JS = """(() => {
+    let watch = window.__observeDomWatch;
+    if (!watch) {
+        watch = window.__observeDomWatch = {id: Math.random().toString(36).slice(2), mutations: 0};
+        new MutationObserver(records => { watch.mutations += records.length; }).observe(document, {
+            subtree: true, childList: true, characterData: true, attributes: true,
+            attributeFilter: ['href', 'id', 'name', 'role', 'type', 'aria-label', 'placeholder', 'disabled', 'hidden'],
+        });
+    }
+    return [watch.id, location.href, document.getElementsByTagName('*').length, watch.mutations];
+})()"""
+
+
+def children_text(element: EnhancedDOMTreeNode) -> tuple[str, str]:
+    """get_all_children_text() for max_depth 2 and 3 in a single walk."""
+    parts: list[tuple[int, str]] = []
+
+    def collect(node: EnhancedDOMTreeNode, depth: int) -> None:
+        if depth > 3:
+            return
+        if node.node_type == NodeType.TEXT_NODE:
+            parts.append((depth, node.node_value))
+        elif node.node_type == NodeType.ELEMENT_NODE:
+            for child in node.children:
+                collect(child, depth + 1)
+
+    collect(element, 0)
+    return "\n".join(text for depth, text in parts if depth <= 2).strip(), "\n".join(text for _, text in parts).strip()
+
+
+class DOMView:
+    """The classified elements of one browser state snapshot, as observe_dom lines keyed by index.
+
+    Classification runs once per snapshot, and children text is collected in one walk, only for
+    elements that need it to be classified (add-to-cart candidates) or shown. `indices` holds every
+    element, shown or not, so diffs can tell removed elements from ones left out of the listing.
+    """
+
+    def __init__(self, state: BrowserStateSummary, fingerprint: Optional[tuple] = None):
+        self.url = state.url
+        self.title = state.title
+        self.dom_state = state.dom_state
+        self.fingerprint = fingerprint
+        selector_map = state.dom_state.selector_map if state.dom_state else {}
+        self.element_count = len(selector_map)
+        self.indices = frozenset(selector_map)
+        self.is_search_page = '/s?' in state.url or 'k=' in state.url
+        self.is_product_page = '/dp/' in state.url or '/gp/product/' in state.url
+
+        product_links: list[tuple[int, EnhancedDOMTreeNode]] = []
+        add_to_cart_buttons: list[tuple[int, EnhancedDOMTreeNode, str]] = []
+        other_elements: list[tuple[int, EnhancedDOMTreeNode]] = []
+        for index, element in selector_map.items():
+            href = element.attributes.get('href', '')
+            # Check if this is a product link (on search pages)
+            if self.is_search_page and element.tag_name == 'a' and href and ('/dp/' in href or '/gp/product/' in href):
+                product_links.append((index, element))
+            # Check if this is an "Add to Cart" button (on product pages)
+            elif self.is_product_page and element.tag_name in ADD_TO_CART_TAGS:
+                # Check by ID/name attributes and aria-label first, text only when those don't tell
+                text = children_text(element)[1][:200]
+                is_add_to_cart = (
+                    ADD_TO_CART_ATTRIBUTE.search(element.attributes.get('id', '').lower())
+                    or ADD_TO_CART_ATTRIBUTE.search(element.attributes.get('name', '').lower())
+                    or ADD_TO_CART_ARIA_LABEL.search(element.attributes.get('aria-label', '').lower())
+                    or ADD_TO_CART_TEXT.search(text.lower())
+                )
+                if is_add_to_cart:
+                    add_to_cart_buttons.append((index, element, text))
+                else:
+                    other_elements.append((index, element))
+            else:
+                other_elements.append((index, element))
+
+        self.has_product_links = bool(product_links)
+        self.has_add_to_cart_buttons = bool(add_to_cart_buttons)
+        # Show product links first if we're on a search page
+        self.product_links = {
+            index: self._product_link_line(index, element)
+            for index, element in (product_links[:20] if self.is_search_page else [])  # Show first 20 product links
+        }
+        # Show Add to Cart buttons first if we're on a product page
+        self.add_to_cart_buttons = {
+            index: self._add_to_cart_line(index, element, text) for index, element, text in add_to_cart_buttons
+        }
+        # Show other elements (limit appropriately)
+        if (self.is_product_page and add_to_cart_buttons) or (self.is_search_page and product_links):
+            limit = 100  # Show fewer other elements if we found what the agent is looking for
+        else:
+            limit = 150
+        self.other_elements = {index: self._other_line(index, element) for index, element in other_elements[:limit]}
+
+    @staticmethod
+    def _product_link_line(index: int, element: EnhancedDOMTreeNode) -> str:
+        text = children_text(element)[1][:200]
+        href = element.attributes.get('href', '')
+        elem_info = f"  [{index}] {element.tag_name} href='{href[:80]}'"
+        if text and len(text) > 10:
+            elem_info += f" text='{text[:150]}'"
+        return elem_info
+
+    @staticmethod
+    def _add_to_cart_line(index: int, element: EnhancedDOMTreeNode, text: str) -> str:
+        elem_info = f"  [{index}] {element.tag_name}"
+        if element.attributes.get('id'):
+            elem_info += f" id='{element.attributes['id']}'"
+        if element.attributes.get('name'):
+            elem_info += f" name='{element.attributes['name']}'"
+        if text:
+            elem_info += f" text='{text[:150]}'"
+        return elem_info
+
+    @staticmethod
+    def _other_line(index: int, element: EnhancedDOMTreeNode) -> str:
+        elem_info = f"  [{index}] {element.tag_name}"
+        if element.attributes.get('role'):
+            elem_info += f" role={element.attributes['role']}"
+        if element.attributes.get('type'):
+            elem_info += f" type={element.attributes['type']}"
+        if element.attributes.get('id'):
+            elem_id = element.attributes['id']
+            if 'cart' in elem_id.lower() or 'buy' in elem_id.lower():
+                elem_info += f" id='{elem_id}' ⚠️ (might be cart-related)"
+            else:
+                elem_info += f" id='{element.attributes['id']}'"
+        href = element.attributes.get('href', '')
+        if href:
+            if len(href) > 80:
+                href = href[:77] + "..."
+            elem_info += f" href='{href}'"
+        text = children_text(element)[0][:100]
+        if text:
+            elem_info += f" text='{text}'"
+        if element.attributes.get('placeholder'):
+            elem_info += f" placeholder='{element.attributes['placeholder']}'"
+        return elem_info
+
+    @property
+    def lines(self) -> dict[int, str]:
+        return {**self.product_links, **self.add_to_cart_buttons, **self.other_elements}
+
+    def render(self, previous: Optional["DOMView"] = None) -> str:
+        """The observe_dom output: every element, or only what changed since `previous` (same URL)."""
+        result_parts = [
+            f"URL: {self.url}",
+            f"Title: {self.title}",
+        ]
+        if not self.element_count:
+            return "\n".join(result_parts)
+
+        if previous is None:
+            product_links, add_to_cart_buttons, other_elements = self.product_links, self.add_to_cart_buttons, self.other_elements
+            result_parts.append(f"\nInteractive Elements ({self.element_count}):")
+            result_parts.append("Use the EXACT index numbers shown below - they do NOT start from 0!")
+        else:
+            previous_lines = previous.lines
+            def changed(lines: dict[int, str]) -> dict[int, str]:
+                return {index: line for index, line in lines.items() if previous_lines.get(index) != line}
+            product_links, add_to_cart_buttons, other_elements = (
+                changed(self.product_links), changed(self.add_to_cart_buttons), changed(self.other_elements)
+            )
+            # Diff against every element on the page, not just the listed ones: an element that is
+            # still there but no longer fits in the listing keeps its index and is not "removed"
+            current_lines = self.lines
+            removed = [index for index in previous_lines if index not in self.indices]
+            unchanged = sum(
+                1 for index, line in previous_lines.items()
+                if index in self.indices and current_lines.get(index, line) == line
+            )
+            if not (product_links or add_to_cart_buttons or other_elements or removed):
+                result_parts.append(f"\nNo changes since the last observe_dom: the {unchanged} elements listed there are still valid.")
+            else:
+                result_parts.append(f"\nInteractive Elements ({self.element_count}), changes since the last observe_dom:")
+                result_parts.append(f"{unchanged} elements listed there are unchanged and keep their index numbers.")
+                if removed:
+                    result_parts.append(f"No longer available: {', '.join(f'[{index}]' for index in removed)}")
+        result_parts.append("")
+
+        if self.is_search_page and product_links:
+            result_parts.append("✅ PRODUCT LINKS (click these to view products):")
+            result_parts.extend(product_links.values())
+            result_parts.append("")
+            result_parts.append("Other interactive elements:")
+
+        if self.is_product_page and add_to_cart_buttons:
+            result_parts.append("⭐ ADD TO CART BUTTONS (click these to add product to cart):")
+            result_parts.extend(add_to_cart_buttons.values())
+            result_parts.append("")
+            result_parts.append("Other interactive elements:")
+
+        result_parts.extend(other_elements.values())
+
+        # If no product links found on search page, suggest scrolling
+        if self.is_search_page and not self.has_product_links:
+            result_parts.append("")
+            result_parts.append("⚠️ No product links found in visible area. Try scrolling down to see product listings.")
+
+        # If no Add to Cart button found on product page, provide guidance
+        if self.is_product_page and not self.has_add_to_cart_buttons:
+            result_parts.append("")
+            result_parts.append("⚠️ No 'Add to Cart' button found. Look for buttons with text containing 'cart', 'basket', 'buy', or 'add'. You may need to select product options (size, color, quantity) first.")
+
+        return "\n".join(result_parts)
+
 
 class ObserveDOMTool(BaseTool):
     name: str = "observe_dom"
-    description: str = "Observe and summarize the current DOM"
+    description: str = (
+        "Observe and summarize the current DOM. Lists only the elements that changed since the last observation "
+        "on the same page; pass full=true to list everything again"
+    )
     args_schema: type[BaseModel] = ObserveDOMInput
     session: Optional[BrowserSession] = Field(exclude=True, default=None)
 
+    _view: Optional[DOMView] = PrivateAttr(default=None)
+    _page_changed: bool = PrivateAttr(default=True)
+    _watched_event_bus: Any = PrivateAttr(default=None)
+
     def __init__(self, session: BrowserSession, **kwargs: Any):
         super().__init__(session=session, **kwargs)
 
-    async def _arun(self, unused: str = "") -> str:
+    def _watch_page_changes(self) -> None:
+        """Get told about every action on the page, on the session's current event bus (kill() replaces it)."""
+        event_bus = self.session.event_bus
+        if event_bus is self._watched_event_bus:
+            return
+        self._page_changed = True
+
+        def page_changed(event: Any) -> None:
+            self._page_changed = True
+
+        page_changed.__name__ = f"observe_dom_page_changed_{id(self)}"  # bubus warns about duplicate handler names
+        for event_name in PAGE_CHANGING_EVENTS:
+            event_bus.on(event_name, page_changed)
+        self._watched_event_bus = event_bus
+
+    async def _dom_fingerprint(self) -> Optional[tuple]:
+        """DOM_FINGERPRINT_JS on the focused page, None when it can't be taken (nothing is reused then)."""
+        try:
+            cdp_session = await self.session.get_or_create_cdp_session()
+            result = await cdp_session.cdp_client.send.Runtime.evaluate(
+                params={"expression": DOM_FINGERPRINT_JS, "returnByValue": True}, session_id=cdp_session.session_id
+            )
+            return tuple(result["result"]["value"])
+        except Exception:
+            return None
+
+    async def _arun(self, unused: str = "", full: bool = False) -> str:
         """Observe and summarize the current DOM state."""
         if not self.session:
             return "Error: Browser session not initialized"
         # Ensure browser is started
         if not self.session.agent_focus_target_id:
             await self.session.start()
-        
-        # Get browser state summary
-        state = await self.session.get_browser_state_summary(include_screenshot=False)
-        
-        # Format the state as a readable string
-        result_parts = [
-            f"URL: {state.url}",
-            f"Title: {state.title}",
-        ]
-        
-        if state.dom_state and state.dom_state.selector_map:
-            result_parts.append(f"\nInteractive Elements ({len(state.dom_state.selector_map)}):")
-            result_parts.append("Use the EXACT index numbers shown below - they do NOT start from 0!")
-            result_parts.append("")
-            
-            # Check if we're on a search results page or product page
-            is_search_page = '/s?' in state.url or 'k=' in state.url
-            is_product_page = '/dp/' in state.url or '/gp/product/' in state.url
-            
-            # Separate elements by type
-            product_links = []
-            add_to_cart_buttons = []
-            other_elements = []
-            
-            for index, element in list(state.dom_state.selector_map.items()):
-                href = element.attributes.get('href', '')
-                text = element.get_all_children_text(max_depth=3)[:200]
-                text_lower = text.lower() if text else ''
-                
-                # Check if this is a product link (on search pages)
-                if is_search_page and element.tag_name == 'a' and href and ('/dp/' in href or '/gp/product/' in href):
-                    product_links.append((index, element, text))
-                # Check if this is an "Add to Cart" button (on product pages)
-                elif is_product_page:
-                    # Check by text content
-                    is_add_to_cart = any(keyword in text_lower for keyword in [
-                        'add to cart', 'add to basket', 'add to bag', 'buy now',
-                        'add to shopping cart', 'add item to cart'
-                    ])
-                    # Check by ID/name attributes
-                    elem_id = element.attributes.get('id', '').lower()
-                    elem_name = element.attributes.get('name', '').lower()
-                    is_add_to_cart = is_add_to_cart or any(keyword in elem_id or keyword in elem_name for keyword in [
-                        'add-to-cart', 'addtocart', 'add-to-basket', 'buy-now', 'add-to-bag'
-                    ])
-                    # Check by aria-label
-                    aria_label = element.attributes.get('aria-label', '').lower()
-                    is_add_to_cart = is_add_to_cart or any(keyword in aria_label for keyword in [
-                        'add to cart', 'add to basket', 'buy now'
-                    ])
-                    
-                    if is_add_to_cart and element.tag_name in ['button', 'input', 'span', 'a', 'div']:
-                        add_to_cart_buttons.append((index, element, text))
-                    else:
-                        other_elements.append((index, element))
-                else:
-                    other_elements.append((index, element))
-            
-            # Show product links first if we're on a search page
-            if is_search_page and product_links:
-                result_parts.append("✅ PRODUCT LINKS (click these to view products):")
-                for index, element, text in product_links[:20]:  # Show first 20 product links
-                    href = element.attributes.get('href', '')
-                    elem_info = f"  [{index}] {element.tag_name} href='{href[:80]}'"
-                    if text and len(text) > 10:
-                        elem_info += f" text='{text[:150]}'"
-                    result_parts.append(elem_info)
-                result_parts.append("")
-                result_parts.append("Other interactive elements:")
-            
-            # Show Add to Cart buttons first if we're on a product page
-            if is_product_page and add_to_cart_buttons:
-                result_parts.append("⭐ ADD TO CART BUTTONS (click these to add product to cart):")
-                for index, element, text in add_to_cart_buttons:
-                    elem_info = f"  [{index}] {element.tag_name}"
-                    if element.attributes.get('id'):
-                        elem_info += f" id='{element.attributes['id']}'"
-                    if element.attributes.get('name'):
-                        elem_info += f" name='{element.attributes['name']}'"
-                    if text:
-                        elem_info += f" text='{text[:150]}'"
-                    result_parts.append(elem_info)
-                result_parts.append("")
-                result_parts.append("Other interactive elements:")
-            
-            # Show other elements (limit appropriately)
-            if is_product_page and add_to_cart_buttons:
-                limit = 100  # Show fewer other elements if we found Add to Cart buttons
-            elif is_search_page and product_links:
-                limit = 100
-            else:
-                limit = 150
-            
-            for index, element in other_elements[:limit]:
-                elem_info = f"  [{index}] {element.tag_name}"
-                if element.attributes.get('role'):
-                    elem_info += f" role={element.attributes['role']}"
-                if element.attributes.get('type'):
-                    elem_info += f" type={element.attributes['type']}"
-                if element.attributes.get('id'):
-                    elem_id = element.attributes['id']
-                    if 'cart' in elem_id.lower() or 'buy' in elem_id.lower():
-                        elem_info += f" id='{elem_id}' ⚠️ (might be cart-related)"
-                    else:
-                        elem_info += f" id='{element.attributes['id']}'"
-                href = element.attributes.get('href', '')
-                if href:
-                    if len(href) > 80:
-                        href = href[:77] + "..."
-                    elem_info += f" href='{href}'"
-                text = element.get_all_children_text(max_depth=2)[:100]
-                if text:
-                    elem_info += f" text='{text}'"
-                if element.attributes.get('placeholder'):
-                    elem_info += f" placeholder='{element.attributes['placeholder']}'"
-                result_parts.append(elem_info)
-            
-            # If no product links found on search page, suggest scrolling
-            if is_search_page and not product_links:
-                result_parts.append("")
-                result_parts.append("⚠️ No product links found in visible area. Try scrolling down to see product listings.")
-            
-            # If no Add to Cart button found on product page, provide guidance
-            if is_product_page and not add_to_cart_buttons:
-                result_parts.append("")
-                result_parts.append("⚠️ No 'Add to Cart' button found. Look for buttons with text containing 'cart', 'basket', 'buy', or 'add'. You may need to select product options (size, color, quantity) first.")
-        
-        return "\n".join(result_parts)
-    
-    def _run(self, unused: str = "") -> str:
+        self._watch_page_changes()
+
+        previous = self._view
+        # Taken before the snapshot, so DOM changes while it is captured make the next call take a new one
+        fingerprint = await self._dom_fingerprint()
+        if (
+            previous is not None
+            and not self._page_changed
+            and fingerprint is not None
+            and fingerprint == previous.fingerprint
+        ):
+            # No action ran and the DOM hasn't changed since the last snapshot, its classified view is still current
+            view = previous
+        else:
+            self._page_changed = False
+            state = await self.session.get_browser_state_summary(include_screenshot=False)
+            view = DOMView(state, fingerprint)
+            self._view = view
+
+        if full or previous is None or previous.url != view.url:
+            return view.render()
+        return view.render(previous)
+
+    def _run(self, unused: str = "", full: bool = False) -> str:
         """Synchronous wrapper for async observation."""
         import asyncio
         try:
@@ -201,12 +353,12 @@ class ObserveDOMTool(BaseTool):
                 # If loop is running, create a task
                 import concurrent.futures
                 with concurrent.futures.ThreadPoolExecutor() as executor:
-                    future = executor.submit(asyncio.run, self._arun(unused))
+                    future = executor.submit(asyncio.run, self._arun(unused, full))
                     return future.result()
-            return loop.run_until_complete(self._arun(unused))
+            return loop.run_until_complete(self._arun(unused, full))
         except RuntimeError:
             # No event loop, create one
-            return asyncio.run(self._arun(unused))
+            return asyncio.run(self._arun(unused, full))
 
 
 class ClickElementInput(BaseModel):
@@ -524,6 +524,32 @@ class TestDOMSerializer:
 		print('   ✓ Cross-origin iframe extraction works (CDP target switching enabled)')
 		print('   ✓ Truly nested structure works: Open Shadow → Closed Shadow → Iframe')
 
+	@pytest.mark.parametrize('path', ['/dom-test-main', '/stacked-test'])
+	async def test_compiled_clickable_detector_matches_reference(self, browser_session, base_url, path):
+		"""The serializer's compiled clickable detector classifies every node of a real page like the reference rules."""
+		from browser_use.dom.serializer.clickable_elements import ClickableElementDetector, CompiledClickableElementDetector
+		from browser_use.dom.service import DomService
+
+		await browser_session.navigate_to(f'{base_url}{path}')
+		assert browser_session.agent_focus_target_id is not None
+		root, _ = await DomService(browser_session, cross_origin_iframes=True).get_dom_tree(
+			target_id=browser_session.agent_focus_target_id
+		)
+
+		detector = CompiledClickableElementDetector()
+		classified = detector.classify_tree(root)
+		nodes, stack = 0, [root]
+		while stack:
+			node = stack.pop()
+			expected = ClickableElementDetector.is_interactive(node)
+			assert detector.is_interactive(node) is expected, node
+			assert classified.get(node.node_id, expected) is expected, node
+			nodes += 1
+			stack.extend(node.children_and_shadow_roots)
+			if node.content_document:
+				stack.append(node.content_document)
+		assert nodes > 20
+
 
 if __name__ == '__main__':
 	"""Run test in debug mode with manual fixture setup."""
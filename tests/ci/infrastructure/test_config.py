@@ -1,6 +1,9 @@
 """Tests for lazy loading configuration system."""
 
 import os
+import time
+
+import pytest
 
 from browser_use.config import CONFIG
 
@@ -118,3 +121,64 @@ class TestLazyConfig:
 				os.environ['BROWSER_USE_CLOUD_SYNC'] = sync_original
 			else:
 				os.environ.pop('BROWSER_USE_CLOUD_SYNC', None)
+
+
+class TestConfigSnapshot:
+	"""Test the cached snapshot behind CONFIG, and explicit / watched reloads."""
+
+	@pytest.fixture(autouse=True)
+	def fresh_snapshot(self):
+		# Values read from a test's .env must not leak into later tests
+		yield
+		CONFIG.reload()
+
+	def test_snapshot_is_reused_until_the_environment_changes(self, monkeypatch):
+		monkeypatch.setenv('BROWSER_USE_LOGGING_LEVEL', 'debug')
+		snapshot = CONFIG.snapshot
+		assert CONFIG.snapshot is snapshot
+		assert snapshot.BROWSER_USE_LOGGING_LEVEL == 'debug'
+
+		monkeypatch.setenv('BROWSER_USE_LOGGING_LEVEL', 'warning')
+		assert CONFIG.snapshot is not snapshot
+		assert CONFIG.BROWSER_USE_LOGGING_LEVEL == 'warning'
+		# Snapshots are frozen, an old one keeps its values
+		assert snapshot.BROWSER_USE_LOGGING_LEVEL == 'debug'
+		with pytest.raises(AttributeError):
+			snapshot.BROWSER_USE_LOGGING_LEVEL = 'info'
+
+	def test_reload_picks_up_dotenv_changes(self, tmp_path, monkeypatch):
+		monkeypatch.chdir(tmp_path)
+		monkeypatch.delenv('BROWSER_USE_PROXY_URL', raising=False)
+		(tmp_path / '.env').write_text('BROWSER_USE_PROXY_URL=http://proxy-a:8080\n')
+		CONFIG.reload()
+		assert CONFIG.BROWSER_USE_PROXY_URL == 'http://proxy-a:8080'
+
+		(tmp_path / '.env').write_text('BROWSER_USE_PROXY_URL=http://proxy-b:8080\n')
+		assert CONFIG.BROWSER_USE_PROXY_URL == 'http://proxy-a:8080'
+		CONFIG.reload()
+		assert CONFIG.BROWSER_USE_PROXY_URL == 'http://proxy-b:8080'
+
+	def test_watch_reloads_when_dotenv_changes(self, tmp_path, monkeypatch):
+		monkeypatch.chdir(tmp_path)
+		monkeypatch.delenv('BROWSER_USE_PROXY_URL', raising=False)
+		CONFIG.reload()
+		assert CONFIG.BROWSER_USE_PROXY_URL is None
+
+		CONFIG.watch(interval=0.01)
+		try:
+			(tmp_path / '.env').write_text('BROWSER_USE_PROXY_URL=http://proxy-a:8080\n')
+			deadline = time.monotonic() + 5
+			while CONFIG.BROWSER_USE_PROXY_URL is None and time.monotonic() < deadline:
+				time.sleep(0.01)
+			assert CONFIG.BROWSER_USE_PROXY_URL == 'http://proxy-a:8080'
+		finally:
+			CONFIG.stop_watching()
+
+	def test_config_dirs_are_created_on_access_not_on_snapshot(self, tmp_path, monkeypatch):
+		config_dir = tmp_path / 'browseruse'
+		monkeypatch.setenv('BROWSER_USE_CONFIG_DIR', str(config_dir))
+		assert CONFIG.snapshot.BROWSER_USE_CONFIG_DIR == config_dir
+		assert not config_dir.exists()
+
+		assert CONFIG.BROWSER_USE_PROFILES_DIR == config_dir / 'profiles'
+		assert (config_dir / 'profiles').is_dir() and (config_dir / 'extensions').is_dir()
@@ -917,6 +917,87 @@ class TestFileSystemEdgeCases:
 			fs.nuke()
 
 
+class TestJournaledAppends:
+	"""Test append-only disk writes, chunked content and batched flushing."""
+
+	async def test_appends_do_not_rewrite_file(self, monkeypatch):
+		"""Appends should be written with a true file append, only write_file rewrites the file."""
+		full_writes = []
+		original_write = TxtFile._write_to_disk
+
+		def counting_write(self, path, content):
+			full_writes.append(content)
+			original_write(self, path, content)
+
+		monkeypatch.setattr(TxtFile, '_write_to_disk', counting_write)
+
+		with tempfile.TemporaryDirectory() as tmp_dir:
+			fs = FileSystem(base_dir=tmp_dir, create_default_files=False)
+			await fs.write_file('rows.txt', 'header\n')
+			for i in range(50):
+				await fs.append_file('rows.txt', f'row {i}\n')
+
+			expected = 'header\n' + ''.join(f'row {i}\n' for i in range(50))
+			assert full_writes == ['header\n']
+			assert (fs.data_dir / 'rows.txt').read_text() == expected
+			assert fs.get_file('rows.txt').content == expected
+			assert fs.get_file('rows.txt').get_size == len(expected)
+
+			# a replacement rewrites the file, later appends continue from the new content
+			await fs.replace_file_str('rows.txt', 'header', 'HEADER')
+			await fs.append_file('rows.txt', 'tail')
+			assert len(full_writes) == 2
+			assert (fs.data_dir / 'rows.txt').read_text() == expected.replace('header', 'HEADER') + 'tail'
+			fs.nuke()
+
+	async def test_batched_appends_flush_after_interval(self):
+		"""With a flush interval, appends reach disk in one batch while reads see them immediately."""
+		with tempfile.TemporaryDirectory() as tmp_dir:
+			fs = FileSystem(base_dir=tmp_dir, create_default_files=False, append_flush_interval=0.05)
+			await fs.write_file('results.jsonl', '')
+			for i in range(3):
+				await fs.append_file('results.jsonl', f'{{"i": {i}}}\n')
+
+			expected = '{"i": 0}\n{"i": 1}\n{"i": 2}\n'
+			assert fs.get_file('results.jsonl').content == expected
+			assert (fs.data_dir / 'results.jsonl').read_text() == ''
+
+			await asyncio.sleep(0.15)
+			assert (fs.data_dir / 'results.jsonl').read_text() == expected
+
+			await fs.append_file('results.jsonl', 'last\n')
+			await fs.flush()
+			assert (fs.data_dir / 'results.jsonl').read_text() == expected + 'last\n'
+			fs.nuke()
+
+	async def test_batched_appends_reach_disk_on_close(self):
+		"""Closing the file system writes batched appends instead of dropping the pending flush."""
+		with tempfile.TemporaryDirectory() as tmp_dir:
+			fs = FileSystem(base_dir=tmp_dir, create_default_files=False, append_flush_interval=60)
+			await fs.write_file('results.jsonl', '')
+			await fs.append_file('results.jsonl', '{"i": 0}\n')
+			flush_task = fs._flush_task
+			assert flush_task is not None and not flush_task.done()
+
+			await fs.close()
+			assert flush_task.done()
+			assert (fs.data_dir / 'results.jsonl').read_text() == '{"i": 0}\n'
+			fs.nuke()
+
+	async def test_appended_content_survives_state_round_trip(self):
+		"""Chunked content should serialize like a plain string."""
+		with tempfile.TemporaryDirectory() as tmp_dir:
+			fs = FileSystem(base_dir=tmp_dir, create_default_files=False)
+			await fs.write_file('notes.md', '# Notes\n')
+			await fs.append_file('notes.md', 'one\n')
+			await fs.append_file('notes.md', 'two\n')
+
+			restored = FileSystem.from_state(fs.get_state())
+			assert restored.get_file('notes.md').content == '# Notes\none\ntwo\n'
+			assert (restored.data_dir / 'notes.md').read_text() == '# Notes\none\ntwo\n'
+			restored.nuke()
+
+
 class TestFileSystemIntegration:
 	"""Integration tests for FileSystem with real file operations."""
 
@@ -0,0 +1,197 @@
+"""Tests for the shared element index behind actor Page selector and prompt lookups."""
+
+import asyncio
+from types import SimpleNamespace
+
+from cdp_use import CDPClient
+
+from browser_use.actor.element_index import _client_indexes, get_element_index
+from browser_use.actor.page import Page
+from browser_use.browser import BrowserSession
+from browser_use.browser.session_manager import SessionManager
+
+
+class FakeCDPClient:
+	"""Minimal CDP client serving a fixed document and counting commands."""
+
+	def __init__(self):
+		self.handlers: dict[str, object] = {}
+		self.calls: list[str] = []
+		self.fingerprint = 'https://example.com/|10|100'
+		self.matches = {'button': [11, 12], 'a': [12, 13]}
+		self.in_flight = 0
+		self.peak_in_flight = 0
+		self.register = SimpleNamespace(
+			DOM=_Namespace(lambda name, handler: self.handlers.__setitem__(f'DOM.{name}', handler)),
+			Page=_Namespace(lambda name, handler: self.handlers.__setitem__(f'Page.{name}', handler)),
+		)
+		self.send = SimpleNamespace(
+			Target=SimpleNamespace(attachToTarget=self._command('Target.attachToTarget', {'sessionId': 'session-1'})),
+			Page=SimpleNamespace(enable=self._command('Page.enable', {})),
+			DOM=SimpleNamespace(
+				enable=self._command('DOM.enable', {}),
+				getDocument=self._command('DOM.getDocument', {'root': {'nodeId': 1}}),
+				querySelectorAll=self._command(
+					'DOM.querySelectorAll', lambda params: {'nodeIds': self.matches[params['selector']]}
+				),
+				describeNode=self._command(
+					'DOM.describeNode', lambda params: {'node': {'backendNodeId': params['nodeId'] * 100}}
+				),
+			),
+			Runtime=SimpleNamespace(
+				enable=self._command('Runtime.enable', {}),
+				evaluate=self._command('Runtime.evaluate', lambda params: {'result': {'value': self.fingerprint}}),
+			),
+			Network=SimpleNamespace(enable=self._command('Network.enable', {})),
+		)
+
+	def _command(self, method, result):
+		async def send(params=None, session_id=None):
+			self.calls.append(method)
+			self.in_flight += 1
+			self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+			await asyncio.sleep(0.01)
+			self.in_flight -= 1
+			return result(params) if callable(result) else result
+
+		return send
+
+	def emit(self, method: str, event: dict, session_id: str = 'session-1'):
+		self.handlers[method](event, session_id)  # type: ignore[operator]
+
+
+class _Namespace:
+	def __init__(self, register):
+		self._register = register
+
+	def __getattr__(self, name):
+		return lambda handler: self._register(name, handler)
+
+
+class FakeLLM:
+	def __init__(self, index: int | None):
+		self.index = index
+		self.calls = 0
+
+	async def ainvoke(self, messages, output_format=None):
+		self.calls += 1
+		assert output_format is not None
+		return SimpleNamespace(completion=output_format(element_highlight_index=self.index))
+
+
+def make_page(client: FakeCDPClient, builds: list[str], llm=None) -> Page:
+	session = SimpleNamespace(cdp_client=client, id='browser-session')
+	page = Page(session, 'target-1', llm=llm)  # type: ignore[arg-type]
+
+	async def serialize_dom():
+		builds.append(client.fingerprint)
+		return f'[5]<button>Buy</button> {client.fingerprint}', {5: 500}
+
+	page._serialize_dom = serialize_dom  # type: ignore[method-assign]
+	return page
+
+
+async def test_selectors_are_batched_and_reuse_described_nodes():
+	client = FakeCDPClient()
+	page = make_page(client, [])
+
+	buttons, links = await page.get_elements_by_css_selectors(['button', 'a'])
+	assert [element._backend_node_id for element in buttons] == [1100, 1200]
+	assert [element._backend_node_id for element in links] == [1200, 1300]
+	assert client.calls.count('DOM.describeNode') == 3  # node 12 described once
+	assert client.peak_in_flight >= 2
+
+	# A fresh Page of the same target reuses the document root and described nodes
+	client.calls.clear()
+	again = await make_page(client, []).get_elements_by_css_selector('button')
+	assert [element._backend_node_id for element in again] == [1100, 1200]
+	assert 'DOM.getDocument' not in client.calls and 'DOM.describeNode' not in client.calls
+
+	client.emit('DOM.documentUpdated', {})
+	client.calls.clear()
+	await page.get_elements_by_css_selector('button')
+	assert client.calls.count('DOM.getDocument') == 1 and client.calls.count('DOM.describeNode') == 2
+
+
+async def test_repeated_prompt_on_unchanged_content_skips_llm_and_dom_rebuild():
+	client = FakeCDPClient()
+	builds: list[str] = []
+	llm = FakeLLM(5)
+
+	element = await make_page(client, builds, llm).get_element_by_prompt('buy button')
+	again = await make_page(client, builds, llm).get_element_by_prompt('buy button')
+	assert element is not None and again is not None
+	assert element._backend_node_id == again._backend_node_id == 500
+	assert llm.calls == 1 and len(builds) == 1
+
+	# A mutation forces a rebuild, but identical serialized content still hits the prompt cache
+	client.emit('DOM.attributeModified', {'nodeId': 3, 'name': 'class', 'value': 'x'})
+	await make_page(client, builds, llm).get_element_by_prompt('buy button')
+	assert llm.calls == 1 and len(builds) == 2
+
+	# Changed content means a new hash and a new LLM call
+	client.fingerprint = 'https://example.com/|11|120'
+	await make_page(client, builds, llm).get_element_by_prompt('buy button')
+	assert llm.calls == 2 and len(builds) == 3
+
+
+async def test_unresolved_prompt_is_not_memoized():
+	client = FakeCDPClient()
+	llm = FakeLLM(None)
+	page = make_page(client, [], llm)
+
+	assert await page.get_element_by_prompt('missing') is None
+	assert await page.get_element_by_prompt('missing') is None
+	assert llm.calls == 2
+
+
+class FakeBrowserCDPClient(CDPClient):
+	"""Browser-level CDP connection with two tabs, without a websocket."""
+
+	def __init__(self):
+		super().__init__('ws://localhost:0/fake')
+		self.targets = [
+			{'targetId': target_id, 'type': 'page', 'title': '', 'url': 'about:blank', 'browserContextId': 'default'}
+			for target_id in ('tab-1', 'tab-2')
+		]
+
+	async def send_raw(self, method, params=None, session_id=None):  # type: ignore[override]
+		if method == 'Target.getTargets':
+			return {'targetInfos': self.targets}
+		if method == 'Target.attachToTarget':
+			target_info = next(target for target in self.targets if target['targetId'] == params['targetId'])  # type: ignore[index]
+			event = {'sessionId': f'session-{target_info["targetId"]}', 'targetInfo': target_info, 'waitingForDebugger': False}
+			asyncio.get_running_loop().create_task(self._event_registry.handle_event('Target.attachedToTarget', event))
+			return {'sessionId': event['sessionId']}
+		return {}
+
+
+async def test_closed_tab_is_dropped_from_the_element_index():
+	client = FakeBrowserCDPClient()
+	browser_session = BrowserSession(cdp_url='ws://localhost:0/fake')
+	browser_session._cdp_client_root = client
+	browser_session.session_manager = SessionManager(browser_session)
+	try:
+		await browser_session.session_manager.start_monitoring()
+		for _ in range(100):
+			if len(browser_session.session_manager.get_all_page_targets()) == 2:
+				break
+			await asyncio.sleep(0.01)
+
+		first = get_element_index(browser_session, 'tab-1', 'session-tab-1')
+		get_element_index(browser_session, 'tab-2', 'session-tab-2')
+		indexes = _client_indexes[client]
+		assert set(indexes.by_target) == {'tab-1', 'tab-2'} and len(indexes.by_session) == 2
+
+		# Chrome detaches the tab's session when it closes, the SessionManager handles that in a task
+		await client._event_registry.handle_event(
+			'Target.detachedFromTarget', {'sessionId': 'session-tab-1', 'targetId': 'tab-1'}
+		)
+		for _ in range(100):
+			if 'tab-1' not in indexes.by_target:
+				break
+			await asyncio.sleep(0.01)
+		assert set(indexes.by_target) == {'tab-2'} and set(indexes.by_session) == {'session-tab-2'}
+		assert get_element_index(browser_session, 'tab-1') is not first
+	finally:
+		await browser_session.event_bus.stop(clear=True, timeout=5)
@@ -0,0 +1,103 @@
+"""Tests for BrowserSessions scoped to their own browser context (new_browser_context) in a shared browser."""
+
+import asyncio
+import sys
+from pathlib import Path
+
+from cdp_use import CDPClient
+
+from browser_use.browser import BrowserSession
+from browser_use.browser.session_manager import SessionManager
+
+
+def page(target_id: str, context_id: str) -> dict:
+	return {'targetId': target_id, 'type': 'page', 'title': '', 'url': 'about:blank', 'browserContextId': context_id}
+
+
+class FakeBrowserCDPClient(CDPClient):
+	"""Browser-level CDP connection to a browser with tabs in several contexts, without a websocket."""
+
+	def __init__(self, targets: list[dict]):
+		super().__init__('ws://localhost:0/fake')
+		self.targets = targets
+		self.created: list[dict] = []
+		self.detached: list[str] = []
+
+	async def send_raw(self, method, params=None, session_id=None):  # type: ignore[override]
+		params = params or {}
+		if method == 'Target.getTargets':
+			return {'targetInfos': self.targets}
+		if method == 'Target.attachToTarget':
+			target_info = next(target for target in self.targets if target['targetId'] == params['targetId'])
+			self.announce(target_info)
+			return {'sessionId': f'session-{params["targetId"]}'}
+		if method == 'Target.detachFromTarget':
+			self.detached.append(params['sessionId'])
+		if method == 'Target.createTarget':
+			self.created.append(params)
+			return {'targetId': f'created-{len(self.created)}'}
+		return {}
+
+	def announce(self, target_info: dict) -> None:
+		"""Target.attachedToTarget as Chrome sends it, for an existing target or a new one (auto-attach)."""
+		event = {'sessionId': f'session-{target_info["targetId"]}', 'targetInfo': target_info, 'waitingForDebugger': False}
+		asyncio.get_running_loop().create_task(self._event_registry.handle_event('Target.attachedToTarget', event))
+
+
+async def connect(client: FakeBrowserCDPClient, context_id: str | None) -> BrowserSession:
+	browser_session = BrowserSession(cdp_url='ws://localhost:0/fake', new_browser_context=context_id is not None)
+	browser_session._cdp_client_root = client
+	browser_session._browser_context_id = context_id
+	browser_session.session_manager = SessionManager(browser_session)
+	await browser_session.session_manager.start_monitoring()
+	return browser_session
+
+
+def page_ids(browser_session: BrowserSession) -> list[str]:
+	return [target.target_id for target in browser_session.session_manager.get_all_page_targets()]
+
+
+async def test_scoped_session_only_manages_its_own_contexts_tabs():
+	client = FakeBrowserCDPClient([page('default-1', 'default'), page('a-1', 'ctx-a'), page('b-1', 'ctx-b')])
+	browser_session = await connect(client, 'ctx-a')
+	assert browser_session.browser_context_id == 'ctx-a'
+	assert page_ids(browser_session) == ['a-1']
+
+	# Auto-attach announces every new tab in the browser, another context's is dropped and detached
+	client.announce(page('b-2', 'ctx-b'))
+	client.announce(page('a-2', 'ctx-a'))  # e.g. a popup opened by the session's own tab
+	for _ in range(100):
+		if 'a-2' in page_ids(browser_session) and client.detached:
+			break
+		await asyncio.sleep(0.01)
+	assert page_ids(browser_session) == ['a-1', 'a-2']
+	assert client.detached == ['session-b-2']
+
+	# Tabs the session opens itself (new tabs, focus recovery, ...) are created in its context
+	await browser_session._cdp_create_new_page('about:blank')
+	await browser_session.new_page()
+	assert [params.get('browserContextId') for params in client.created] == ['ctx-a', 'ctx-a']
+
+
+async def test_unscoped_session_manages_every_tab():
+	client = FakeBrowserCDPClient([page('default-1', 'default'), page('a-1', 'ctx-a')])
+	browser_session = await connect(client, None)
+
+	assert browser_session.browser_context_id is None
+	assert page_ids(browser_session) == ['default-1', 'a-1']
+	await browser_session._cdp_create_new_page('about:blank')
+	assert 'browserContextId' not in client.created[0]
+
+
+def test_cart_result_has_no_structured_output_when_nothing_was_added():
+	# The cart automation runs from inside langchain_agent/ and imports its siblings as top-level modules
+	sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'langchain_agent'))
+	from automation import CartResult, GroceryItem, ItemResult
+
+	failed = ItemResult(item='milk', error='Agent completed but no structured output was returned')
+	assert CartResult(results=[failed]).structured_output is None
+	assert CartResult().structured_output is None
+
+	bread = GroceryItem(name='Bread', price=40.0, url='https://www.amazon.in/dp/bread')
+	cart = CartResult(results=[failed, ItemResult(item='bread', added=[bread])]).structured_output
+	assert cart is not None and cart.items == [bread]
@@ -0,0 +1,201 @@
+"""Tests for CDP round-trip accounting and pipelining helpers."""
+
+import asyncio
+from types import SimpleNamespace
+from typing import Any
+
+from cdp_use import CDPClient
+
+from browser_use.browser import BrowserProfile, BrowserSession
+from browser_use.browser.cdp_batch import (
+	CDPRoundTripStats,
+	install_round_trip_counter,
+	pipeline,
+	track_cdp_round_trips,
+	tracks_cdp_round_trips,
+)
+from browser_use.browser.watchdogs.default_action_watchdog import _PREPARE_ELEMENT_JS, DefaultActionWatchdog
+
+
+class FakeCDPClient(CDPClient):
+	"""CDPClient whose send_raw answers after a fixed latency instead of using a websocket."""
+
+	def __init__(self, latency: float = 0.01):
+		super().__init__('ws://localhost:0/fake')
+		self.latency = latency
+		self.sent: list[str] = []
+
+	async def send_raw(self, method, params=None, session_id=None):  # type: ignore[override]
+		self.sent.append(method)
+		await asyncio.sleep(self.latency)
+		if method == 'Runtime.fail':
+			raise RuntimeError('boom')
+		return {'method': method}
+
+
+async def test_sequential_commands_count_one_round_trip_each():
+	client = FakeCDPClient()
+	install_round_trip_counter(client)
+
+	with track_cdp_round_trips('sequential') as counter:
+		await client.send.DOM.resolveNode(params={'backendNodeId': 1})
+		await client.send.Runtime.callFunctionOn(params={'functionDeclaration': 'function() {}'})
+		await client.send.Page.getLayoutMetrics()
+
+	assert counter.commands == 3
+	assert counter.round_trips == 3
+	assert counter.methods == ['DOM.resolveNode', 'Runtime.callFunctionOn', 'Page.getLayoutMetrics']
+
+
+async def test_pipelined_commands_share_a_round_trip():
+	client = FakeCDPClient()
+	install_round_trip_counter(client)
+
+	with track_cdp_round_trips('pipelined') as counter:
+		results = await pipeline(
+			client.send.Page.getLayoutMetrics(),
+			client.send.DOM.scrollIntoViewIfNeeded(params={'backendNodeId': 1}),
+			client.send.DOM.resolveNode(params={'backendNodeId': 1}),
+		)
+		await client.send.DOM.getContentQuads(params={'backendNodeId': 1})
+
+	assert [r['method'] for r in results] == ['Page.getLayoutMetrics', 'DOM.scrollIntoViewIfNeeded', 'DOM.resolveNode']
+	assert counter.commands == 4
+	assert counter.round_trips == 2
+
+
+async def test_pipeline_returns_exceptions_in_place():
+	client = FakeCDPClient()
+
+	ok, failed = await pipeline(client.send_raw('DOM.resolveNode'), client.send_raw('Runtime.fail'))
+
+	assert ok == {'method': 'DOM.resolveNode'}
+	assert isinstance(failed, RuntimeError)
+
+
+async def test_untracked_commands_are_not_counted_and_install_is_idempotent():
+	client = FakeCDPClient()
+	install_round_trip_counter(client)
+	install_round_trip_counter(client)
+
+	await client.send.DOM.resolveNode(params={'backendNodeId': 1})
+	with track_cdp_round_trips('tracked') as counter:
+		await client.send.DOM.resolveNode(params={'backendNodeId': 1})
+
+	assert counter.commands == 1
+	assert client.sent == ['DOM.resolveNode', 'DOM.resolveNode']
+
+
+async def test_decorator_aggregates_stats_per_action():
+	client = FakeCDPClient()
+	install_round_trip_counter(client)
+
+	class Handler:
+		def __init__(self):
+			self.cdp_round_trip_stats = CDPRoundTripStats()
+
+		@tracks_cdp_round_trips('click_element')
+		async def on_ClickElementEvent(self, n: int) -> int:
+			for _ in range(n):
+				await client.send.DOM.resolveNode(params={'backendNodeId': 1})
+			return n
+
+	handler = Handler()
+	assert handler.on_ClickElementEvent.__name__ == 'on_ClickElementEvent'
+	assert await handler.on_ClickElementEvent(2) == 2
+	await handler.on_ClickElementEvent(4)
+
+	summary = handler.cdp_round_trip_stats.summary()
+	assert summary['click_element'] == {'calls': 2, 'commands': 6, 'round_trips': 6, 'avg_round_trips': 3.0}
+
+
+class FakePageCDPClient(FakeCDPClient):
+	"""Answers the commands clicking and typing make; the single-call element preparation can be made to fail."""
+
+	def __init__(self, prepare_fails: bool = False):
+		super().__init__(latency=0.001)
+		self.prepare_fails = prepare_fails
+
+	async def send_raw(self, method, params=None, session_id=None):  # type: ignore[override]
+		self.sent.append(method)
+		await asyncio.sleep(self.latency)
+		if method == 'DOM.resolveNode':
+			return {'object': {'objectId': 'node-1'}}
+		if method == 'Page.getLayoutMetrics':
+			return {'layoutViewport': {'clientWidth': 1280, 'clientHeight': 720}}
+		if method == 'DOM.getContentQuads':
+			return {'quads': [[100, 200, 140, 200, 140, 220, 100, 220]]}
+		if method == 'Runtime.callFunctionOn':
+			if params and params['functionDeclaration'] == _PREPARE_ELEMENT_JS:
+				if self.prepare_fails:
+					raise RuntimeError('Execution context was destroyed')
+				value = {
+					'rect': {'x': 100, 'y': 200, 'width': 40, 'height': 20},
+					'viewportWidth': 1280,
+					'viewportHeight': 720,
+					'occluded': False,
+					'focused': True,
+					'cleared': {'cleared': True, 'method': 'value', 'finalText': ''} if params['arguments'][1]['value'] else None,
+				}
+				return {'result': {'value': value}}
+			return {'result': {'value': {'isClickable': True, 'cleared': True, 'finalText': ''}}}
+		return {}
+
+
+def make_watchdog(monkeypatch, client: FakePageCDPClient) -> DefaultActionWatchdog:
+	install_round_trip_counter(client)
+	cdp_session = SimpleNamespace(cdp_client=client, session_id='session-1')
+
+	async def get_session(*args, **kwargs):
+		return cdp_session
+
+	monkeypatch.setattr(BrowserSession, 'cdp_client_for_node', get_session)
+	monkeypatch.setattr(BrowserSession, 'get_or_create_cdp_session', get_session)
+	browser_session = BrowserSession(browser_profile=BrowserProfile(headless=True))
+	browser_session._cdp_client_root = client
+	return DefaultActionWatchdog(event_bus=browser_session.event_bus, browser_session=browser_session)
+
+
+def make_node(tag_name: str) -> Any:
+	return SimpleNamespace(tag_name=tag_name, attributes={}, backend_node_id=42)
+
+
+async def test_click_prepares_element_in_a_single_call(monkeypatch):
+	prepared_client = FakePageCDPClient()
+	with track_cdp_round_trips('click_element') as prepared:
+		result = await make_watchdog(monkeypatch, prepared_client)._click_element_node_impl(make_node('button'))
+
+	fallback_client = FakePageCDPClient(prepare_fails=True)
+	with track_cdp_round_trips('click_element') as fallback:
+		fallback_result = await make_watchdog(monkeypatch, fallback_client)._click_element_node_impl(make_node('button'))
+
+	assert result == fallback_result == {'click_x': 120, 'click_y': 210}
+	assert prepared.methods == [
+		'DOM.resolveNode',
+		'Runtime.callFunctionOn',
+		'Input.dispatchMouseEvent',
+		'Input.dispatchMouseEvent',
+		'Input.dispatchMouseEvent',
+		'Runtime.runIfWaitingForDebugger',
+	]
+	assert 'DOM.getContentQuads' in fallback.methods and 'Page.getLayoutMetrics' in fallback.methods
+	assert prepared.round_trips == 6 and fallback.round_trips == 9
+
+
+async def test_type_prepares_focuses_and_clears_in_a_single_call(monkeypatch):
+	prepared_client = FakePageCDPClient()
+	with track_cdp_round_trips('type_text') as prepared:
+		coordinates = await make_watchdog(monkeypatch, prepared_client)._input_text_element_node_impl(make_node('input'), 'a')
+
+	fallback_client = FakePageCDPClient(prepare_fails=True)
+	with track_cdp_round_trips('type_text') as fallback:
+		await make_watchdog(monkeypatch, fallback_client)._input_text_element_node_impl(make_node('input'), 'a')
+
+	assert coordinates == {'input_x': 120, 'input_y': 210}
+	# Everything before the first key event: resolve + one prepare call instead of scroll, quads, occlusion, focus and clear
+	before_typing = prepared.methods[: prepared.methods.index('Input.dispatchKeyEvent')]
+	assert before_typing == ['DOM.resolveNode', 'Runtime.callFunctionOn']
+	fallback_before_typing = fallback.methods[: fallback.methods.index('Input.dispatchKeyEvent')]
+	assert 'DOM.focus' in fallback_before_typing and 'DOM.getContentQuads' in fallback_before_typing
+	assert fallback.round_trips - prepared.round_trips == len(fallback_before_typing) - len(before_typing)
+	assert len(fallback_before_typing) == 7
@@ -0,0 +1,173 @@
+"""CompiledClickableElementDetector must classify every node exactly like ClickableElementDetector."""
+
+import random
+
+from browser_use.dom.serializer.clickable_elements import ClickableElementDetector, CompiledClickableElementDetector
+from browser_use.dom.serializer.serializer import DOMTreeSerializer
+from browser_use.dom.views import DOMRect, EnhancedAXNode, EnhancedAXProperty, EnhancedDOMTreeNode, EnhancedSnapshotNode, NodeType
+
+TAGS = [
+	'div',
+	'span',
+	'DIV',
+	'a',
+	'A',
+	'button',
+	'input',
+	'label',
+	'iframe',
+	'IFRAME',
+	'frame',
+	'html',
+	'body',
+	'svg',
+	'li',
+	'img',
+]
+ATTRIBUTES = {
+	'class': ['btn', 'nav  Search-Icon', 'header\tmagnifier', 'item card', 'glassy', 'SEARCHBOX', 'x'],
+	'id': ['main', 'findMe', 'query-input', 'QUERY', 'content'],
+	'data-testid': ['lookup-btn', 'row', 'Glass'],
+	'data-action': ['open', 'toggle'],
+	'role': ['button', 'Button', 'presentation', 'listbox', 'search', 'tab'],
+	'onclick': ['go()'],
+	'tabindex': ['0', '-1'],
+	'aria-label': ['Close'],
+	'href': ['/x'],
+	'style': ['color: red'],
+}
+AX_PROPERTIES = [
+	'disabled',
+	'hidden',
+	'focusable',
+	'editable',
+	'settable',
+	'checked',
+	'expanded',
+	'pressed',
+	'selected',
+	'required',
+	'autocomplete',
+	'keyshortcuts',
+	'level',
+	'focused',
+]
+AX_ROLES = [None, 'button', 'generic', 'listbox', 'StaticText', 'link', 'searchbox', 'none']
+SIZES = [0, 5, 10, 30, 50, 51, 100, 101, 400]
+
+_next_id = 0
+
+
+def make_node(node_type: NodeType, name: str, **fields) -> EnhancedDOMTreeNode:
+	global _next_id
+	_next_id += 1
+	node = EnhancedDOMTreeNode(
+		node_id=fields.pop('node_id', _next_id),
+		backend_node_id=_next_id,
+		node_type=node_type,
+		node_name=name,
+		node_value='',
+		attributes={},
+		is_scrollable=None,
+		is_visible=True,
+		absolute_position=None,
+		target_id='target',
+		frame_id=None,
+		session_id=None,
+		content_document=None,
+		shadow_root_type=None,
+		shadow_roots=None,
+		parent_node=None,
+		children_nodes=[],
+		ax_node=None,
+		snapshot_node=None,
+	)
+	for key, value in fields.items():
+		setattr(node, key, value)
+	return node
+
+
+def random_element(rng: random.Random) -> EnhancedDOMTreeNode:
+	attributes = {name: rng.choice(values) for name, values in ATTRIBUTES.items() if rng.random() < 0.2}
+	ax_node = None
+	if rng.random() < 0.6:
+		properties = [
+			EnhancedAXProperty(name=rng.choice(AX_PROPERTIES), value=rng.choice([True, False, None, '', 'true', 'Ctrl+K']))  # type: ignore[arg-type]
+			for _ in range(rng.randint(0, 3))
+		]
+		ax_node = EnhancedAXNode(
+			ax_node_id='ax',
+			ignored=False,
+			role=rng.choice(AX_ROLES),
+			name=None,
+			description=None,
+			properties=properties or rng.choice([None, []]),
+			child_ids=None,
+		)
+	snapshot_node = None
+	if rng.random() < 0.7:
+		bounds = DOMRect(x=0, y=0, width=rng.choice(SIZES), height=rng.choice(SIZES)) if rng.random() < 0.8 else None
+		snapshot_node = EnhancedSnapshotNode(
+			is_clickable=None,
+			cursor_style=rng.choice([None, 'auto', 'pointer', 'text']),
+			bounds=bounds,
+			clientRects=None,
+			scrollRects=None,
+			computed_styles=None,
+			paint_order=None,
+			stacking_contexts=None,
+		)
+	return make_node(NodeType.ELEMENT_NODE, rng.choice(TAGS), attributes=attributes, ax_node=ax_node, snapshot_node=snapshot_node)
+
+
+def all_nodes(root: EnhancedDOMTreeNode):
+	stack = [root]
+	while stack:
+		node = stack.pop()
+		yield node
+		stack.extend(node.children_nodes or [])
+		stack.extend(node.shadow_roots or [])
+		if node.content_document:
+			stack.append(node.content_document)
+
+
+def assert_equivalent(root: EnhancedDOMTreeNode) -> int:
+	detector = CompiledClickableElementDetector()
+	classified = detector.classify_tree(root)
+	count = 0
+	for node in all_nodes(root):
+		expected = ClickableElementDetector.is_interactive(node)
+		assert detector.is_interactive(node) is expected, node
+		assert classified[node.node_id] is expected, node
+		count += 1
+	return count
+
+
+def test_compiled_detector_matches_reference_on_generated_trees():
+	rng = random.Random(0)
+	root = make_node(NodeType.DOCUMENT_NODE, '#document')
+	parents = [root]
+	for _ in range(20000):
+		node = random_element(rng) if rng.random() < 0.85 else make_node(NodeType.TEXT_NODE, '#text')
+		rng.choice(parents).children_nodes.append(node)  # type: ignore[union-attr]
+		if node.node_type == NodeType.ELEMENT_NODE:
+			parents.append(node)
+	assert assert_equivalent(root) == 20001
+
+
+def test_classify_tree_leaves_out_node_ids_reused_across_frames():
+	button = make_node(NodeType.ELEMENT_NODE, 'button', node_id=7)
+	span = make_node(NodeType.ELEMENT_NODE, 'span', node_id=7)
+	iframe_document = make_node(NodeType.DOCUMENT_NODE, '#document', children_nodes=[span])
+	iframe = make_node(NodeType.ELEMENT_NODE, 'iframe', content_document=iframe_document)
+	root = make_node(NodeType.DOCUMENT_NODE, '#document', children_nodes=[button, iframe])
+
+	classified = CompiledClickableElementDetector().classify_tree(root)
+	assert 7 not in classified
+	assert classified[iframe.node_id] is False
+
+	# The serializer classifies such nodes on demand, like it did before batching
+	serializer = DOMTreeSerializer(root, paint_order_filtering=False)
+	serializer.serialize_accessible_elements()
+	assert 'clickable_detection_time' in serializer.timing_info
+	assert serializer._is_interactive_cached(button) is True
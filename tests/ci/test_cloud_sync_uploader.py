@@ -0,0 +1,192 @@
+"""Tests for the batched cloud sync uploader against a local HTTP server."""
+
+import asyncio
+import gzip
+import json
+import os
+
+from bubus import BaseEvent
+from pytest_httpserver import HTTPServer
+from werkzeug import Request, Response
+
+from browser_use.sync.service import CloudSync
+from browser_use.sync.uploader import EventUploader
+
+
+class EventsEndpoint:
+	"""Stand-in for /api/v1/events that records batches and can be switched off."""
+
+	def __init__(self):
+		self.available = True
+		self.batches: list[list[dict]] = []
+		self.encodings: list[str | None] = []
+
+	def __call__(self, request: Request) -> Response:
+		if not self.available:
+			return Response(status=503)
+		body = request.get_data()
+		self.encodings.append(request.headers.get('Content-Encoding'))
+		if request.headers.get('Content-Encoding') == 'gzip':
+			body = gzip.decompress(body)
+		self.batches.append(json.loads(body)['events'])
+		return Response('{}', status=200, content_type='application/json')
+
+	@property
+	def event_ids(self) -> list[int]:
+		return [event['n'] for batch in self.batches for event in batch]
+
+
+def make_endpoint(httpserver: HTTPServer) -> EventsEndpoint:
+	endpoint = EventsEndpoint()
+	httpserver.expect_request('/api/v1/events', method='POST').respond_with_handler(endpoint)
+	return endpoint
+
+
+async def test_batches_by_count_and_compresses(httpserver: HTTPServer, tmp_path):
+	endpoint = make_endpoint(httpserver)
+	uploader = EventUploader(
+		httpserver.url_for('/api/v1/events'),
+		spool_dir=tmp_path,
+		headers=lambda: {'Authorization': 'Bearer test'},
+		max_batch_events=10,
+		flush_interval=60,
+	)
+
+	for n in range(25):
+		uploader.enqueue({'event_type': 'CreateAgentStepEvent', 'n': n})
+	assert await uploader.flush(timeout=5)
+
+	assert [len(batch) for batch in endpoint.batches] == [10, 10, 5]
+	assert endpoint.event_ids == list(range(25))
+	assert set(endpoint.encodings) == {'gzip'}
+	assert uploader.stats.events_sent == 25 and uploader.stats.batches_sent == 3
+	assert uploader.stats.latency_summary()['samples'] == 3
+	assert uploader.backlog == {'pending_events': 0, 'spooled_batches': 0}
+	await uploader.close()
+
+
+async def test_flush_interval_sends_partial_batch(httpserver: HTTPServer, tmp_path):
+	endpoint = make_endpoint(httpserver)
+	uploader = EventUploader(httpserver.url_for('/api/v1/events'), spool_dir=tmp_path, flush_interval=0.05)
+
+	uploader.enqueue({'n': 1})
+	uploader.enqueue({'n': 2})
+	assert await uploader.flush(timeout=5)
+
+	assert endpoint.batches == [[{'n': 1}, {'n': 2}]]
+	await uploader.close()
+
+
+async def test_spools_while_endpoint_down_and_replays_in_order(httpserver: HTTPServer, tmp_path):
+	endpoint = make_endpoint(httpserver)
+	endpoint.available = False
+	uploader = EventUploader(
+		httpserver.url_for('/api/v1/events'), spool_dir=tmp_path, max_batch_events=5, retry_backoff=0.01, max_retry_backoff=0.05
+	)
+
+	for n in range(12):
+		uploader.enqueue({'n': n})
+	assert not await uploader.flush(timeout=0.3)
+	assert uploader.stats.failed_requests > 0
+	assert uploader.backlog['spooled_batches'] >= 1
+	assert list(tmp_path.glob('*/*.jsonl'))
+
+	endpoint.available = True
+	assert await uploader.flush(timeout=5)
+
+	assert endpoint.event_ids == list(range(12))
+	assert not list(tmp_path.glob('*/*.jsonl'))
+	await uploader.close()
+
+
+async def test_spool_survives_restart(httpserver: HTTPServer, tmp_path):
+	endpoint = make_endpoint(httpserver)
+	endpoint.available = False
+	first = EventUploader(httpserver.url_for('/api/v1/events'), spool_dir=tmp_path, retry_backoff=0.01)
+	for n in range(3):
+		first.enqueue({'n': n})
+	await first.close(timeout=0.2)
+	assert list(tmp_path.glob('*/*.jsonl'))
+
+	endpoint.available = True
+	second = EventUploader(httpserver.url_for('/api/v1/events'), spool_dir=tmp_path)
+	assert await second.flush(timeout=5)
+
+	assert endpoint.event_ids == [0, 1, 2]
+	assert not list(tmp_path.glob('*/*.jsonl'))
+	await second.close()
+
+
+async def test_rejected_batch_is_dropped_not_retried(httpserver: HTTPServer, tmp_path):
+	httpserver.expect_request('/api/v1/events', method='POST').respond_with_data('bad', status=400)
+	uploader = EventUploader(httpserver.url_for('/api/v1/events'), spool_dir=tmp_path)
+
+	uploader.enqueue({'n': 1})
+	assert await uploader.flush(timeout=5)
+
+	assert uploader.stats.events_dropped == 1
+	assert not list(tmp_path.glob('*/*.jsonl'))
+	await uploader.close()
+
+
+async def test_cloud_sync_batch_uploads(httpserver: HTTPServer, tmp_path, monkeypatch):
+	class SampleEvent(BaseEvent):
+		n: int
+
+	monkeypatch.setenv('BROWSER_USE_CLOUD_SYNC', 'true')
+	endpoint = make_endpoint(httpserver)
+	sync = CloudSync(base_url=httpserver.url_for('/'), allow_session_events_for_auth=True, batch_uploads=True, spool_dir=tmp_path)
+
+	for n in range(3):
+		await sync.handle_event(SampleEvent(n=n))
+	assert endpoint.batches == []  # queued, not sent inline
+
+	assert await sync.flush()
+	assert endpoint.event_ids == [0, 1, 2]
+	assert all(event['event_type'] == 'SampleEvent' and event['user_id'] for event in endpoint.batches[0])
+	await sync.close()
+
+
+async def test_uploaders_sharing_a_spool_dir_never_replay_each_others_batches(httpserver: HTTPServer, tmp_path):
+	endpoint = make_endpoint(httpserver)
+	endpoint.available = False
+	url = httpserver.url_for('/api/v1/events')
+	first = EventUploader(url, spool_dir=tmp_path, max_batch_events=2, retry_backoff=0.01, max_retry_backoff=0.05)
+	second = EventUploader(url, spool_dir=tmp_path, max_batch_events=2, retry_backoff=0.01, max_retry_backoff=0.05)
+	for n in range(4):
+		first.enqueue({'n': n})
+		second.enqueue({'n': 100 + n})
+	assert not await first.flush(timeout=0.3)
+	assert not await second.flush(timeout=0.3)
+	assert len({path.parent for path in tmp_path.glob('*/*.jsonl')}) == 2
+
+	# A third uploader started while both are alive leaves their spools alone
+	endpoint.available = True
+	third = EventUploader(url, spool_dir=tmp_path)
+	assert await third.flush(timeout=5)
+	assert endpoint.event_ids == []
+
+	assert await first.flush(timeout=5)
+	assert await second.flush(timeout=5)
+	assert sorted(endpoint.event_ids) == [0, 1, 2, 3, 100, 101, 102, 103]
+	for uploader in (first, second, third):
+		await uploader.close()
+	assert not list(tmp_path.glob('*/*.jsonl'))
+
+
+async def test_orphaned_spool_is_claimed_by_exactly_one_uploader(httpserver: HTTPServer, tmp_path):
+	endpoint = make_endpoint(httpserver)
+	url = httpserver.url_for('/api/v1/events')
+	# Left behind by an uploader whose process has exited (a start time that doesn't match the pid)
+	orphan = tmp_path / f'{os.getpid()}-1-000000000000'
+	orphan.mkdir()
+	for n in range(20):
+		(orphan / f'{n:020d}-1-{n:06d}.jsonl').write_bytes(json.dumps({'n': n}).encode() + b'\n')
+
+	uploaders = [EventUploader(url, spool_dir=tmp_path) for _ in range(3)]
+	assert all(await asyncio.gather(*(uploader.flush(timeout=5) for uploader in uploaders)))
+
+	assert sorted(endpoint.event_ids) == list(range(20))
+	assert not orphan.exists()
+	for uploader in uploaders:
+		await uploader.close()
@@ -0,0 +1,89 @@
+"""Tests for streaming CodeAgent cells and history to disk."""
+
+import json
+
+from browser_use.code_use.journal import NotebookJournal, load_history
+from browser_use.code_use.service import CodeAgent
+from browser_use.code_use.views import (
+	CodeAgentHistory,
+	CodeAgentModelOutput,
+	CodeAgentResult,
+	CodeAgentState,
+	CodeCell,
+	ExecutionStatus,
+)
+from browser_use.filesystem.file_system import FileSystem
+from browser_use.llm.browser_use.chat import ChatBrowserUse
+
+
+def make_step(n: int, done: bool = False) -> CodeAgentHistory:
+	return CodeAgentHistory(
+		model_output=CodeAgentModelOutput(model_output=f'print({n})', full_response=f'step {n}'),
+		result=[CodeAgentResult(extracted_content=f'{n}\n', is_done=done, success=True if done else None)],
+		state=CodeAgentState(url=f'https://example.com/{n}', screenshot_path=f'/tmp/shots/step_{n}.png'),
+	)
+
+
+def test_notebook_is_valid_after_every_cell(tmp_path):
+	journal = NotebookJournal(tmp_path)
+	for n in range(3):
+		journal.append_cell(CodeCell(source=f'x = {n}\nprint(x)', output=f'{n}\n', execution_count=n + 1))
+		notebook = json.loads(journal.notebook_path.read_text())
+		assert len(notebook['cells']) == n + 2  # setup cell + cells so far
+
+	assert notebook['nbformat'] == 4 and notebook['metadata']['kernelspec']['name'] == 'python3'
+	assert notebook['cells'][-1]['outputs'][0]['text'] == ['2', '']
+	assert [cell.execution_count for cell in journal.cells()] == [1, 2, 3]
+
+
+def test_history_is_read_back_lazily_and_survives_a_torn_write(tmp_path):
+	journal = NotebookJournal(tmp_path)
+	for n in range(3):
+		journal.history.append(make_step(n))
+
+	# Crash while writing a fourth step
+	with open(tmp_path / 'history.jsonl', 'ab') as f:
+		f.write(b'{"index": 3, "entry": {"model_out')
+
+	history = load_history(tmp_path)
+	assert len(history) == 3
+	assert history.urls() == ['https://example.com/0', 'https://example.com/1', 'https://example.com/2']
+	assert history.screenshot_paths(n_last=1) == ['/tmp/shots/step_2.png']
+	assert history.final_result() == '2\n'
+
+	# A resumed journal appends after the last complete step and replacements win on reload
+	resumed = NotebookJournal(tmp_path)
+	resumed.history.append(make_step(3, done=True))
+	last = resumed.history[-1]
+	last.result[0].extracted_content = 'final answer'
+	resumed.history[-1] = last
+
+	history = load_history(tmp_path)
+	assert len(history) == 4 and history.is_done() and history.final_result() == 'final answer'
+
+
+def test_incomplete_notebook_is_rebuilt_from_cells(tmp_path):
+	journal = NotebookJournal(tmp_path)
+	journal.append_cell(CodeCell(source='a = 1', execution_count=1))
+	journal.append_cell(CodeCell(source='b = 2', execution_count=2))
+	journal.notebook_path.write_bytes(journal.notebook_path.read_bytes()[:-10])
+
+	reopened = NotebookJournal(tmp_path)
+	notebook = json.loads(reopened.notebook_path.read_text())
+	assert [cell['source'] for cell in notebook['cells'][1:]] == [['a = 1'], ['b = 2']]
+
+
+async def test_code_agent_streams_cells_to_journal(tmp_path):
+	agent = CodeAgent(
+		task='test', llm=ChatBrowserUse(api_key='test'), file_system=FileSystem(tmp_path / 'fs'), journal_dir=tmp_path
+	)
+
+	output, error, _ = await agent._execute_code('values = [1, 2, 3]\nprint(sum(values))')
+	assert output == '6\n' and error is None
+	_, error, _ = await agent._execute_code('1 / 0')
+	assert error == 'ZeroDivisionError: division by zero'
+
+	cells = NotebookJournal(tmp_path).cells()
+	assert [cell.status for cell in cells] == [ExecutionStatus.SUCCESS, ExecutionStatus.ERROR]
+	assert cells[0].output == '6\n' and cells[0].execution_time is not None
+	assert agent.complete_history is agent.journal.history  # type: ignore[union-attr]
@@ -0,0 +1,146 @@
+"""Tests for CodeAgent cell kernels: output isolation and the out-of-process kernel."""
+
+import asyncio
+import time
+
+import pytest
+
+from browser_use.code_use.kernel import EvaluateError, InProcessKernel, SubprocessKernel, create_kernel
+
+
+def make_tools(calls: list[tuple]) -> dict:
+	"""Agent-side namespace with fake browser tools."""
+
+	async def navigate(url: str, new_tab: bool = False):
+		calls.append(('navigate', url, new_tab))
+		print(f'navigated to {url}')
+		return f'Navigated to {url}'
+
+	async def evaluate(code: str):
+		if 'throw' in code:
+			raise EvaluateError('JavaScript execution error: boom')
+		await asyncio.sleep(0.01)
+		return [{'title': 'a'}, {'title': 'b'}]
+
+	return {'navigate': navigate, 'evaluate': evaluate, '_task_done': False}
+
+
+async def test_concurrent_in_process_kernels_keep_their_own_output():
+	first = InProcessKernel({})
+	second = InProcessKernel({})
+	code = 'for i in range(5):\n    print(NAME, i)\n    await asyncio.sleep(0.01)'
+	first.namespace['NAME'] = 'first'
+	second.namespace['NAME'] = 'second'
+
+	a, b = await asyncio.gather(first.execute(code), second.execute(code))
+
+	assert a.output == ''.join(f'first {i}\n' for i in range(5))
+	assert b.output == ''.join(f'second {i}\n' for i in range(5))
+
+
+async def test_in_process_errors_and_timeout():
+	kernel = InProcessKernel({}, cell_timeout=0.2)
+
+	syntax = await kernel.execute("x = 'unterminated")
+	assert syntax.error_type == 'SyntaxError' and 'Hint: Unterminated' in (syntax.error or '')
+
+	slow = await kernel.execute('await asyncio.sleep(5)')
+	assert slow.error_type == 'TimeoutError'
+
+	with pytest.raises(ValueError):
+		create_kernel('in_process', {}, cpu_time_limit=1)
+
+
+async def test_subprocess_kernel_proxies_tools_and_keeps_state():
+	calls: list[tuple] = []
+	kernel = SubprocessKernel(make_tools(calls))
+	await kernel.start()
+	try:
+		result = await kernel.execute("page = await navigate('https://example.com', True)\nitems = await evaluate('x')")
+		assert result.error is None
+		assert result.output == 'navigated to https://example.com\n'  # printed by the tool in this process
+		assert calls == [('navigate', 'https://example.com', True)]
+		assert kernel.variables()['items'] == ('list', 2)
+		assert result.cpu_time is not None and result.peak_memory_mb
+
+		result = await kernel.execute('print(page, len(items) + len(extra))', inject={'extra': 'abc'})
+		assert result.output == 'Navigated to https://example.com 5\n'
+
+		result = await kernel.execute("await evaluate('throw')\nprint('not reached')")
+		assert result.error_type == 'EvaluateError' and result.error == 'JavaScript execution error: boom'
+		assert result.output is None
+
+		assert 'page' not in kernel.namespace  # user variables stay in the kernel process
+	finally:
+		await kernel.close()
+	assert kernel.pid is None
+
+
+async def test_subprocess_cpu_heavy_cell_does_not_block_agent_loop():
+	kernel = SubprocessKernel({}, cpu_time_limit=1)
+	await kernel.start()
+	ticks = 0
+
+	async def ticker():
+		nonlocal ticks
+		while True:
+			await asyncio.sleep(0.01)
+			ticks += 1
+
+	ticking = asyncio.create_task(ticker())
+	try:
+		start = time.monotonic()
+		result = await kernel.execute('while True:\n    pass')
+		elapsed = time.monotonic() - start
+
+		assert result.error_type == 'CPULimitExceeded'
+		assert ticks > elapsed / 0.01 / 4  # the agent's loop kept running meanwhile
+
+		result = await kernel.execute("print('still alive')")
+		assert result.output == 'still alive\n' and kernel.restarts == 0
+	finally:
+		ticking.cancel()
+		await kernel.close()
+
+
+async def test_subprocess_timeout_restarts_kernel():
+	kernel = SubprocessKernel({}, cell_timeout=0.5)
+	await kernel.start()
+	try:
+		await kernel.execute('x = 1')
+		first_pid = kernel.pid
+
+		result = await kernel.execute('import time\ntime.sleep(10)')
+		assert result.error_type == 'TimeoutError' and 'restarted' in (result.error or '')
+		assert kernel.restarts == 1 and kernel.pid != first_pid
+
+		result = await kernel.execute('print(x)')
+		assert result.error_type == 'NameError'
+	finally:
+		await kernel.close()
+
+
+async def test_subprocess_kernel_names_the_mode_for_objects_it_cannot_proxy():
+	kernel = SubprocessKernel({**make_tools([]), 'browser': object(), 'file_system': object(), 'json': None})
+	await kernel.start()
+	try:
+		result = await kernel.execute('await browser.get_current_page_url()')
+		assert result.error_type == 'NameError'
+		assert "'browser' is not available with kernel='subprocess'" in (result.error or '')
+
+		result = await kernel.execute("file_system.read_file('todo.md')")
+		assert result.error_type == 'NameError' and "kernel='in_process'" in (result.error or '')
+
+		# Libraries the kernel process imports itself are real, and placeholders aren't reported as variables
+		result = await kernel.execute("print(json.dumps({'a': 1}))")
+		assert result.output == '{"a": 1}\n'
+		assert 'browser' not in kernel.variables()
+	finally:
+		await kernel.close()
+
+
+def test_code_kernel_is_abstract():
+	from browser_use.code_use.kernel import CodeKernel
+
+	with pytest.raises(TypeError):
+		CodeKernel()  # type: ignore[abstract]
@@ -0,0 +1,118 @@
+"""Tests for running DOM construction and serialization off the event loop."""
+
+import asyncio
+import logging
+import time
+from types import SimpleNamespace
+
+from browser_use.dom.service import DomService
+from browser_use.dom.views import EnhancedDOMTreeNode, TargetAllTrees
+from browser_use.utils import LoopLagMonitor
+
+
+def make_dom_payload(sections: int, items_per_section: int) -> dict:
+	"""Raw DOM.getDocument-shaped payload: html > body > sections of div > span."""
+	next_id = 0
+
+	def node(name: str, node_type: int = 1, children: list | None = None, value: str = '', parent_id: int | None = None):
+		nonlocal next_id
+		next_id += 1
+		result = {
+			'nodeId': next_id,
+			'backendNodeId': next_id,
+			'nodeType': node_type,
+			'nodeName': name,
+			'localName': name.lower(),
+			'nodeValue': value,
+			'attributes': ['class', 'item'] if node_type == 1 else [],
+		}
+		if parent_id is not None:
+			result['parentId'] = parent_id
+		if children is not None:
+			for child in children:
+				child['parentId'] = result['nodeId']
+			result['children'] = children
+		return result
+
+	def item(i: int) -> dict:
+		return node('SPAN', children=[node('#text', node_type=3, value=f'Item {i}')])
+
+	body = node('BODY', children=[node('DIV', children=[item(i) for i in range(items_per_section)]) for _ in range(sections)])
+	html = node('HTML', children=[body])
+	return node('#document', node_type=9, children=[html])
+
+
+class OfflineDomService(DomService):
+	"""DomService that builds from a fixed raw payload instead of CDP."""
+
+	def __init__(self, dom_tree: dict, offload_cpu_work: bool):
+		session = SimpleNamespace(session_id='session')
+
+		async def get_or_create_cdp_session(target_id, focus=False):
+			return session
+
+		browser_session = SimpleNamespace(
+			logger=logging.getLogger('test_dom_offload'),
+			id='browser-session',
+			agent_focus_target_id='target',
+			get_or_create_cdp_session=get_or_create_cdp_session,
+		)
+		super().__init__(browser_session, offload_cpu_work=offload_cpu_work)  # type: ignore[arg-type]
+		self._dom_tree = dom_tree
+
+	async def _get_all_trees(self, target_id):
+		return TargetAllTrees(
+			snapshot={'documents': [], 'strings': []},
+			dom_tree={'root': self._dom_tree},  # type: ignore[typeddict-item]
+			ax_tree={'nodes': []},
+			device_pixel_ratio=1.0,
+			cdp_timing={},
+		)
+
+
+def count_nodes(node: EnhancedDOMTreeNode) -> int:
+	return 1 + sum(count_nodes(child) for child in node.children_and_shadow_roots)
+
+
+async def test_offloaded_build_matches_inline_build():
+	payload = make_dom_payload(sections=20, items_per_section=20)
+
+	inline_state, inline_tree, _ = await OfflineDomService(payload, offload_cpu_work=False).get_serialized_dom_tree()
+	thread_state, thread_tree, _ = await OfflineDomService(payload, offload_cpu_work=True).get_serialized_dom_tree()
+
+	assert count_nodes(inline_tree) == count_nodes(thread_tree) == 2 + 1 + 20 + 20 * 20 * 2
+	assert thread_tree.children[0].tag_name == 'html'
+	assert thread_tree.children[0].children[0].parent_node is thread_tree.children[0]
+	assert inline_state.llm_representation() == thread_state.llm_representation()
+
+
+async def test_offloading_keeps_event_loop_responsive_under_concurrent_builds():
+	payload = make_dom_payload(sections=100, items_per_section=100)
+
+	async def lag_summary(offload: bool) -> dict[str, float]:
+		services = [OfflineDomService(payload, offload_cpu_work=offload) for _ in range(3)]
+		async with LoopLagMonitor(interval=0.005) as monitor:
+			await asyncio.gather(*(service.get_dom_tree('target') for service in services))
+		return monitor.summary()
+
+	inline = await lag_summary(offload=False)
+	offloaded = await lag_summary(offload=True)
+
+	# inline builds block the loop for their whole duration, offloaded ones only for GIL switch slices
+	assert offloaded['max_ms'] < inline['max_ms'] / 2, (inline, offloaded)
+	assert offloaded['samples'] > inline['samples']
+
+
+def block_event_loop(seconds: float) -> None:
+	time.sleep(seconds)
+
+
+async def test_loop_lag_monitor_reports_blocking():
+	async with LoopLagMonitor(interval=0.005) as monitor:
+		await asyncio.sleep(0.02)
+		block_event_loop(0.1)
+		await asyncio.sleep(0.02)
+
+	summary = monitor.summary()
+	assert summary['samples'] >= 2
+	assert summary['max_ms'] >= 80
@@ -0,0 +1,126 @@
+"""Tests for chunked map-reduce extraction helpers used by the extract action."""
+
+import asyncio
+
+from browser_use.llm.messages import BaseMessage
+from browser_use.llm.views import ChatInvokeCompletion
+from browser_use.tools.extraction import (
+	MAP_SYSTEM_PROMPT,
+	NO_RELEVANT_CONTENT,
+	ExtractionCache,
+	map_reduce_extract,
+	split_markdown_into_chunks,
+)
+
+
+class RecordingLLM:
+	"""Minimal chat model that answers map calls per chunk and records concurrency."""
+
+	model = 'recording'
+	provider = 'test'
+	name = 'recording'
+
+	def __init__(self, relevant_marker: str = 'PRODUCT'):
+		self.relevant_marker = relevant_marker
+		self.map_calls = 0
+		self.reduce_calls = 0
+		self.in_flight = 0
+		self.max_in_flight = 0
+
+	async def ainvoke(self, messages: list[BaseMessage], output_format=None, **kwargs):
+		self.in_flight += 1
+		self.max_in_flight = max(self.max_in_flight, self.in_flight)
+		try:
+			await asyncio.sleep(0.01)
+			system, user = messages[0].text, messages[1].text
+			if system == MAP_SYSTEM_PROMPT:
+				self.map_calls += 1
+				found = [line for line in user.splitlines() if self.relevant_marker in line]
+				completion = '\n'.join(found) if found else NO_RELEVANT_CONTENT
+			else:
+				self.reduce_calls += 1
+				completion = 'MERGED:' + ','.join(line for line in user.splitlines() if self.relevant_marker in line)
+			return ChatInvokeCompletion(completion=completion, usage=None)
+		finally:
+			self.in_flight -= 1
+
+
+class TestSplitMarkdownIntoChunks:
+	def test_short_content_is_single_chunk(self):
+		chunks = split_markdown_into_chunks('# Title\nshort', 100)
+		assert len(chunks) == 1
+		assert chunks[0].start == 0 and chunks[0].content == '# Title\nshort'
+
+	def test_chunks_round_trip_and_respect_limit(self):
+		content = '\n\n'.join(f'Paragraph {i} ' + 'word ' * 40 for i in range(200))
+		chunks = split_markdown_into_chunks(content, 1000)
+
+		assert ''.join(chunk.content for chunk in chunks) == content
+		assert all(len(chunk.content) <= 1000 for chunk in chunks)
+		for previous, chunk in zip(chunks, chunks[1:]):
+			assert chunk.start == previous.end
+
+	def test_prefers_heading_boundaries(self):
+		section = 'text line\n' * 30
+		content = f'# One\n{section}# Two\n{section}# Three\n{section}'
+		chunks = split_markdown_into_chunks(content, len(section) + 20)
+
+		assert [chunk.content.lstrip('\n').split('\n', 1)[0] for chunk in chunks] == ['# One', '# Two', '# Three']
+
+	def test_hard_cut_without_boundaries(self):
+		chunks = split_markdown_into_chunks('x' * 2500, 1000)
+		assert [len(chunk.content) for chunk in chunks] == [1000, 1000, 500]
+
+
+class TestExtractionCache:
+	def test_key_depends_on_content_and_options(self):
+		key = ExtractionCache.make_key('https://a.com', 'q', 'content', extract_links=False)
+		assert key == ExtractionCache.make_key('https://a.com', 'q', 'content', extract_links=False)
+		assert key != ExtractionCache.make_key('https://a.com', 'q', 'changed content', extract_links=False)
+		assert key != ExtractionCache.make_key('https://a.com', 'q', 'content', extract_links=True)
+		assert key != ExtractionCache.make_key('https://a.com', 'other q', 'content', extract_links=False)
+
+	def test_lru_eviction(self):
+		cache = ExtractionCache(max_entries=2)
+		cache.set('a', '1')
+		cache.set('b', '2')
+		assert cache.get('a') == '1'  # refresh a
+		cache.set('c', '3')
+
+		assert cache.get('b') is None
+		assert cache.get('a') == '1' and cache.get('c') == '3'
+		assert len(cache) == 2
+
+
+class TestMapReduceExtract:
+	async def test_maps_concurrently_and_reduces(self):
+		content = '\n\n'.join(f'PRODUCT {i}' if i % 50 == 0 else f'filler {i} ' + 'x' * 50 for i in range(400))
+		chunks = split_markdown_into_chunks(content, 2000)
+		llm = RecordingLLM()
+
+		result = await map_reduce_extract(llm, 'list products', chunks, 'stats', max_concurrency=3)  # type: ignore[arg-type]
+
+		assert llm.map_calls == len(chunks)
+		assert llm.reduce_calls == 1
+		assert 1 < llm.max_in_flight <= 3
+		assert result.startswith('MERGED:')
+		for i in range(0, 400, 50):
+			assert f'PRODUCT {i}' in result
+
+	async def test_single_relevant_chunk_skips_reduce(self):
+		chunks = split_markdown_into_chunks('PRODUCT only here\n\n' + 'filler\n' * 500, 1000)
+		llm = RecordingLLM()
+
+		result = await map_reduce_extract(llm, 'list products', chunks, 'stats')  # type: ignore[arg-type]
+
+		assert result == 'PRODUCT only here'
+		assert llm.reduce_calls == 0
+
+	async def test_nothing_relevant(self):
+		chunks = split_markdown_into_chunks('filler\n' * 500, 1000)
+		llm = RecordingLLM()
+
+		result = await map_reduce_extract(llm, 'list products', chunks, 'stats')  # type: ignore[arg-type]
+
+		assert 'not available' in result
+		assert llm.reduce_calls == 0
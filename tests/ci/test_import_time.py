@@ -0,0 +1,81 @@
+"""Import-time budgets for the public entry points, measured with `python -X importtime`.
+
+Budgets cover the self time of browser_use's own modules (third-party import times depend
+too much on the machine and installed versions), with room for slower CI machines. Heavy
+optional dependencies are checked by name, so pulling one back into an entry point fails
+regardless of timing.
+"""
+
+import os
+import re
+import subprocess
+import sys
+from importlib.util import find_spec
+
+import pytest
+
+_IMPORTTIME_LINE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)')
+
+PROVIDER_SDKS = ['openai', 'anthropic', 'google.genai', 'groq', 'mistralai', 'boto3', 'ollama']
+
+# statement -> (budget in seconds for browser_use's own modules, modules that must not be imported)
+ENTRY_POINTS = {
+	'import browser_use': (0.15, ['browser_use.agent.views', 'browser_use.browser.events', 'posthog', *PROVIDER_SDKS]),
+	'from browser_use import BrowserSession': (0.6, ['posthog', *PROVIDER_SDKS]),
+	'from browser_use import Tools': (1.0, ['posthog', *PROVIDER_SDKS]),
+	'from browser_use import Agent': (1.0, ['posthog', *PROVIDER_SDKS]),
+	'import browser_use.cli': (1.2, ['posthog', *PROVIDER_SDKS]),
+	'import browser_use.mcp.server': (1.2, ['posthog', *PROVIDER_SDKS]),
+}
+
+
+def profile_import(statement: str) -> tuple[float, dict[str, float]]:
+	"""Run statement in a fresh interpreter, returning (own self time, {module: cumulative time}) in seconds."""
+	env = {**os.environ, 'ANONYMIZED_TELEMETRY': 'false'}
+	result = subprocess.run(
+		[sys.executable, '-X', 'importtime', '-c', statement], capture_output=True, text=True, env=env, timeout=120
+	)
+	own = 0.0
+	modules: dict[str, float] = {}
+	for line in result.stderr.splitlines():
+		if match := _IMPORTTIME_LINE.match(line):
+			self_us, cumulative_us, _, module = match.groups()
+			modules[module] = int(cumulative_us) / 1e6
+			if module == 'browser_use' or module.startswith('browser_use.'):
+				own += int(self_us) / 1e6
+	return own, modules
+
+
+def test_importtime_output_is_parsed():
+	own, modules = profile_import('import browser_use.config')
+	assert 'browser_use.config' in modules and 'pydantic' in modules
+	assert 0 < own < modules['browser_use.config'] + modules['browser_use']
+
+
+@pytest.mark.parametrize('statement', list(ENTRY_POINTS))
+def test_entry_point_import_budget(statement):
+	if statement.endswith('mcp.server') and find_spec('mcp') is None:
+		pytest.skip('mcp is not installed')
+	budget, forbidden = ENTRY_POINTS[statement]
+	# Best of two runs, the first one may still be compiling .pyc files
+	own, modules = min(profile_import(statement), profile_import(statement), key=lambda run: run[0])
+
+	imported = [module for module in forbidden if module in modules]
+	assert not imported, f'{statement} should not import {imported}'
+	slowest = sorted((m for m in modules if m.startswith('browser_use')), key=modules.__getitem__, reverse=True)[:5]
+	assert own < budget, f'{statement}: browser_use modules took {own:.3f}s (budget {budget}s), slowest: {slowest}'
+
+
+def test_event_schemas_are_built_on_first_use():
+	code = (
+		'from browser_use.browser import events\n'
+		'from browser_use import Agent, Tools\n'
+		'deferred = [name for name, cls in vars(events).items() if name.endswith("Event") and not cls.__pydantic_complete__]\n'
+		'assert len(deferred) > 30, deferred\n'
+		'from bubus import BaseEvent\n'
+		'assert "defer_build" not in BaseEvent.model_config  # set per event, the shared bubus config is untouched\n'
+		'event = events.NavigateToUrlEvent(url="https://example.com")\n'
+		'assert events.NavigateToUrlEvent.__pydantic_complete__ and event.url == "https://example.com"\n'
+	)
+	result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, timeout=120)
+	assert result.returncode == 0, result.stderr
@@ -0,0 +1,248 @@
+"""Tests for the cart API's job queue (langchain_agent/jobs.py) and its job endpoints, with a fake runner and no browser."""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# The cart API runs from inside langchain_agent/ and imports its siblings as top-level modules
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'langchain_agent'))
+
+from jobs import Job, JobChannel, JobQueue, JobStatus, QueueFullError  # noqa: E402
+
+
+class FakeBrowser:
+	def __init__(self, worker_id: int):
+		self.worker_id = worker_id
+		self.killed = False
+
+
+class FakeBrowserQueue(JobQueue):
+	"""JobQueue whose workers get a stand-in object instead of launching a browser."""
+
+	def __init__(self, *args, **kwargs):
+		super().__init__(*args, **kwargs)
+		self.closed_browsers: list[FakeBrowser] = []
+
+	async def _get_session(self, worker_id):
+		if worker_id not in self._sessions:
+			self._sessions[worker_id] = FakeBrowser(worker_id)  # type: ignore[assignment]
+			self._browser_starts += 1
+		return self._sessions[worker_id]
+
+	async def _clean_session(self, browser_session):
+		return True
+
+	async def _close_session(self, worker_id):
+		browser = self._sessions.pop(worker_id, None)
+		if browser is not None:
+			browser.killed = True  # type: ignore[attr-defined]
+			self.closed_browsers.append(browser)  # type: ignore[arg-type]
+
+
+class FakeRunner:
+	"""Job runner recording start order and concurrency, a job named 'fail' raises, 'block' waits for release."""
+
+	def __init__(self):
+		self.started: list[str] = []
+		self.active = 0
+		self.max_active = 0
+		self.release = asyncio.Event()
+
+	async def __call__(self, job: Job, browser_session) -> dict:
+		self.started.append(job.product_name)
+		self.active += 1
+		self.max_active = max(self.max_active, self.active)
+		try:
+			job.publish({'type': 'progress', 'step': 1, 'action': 'navigate', 'message': '✅ Step 1 completed'})
+			if job.product_name == 'fail':
+				raise ValueError('boom')
+			if job.product_name == 'block':
+				await self.release.wait()
+			await asyncio.sleep(0.01)
+			return {'success': True, 'message': f'added {job.product_name}', 'cart': {'product_name': job.product_name}}
+		finally:
+			self.active -= 1
+
+
+@pytest.fixture
+async def queue():
+	runner = FakeRunner()
+	job_queue = FakeBrowserQueue(runner, workers=2, max_queued=10)
+	await job_queue.start()
+	yield job_queue, runner
+	runner.release.set()
+	await job_queue.stop()
+
+
+async def test_jobs_start_in_submission_order_and_at_most_workers_at_once(queue):
+	job_queue, runner = queue
+	jobs = [job_queue.submit(f'item-{i}') for i in range(6)]
+	await asyncio.wait_for(asyncio.gather(*(job.wait() for job in jobs)), 5)
+
+	assert runner.started == [f'item-{i}' for i in range(6)]
+	assert runner.max_active == 2
+	assert all(job.status == JobStatus.SUCCEEDED for job in jobs)
+	assert jobs[0].result == {'success': True, 'message': 'added item-0', 'cart': {'product_name': 'item-0'}}
+	assert [event['type'] for event in jobs[0].events] == ['status', 'status', 'progress', 'complete']
+
+	metrics = job_queue.metrics()
+	assert metrics['jobs_succeeded'] == 6 and metrics['queue_depth'] == 0 and metrics['busy_workers'] == 0
+	assert metrics['browser_starts'] == 2  # warm browsers are reused between successful jobs
+
+
+async def test_failed_job_reports_error_and_replaces_its_browser(queue):
+	job_queue, runner = queue
+	failed = await asyncio.wait_for(job_queue.submit('fail').wait(), 5)
+
+	assert failed.status == JobStatus.FAILED and failed.error == 'ValueError: boom'
+	assert failed.events[-1] == {
+		'type': 'error',
+		'success': False,
+		'message': '❌ An error occurred',
+		'error': 'ValueError: boom',
+	}
+	[replaced] = job_queue.closed_browsers
+	assert replaced.killed and replaced not in job_queue._sessions.values()
+
+	after = await asyncio.wait_for(job_queue.submit('next').wait(), 5)
+	assert after.status == JobStatus.SUCCEEDED
+	assert job_queue.metrics()['jobs_failed'] == 1 and job_queue.metrics()['jobs_succeeded'] == 1
+
+
+async def test_full_queue_rejects_new_jobs():
+	job_queue = FakeBrowserQueue(FakeRunner(), workers=1, max_queued=2)  # not started: nothing leaves the queue
+	first, second = job_queue.submit('a'), job_queue.submit('b')
+
+	with pytest.raises(QueueFullError):
+		job_queue.submit('c')
+	assert [job_queue.get(first.id), job_queue.get(second.id)] == [first, second]
+	assert job_queue.metrics()['queue_depth'] == 2
+
+
+async def test_stop_fails_running_and_queued_jobs():
+	runner = FakeRunner()
+	job_queue = FakeBrowserQueue(runner, workers=1)
+	await job_queue.start()
+	running, queued = job_queue.submit('block'), job_queue.submit('waiting')
+	for _ in range(100):
+		if running.status == JobStatus.RUNNING:
+			break
+		await asyncio.sleep(0.01)
+
+	await job_queue.stop()
+
+	await asyncio.wait_for(asyncio.gather(running.wait(), queued.wait()), 1)
+	assert (running.status, running.error) == (JobStatus.FAILED, 'Worker stopped')
+	assert (queued.status, queued.error) == (JobStatus.FAILED, 'Queue stopped')
+	assert running.events[-1]['type'] == queued.events[-1]['type'] == 'error'
+	assert runner.started == ['block'] and job_queue.closed_browsers[0].killed
+
+
+async def collect(channel: JobChannel, after: int = 0) -> list[tuple[int, dict]]:
+	return [item async for item in channel.subscribe(after)]
+
+
+async def test_channel_fans_out_every_event_to_every_subscriber():
+	channel = JobChannel()
+	followers = [asyncio.create_task(collect(channel)) for _ in range(3)]
+	await asyncio.sleep(0)  # let them subscribe before anything is published
+	for step in range(5):
+		channel.publish({'step': step})
+	channel.close()
+
+	expected = [(step, {'step': step}) for step in range(5)]
+	assert await asyncio.wait_for(asyncio.gather(*followers), 1) == [expected] * 3
+
+
+async def test_channel_replays_history_and_clamps_resume_points():
+	channel = JobChannel()
+	for step in range(3):
+		channel.publish({'step': step})
+
+	beyond = asyncio.create_task(collect(channel, after=10))
+	await asyncio.sleep(0)
+	channel.publish({'step': 3})
+	channel.close()
+
+	assert await collect(channel) == [(step, {'step': step}) for step in range(4)]
+	assert await collect(channel, after=2) == [(2, {'step': 2}), (3, {'step': 3})]
+	# A resume point past the end starts at the next event, which keeps its own index
+	assert await asyncio.wait_for(beyond, 1) == [(3, {'step': 3})]
+	assert await collect(channel, after=10) == []
+
+
+async def test_stalled_subscriber_never_blocks_publish_and_catches_up():
+	channel = JobChannel(max_buffered=2)
+	channel.publish({'step': 0})
+	stalled = channel.subscribe()
+	assert await anext(stalled) == (0, {'step': 0})  # attached, then stops reading
+	fast = asyncio.create_task(collect(channel, after=1))
+	await asyncio.sleep(0)
+
+	for step in range(1, 20):
+		channel.publish({'step': step})  # synchronous: returns without waiting on anyone
+	channel.close()
+
+	expected = [(step, {'step': step}) for step in range(1, 20)]
+	assert await asyncio.wait_for(fast, 1) == expected
+	assert [item async for item in stalled] == expected  # from its buffer, then from history, each event once
+
+
+@pytest.fixture
+async def api_client(queue, monkeypatch):
+	api = pytest.importorskip('api', reason='langchain_agent/api.py needs its product model module (gr)')
+	httpx = pytest.importorskip('httpx')
+	job_queue, _ = queue
+	monkeypatch.setattr(api, 'job_queue', job_queue)
+	async with httpx.AsyncClient(transport=httpx.ASGITransport(app=api.app), base_url='http://test') as client:
+		yield client, job_queue
+
+
+async def test_job_endpoints_queue_poll_and_stream(api_client):
+	client, job_queue = api_client
+	response = await client.post('/jobs', json={'product_name': ' laptop '})
+	assert response.status_code == 202 and response.json()['status'] == 'queued'
+	job_id = response.json()['job_id']
+
+	await asyncio.wait_for(job_queue.get(job_id).wait(), 5)  # type: ignore[union-attr]
+	status = (await client.get(f'/jobs/{job_id}')).json()
+	assert status['status'] == 'succeeded' and status['product_name'] == 'laptop'
+
+	stream = (await client.get(f'/jobs/{job_id}/events')).text
+	events = [json.loads(line[len('data: ') :]) for line in stream.splitlines() if line.startswith('data: ')]
+	assert events == status['events'] and events[-1]['type'] == 'complete'
+
+	assert (await client.get('/jobs/unknown')).status_code == 404
+	assert (await client.post('/jobs', json={'product_name': '  '})).status_code == 400
+
+
+async def test_job_endpoints_report_errors_and_a_full_queue(api_client, monkeypatch):
+	client, job_queue = api_client
+	job_id = (await client.post('/jobs', json={'product_name': 'fail'})).json()['job_id']
+	await asyncio.wait_for(job_queue.get(job_id).wait(), 5)  # type: ignore[union-attr]
+	status = (await client.get(f'/jobs/{job_id}')).json()
+	assert status['status'] == 'failed' and status['error'] == 'ValueError: boom'
+
+	def full(product_name):
+		raise QueueFullError('20 jobs are already queued, try again later')
+
+	monkeypatch.setattr(job_queue, 'submit', full)
+	response = await client.post('/jobs', json={'product_name': 'laptop'})
+	assert response.status_code == 429 and response.headers['Retry-After'] == '30'
+
+
+async def test_job_events_resume_after_last_event_id(api_client):
+	client, job_queue = api_client
+	job_id = (await client.post('/jobs', json={'product_name': 'laptop'})).json()['job_id']
+	job = await asyncio.wait_for(job_queue.get(job_id).wait(), 5)  # type: ignore[union-attr]
+
+	def ids(stream: str) -> list[int]:
+		return [int(line[len('id: ') :]) for line in stream.splitlines() if line.startswith('id: ')]
+
+	resumed = await client.get(f'/jobs/{job_id}/events', headers={'Last-Event-ID': '1'})
+	assert ids(resumed.text) == list(range(2, len(job.events)))
+	beyond = await client.get(f'/jobs/{job_id}/events', headers={'Last-Event-ID': '99'})
+	assert ids(beyond.text) == []
@@ -0,0 +1,139 @@
+"""Tests for block-level markdown caching and the streaming markdown filter."""
+
+from browser_use.dom.markdown_extractor import (
+	MarkdownBlockCache,
+	MarkdownCaches,
+	MarkdownStreamFilter,
+	_collect_html_blocks,
+	_preprocess_markdown_content,
+)
+from browser_use.dom.serializer.html_serializer import HTMLSerializer
+from browser_use.dom.views import EnhancedDOMTreeNode, NodeType
+
+_next_id = 0
+
+
+def make_node(node_type: NodeType, name: str, value: str = '', children=None, attributes=None) -> EnhancedDOMTreeNode:
+	global _next_id
+	_next_id += 1
+	node = EnhancedDOMTreeNode(
+		node_id=_next_id,
+		backend_node_id=_next_id,
+		node_type=node_type,
+		node_name=name,
+		node_value=value,
+		attributes=attributes or {},
+		is_scrollable=None,
+		is_visible=True,
+		absolute_position=None,
+		target_id='target',
+		frame_id=None,
+		session_id=None,
+		content_document=None,
+		shadow_root_type=None,
+		shadow_roots=None,
+		parent_node=None,
+		children_nodes=children or [],
+		ax_node=None,
+		snapshot_node=None,
+	)
+	for child in node.children:
+		child.parent_node = node
+	return node
+
+
+def el(tag: str, *children: EnhancedDOMTreeNode) -> EnhancedDOMTreeNode:
+	return make_node(NodeType.ELEMENT_NODE, tag.upper(), children=list(children))
+
+
+def text(value: str) -> EnhancedDOMTreeNode:
+	return make_node(NodeType.TEXT_NODE, '#text', value=value)
+
+
+def make_page(articles: list[str]) -> EnhancedDOMTreeNode:
+	body = el(
+		'body',
+		el('h1', text('Listing')),
+		*(el('article', el('h2', text(title)), el('p', text(f'{title} description ' * 80))) for title in articles),
+		text('Footer '),
+		el('a', text('link')),
+	)
+	return make_node(NodeType.DOCUMENT_NODE, '#document', children=[el('html', el('head', el('title', text('t'))), body)])
+
+
+def test_blocks_split_at_containers_and_group_inline_content():
+	blocks = _collect_html_blocks(make_page(['First', 'Second']), HTMLSerializer())
+
+	assert blocks[0] == '<h1>Listing</h1>'
+	assert blocks[1].startswith('<h2>First</h2><p>First description')
+	assert blocks[-1] == 'Footer <a>link</a>'
+	assert not any('<title>' in block for block in blocks)
+
+
+def test_small_containers_stay_whole():
+	page = make_node(NodeType.DOCUMENT_NODE, '#document', children=[el('div', el('p', text('a')), el('p', text('b')))])
+	assert _collect_html_blocks(page, HTMLSerializer()) == ['<p>a</p><p>b</p>']
+
+
+def test_cache_only_converts_changed_blocks():
+	cache = MarkdownBlockCache()
+	serializer = HTMLSerializer()
+
+	first, reused = cache.convert(_collect_html_blocks(make_page(['First', 'Second', 'Third']), serializer))
+	assert reused == 0
+	markdown = '\n'.join(md for _, md in first if md)
+	assert markdown.startswith('# Listing\n## First\nFirst description')
+	assert markdown.endswith('Footer link')
+
+	second, reused = cache.convert(_collect_html_blocks(make_page(['First', 'Changed', 'Third']), serializer))
+	assert reused == len(second) - 1
+	assert 'Changed description' in '\n'.join(md for _, md in second)
+
+
+def test_cache_eviction_and_per_target_caches():
+	cache = MarkdownBlockCache(max_entries=2)
+	cache.convert(['<p>a</p>', '<p>b</p>', '<p>c</p>'])
+	assert len(cache) == 2
+
+	caches = MarkdownCaches(max_targets=2)
+	tab_a = caches.get('tab-a')
+	assert caches.get('tab-a') is tab_a
+	assert caches.get('tab-b') is not tab_a
+	caches.forget('tab-a')
+	assert caches.get('tab-a') is not tab_a
+
+	caches.get('tab-c')
+	assert len(caches) == 2  # least recently used tab-b was evicted
+
+
+async def test_markdown_caches_belong_to_the_sessions_dom_watchdog():
+	from browser_use.browser import BrowserSession
+	from browser_use.browser.events import TabClosedEvent
+	from browser_use.browser.watchdogs.dom_watchdog import DOMWatchdog
+
+	watchdogs = []
+	for _ in range(2):
+		browser_session = BrowserSession(cdp_url='ws://localhost:0/fake')
+		watchdogs.append(DOMWatchdog(event_bus=browser_session.event_bus, browser_session=browser_session))
+	first, second = watchdogs
+	tab_a = first.markdown_caches.get('tab-a')
+	assert second.markdown_caches.get('tab-a') is not tab_a
+
+	await first.on_TabClosedEvent(TabClosedEvent(target_id='tab-a'))
+	assert first.markdown_caches.get('tab-a') is not tab_a
+
+
+def test_stream_filter_handles_chunk_boundaries():
+	content = 'Intro %20text\n`{"state":\n"x"}` kept\n\n\n{"$type":"' + 'a' * 120 + '"} tail\n' + '[' + '1,' * 60 + ']\nEnd'
+	expected, _ = _preprocess_markdown_content(content)
+	assert expected == 'Intro text\n kept\n tail\nEnd'
+
+	stream_filter = MarkdownStreamFilter()
+	for i in range(0, len(content), 7):
+		stream_filter.feed(content[i : i + 7])
+	assert stream_filter.finish() == expected
+
+
+def test_unclosed_code_json_does_not_swallow_following_paragraphs():
+	filtered, _ = _preprocess_markdown_content('See `{config\nstill here\n\nNext paragraph')
+	assert filtered == 'See `{config\nstill here\nNext paragraph'
@@ -0,0 +1,121 @@
+"""Integration tests for the MCP server's streamable HTTP transport and per-client browser sessions."""
+
+import asyncio
+import json
+import socket
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+import uvicorn
+
+mcp_server = pytest.importorskip('mcp.server')
+if not hasattr(mcp_server.Server, 'list_tools'):
+	pytest.skip('browser_use.mcp.server uses the mcp 1.x Server API', allow_module_level=True)
+
+from mcp import ClientSession
+from mcp.client.streamable_http import streamablehttp_client
+
+from browser_use.mcp.server import BrowserUseServer, ClientBrowser
+
+
+class FakeBrowserSession:
+	"""Stands in for a launched browser, get_tabs() can be held open to keep a call busy."""
+
+	def __init__(self, key: str):
+		self.id = f'browser-{key}'
+		self.gate: asyncio.Event | None = None
+		self.killed = False
+
+	async def get_tabs(self):
+		if self.gate is not None:
+			await self.gate.wait()
+		return [SimpleNamespace(target_id=f'target-{self.id}', url='about:blank', title='')]
+
+	async def kill(self) -> None:
+		self.killed = True
+
+
+@pytest.fixture
+async def mcp_http():
+	server = BrowserUseServer(max_sessions=2)
+	browsers: dict[str, FakeBrowserSession] = {}
+
+	async def create(key: str) -> ClientBrowser:
+		browsers[key] = FakeBrowserSession(key)
+		return ClientBrowser(browser_session=browsers[key], tools=None, file_system=None)  # type: ignore[arg-type]
+
+	server.pool.factory = create
+
+	with socket.socket() as sock:
+		sock.bind(('127.0.0.1', 0))
+		port = sock.getsockname()[1]
+	http = uvicorn.Server(uvicorn.Config(server._http_app(), host='127.0.0.1', port=port, log_level='warning'))
+	serving = asyncio.create_task(http.serve())
+	for _ in range(500):
+		if http.started:
+			break
+		await asyncio.sleep(0.01)
+
+	yield server, f'http://127.0.0.1:{port}/mcp', browsers
+
+	http.should_exit = True
+	await serving
+	await server.pool.close_all()
+
+
+@asynccontextmanager
+async def connect(url: str):
+	async with streamablehttp_client(url) as (read_stream, write_stream, _):
+		async with ClientSession(read_stream, write_stream) as session:
+			await session.initialize()
+			yield session
+
+
+async def call(session: ClientSession, name: str, **arguments) -> str:
+	result = await session.call_tool(name, arguments)
+	return result.content[0].text  # type: ignore[union-attr]
+
+
+async def test_each_http_client_gets_its_own_browser(mcp_http):
+	server, url, browsers = mcp_http
+	async with connect(url) as first, connect(url) as second:
+		tools = {tool.name: tool for tool in (await first.list_tools()).tools}
+		assert 'session_id' in tools['browser_list_tabs'].inputSchema['properties']
+
+		first_tabs = json.loads(await call(first, 'browser_list_tabs'))
+		second_tabs = json.loads(await call(second, 'browser_list_tabs'))
+		assert first_tabs != second_tabs
+		assert len(browsers) == 2 and len(server.pool) == 2
+
+		sessions = json.loads(await call(first, 'browser_list_sessions'))
+		assert {s['browser_session_id'] for s in sessions} == {b.id for b in browsers.values()}
+
+
+async def test_busy_session_does_not_block_other_clients(mcp_http):
+	server, url, browsers = mcp_http
+	async with connect(url) as first, connect(url) as second:
+		await call(first, 'browser_list_tabs')
+		[first_browser] = browsers.values()
+		first_browser.gate = asyncio.Event()
+
+		blocked = asyncio.create_task(call(first, 'browser_list_tabs'))
+		await asyncio.sleep(0.1)
+		assert json.loads(await asyncio.wait_for(call(second, 'browser_list_tabs'), 5))
+		assert not blocked.done()
+
+		first_browser.gate.set()
+		assert json.loads(await asyncio.wait_for(blocked, 5))
+
+
+async def test_browser_close_closes_only_the_callers_session(mcp_http):
+	server, url, browsers = mcp_http
+	async with connect(url) as first, connect(url) as second:
+		await call(first, 'browser_list_tabs')
+		await call(second, 'browser_list_tabs', session_id='shared')
+		first_key = next(key for key in browsers if key != 'shared')
+
+		assert await call(first, 'browser_close') == 'Browser closed'
+		assert browsers[first_key].killed and not browsers['shared'].killed
+		assert first_key not in server.pool and 'shared' in server.pool
+		assert await call(first, 'browser_close') == 'No browser session to close'
@@ -0,0 +1,160 @@
+"""Tests for the keyed browser session pool used by the MCP server."""
+
+import asyncio
+import itertools
+
+import pytest
+
+from browser_use.mcp.session_pool import SessionPool
+
+
+class FakeBrowsers:
+	"""Factory/closer pair that hands out numbered fake browsers."""
+
+	def __init__(self):
+		self.counter = itertools.count(1)
+		self.created: list[str] = []
+		self.closed: list[str] = []
+
+	async def create(self, key: str) -> str:
+		await asyncio.sleep(0.01)
+		self.created.append(key)
+		return f'{key}#{next(self.counter)}'
+
+	async def close(self, value: str) -> None:
+		self.closed.append(value)
+
+
+@pytest.fixture
+def browsers():
+	return FakeBrowsers()
+
+
+async def test_different_keys_run_concurrently_same_key_serializes(browsers):
+	pool = SessionPool(browsers.create, browsers.close, max_sessions=4)
+	active: dict[str, int] = {}
+	peak: dict[str, int] = {}
+	overall_peak = 0
+
+	async def call(key: str):
+		nonlocal overall_peak
+		async with pool.session(key):
+			active[key] = active.get(key, 0) + 1
+			peak[key] = max(peak.get(key, 0), active[key])
+			overall_peak = max(overall_peak, sum(active.values()))
+			await asyncio.sleep(0.02)
+			active[key] -= 1
+
+	await asyncio.gather(*(call(key) for key in ['a', 'b', 'a', 'b', 'c']))
+
+	assert peak == {'a': 1, 'b': 1, 'c': 1}
+	assert overall_peak == 3
+	assert sorted(browsers.created) == ['a', 'b', 'c']  # one browser per key despite concurrent first calls
+
+
+async def test_full_pool_evicts_least_recently_used_idle_session(browsers):
+	pool = SessionPool(browsers.create, browsers.close, max_sessions=2)
+	for key in ['a', 'b', 'a']:
+		async with pool.session(key):
+			pass
+
+	async with pool.session('c') as entry:
+		assert entry.value == 'c#3'
+
+	assert browsers.closed == ['b#2']
+	assert 'a' in pool and 'c' in pool and len(pool) == 2
+
+
+async def test_new_key_waits_when_every_session_is_busy(browsers):
+	pool = SessionPool(browsers.create, browsers.close, max_sessions=1)
+	release = asyncio.Event()
+
+	async def hold_a():
+		async with pool.session('a'):
+			await release.wait()
+
+	async def use_b():
+		async with pool.session('b') as entry:
+			return entry
+
+	holder = asyncio.create_task(hold_a())
+	await asyncio.sleep(0.05)
+	waiter = asyncio.create_task(use_b())
+	await asyncio.sleep(0.05)
+	assert not waiter.done()
+
+	release.set()
+	entry = await asyncio.wait_for(waiter, 1)
+	assert entry.key == 'b' and browsers.closed == ['a#1']
+	await holder
+
+
+async def test_close_waits_for_running_call_and_next_call_gets_new_session(browsers):
+	pool = SessionPool(browsers.create, browsers.close, max_sessions=2)
+	order: list[str] = []
+
+	async def slow_call():
+		async with pool.session('a'):
+			await asyncio.sleep(0.05)
+			order.append('call done')
+
+	task = asyncio.create_task(slow_call())
+	await asyncio.sleep(0.02)
+	assert await pool.close('a')
+	order.append('closed')
+	await task
+
+	assert order == ['call done', 'closed']
+	async with pool.session('a') as entry:
+		assert entry.value == 'a#2'
+
+
+async def test_close_idle_and_failed_creation(browsers):
+	pool = SessionPool(browsers.create, browsers.close, max_sessions=2)
+	async with pool.session('a') as entry:
+		entry.last_activity = 0
+	entry.last_activity = 0
+
+	assert await pool.close_idle(60) == ['a']
+	assert len(pool) == 0
+
+	async def failing_factory(key: str) -> str:
+		raise RuntimeError('browser failed to start')
+
+	pool.factory = failing_factory
+	with pytest.raises(RuntimeError):
+		async with pool.session('b'):
+			pass
+	assert 'b' not in pool
+
+	pool.factory = browsers.create
+	async with pool.session('b') as entry:
+		assert entry.value.startswith('b#')
+
+
+async def test_live_values_never_exceed_max_sessions_while_closing():
+	live: set[str] = set()
+	peak = 0
+
+	async def create(key: str) -> str:
+		nonlocal peak
+		live.add(key)
+		peak = max(peak, len(live))
+		await asyncio.sleep(0.01)
+		return key
+
+	async def close(value: str) -> None:
+		await asyncio.sleep(0.05)  # browsers take a while to shut down
+		live.discard(value)
+
+	async def use(key: str) -> None:
+		async with pool.session(key):
+			await asyncio.sleep(0.01)
+
+	pool = SessionPool(create, close, max_sessions=2)
+	await asyncio.gather(use('a'), use('b'))
+	# Explicit close, eviction and a waiting key all racing for the two slots
+	await asyncio.gather(pool.close('a'), use('c'), use('d'), use('e'))
+
+	assert peak == 2
+	assert len(pool) == 2 and len(live) == 2
@@ -0,0 +1,148 @@
+"""Tests for the observe_dom tool of langchain_agent: DOMView diffs and snapshot reuse."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip('langchain_core')
+
+from browser_use.browser import BrowserSession  # noqa: E402
+from browser_use.browser.views import BrowserStateSummary  # noqa: E402
+from browser_use.dom.views import EnhancedDOMTreeNode, NodeType, SerializedDOMState  # noqa: E402
+
+# The cart automation runs from inside langchain_agent/ and imports its siblings as top-level modules
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'langchain_agent'))
+
+from tools import DOMView, ObserveDOMTool  # noqa: E402
+
+URL = 'https://www.amazon.in/gp/cart/view.html'
+
+
+def make_node(node_type: NodeType, name: str, value: str = '', attributes: dict | None = None, children=None):
+	return EnhancedDOMTreeNode(
+		node_id=0,
+		backend_node_id=0,
+		node_type=node_type,
+		node_name=name,
+		node_value=value,
+		attributes=attributes or {},
+		is_scrollable=None,
+		is_visible=True,
+		absolute_position=None,
+		target_id='target',
+		frame_id=None,
+		session_id=None,
+		content_document=None,
+		shadow_root_type=None,
+		shadow_roots=None,
+		parent_node=None,
+		children_nodes=children or [],
+		ax_node=None,
+		snapshot_node=None,
+	)
+
+
+def button(text: str) -> EnhancedDOMTreeNode:
+	return make_node(NodeType.ELEMENT_NODE, 'BUTTON', children=[make_node(NodeType.TEXT_NODE, '#text', value=text)])
+
+
+def state(elements: dict[int, str], url: str = URL) -> BrowserStateSummary:
+	selector_map = {index: button(text) for index, text in elements.items()}
+	return BrowserStateSummary(
+		dom_state=SerializedDOMState(_root=None, selector_map=selector_map), url=url, title='Cart', tabs=[]
+	)
+
+
+def listed(rendered: str) -> list[int]:
+	return [int(line.split(']')[0].strip(' [')) for line in rendered.splitlines() if line.startswith('  [')]
+
+
+def test_diff_lists_only_new_and_changed_elements_and_reports_removed_ones():
+	previous = DOMView(state({1: 'Delete', 2: 'Save for later', 3: 'Quantity 1'}))
+	current = DOMView(state({1: 'Delete', 3: 'Quantity 2', 4: 'Proceed to Buy'}))
+
+	rendered = current.render(previous)
+	assert listed(rendered) == [3, 4]
+	assert '1 elements listed there are unchanged' in rendered
+	assert 'No longer available: [2]' in rendered
+
+	assert 'No changes since the last observe_dom: the 3 elements' in DOMView(
+		state({1: 'Delete', 2: 'Save for later', 3: 'Quantity 1'})
+	).render(previous)
+
+
+def test_elements_that_only_slide_out_of_the_listing_are_not_reported_removed():
+	# Generic pages list the first 150 elements, a new element in front pushes the last one out of the listing
+	elements = {index: f'Item {index}' for index in range(1, 151)}
+	previous = DOMView(state(elements))
+	current = DOMView(state({0: 'New offer', **elements}))
+	assert 150 not in current.lines and 150 in current.indices
+
+	rendered = current.render(previous)
+	assert listed(rendered) == [0]
+	assert 'No longer available' not in rendered
+	assert '150 elements listed there are unchanged' in rendered
+
+	# It is only reported once it is actually gone from the page
+	without_150 = {index: text for index, text in elements.items() if index != 150}
+	assert 'No longer available: [150]' in DOMView(state({0: 'New offer', **without_150})).render(previous)
+
+
+class FakeCDP:
+	def __init__(self):
+		self.fingerprint: list | None = ['doc-1', URL, 40, 0]
+		self.send = self
+		self.Runtime = self
+
+	async def evaluate(self, params, session_id=None):
+		if self.fingerprint is None:
+			raise RuntimeError('Execution context was destroyed')
+		return {'result': {'value': self.fingerprint}}
+
+
+@pytest.fixture
+async def observe(monkeypatch):
+	cdp = FakeCDP()
+	snapshots: list[BrowserStateSummary] = []
+
+	async def get_browser_state_summary(self, include_screenshot=True, **kwargs):
+		snapshots.append(state({1: 'Delete', 2: f'Snapshot {len(snapshots)}'}))
+		return snapshots[-1]
+
+	async def get_or_create_cdp_session(self, target_id=None, focus=True):
+		return type('Session', (), {'cdp_client': cdp, 'session_id': 'session'})()
+
+	monkeypatch.setattr(BrowserSession, 'get_browser_state_summary', get_browser_state_summary)
+	monkeypatch.setattr(BrowserSession, 'get_or_create_cdp_session', get_or_create_cdp_session)
+	browser_session = BrowserSession(cdp_url='ws://localhost:0/fake')
+	browser_session.agent_focus_target_id = 'target'
+	yield ObserveDOMTool(session=browser_session), cdp, snapshots
+	await browser_session.event_bus.stop(clear=True, timeout=5)
+
+
+async def test_snapshot_is_reused_while_the_dom_fingerprint_is_unchanged(observe):
+	tool, cdp, snapshots = observe
+	await tool._arun()
+	assert 'No changes since the last observe_dom' in await tool._arun()
+	assert len(snapshots) == 1
+
+	cdp.fingerprint = ['doc-1', URL, 40, 3]  # the page mutated its DOM by itself
+	assert listed(await tool._arun()) == [2]
+	assert len(snapshots) == 2
+
+	cdp.fingerprint = None  # no fingerprint, no reuse
+	await tool._arun()
+	await tool._arun()
+	assert len(snapshots) == 4
+
+
+async def test_page_changing_action_forces_a_new_snapshot(observe):
+	from browser_use.browser.events import ScrollEvent
+
+	tool, cdp, snapshots = observe
+	await tool._arun()
+	await tool.session.event_bus.dispatch(ScrollEvent(direction='down', amount=500))
+
+	await tool._arun()
+	assert len(snapshots) == 2
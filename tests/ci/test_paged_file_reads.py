@@ -0,0 +1,161 @@
+"""Tests for paged reads of large files through FileSystem.read_file_structured."""
+
+import pytest
+
+from browser_use.filesystem import paged_reader
+from browser_use.filesystem.file_system import FileSystem
+from browser_use.filesystem.paged_reader import read_document_window, read_text_window
+
+
+@pytest.fixture
+def fs(tmp_path):
+	return FileSystem(base_dir=tmp_path / 'agent', create_default_files=False)
+
+
+def write_lines(path, count: int) -> None:
+	path.write_text(''.join(f'line {i}\n' for i in range(1, count + 1)))
+
+
+class TestReadTextWindow:
+	def test_explicit_range_and_totals(self, tmp_path):
+		path = tmp_path / 'data.txt'
+		write_lines(path, 1000)
+
+		window = read_text_window(str(path), start=10, end=12)
+
+		assert window.content == 'line 10\nline 11\nline 12'
+		assert (window.start, window.end, window.total) == (10, 12, 1000)
+		assert window.is_partial
+		assert 'Use start=13' in window.describe_range()
+
+	def test_default_window_stops_at_max_chars(self, tmp_path):
+		path = tmp_path / 'data.csv'
+		write_lines(path, 10_000)
+
+		window = read_text_window(str(path), max_chars=1000)
+
+		assert len(window.content) <= 1000
+		assert window.content.startswith('line 1\n')
+		assert window.end < window.total == 10_000
+		assert read_text_window(str(path), start=window.end + 1, max_chars=1000).start == window.end + 1
+
+	def test_whole_small_file_is_not_partial(self, tmp_path):
+		path = tmp_path / 'small.md'
+		path.write_text('# Title\nbody')
+
+		window = read_text_window(str(path))
+
+		assert window.content == '# Title\nbody'
+		assert window.total == 2 and not window.is_partial
+
+	def test_single_long_line_is_truncated(self, tmp_path):
+		path = tmp_path / 'minified.json'
+		path.write_text('{"a": "' + 'x' * 5000 + '"}')
+
+		window = read_text_window(str(path), max_chars=100)
+
+		assert len(window.content) == 100
+		assert window.truncated and window.total == 1
+		assert 'cut off' in window.describe_range()
+
+	def test_index_is_rebuilt_when_file_changes(self, tmp_path):
+		path = tmp_path / 'grow.txt'
+		write_lines(path, 5)
+		assert read_text_window(str(path)).total == 5
+
+		write_lines(path, 50)
+		assert read_text_window(str(path)).total == 50
+
+	def test_empty_file(self, tmp_path):
+		path = tmp_path / 'empty.txt'
+		path.write_text('')
+
+		window = read_text_window(str(path))
+
+		assert window.content == '' and window.total == 0
+
+
+class TestReadDocumentWindow:
+	async def test_pdf_page_range_parses_only_missing_pages(self, tmp_path, monkeypatch):
+		from reportlab.pdfgen import canvas
+
+		path = tmp_path / 'report.pdf'
+		pdf = canvas.Canvas(str(path))
+		for page in range(1, 31):
+			pdf.drawString(72, 720, f'Page number {page}')
+			pdf.showPage()
+		pdf.save()
+
+		requested: list[list[int]] = []
+		real_extraction = paged_reader._run_extraction
+
+		async def recording_extraction(path, extension, pages):
+			requested.append(pages)
+			return await real_extraction(path, extension, pages)
+
+		monkeypatch.setattr(paged_reader, '_run_extraction', recording_extraction)
+
+		window = await read_document_window(str(path), 'pdf', start=3, end=4)
+		assert 'Page number 3' in window.content and 'Page number 4' in window.content
+		assert 'Page number 5' not in window.content
+		assert (window.start, window.end, window.total) == (3, 4, 30)
+
+		# Cached pages are reused, only the new page is parsed
+		window = await read_document_window(str(path), 'pdf', start=4, end=5)
+		assert 'Page number 5' in window.content
+		assert requested == [[2, 3], [4]]
+
+		# Without an end the default window is returned
+		window = await read_document_window(str(path), 'pdf')
+		assert (window.start, window.end) == (1, paged_reader.DEFAULT_MAX_PAGES)
+
+	async def test_docx_is_grouped_into_pages(self, tmp_path):
+		from docx import Document
+
+		path = tmp_path / 'long.docx'
+		doc = Document()
+		for i in range(200):
+			doc.add_paragraph(f'Paragraph {i} ' + 'text ' * 40)
+		doc.save(str(path))
+
+		first = await read_document_window(str(path), 'docx', start=1, end=1)
+		second = await read_document_window(str(path), 'docx', start=2, end=2)
+
+		assert first.total > 2
+		assert first.content.startswith('Paragraph 0 ')
+		assert 'Paragraph 0 ' not in second.content
+		assert len(first.content) <= paged_reader.DOCX_PAGE_CHARS + 250
+
+
+class TestFileSystemPagedReads:
+	async def test_external_text_file_reports_range(self, fs, tmp_path):
+		path = tmp_path / 'big.txt'
+		write_lines(path, 500)
+
+		result = await fs.read_file_structured(str(path), external_file=True, start=100, end=101)
+
+		assert '<content>\nline 100\nline 101\n</content>' in result['message']
+		assert 'Showing lines 100-101 of 500' in result['message']
+		assert result['total_lines'] == 500
+
+	async def test_external_pdf_reports_total_pages(self, fs, tmp_path):
+		from reportlab.pdfgen import canvas
+
+		path = tmp_path / 'short.pdf'
+		pdf = canvas.Canvas(str(path))
+		pdf.drawString(72, 720, 'Only page')
+		pdf.save()
+
+		result = await fs.read_file_structured(str(path), external_file=True)
+
+		assert 'Only page' in result['message']
+		assert 'Showing pages' not in result['message']
+		assert result['total_pages'] == 1
+
+	async def test_internal_file_line_range(self, fs):
+		await fs.write_file('notes.md', '\n'.join(f'note {i}' for i in range(1, 21)))
+
+		result = await fs.read_file_structured('notes.md', start=5, end=6)
+
+		assert '<content>\nnote 5\nnote 6\n</content>' in result['message']
+		assert result['total_lines'] == 20
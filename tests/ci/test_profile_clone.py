@@ -0,0 +1,67 @@
+"""Tests for cloning Chrome profiles into temp user_data_dirs."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from browser_use.browser.profile import BrowserProfile
+from browser_use.browser.profile_clone import clone_profile
+
+
+def write(path: Path, content: bytes = b'data') -> Path:
+	path.parent.mkdir(parents=True, exist_ok=True)
+	path.write_bytes(content)
+	return path
+
+
+@pytest.fixture
+def user_data_dir(tmp_path) -> Path:
+	root = tmp_path / 'chrome-profile'
+	profile = root / 'Default'
+	write(root / 'Local State', b'{"profile": {}}')
+	write(profile / 'Preferences', b'{"prefs": 1}')
+	write(profile / 'Cookies', b'sqlite')
+	write(profile / 'Local Storage' / 'leveldb' / '000003.ldb', b'table')
+	write(profile / 'Local Storage' / 'leveldb' / '000004.log', b'log')
+	write(profile / 'IndexedDB' / 'https_example.com_0.indexeddb.blob' / '1' / '00' / '1', b'blob')
+	write(profile / 'Cache' / 'Cache_Data' / 'data_0', b'x' * 4096)
+	write(profile / 'Code Cache' / 'js' / 'index', b'x' * 4096)
+	write(profile / 'Service Worker' / 'CacheStorage' / 'abc' / 'index', b'x' * 4096)
+	write(profile / 'Service Worker' / 'Database' / 'CURRENT', b'MANIFEST-000001')
+	return root
+
+
+def test_clone_skips_caches_and_links_write_once_files(user_data_dir, tmp_path):
+	src = user_data_dir / 'Default'
+	dst = tmp_path / 'clone' / 'Default'
+	stats = clone_profile(src, dst)
+
+	assert sorted(stats.skipped_dirs) == sorted(['Cache', 'Code Cache', os.path.join('Service Worker', 'CacheStorage')])
+	assert not (dst / 'Cache').exists() and not (dst / 'Service Worker' / 'CacheStorage').exists()
+	assert (dst / 'Service Worker' / 'Database' / 'CURRENT').read_bytes() == b'MANIFEST-000001'
+	assert stats.files_linked + stats.files_reflinked + stats.files_copied == 6
+
+	# Immutable LevelDB tables and IndexedDB blobs are shared instead of copied
+	ldb = Path('Local Storage') / 'leveldb' / '000003.ldb'
+	assert os.path.samefile(src / ldb, dst / ldb)
+	assert stats.files_linked == 2
+
+	# Files Chrome writes in place never share storage with the original
+	(dst / 'Cookies').write_bytes(b'changed')
+	(dst / 'Local Storage' / 'leveldb' / '000004.log').write_bytes(b'changed')
+	assert (src / 'Cookies').read_bytes() == b'sqlite'
+	assert (src / 'Local Storage' / 'leveldb' / '000004.log').read_bytes() == b'log'
+
+	with pytest.raises(FileExistsError):
+		clone_profile(src, dst)
+
+
+def test_browser_profile_uses_clone_for_temp_user_data_dir(user_data_dir):
+	profile = BrowserProfile(user_data_dir=user_data_dir, headless=True)
+	temp_dir = Path(profile.user_data_dir)
+
+	assert 'browser-use-user-data-dir-' in temp_dir.name
+	assert (temp_dir / 'Local State').read_bytes() == b'{"profile": {}}'
+	assert (temp_dir / 'Default' / 'Preferences').read_bytes() == b'{"prefs": 1}'
+	assert not (temp_dir / 'Default' / 'Cache').exists()
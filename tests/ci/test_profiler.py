@@ -0,0 +1,78 @@
+"""Tests for the sampling profiler used by Agent.run(profile=...)."""
+
+import asyncio
+import json
+import time
+
+from browser_use.profiler import IDLE_FRAME, SamplingProfiler
+
+
+class FakeAgent:
+	def __init__(self):
+		self.step = 1
+
+	async def think(self):
+		# Awaits a separate task, like an LLM call wrapped in wait_for on Python 3.11
+		await asyncio.create_task(self._request())
+
+	async def _request(self):
+		await asyncio.sleep(0.2)
+
+	async def act(self):
+		self._spin(0.2)
+
+	def _spin(self, seconds: float):
+		end = time.perf_counter() + seconds
+		while time.perf_counter() < end:
+			pass
+
+	async def run(self, profiler: SamplingProfiler):
+		profiler.start()
+		try:
+			await self.think()
+			self.step = 2
+			await self.act()
+		finally:
+			profiler.stop()
+
+
+def make_profiler(agent: FakeAgent, steps=None) -> SamplingProfiler:
+	return SamplingProfiler(
+		interval=0.002,
+		step=lambda: agent.step,
+		steps=steps,
+		phases={'FakeAgent.think': 'llm', 'FakeAgent.act': 'actions'},
+	)
+
+
+async def test_samples_follow_awaits_and_are_tagged_with_step_and_phase():
+	agent = FakeAgent()
+	profiler = make_profiler(agent)
+	await agent.run(profiler)
+	assert not profiler.running
+
+	lines = [line.rsplit(' ', 1) for line in profiler.collapsed().splitlines()]
+	waiting = [stack for stack, _ in lines if stack.startswith(f'step 1;llm;{IDLE_FRAME};')]
+	assert any('FakeAgent.think' in stack and 'FakeAgent._request' in stack for stack in waiting)
+	spinning = sum(int(us) for stack, us in lines if stack.startswith('step 2;actions;') and 'FakeAgent._spin' in stack)
+	assert 0.1 < spinning / 1e6 < 0.4
+
+
+async def test_selected_steps_and_speedscope_export(tmp_path):
+	agent = FakeAgent()
+	profiler = make_profiler(agent, steps=[2])
+	await agent.run(profiler)
+	assert all(line.startswith('step 2;') for line in profiler.collapsed().splitlines())
+
+	speedscope_path, collapsed_path = profiler.save(tmp_path / 'nested' / 'AgentHistory')
+	assert speedscope_path.name == 'AgentHistory.speedscope.json' and collapsed_path.read_text()
+
+	data = json.loads(speedscope_path.read_text())
+	frames = data['shared']['frames']
+	[profile] = data['profiles']
+	assert profile['name'] == 'step 2' and profile['type'] == 'sampled'
+	assert len(profile['samples']) == len(profile['weights'])
+	assert profile['endValue'] == sum(profile['weights'])
+	assert all(0 <= index < len(frames) for sample in profile['samples'] for index in sample)
+	assert {frames[sample[0]]['name'] for sample in profile['samples']} <= {'phase: actions', 'phase: other'}
+	assert any(frame['name'] == 'FakeAgent._spin' and frame['line'] > 0 for frame in frames)
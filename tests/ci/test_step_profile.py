@@ -0,0 +1,114 @@
+"""Tests for the per-step performance profile stored in AgentHistory metadata."""
+
+import time
+
+from browser_use.agent.service import Agent
+from browser_use.agent.views import (
+	ActionProfile,
+	ActionResult,
+	AgentHistory,
+	AgentHistoryList,
+	AgentOutput,
+	LLMCallProfile,
+	StepMetadata,
+	StepProfile,
+	TimingStats,
+)
+from browser_use.browser.views import BrowserStateHistory, BrowserStateSummary
+from browser_use.dom.views import SerializedDOMState
+from browser_use.tools.service import Tools
+from tests.ci.conftest import create_mock_llm
+
+
+def make_history(profiles: list[StepProfile | None]) -> AgentHistoryList:
+	history = []
+	for i, profile in enumerate(profiles):
+		metadata = StepMetadata(step_number=i + 1, step_start_time=float(i), step_end_time=i + 0.5, profile=profile)
+		state = BrowserStateHistory(url='https://example.com', title='Example', tabs=[], interacted_element=[])
+		history.append(AgentHistory(model_output=None, result=[], state=state, metadata=metadata))
+	return AgentHistoryList(history=history)
+
+
+def make_profile(llm_ms: float, actions: list[tuple[str, float]]) -> StepProfile:
+	return StepProfile(
+		state_capture_ms=100.0,
+		state_capture={'cdp_ms': 40.0, 'serialization_ms': 20.0, 'screenshot_ms': 60.0},
+		context_ms=5.0,
+		llm=LLMCallProfile(calls=1, request_ms=llm_ms - 2, total_ms=llm_ms, prompt_tokens=1000, completion_tokens=50),
+		actions=[ActionProfile(name=name, duration_ms=duration_ms) for name, duration_ms in actions],
+		post_process_ms=1.0,
+		total_ms=500.0,
+	)
+
+
+def test_timing_stats_use_nearest_rank_percentiles():
+	stats = TimingStats.from_samples([float(i) for i in range(1, 21)])
+
+	assert stats.count == 20 and stats.total_ms == 210.0 and stats.mean_ms == 10.5
+	assert stats.p50_ms == 10.0 and stats.p95_ms == 19.0 and stats.max_ms == 20.0
+	assert TimingStats.from_samples([7.0]).p95_ms == 7.0
+
+
+def test_performance_summary_aggregates_phases_stages_and_actions():
+	history = make_history(
+		[
+			make_profile(300.0, [('click', 50.0), ('input', 30.0)]),
+			None,  # steps recorded without a profile are skipped
+			make_profile(100.0, [('click', 150.0)]),
+		]
+	)
+
+	summary = history.performance_summary()
+
+	assert summary.steps == 2
+	assert summary.phases['llm'].mean_ms == 200.0 and summary.phases['llm'].max_ms == 300.0
+	assert summary.phases['actions'].total_ms == 230.0
+	assert summary.phases['total'].count == 2
+	assert summary.state_capture['screenshot_ms'].total_ms == 120.0
+	assert summary.actions['click'].count == 2 and summary.actions['click'].max_ms == 150.0
+	assert summary.actions['input'].total_ms == 30.0
+	assert summary.llm_calls == 2 and summary.prompt_tokens == 2000 and summary.completion_tokens == 100
+
+
+def test_profile_is_persisted_with_history(tmp_path):
+	path = tmp_path / 'history.json'
+	make_history([make_profile(250.0, [('navigate', 900.0)]), None]).save_to_file(path)
+
+	output_model = AgentOutput.type_with_custom_actions(Tools().registry.create_action_model())
+	loaded = AgentHistoryList.load_from_file(path, output_model)
+
+	assert loaded.history[0].metadata and loaded.history[0].metadata.profile == make_profile(250.0, [('navigate', 900.0)])
+	assert loaded.history[1].metadata and loaded.history[1].metadata.profile is None
+	assert loaded.performance_summary().actions['navigate'].total_ms == 900.0
+	assert make_history([]).performance_summary().steps == 0
+
+
+async def test_actions_outside_a_step_do_not_change_its_saved_profile(monkeypatch):
+	agent = Agent(task='Test task', llm=create_mock_llm())
+
+	async def act(action, **kwargs):
+		return ActionResult(extracted_content='ok')
+
+	monkeypatch.setattr(agent.tools, 'act', act)
+	action = agent.ActionModel(**{'wait': {'seconds': 0}})
+
+	# A step: its actions are profiled, then the profile is saved with the history item
+	agent.step_start_time, agent._step_profile = time.time(), StepProfile()
+	agent.state.last_result = await agent.multi_act([action])
+	await agent._finalize(
+		BrowserStateSummary(dom_state=SerializedDOMState(_root=None, selector_map={}), url='', title='', tabs=[])
+	)
+	saved = agent.history.history[-1].metadata.profile  # type: ignore[union-attr]
+	assert saved is not None and [profile.name for profile in saved.actions] == ['wait']
+
+	# Rerun / initial actions call multi_act outside step()
+	await agent.multi_act([action, action])
+	assert agent._step_profile is None and len(saved.actions) == 1
+
+	# A failed step drops its profile as well
+	async def fail(step_info=None):
+		raise RuntimeError('no browser')
+
+	monkeypatch.setattr(agent, '_prepare_context', fail)
+	await agent.step()
+	assert agent._step_profile is None and len(agent.history.history) == 1
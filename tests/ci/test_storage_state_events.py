@@ -0,0 +1,115 @@
+"""Tests for event-driven storage_state persistence in StorageStateWatchdog."""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+from bubus import EventBus
+
+from browser_use.browser import BrowserProfile, BrowserSession
+from browser_use.browser.watchdogs.storage_state_watchdog import StorageStateWatchdog
+
+
+class _Namespace:
+	def __init__(self, domain: str, handlers: dict):
+		self._domain = domain
+		self._handlers = handlers
+
+	def __getattr__(self, name):
+		return lambda handler: self._handlers.__setitem__(f'{self._domain}.{name}', handler)
+
+
+class FakeBrowser:
+	"""Cookie jar and DOM storage behind a fake CDP client."""
+
+	def __init__(self):
+		self.handlers: dict = {}
+		self.cookies = [{'name': 'sid', 'value': '1', 'domain': 'example.com', 'path': '/'}]
+		self.storage: dict[str, dict[str, str]] = {'https://example.com': {'theme': 'dark'}}
+		self.cookie_reads = 0
+		self.storage_reads: list[str] = []
+		self.register = SimpleNamespace(
+			Network=_Namespace('Network', self.handlers), DOMStorage=_Namespace('DOMStorage', self.handlers)
+		)
+		self.send = SimpleNamespace(DOMStorage=SimpleNamespace(getDOMStorageItems=self._get_items))
+
+	async def _get_items(self, params, session_id=None):
+		origin = params['storageId']['securityOrigin']
+		self.storage_reads.append(origin)
+		return {'entries': [[key, value] for key, value in self.storage.get(origin, {}).items()]}
+
+	async def get_cookies(self):
+		self.cookie_reads += 1
+		return [dict(cookie) for cookie in self.cookies]
+
+	def emit(self, method: str, event: dict):
+		self.handlers[method](event, 'session-1')
+
+
+@pytest.fixture
+async def setup(tmp_path, monkeypatch):
+	browser = FakeBrowser()
+	path = tmp_path / 'storage_state.json'
+	session = BrowserSession(browser_profile=BrowserProfile(storage_state=str(path), user_data_dir=None, headless=True))
+	session._cdp_client_root = browser  # type: ignore[assignment]
+	monkeypatch.setattr(BrowserSession, '_cdp_get_cookies', lambda self: browser.get_cookies())
+	watchdog = StorageStateWatchdog(event_bus=EventBus(), browser_session=session, save_debounce=0.05)
+	await watchdog._start_monitoring()
+	yield browser, watchdog, path
+	await watchdog._stop_monitoring()
+	await watchdog.event_bus.stop(clear=True, timeout=5)
+
+
+def storage_event(origin: str, key: str) -> dict:
+	return {'storageId': {'securityOrigin': origin, 'isLocalStorage': True}, 'key': key}
+
+
+async def test_changes_are_coalesced_into_one_atomic_save(setup):
+	browser, watchdog, path = setup
+
+	browser.emit('Network.responseReceivedExtraInfo', {'headers': {'Set-Cookie': 'sid=1'}})
+	for key in ['a', 'b', 'theme']:
+		browser.emit('DOMStorage.domStorageItemUpdated', storage_event('https://example.com', key))
+	await asyncio.sleep(0.2)
+
+	state = json.loads(path.read_text())
+	assert state['cookies'] == browser.cookies
+	assert state['origins'] == [{'origin': 'https://example.com', 'localStorage': [{'name': 'theme', 'value': 'dark'}]}]
+	assert browser.cookie_reads == 1 and browser.storage_reads == ['https://example.com']
+	assert not path.with_suffix('.json.tmp').exists()
+
+
+async def test_only_changed_origins_are_reread_and_unchanged_state_is_not_rewritten(setup):
+	browser, watchdog, path = setup
+	browser.emit('DOMStorage.domStorageItemAdded', storage_event('https://example.com', 'theme'))
+	await asyncio.sleep(0.2)
+	first_write = path.stat().st_mtime_ns
+
+	# Idle session and unrelated responses: nothing is read or written
+	browser.emit('Network.responseReceivedExtraInfo', {'headers': {'content-type': 'text/html'}})
+	await asyncio.sleep(0.2)
+	assert browser.cookie_reads == 0 and browser.storage_reads == ['https://example.com']
+
+	# A change event that leaves the state as saved does not touch the file
+	browser.emit('DOMStorage.domStorageItemUpdated', storage_event('https://example.com', 'theme'))
+	await asyncio.sleep(0.2)
+	assert path.stat().st_mtime_ns == first_write
+
+	# A second origin is added without re-reading the first, clearing it removes it again
+	browser.storage['https://shop.test'] = {'cart': '3'}
+	browser.emit('DOMStorage.domStorageItemAdded', storage_event('https://shop.test', 'cart'))
+	await asyncio.sleep(0.2)
+	assert [origin['origin'] for origin in json.loads(path.read_text())['origins']] == [
+		'https://example.com',
+		'https://shop.test',
+	]
+	assert browser.storage_reads == ['https://example.com', 'https://example.com', 'https://shop.test']
+	assert path.with_suffix('.json.bak').exists()
+
+	del browser.storage['https://shop.test']
+	browser.emit(
+		'DOMStorage.domStorageItemsCleared', {'storageId': {'securityOrigin': 'https://shop.test', 'isLocalStorage': True}}
+	)
+	await asyncio.sleep(0.2)
+	assert [origin['origin'] for origin in json.loads(path.read_text())['origins']] == ['https://example.com']
@@ -0,0 +1,81 @@
+"""Tests for the background tab snapshot cache used by DOMWatchdog."""
+
+import time
+from typing import Any, cast
+
+from browser_use.browser.profile import BrowserProfile
+from browser_use.browser.tab_state_cache import TabStateCache, TabStateSnapshot
+from browser_use.dom.views import SerializedDOMState
+
+
+def make_snapshot(target_id: str, url: str, captured_at: float | None = None) -> TabStateSnapshot:
+	snapshot = TabStateSnapshot(
+		target_id=target_id,
+		url=url,
+		dom_state=SerializedDOMState(_root=None, selector_map={}),
+		enhanced_dom_tree=cast(Any, None),
+	)
+	if captured_at is not None:
+		snapshot.captured_at = captured_at
+	return snapshot
+
+
+def test_take_returns_fresh_snapshot_once():
+	cache = TabStateCache()
+	cache.put(make_snapshot('tab-a', 'https://example.com'), epoch=cache.epoch('tab-a'))
+
+	assert cache.take('tab-a', 'https://example.com') is not None
+	# consumed: the agent is now interacting with the tab, so the snapshot must not be reused
+	assert cache.take('tab-a', 'https://example.com') is None
+	assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_take_rejects_url_mismatch_and_stale_snapshots():
+	cache = TabStateCache(max_age=5.0)
+	cache.put(make_snapshot('tab-a', 'https://example.com/a'), epoch=0)
+	cache.put(make_snapshot('tab-b', 'https://example.com/b', captured_at=time.monotonic() - 60), epoch=0)
+
+	assert cache.take('tab-a', 'https://example.com/other') is None
+	assert cache.take('tab-b', 'https://example.com/b') is None
+
+
+def test_put_discards_builds_that_raced_with_invalidation():
+	cache = TabStateCache()
+	epoch_at_build_start = cache.epoch('tab-a')
+
+	# navigation happens while the background build is still running
+	cache.invalidate('tab-a')
+
+	assert cache.put(make_snapshot('tab-a', 'https://example.com'), epoch=epoch_at_build_start) is False
+	assert 'tab-a' not in cache
+
+	assert cache.put(make_snapshot('tab-a', 'https://example.com'), epoch=cache.epoch('tab-a')) is True
+	assert 'tab-a' in cache
+
+
+def test_take_invalidates_in_flight_builds_for_focused_tab():
+	cache = TabStateCache()
+	epoch_at_build_start = cache.epoch('tab-a')
+
+	# tab gets focused (cold build, nothing cached) while a background build is in flight
+	assert cache.take('tab-a', 'https://example.com') is None
+
+	assert cache.put(make_snapshot('tab-a', 'https://example.com'), epoch=epoch_at_build_start) is False
+
+
+def test_forget_and_clear():
+	cache = TabStateCache()
+	cache.put(make_snapshot('tab-a', 'https://a.com'), epoch=0)
+	cache.put(make_snapshot('tab-b', 'https://b.com'), epoch=0)
+
+	cache.forget('tab-a')
+	assert 'tab-a' not in cache and len(cache) == 1
+
+	cache.clear()
+	assert len(cache) == 0
+
+
+def test_profile_defaults_keep_background_snapshots_off():
+	profile = BrowserProfile()
+	assert profile.background_tab_state_cache is False
+	assert profile.background_tab_state_max_age == 30.0
@@ -0,0 +1,111 @@
+"""Tests for the shared pricing index and running usage totals in TokenCost."""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from browser_use.llm.views import ChatInvokeUsage
+from browser_use.tokens.pricing_index import pricing_index
+from browser_use.tokens.service import TokenCost
+
+FAKE_PRICING = {
+	'sample_spec': {'input_cost_per_token': 'ignored metadata'},
+	'model-a': {
+		'input_cost_per_token': 1e-6,
+		'output_cost_per_token': 2e-6,
+		'cache_read_input_token_cost': 1e-7,
+		'cache_creation_input_token_cost': 5e-7,
+		'max_tokens': 1000,
+		'litellm_provider': 'test',
+		'supports_vision': True,
+	},
+	'model-b': {'input_cost_per_token': 3e-6, 'output_cost_per_token': 4e-6},
+}
+
+
+@pytest.fixture(autouse=True)
+def fake_pricing(monkeypatch):
+	loads = []
+
+	async def read_pricing_data(self):
+		loads.append(self)
+		await asyncio.sleep(0.01)
+		return FAKE_PRICING
+
+	monkeypatch.setattr(TokenCost, '_read_pricing_data', read_pricing_data)
+	pricing_index.clear()
+	yield loads
+	pricing_index.clear()
+
+
+def usage(prompt: int, completion: int, cached: int | None = None, creation: int | None = None) -> ChatInvokeUsage:
+	return ChatInvokeUsage(
+		prompt_tokens=prompt,
+		prompt_cached_tokens=cached,
+		prompt_cache_creation_tokens=creation,
+		prompt_image_tokens=None,
+		completion_tokens=completion,
+		total_tokens=prompt + completion,
+	)
+
+
+async def test_pricing_is_loaded_once_per_process(fake_pricing):
+	services = [TokenCost(include_cost=True) for _ in range(5)]
+
+	await asyncio.gather(*(service.initialize() for service in services))
+	await TokenCost(include_cost=True).initialize()
+
+	assert len(fake_pricing) == 1
+	pricing = await services[0].get_model_pricing('model-a')
+	assert pricing is not None and pricing.input_cost_per_token == 1e-6 and pricing.max_tokens == 1000
+	assert await services[1].get_model_pricing('model-a') is pricing
+	assert await services[0].get_model_pricing('unknown-model') is None
+	assert await services[0].get_model_pricing('sample_spec') is None
+	assert (await services[0].get_model_pricing('bu-1-0')) is not None
+
+
+async def test_summary_totals_match_per_call_costs():
+	service = TokenCost(include_cost=True)
+	calls = [
+		('model-a', usage(1000, 200, cached=400, creation=100)),
+		('model-a', usage(500, 50)),
+		('model-b', usage(300, 30, cached=100)),
+		('model-a', usage(2000, 10, cached=1500)),
+	]
+	for model, call in calls:
+		service.add_usage(model, call)
+
+	summary = await service.get_usage_summary()
+
+	per_call = [await service.calculate_cost(model, call) for model, call in calls]
+	assert summary.entry_count == 4
+	assert summary.total_prompt_tokens == 3800
+	assert summary.total_completion_tokens == 290
+	assert summary.total_prompt_cached_tokens == 2000
+	assert summary.total_prompt_cost == pytest.approx(sum(c.prompt_cost for c in per_call if c))
+	assert summary.total_completion_cost == pytest.approx(sum(c.completion_cost for c in per_call if c))
+	assert summary.total_prompt_cached_cost == pytest.approx(sum(c.prompt_read_cached_cost or 0 for c in per_call if c))
+	assert summary.by_model['model-a'].invocations == 3
+	assert summary.by_model['model-a'].cost == pytest.approx(sum(c.total_cost for c in per_call[:2] + per_call[3:] if c))
+
+	only_b = await service.get_usage_summary(model='model-b')
+	assert list(only_b.by_model) == ['model-b'] and only_b.total_prompt_tokens == 300
+
+	tokens = service.get_usage_tokens_for_model('model-a')
+	assert (tokens.prompt_tokens, tokens.prompt_cached_tokens, tokens.total_tokens) == (3500, 1900, 3760)
+
+
+async def test_since_filter_and_clear_history():
+	service = TokenCost()
+	old = service.add_usage('model-a', usage(100, 10))
+	old.timestamp = datetime.now() - timedelta(hours=1)
+	service.add_usage('model-a', usage(200, 20))
+
+	recent = await service.get_usage_summary(since=datetime.now() - timedelta(minutes=1))
+	assert recent.entry_count == 1 and recent.total_tokens == 220
+
+	service.clear_history()
+	summary = await service.get_usage_summary()
+	assert summary.entry_count == 0 and summary.by_model == {}
+	assert service.get_usage_tokens_for_model('model-a').total_tokens == 0
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""Benchmark the per-access cost of CONFIG settings against re-reading the environment every time.
+
+Usage: python tests/scripts/benchmark_config.py [accesses]
+"""
+
+import sys
+import time
+
+from browser_use.config import CONFIG, FlatEnvConfig, OldConfig
+
+SETTINGS = ['ANONYMIZED_TELEMETRY', 'BROWSER_USE_CONFIG_DIR', 'BROWSER_USE_LOGGING_LEVEL', 'CDP_LOGGING_LEVEL']
+
+
+def reread(name: str):
+	"""What every CONFIG access used to cost: fresh OldConfig, then FlatEnvConfig for the rest."""
+	old_config = OldConfig()
+	if hasattr(old_config, name):
+		return getattr(old_config, name)
+	return getattr(FlatEnvConfig(), name)
+
+
+def timed(fn, name: str, accesses: int) -> float:
+	start = time.perf_counter()
+	for _ in range(accesses):
+		fn(name)
+	return (time.perf_counter() - start) / accesses * 1e6
+
+
+def main(accesses: int) -> None:
+	snapshot = CONFIG.snapshot
+	print(f'{"setting":<28} {"re-read":>12} {"CONFIG.X":>12} {"snapshot.X":>12}')
+	for name in SETTINGS:
+		before = timed(reread, name, max(accesses // 100, 10))
+		config = timed(lambda name: getattr(CONFIG, name), name, accesses)
+		plain = timed(lambda name: getattr(snapshot, name), name, accesses)
+		print(f'{name:<28} {before:10.2f}µs {config:10.2f}µs {plain:10.2f}µs   ({before / config:.0f}x, {before / plain:.0f}x)')
+
+
+if __name__ == '__main__':
+	main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
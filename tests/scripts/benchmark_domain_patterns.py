@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Benchmark compiled domain pattern lists against the per-pattern loops they replace.
+
+Usage: python tests/scripts/benchmark_domain_patterns.py [number_of_patterns]
+"""
+
+import random
+import sys
+import time
+from urllib.parse import urlparse
+
+from bubus import EventBus
+
+from browser_use.browser import BrowserProfile, BrowserSession
+from browser_use.browser.domain_patterns import DomainPatternMatcher, DomainPolicy
+from browser_use.browser.watchdogs.security_watchdog import SecurityWatchdog
+from browser_use.utils import match_url_with_domain_pattern
+
+
+def make_patterns(count: int) -> list[str]:
+	rng = random.Random(0)
+	patterns = []
+	for i in range(count):
+		domain = f'site{i}.{rng.choice(["com", "org", "net", "io"])}'
+		patterns.append(rng.choice([domain, f'*.{domain}', f'http*://{domain}', f'https://{domain}']))
+	return patterns
+
+
+def make_urls(patterns: list[str], count: int) -> list[str]:
+	rng = random.Random(1)
+	urls = []
+	for _ in range(count):
+		domain = rng.choice(patterns).split('://')[-1].removeprefix('*.')
+		if rng.random() < 0.5:
+			domain = f'not-{domain}'  # a miss has to look at every pattern
+		urls.append(f'https://{rng.choice(["", "www.", "app."])}{domain}/page/{rng.randint(0, 9)}')
+	return urls
+
+
+def timed(label: str, fn, urls: list[str]) -> float:
+	start = time.perf_counter()
+	for url in urls:
+		fn(url)
+	elapsed = time.perf_counter() - start
+	print(f'{label:<45} {elapsed / len(urls) * 1e6:10.2f} µs/url')
+	return elapsed
+
+
+def main(pattern_count: int) -> None:
+	patterns = make_patterns(pattern_count)
+	urls = make_urls(patterns, 500)
+	print(f'{pattern_count} patterns, {len(urls)} URLs')
+
+	loop = timed(
+		'match_url_with_domain_pattern loop', lambda url: [match_url_with_domain_pattern(url, p) for p in patterns], urls
+	)
+	start = time.perf_counter()
+	matcher = DomainPatternMatcher(patterns)
+	print(f'{"DomainPatternMatcher compile":<45} {(time.perf_counter() - start) * 1e3:10.2f} ms')
+	cold = timed('DomainPatternMatcher (cold cache)', matcher.matching, urls)
+	warm = timed('DomainPatternMatcher (warm cache)', matcher.matching, urls)
+	print(f'speedup: {loop / cold:.0f}x cold, {loop / warm:.0f}x warm\n')
+
+	browser_session = BrowserSession(browser_profile=BrowserProfile(headless=True, user_data_dir=None))
+	watchdog = SecurityWatchdog(browser_session=browser_session, event_bus=EventBus())
+	parsed = {url: urlparse(url) for url in urls}
+
+	def watchdog_loop(url: str) -> bool:
+		host, scheme = parsed[url].hostname or '', parsed[url].scheme
+		return any(watchdog._is_url_match(url, host, scheme, pattern) for pattern in patterns)
+
+	def policy_check(url: str) -> bool:
+		return policy.matches(url, parsed[url].hostname or '', parsed[url].scheme)
+
+	policy = DomainPolicy(patterns)
+	loop = timed('SecurityWatchdog._is_url_match loop', watchdog_loop, urls)
+	cold = timed('DomainPolicy (cold cache)', policy_check, urls)
+	warm = timed('DomainPolicy (warm cache)', policy_check, urls)
+	print(f'speedup: {loop / cold:.0f}x cold, {loop / warm:.0f}x warm')
+
+
+if __name__ == '__main__':
+	main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
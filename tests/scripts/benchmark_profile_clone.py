@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""Benchmark cloning a large synthetic Chrome profile with clone_profile vs shutil.copytree.
+
+Usage: python tests/scripts/benchmark_profile_clone.py [profile_size_mb]
+"""
+
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from browser_use.browser.profile_clone import clone_profile
+
+
+def make_profile(root: Path, size_mb: int) -> None:
+	"""Roughly the layout of a long-lived profile: mostly cache, then LevelDB/IndexedDB, then SQLite."""
+	rng = random.Random(0)
+
+	def fill(relative_dir: str, share: float, file_kb: int, suffix: str = '') -> None:
+		directory = root / relative_dir
+		directory.mkdir(parents=True, exist_ok=True)
+		for i in range(max(1, int(size_mb * 1024 * share / file_kb))):
+			(directory / f'{i:06d}{suffix}').write_bytes(rng.randbytes(file_kb * 1024))
+
+	fill('Cache/Cache_Data', 0.45, 32)
+	fill('Code Cache/js', 0.15, 16)
+	fill('Service Worker/CacheStorage/abc', 0.1, 64)
+	fill('GPUCache', 0.02, 16)
+	fill('IndexedDB/https_app.example.com_0.indexeddb.leveldb', 0.1, 512, '.ldb')
+	fill('Local Storage/leveldb', 0.05, 256, '.ldb')
+	fill('IndexedDB/https_app.example.com_0.indexeddb.blob/1/00', 0.05, 64)
+	for name in ['History', 'Cookies', 'Web Data', 'Favicons']:
+		(root / name).write_bytes(rng.randbytes(int(size_mb * 1024 * 1024 * 0.02)))
+	(root / 'Preferences').write_text('{}')
+
+
+def timed(label: str, fn) -> float:
+	start = time.perf_counter()
+	result = fn()
+	elapsed = time.perf_counter() - start
+	print(f'{label:<20} {elapsed * 1e3:10.1f} ms {result or ""}')
+	return elapsed
+
+
+def main(size_mb: int) -> None:
+	with tempfile.TemporaryDirectory() as tmp:
+		src = Path(tmp) / 'Default'
+		make_profile(src, size_mb)
+		file_count = sum(len(files) for _, _, files in os.walk(src))
+		print(f'synthetic profile: {size_mb} MB, {file_count} files')
+
+		copytree = timed('shutil.copytree', lambda: shutil.copytree(src, Path(tmp) / 'copytree') and None)
+		clone = timed('clone_profile', lambda: clone_profile(src, Path(tmp) / 'clone'))
+		print(f'speedup: {copytree / clone:.1f}x')
+
+
+if __name__ == '__main__':
+	main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)